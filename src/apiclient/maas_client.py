@@ -7,8 +7,10 @@ __all__ = ["MAASClient", "MAASDispatcher", "MAASOAuth"]
 
 from collections.abc import Sequence
 import gzip
+import http.client
 from io import BytesIO
 import random
+from threading import Lock
 import time
 import urllib.error
 import urllib.parse
@@ -41,6 +43,119 @@ class PostHTTPRedirectHandler(urllib.request.HTTPRedirectHandler):
             raise urllib.request.HTTPError(req.get_full_url(), code, msg, headers, fp)
 
 
+# The methods of the requests that are sent again on a new connection when
+# a reused connection fails.
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+class KeepAliveHandlerMixin:
+    """Keep the connections to the servers open, to reuse them.
+
+    urllib closes the connection after each request. The connections are
+    kept in a pool instead, once the response has been read, unless the
+    server asked to close them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._connections = {}
+        self._connections_lock = Lock()
+
+    def _get_connection(self, key):
+        with self._connections_lock:
+            connections = self._connections.get(key)
+            return connections.pop() if connections else None
+
+    def _put_connection(self, key, conn):
+        with self._connections_lock:
+            self._connections.setdefault(key, []).append(conn)
+
+    def close(self):
+        """Close the idle connections."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, {}
+        for conns in connections.values():
+            for conn in conns:
+                conn.close()
+
+    def _can_retry(self, req, error):
+        """Whether `req` can be sent again after failing with `error`.
+
+        Idempotent requests can always be sent again. Other requests only
+        when the server closed the connection without sending any response,
+        like it does with idle connections: otherwise the server might have
+        handled them already.
+        """
+        return req.get_method() in IDEMPOTENT_METHODS or isinstance(
+            error, http.client.RemoteDisconnected
+        )
+
+    def do_open(self, http_class, req, **http_conn_args):
+        if req._tunnel_host:
+            # Connections tunneled through a proxy aren't pooled.
+            return super().do_open(http_class, req, **http_conn_args)
+        host = req.host
+        if not host:
+            raise urllib.error.URLError("no host given")
+        headers = dict(req.unredirected_hdrs)
+        headers.update(
+            (name, value)
+            for name, value in req.headers.items()
+            if name not in headers
+        )
+        headers = {name.title(): value for name, value in headers.items()}
+        key = (http_class, host)
+        conn = self._get_connection(key)
+        while True:
+            reused = conn is not None
+            if not reused:
+                conn = http_class(host, timeout=req.timeout, **http_conn_args)
+            try:
+                conn.request(
+                    req.get_method(),
+                    req.selector,
+                    req.data,
+                    headers,
+                    encode_chunked=req.has_header("Transfer-encoding"),
+                )
+                res = conn.getresponse()
+            except ConnectionError as error:
+                conn.close()
+                if not reused or not self._can_retry(req, error):
+                    raise urllib.error.URLError(error)  # noqa: B904
+                # The server closed the connection while it was idle.
+                conn = None
+                continue
+            except (OSError, http.client.HTTPException) as error:
+                conn.close()
+                raise urllib.error.URLError(error)  # noqa: B904
+            break
+        try:
+            body = res.read()
+        except (OSError, http.client.HTTPException) as error:
+            conn.close()
+            raise urllib.error.URLError(error)  # noqa: B904
+        if res.will_close:
+            conn.close()
+        else:
+            self._put_connection(key, conn)
+        response = urllib.request.addinfourl(
+            BytesIO(body), res.msg, req.get_full_url(), res.status
+        )
+        response.msg = res.reason
+        return response
+
+
+class KeepAliveHTTPHandler(KeepAliveHandlerMixin, urllib.request.HTTPHandler):
+    """`HTTPHandler` reusing the connections."""
+
+
+class KeepAliveHTTPSHandler(
+    KeepAliveHandlerMixin, urllib.request.HTTPSHandler
+):
+    """`HTTPSHandler` reusing the connections."""
+
+
 class MAASOAuth:
     """Helper class to OAuth-sign an HTTP request."""
 
@@ -97,12 +212,45 @@ class MAASDispatcher:
     can be replaced with a Twisted-enabled alternative.  See the MAAS
     provider in Juju for the code this would require.
 
+    The connections to the server are kept open and reused by the
+    following requests. The dispatcher can be used from multiple threads.
+
     @ivar autodetect_proxies: Extract proxy information from the
         environment variables (http_proxy, no_proxy). Default True
     """
 
     def __init__(self, autodetect_proxies=True):
         self.autodetect_proxies = autodetect_proxies
+        self._openers = {}
+        self._openers_lock = Lock()
+
+    def _get_opener(self, insecure):
+        with self._openers_lock:
+            opener = self._openers.get(insecure)
+            if opener is None:
+                handlers = [KeepAliveHTTPHandler()]
+                if insecure:
+                    handlers.append(PostHTTPRedirectHandler())
+                    handlers.append(
+                        KeepAliveHTTPSHandler(
+                            context=ssl._create_unverified_context()
+                        )
+                    )
+                else:
+                    handlers.append(KeepAliveHTTPSHandler())
+                if not self.autodetect_proxies:
+                    handlers.append(urllib.request.ProxyHandler({}))
+                opener = urllib.request.build_opener(*handlers)
+                self._openers[insecure] = opener
+            return opener
+
+    def close(self):
+        """Close the idle connections to the server."""
+        with self._openers_lock:
+            openers, self._openers = self._openers, {}
+        for opener in openers.values():
+            for handler in opener.handlers:
+                handler.close()
 
     def dispatch_query(self, request_url, headers, method="GET", data=None, insecure=False):
         """Synchronously dispatch an OAuth-signed request to L{request_url}.
@@ -133,15 +281,9 @@ class MAASDispatcher:
         if data is not None and not isinstance(data, bytes):
             data = bytes(data, "utf-8")
         req = RequestWithMethod(request_url, data, headers, method=method)
+        opener = self._get_opener(insecure)
         # Retry the request maximum of 3 times.
-        handlers = []
-        if insecure:
-            handlers.append(PostHTTPRedirectHandler())
-            handlers.append(urllib.request.HTTPSHandler(context=ssl._create_unverified_context()))
-        if not self.autodetect_proxies:
-            handlers.append(urllib.request.ProxyHandler({}))
         for try_count in range(3):
-            opener = urllib.request.build_opener(*handlers)
             try:
                 res = opener.open(req)
             except urllib.error.HTTPError as exc:
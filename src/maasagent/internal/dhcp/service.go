@@ -17,6 +17,7 @@ package dhcp
 
 import (
 	"context"
+	"crypto/sha256"
 	"encoding/base64"
 	"encoding/json"
 	"errors"
@@ -27,6 +28,7 @@ import (
 	"net/http"
 	"os"
 	"os/exec"
+	"sync"
 	"sync/atomic"
 	"syscall"
 	"time"
@@ -122,8 +124,12 @@ type DHCPService struct {
 	runningV4          *atomic.Bool
 	fatal              chan error
 	running            *atomic.Bool
-	systemID           string
-	activeInterfaces   []string
+	// configHashes holds the SHA-256 of the config files last written, so
+	// that unchanged files aren't written again.
+	configHashes     map[string][sha256.Size]byte
+	systemID         string
+	activeInterfaces []string
+	configMutex      sync.Mutex
 }
 
 type omapiConnFactory func(string, string) (net.Conn, error)
@@ -162,6 +168,7 @@ func NewDHCPService(
 		runningV4:       &atomic.Bool{},
 		runningV6:       &atomic.Bool{},
 		running:         &atomic.Bool{},
+		configHashes:    make(map[string][sha256.Size]byte),
 	}
 
 	for _, opt := range options {
@@ -291,9 +298,12 @@ func (s *DHCPService) configure(ctx tworkflow.Context, config DHCPServiceConfigP
 	childCtx := tworkflow.WithChildOptions(ctx, tworkflow.ChildWorkflowOptions{
 		WorkflowID:            fmt.Sprintf("configure-dhcp:%s", s.systemID),
 		WorkflowIDReusePolicy: enums.WORKFLOW_ID_REUSE_POLICY_TERMINATE_IF_RUNNING,
+		ParentClosePolicy:     enums.PARENT_CLOSE_POLICY_ABANDON,
 		TaskQueue:             "region",
 	})
 
+	// configure-dhcp-for-agent keeps running to apply further changes to this
+	// agent, so only wait for it to start.
 	return tworkflow.ExecuteChildWorkflow(childCtx, "configure-dhcp-for-agent", ConfigureDHCPForAgentParam{
 		SystemID:        s.systemID,
 		FullReload:      true,
@@ -302,7 +312,7 @@ func (s *DHCPService) configure(ctx tworkflow.Context, config DHCPServiceConfigP
 		IPRangeIDs:      []int{},
 		StaticIPAddrIDs: []int{},
 		ReservedIPIDs:   []int{},
-	}).Get(ctx, nil)
+	}).GetChildWorkflowExecution().Get(ctx, nil)
 }
 
 func (s *DHCPService) start() error {
@@ -524,10 +534,12 @@ type dhcpConfig struct {
 // configureViaFile registered as a Temporal Activity that is invoked during the
 // DHCP configuration workflow. This activity is used when the configuration must
 // be applied via a file, which requires restarting the dhcpd daemon.
-func (s *DHCPService) configureViaFile(ctx context.Context) error {
+// Files that didn't change since they were last written are left untouched,
+// and the returned value reports whether any file changed.
+func (s *DHCPService) configureViaFile(ctx context.Context) (bool, error) {
 	config, err := s.getConfig(ctx)
 	if err != nil {
-		return err
+		return false, err
 	}
 
 	files := map[string]string{
@@ -542,10 +554,15 @@ func (s *DHCPService) configureViaFile(ctx context.Context) error {
 	v4 := []bool{false, false}
 	v6 := []bool{false, false}
 
+	changed := false
+
+	s.configMutex.Lock()
+	defer s.configMutex.Unlock()
+
 	for file, config := range files {
 		data, err := base64.StdEncoding.DecodeString(config)
 		if err != nil {
-			return err
+			return false, err
 		}
 
 		hasData := len(data) != 0
@@ -569,16 +586,29 @@ func (s *DHCPService) configureViaFile(ctx context.Context) error {
 		path := s.dataPathFactory(file)
 
 		if !hasData && (file == "dhcpd-interfaces" || file == "dhcpd6-interfaces") {
-			if err := os.Remove(path); err != nil && !os.IsNotExist(err) {
-				return err
+			delete(s.configHashes, file)
+
+			err := os.Remove(path)
+			if err == nil {
+				changed = true
+			} else if !os.IsNotExist(err) {
+				return false, err
 			}
 
 			continue
 		}
 
+		hash := sha256.Sum256(data)
+		if lastHash, ok := s.configHashes[file]; ok && lastHash == hash {
+			continue
+		}
+
 		if err := writeConfigFile(path, data, mode); err != nil {
-			return err
+			return false, err
 		}
+
+		s.configHashes[file] = hash
+		changed = true
 	}
 
 	runningV4 := v4[0] && v4[1]
@@ -588,7 +618,16 @@ func (s *DHCPService) configureViaFile(ctx context.Context) error {
 	s.runningV6.Store(runningV6)
 	s.running.Store(runningV4 || runningV6)
 
-	return nil
+	return changed, nil
+}
+
+// resetConfigHashes forgets the config files that were written, so that they
+// are written again, and reported as changed, by the next configureViaFile.
+func (s *DHCPService) resetConfigHashes() {
+	s.configMutex.Lock()
+	defer s.configMutex.Unlock()
+
+	clear(s.configHashes)
 }
 
 type VLANData struct {
@@ -638,17 +677,25 @@ func (s *DHCPService) setActiveInterfaces(ctx context.Context, param SetActiveIn
 	return nil
 }
 
-func (s *DHCPService) restartService(ctx context.Context) error {
+func (s *DHCPService) restartService(ctx context.Context) (err error) {
+	defer func() {
+		// Make sure dhcpd gets restarted with the next full reload, even if
+		// the config files don't change.
+		if err != nil {
+			s.resetConfigHashes()
+		}
+	}()
+
 	runningV4 := s.runningV4.Load()
 	runningV6 := s.runningV6.Load()
 
 	if runningV4 {
-		err := s.controllerV4.Restart(ctx)
+		err = s.controllerV4.Restart(ctx)
 		if err != nil {
 			return err
 		}
 	} else {
-		err := s.controllerV4.Stop(ctx) // ensure disabled server is stopped
+		err = s.controllerV4.Stop(ctx) // ensure disabled server is stopped
 		if err != nil {
 			return err
 		}
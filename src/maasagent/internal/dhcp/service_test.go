@@ -61,7 +61,8 @@ func (m *mockOMAPIClient) AddHost(ip net.IP, mac net.HardwareAddr) error {
 }
 
 type MockDHCPController struct {
-	restarted bool
+	restartErr error
+	restarted  bool
 }
 
 func NewMockDHCPController(service string) *MockDHCPController {
@@ -78,7 +79,7 @@ func (m *MockDHCPController) Stop(ctx context.Context) error {
 
 func (m *MockDHCPController) Restart(ctx context.Context) error {
 	m.restarted = true
-	return nil
+	return m.restartErr
 }
 
 func (m *MockDHCPController) Status(ctx context.Context) (servicecontroller.ServiceStatus, error) {
@@ -482,6 +483,81 @@ func (s *DHCPServiceTestSuite) TestConfigureViaFileNoV6Interfaces() {
 	assert.False(s.T(), s.svc.runningV6.Load())
 }
 
+// TestConfigureViaFileUnchanged ensures that config files are only written
+// when their content changes.
+func (s *DHCPServiceTestSuite) TestConfigureViaFileUnchanged() {
+	var written []string
+
+	writeConfigFile = func(path string, data []byte, mode os.FileMode) error {
+		written = append(written, filepath.Base(path))
+		return writeConfigFileTest(path, data, mode)
+	}
+
+	s.configAPIResponse = []byte(`{
+    "dhcpd": "Y29uZmlndXJhdGlvbl92NA==",
+    "dhcpd_interfaces": "aW50ZXJmYWNlc192NA==",
+    "dhcpd6": "Y29uZmlndXJhdGlvbl92Ng==",
+    "dhcpd6_interfaces": "aW50ZXJmYWNlc192Ng=="
+  }`)
+
+	var changed bool
+
+	val, err := s.activityEnv.ExecuteActivity("configure-dhcp-via-file")
+	s.Require().NoError(err)
+	s.Require().NoError(val.Get(&changed))
+	s.True(changed)
+	s.Len(written, 4)
+
+	written = nil
+
+	val, err = s.activityEnv.ExecuteActivity("configure-dhcp-via-file")
+	s.Require().NoError(err)
+	s.Require().NoError(val.Get(&changed))
+	s.False(changed)
+	s.Empty(written)
+
+	// "configuration_v4_updated"
+	s.configAPIResponse = []byte(`{
+    "dhcpd": "Y29uZmlndXJhdGlvbl92NF91cGRhdGVk",
+    "dhcpd_interfaces": "aW50ZXJmYWNlc192NA==",
+    "dhcpd6": "Y29uZmlndXJhdGlvbl92Ng==",
+    "dhcpd6_interfaces": "aW50ZXJmYWNlc192Ng=="
+  }`)
+
+	val, err = s.activityEnv.ExecuteActivity("configure-dhcp-via-file")
+	s.Require().NoError(err)
+	s.Require().NoError(val.Get(&changed))
+	s.True(changed)
+	s.Equal([]string{"dhcpd.conf"}, written)
+}
+
+// TestConfigureViaFileAfterFailedRestart ensures that config files are
+// written again after dhcpd failed to restart.
+func (s *DHCPServiceTestSuite) TestConfigureViaFileAfterFailedRestart() {
+	s.configAPIResponse = []byte(`{
+    "dhcpd": "Y29uZmlndXJhdGlvbl92NA==",
+    "dhcpd_interfaces": "aW50ZXJmYWNlc192NA==",
+    "dhcpd6": "",
+    "dhcpd6_interfaces": ""
+  }`)
+
+	_, err := s.activityEnv.ExecuteActivity("configure-dhcp-via-file")
+	s.Require().NoError(err)
+
+	controllerV4 := s.svc.controllerV4.(*MockDHCPController)
+	controllerV4.restartErr = errors.New("failed to restart")
+
+	_, err = s.activityEnv.ExecuteActivity("restart-dhcp-service")
+	s.Error(err)
+
+	var changed bool
+
+	val, err := s.activityEnv.ExecuteActivity("configure-dhcp-via-file")
+	s.Require().NoError(err)
+	s.Require().NoError(val.Get(&changed))
+	s.True(changed)
+}
+
 func TestHostMarshalJSON(t *testing.T) {
 	h := Host{
 		Hostname: "localhost",
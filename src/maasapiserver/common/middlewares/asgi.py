@@ -0,0 +1,44 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Helpers for the middlewares, which are plain ASGI applications.
+
+starlette's `BaseHTTPMiddleware` runs the rest of the stack in another task
+and streams the response body back through a memory channel. The
+middlewares here call the next application directly instead, and keep the
+request-scoped state in `scope["state"]`, which is what `Request.state`
+uses, so it's shared by all the `Request` objects built for the scope.
+"""
+
+from typing import Callable
+
+from starlette.responses import Response
+from starlette.types import Message, Send
+
+
+class ResponseStart(Response):
+    """The status and headers of a response, from its start message.
+
+    The headers are those of the message, so that the `Response` API, e.g.
+    `set_cookie`, can be used to change them before the message is sent.
+    """
+
+    def __init__(self, message: Message):
+        self.status_code = message["status"]
+        self.raw_headers = message["headers"] = list(
+            message.get("headers", [])
+        )
+        self.background = None
+
+
+def on_response_start(
+    send: Send, callback: Callable[[ResponseStart], None]
+) -> Send:
+    """Wrap `send` to call `callback` before the response is started."""
+
+    async def wrapped_send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            callback(ResponseStart(message))
+        await send(message)
+
+    return wrapped_send
@@ -1,13 +1,12 @@
 from contextlib import asynccontextmanager
 import time
-from typing import Any, AsyncIterator, Awaitable, Callable
+from typing import Any, AsyncIterator
 
-from fastapi import Request, Response
+from fastapi import Request
 from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncConnection
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
 from maasservicelayer.db import Database
@@ -22,21 +21,42 @@ from maasservicelayer.exceptions.constants import (
 logger = structlog.get_logger()
 
 
-class TransactionMiddleware(BaseHTTPMiddleware):
+# Methods that aren't meant to change anything, see RFC 9110.
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+def record_pool_wait(request: Request, lane: str, seconds: float) -> None:
+    """Record how long the request waited for a database connection."""
+    if not hasattr(request.state, "db_pool_waits"):
+        request.state.db_pool_waits = {}
+    request.state.db_pool_waits[lane] = seconds
+
+
+class TransactionMiddleware:
     """Run a request in a transaction, handling commit/rollback.
 
     This makes the database connection available as `request.state.context.get_connection()`.
+
+    Requests with a safe method run in the read lane: a READ COMMITTED
+    transaction, without the Temporal post-commit. The transaction isn't
+    read-only, since authenticating a request can update the user.
+
+    The response is held back until the transaction is committed, so that
+    a failure to commit results in an error response instead.
     """
 
     def __init__(self, app: ASGIApp, db: Database):
-        super().__init__(app)
+        self.app = app
         self.db = db
 
     @asynccontextmanager
-    async def get_connection(self) -> AsyncIterator[AsyncConnection]:
+    async def get_connection(
+        self, read_only: bool = False
+    ) -> AsyncIterator[AsyncConnection]:
         """Return the connection in a transaction context manager."""
+        engine = self.db.read_engine if read_only else self.db.engine
         try:
-            async with self.db.engine.connect() as conn:
+            async with engine.connect() as conn:
                 async with conn.begin():
                     yield conn
         # Foreign key exceptions are raised only when the transaction is committed, so we have to capture them here.
@@ -51,33 +71,84 @@ class TransactionMiddleware(BaseHTTPMiddleware):
                 ]
             )
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        async with self.get_connection() as conn:
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        read_only = request.method in SAFE_METHODS
+        request.state.db = self.db
+        messages: list[Message] = []
+
+        async def hold(message: Message) -> None:
+            messages.append(message)
+
+        started = time.perf_counter()
+        async with self.get_connection(read_only=read_only) as conn:
+            record_pool_wait(
+                request,
+                "read" if read_only else "write",
+                time.perf_counter() - started,
+            )
             request.state.context.set_connection(conn)
-            response = await call_next(request)
+            await self.app(scope, receive, hold)
+
+        if not read_only:
+            # After the transaction has been committed, we execute all the post commit hooks in the order they were registered.
+            for (
+                post_commit_hook
+            ) in request.state.context.get_post_commit_hooks():
+                try:
+                    await post_commit_hook()
+                except Exception as e:
+                    logger.error(
+                        "The transaction has been committed but a post commit hook has failed.",
+                        exc_info=e,
+                    )
 
-        # TODO: rewrite the temporal service in order to just register the post commit hooks with no additional logic
-        # After the transaction has been committed, we execute all the post commit hooks in the order they were registered.
-        # for post_commit_hook in request.state.context.get_post_commit_hooks():
-        #     try:
-        #         await post_commit_hook()
-        #     except Exception as e:
-        #         logger.error("The transaction has been committed but a post commit hook has failed.", exc_info=e)
-        #         raise e
+            # TODO: rewrite the temporal service in order to just register the post commit hooks with no additional logic
+            if hasattr(request.state, "services") and hasattr(
+                request.state.services, "temporal"
+            ):
+                await request.state.services.temporal.post_commit()
 
-        if hasattr(request.state, "services") and hasattr(
-            request.state.services, "temporal"
-        ):
-            await request.state.services.temporal.post_commit()
+        for message in messages:
+            await send(message)
 
-        return response
 
+async def read_replica(request: Request) -> AsyncIterator[None]:
+    """Dependency running the handler on the read replica, if configured.
 
-class DatabaseMetricsMiddleware(BaseHTTPMiddleware):
+    This is only for handlers of safe methods that don't write anything,
+    since the replica connection is read-only. Authentication and the
+    dependencies listed before this one use the primary connection.
+    """
+    db = getattr(request.state, "db", None)
+    if (
+        db is None
+        or db.replica_engine is None
+        or request.method not in SAFE_METHODS
+    ):
+        yield
+        return
+
+    context = request.state.context
+    primary = context.get_connection()
+    started = time.perf_counter()
+    async with db.replica_engine.connect() as conn:
+        record_pool_wait(request, "replica", time.perf_counter() - started)
+        async with conn.begin():
+            context.set_connection(conn)
+            try:
+                yield
+            finally:
+                context.set_connection(primary)
+
+
+class DatabaseMetricsMiddleware:
     """Track database-related metrics.
 
     It requires the database connection to be available as
@@ -85,14 +156,17 @@ class DatabaseMetricsMiddleware(BaseHTTPMiddleware):
     """
 
     def __init__(self, app: ASGIApp, db: Database):
-        super().__init__(app)
+        self.app = app
         self.db = db
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         query_metrics = {"latency": 0.0, "count": 0}
         request.state.query_metrics = query_metrics
 
@@ -110,8 +184,7 @@ class DatabaseMetricsMiddleware(BaseHTTPMiddleware):
         event.listen(conn, "before_cursor_execute", before)
         event.listen(conn, "after_cursor_execute", after)
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send)
         finally:
             event.remove(conn, "before_cursor_execute", before)
             event.remove(conn, "after_cursor_execute", after)
-        return response
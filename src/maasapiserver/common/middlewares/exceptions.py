@@ -1,12 +1,12 @@
 # Copyright 2024 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import Any, Awaitable, Callable
+from typing import Any
 
 from fastapi.exceptions import RequestValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
 from maasapiserver.common.api.models.responses.errors import (
@@ -93,14 +93,37 @@ class ExceptionHandlers:
         return ValidationErrorResponse(details=details)
 
 
-class ExceptionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+class ExceptionMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def wrapped_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, wrapped_send)
+        except Exception as e:
+            if response_started:
+                raise
+            response = self.get_error_response(e)
+            await response(scope, receive, send)
+
+    def get_error_response(self, exc: Exception) -> Response:
+        """Return the response for an exception raised by the request."""
         try:
-            return await call_next(request)
+            raise exc
         except AlreadyExistsException as e:
             logger.debug(e)
             return ConflictResponse(details=e.details)
@@ -1,11 +1,15 @@
-from typing import Awaitable, Callable
+import time
 
-from fastapi import Request, Response
+from fastapi import Request
 from prometheus_client import CollectorRegistry
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.routing import Match
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from maasapiserver.common.middlewares.asgi import (
+    on_response_start,
+    ResponseStart,
+)
+from maascommon.openfga.cache import DECISION_CACHE
 from provisioningserver.prometheus.utils import (
     create_metrics,
     MetricDefinition,
@@ -15,42 +19,49 @@ from provisioningserver.utils.env import MAAS_UUID
 from provisioningserver.utils.ipaddr import get_machine_default_gateway_ip
 
 
-class PrometheusMiddleware(BaseHTTPMiddleware):
+class PrometheusMiddleware:
     """Collect Prometheus metrics for the call.
 
     This requires the DatabaseMetricsMiddleware to be configured.
     """
 
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         self.metrics = _get_metrics()
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         # make metrics accessible everywhere
         request.state.prometheus_metrics = self.metrics
 
-        def get_labels(request, response):
-            return {
-                "handler": self._get_handler(request),
-                "method": request.method,
-                "status": response.status_code,
-            }
-
-        # wrap the call to time request latency and call the next handler
-        call_next = self.metrics.record_call_latency(
-            "maas_apiserver_request_latency",
-            get_labels=lambda args, kwargs, response: get_labels(
-                request, response
-            ),
-        )(call_next)
-        response = await call_next(request)
+        responses: list[ResponseStart] = []
+        started = time.perf_counter()
+        await self.app(
+            scope, receive, on_response_start(send, responses.append)
+        )
+        latency = time.perf_counter() - started
+        if not responses:
+            return
+        [response] = responses
 
-        labels = get_labels(request, response)
+        labels = {
+            "handler": self._get_handler(request),
+            "method": request.method,
+            "status": response.status_code,
+        }
         # update HTTP metrics
+        self.metrics.update(
+            "maas_apiserver_request_latency",
+            "observe",
+            latency,
+            labels=labels,
+        )
         self.metrics.update(
             "maas_apiserver_response_size",
             "observe",
@@ -73,7 +84,15 @@ class PrometheusMiddleware(BaseHTTPMiddleware):
                 labels=labels,
             )
 
-        return response
+        for lane, seconds in getattr(
+            request.state, "db_pool_waits", {}
+        ).items():
+            self.metrics.update(
+                "maas_apiserver_db_pool_wait_time",
+                "observe",
+                seconds,
+                labels={"lane": lane},
+            )
 
     def _get_handler(self, request: Request) -> str:
         for route in request.app.routes:
@@ -112,12 +131,45 @@ def _get_metrics() -> PrometheusMetrics:
             labels=http_labels,
             buckets=(0.001, 0.005, 0.01, 0.1, 0.25, 0.5, 1.0),
         ),
+        MetricDefinition(
+            "Histogram",
+            "maas_apiserver_db_pool_wait_time",
+            "API server - time waited for a database connection in seconds, "
+            "by lane (read, write or replica)",
+            labels=("lane",),
+            buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+        ),
+        MetricDefinition(
+            "Counter",
+            "maas_apiserver_openfga_cache_hits",
+            "API server - number of OpenFGA decisions served from the cache",
+        ),
+        MetricDefinition(
+            "Counter",
+            "maas_apiserver_openfga_cache_misses",
+            "API server - number of OpenFGA decisions not found in the cache",
+        ),
+        MetricDefinition(
+            "Gauge",
+            "maas_apiserver_openfga_cache_hit_rate",
+            "API server - ratio of OpenFGA decisions served from the cache",
+        ),
     )
     return create_metrics(
         definitions,
+        update_handlers=[_update_openfga_cache_metrics],
         registry=CollectorRegistry(),
         extra_labels={
             "host": get_machine_default_gateway_ip(),
             "maas_id": MAAS_UUID.get(),
         },
     )
+
+
+def _update_openfga_cache_metrics(metrics: PrometheusMetrics) -> None:
+    stats = DECISION_CACHE.stats()
+    metrics.update("maas_apiserver_openfga_cache_hits", "set", stats.hits)
+    metrics.update("maas_apiserver_openfga_cache_misses", "set", stats.misses)
+    metrics.update(
+        "maas_apiserver_openfga_cache_hit_rate", "set", stats.hit_rate
+    )
@@ -1,22 +1,34 @@
 # Copyright 2026 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import Awaitable, Callable
-
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from maasapiserver.common.middlewares.asgi import (
+    on_response_start,
+    ResponseStart,
+)
 
 
-class ResponseFinalizerMiddleware(BaseHTTPMiddleware):
+class ResponseFinalizerMiddleware:
     """Finalizes the response by binding any unbound cookies during request processing to the response."""
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        response = await call_next(request)
-        if cookie_manager := getattr(request.state, "cookie_manager", None):
-            cookie_manager.bind_response(response)
-        return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
+        def finalize(response: ResponseStart) -> None:
+            if cookie_manager := getattr(
+                request.state, "cookie_manager", None
+            ):
+                cookie_manager.bind_response(response)
+
+        await self.app(scope, receive, on_response_start(send, finalize))
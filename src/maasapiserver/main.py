@@ -40,6 +40,7 @@ from maasapiserver.settings import (
 from maasapiserver.tls import TLSPatchedH11Protocol
 from maasapiserver.v3.api.internal.handlers import APIv3Internal
 from maasapiserver.v3.api.public.handlers import APIv3, APIv3UI
+from maasapiserver.v3.listeners.openfga import OpenFGATuplesPostgresListener
 from maasapiserver.v3.listeners.vault import VaultMigrationPostgresListener
 from maasapiserver.v3.middlewares.auth import (
     AuthenticationProvidersCache,
@@ -119,7 +120,10 @@ def craft_public_app(
                 partial(
                     PostgresListenersTaskFactory.create,
                     db_engine=db.engine,
-                    listeners=[VaultMigrationPostgresListener()],
+                    listeners=[
+                        VaultMigrationPostgresListener(),
+                        OpenFGATuplesPostgresListener(),
+                    ],
                 ),
             ),
             EventListener("shutdown", cache.close),
@@ -84,6 +84,12 @@ async def _get_default_db_config(
         username=str(database_user),
         password=str(database_pass),
         port=int(str(config.database_port)),
+        pool_size=config.database_pool_size,
+        pool_max_overflow=config.database_pool_max_overflow,
+        pool_timeout=config.database_pool_timeout,
+        pool_pre_ping=config.database_pool_pre_ping,
+        replica_host=config.database_replica_host or None,
+        replica_port=config.database_replica_port,
     )
 
 
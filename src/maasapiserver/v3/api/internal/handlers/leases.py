@@ -1,4 +1,4 @@
-#  Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+#  Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
 from typing import List
@@ -30,8 +30,8 @@ class LeasesHandler(Handler):
         leases_info_request: List[LeaseInfoRequest],
         services: ServiceCollectionV3 = Depends(services),  # noqa: B008
     ):
-        for lease_info_request in leases_info_request:
-            await services.leases.store_lease_info(
+        await services.leases.store_lease_info_batch(
+            [
                 Lease(
                     action=lease_info_request.action,
                     ip_family=(
@@ -45,4 +45,6 @@ class LeasesHandler(Handler):
                     timestamp_epoch=lease_info_request.timestamp,
                     lease_time_seconds=lease_info_request.lease_time,
                 )
-            )
+                for lease_info_request in leases_info_request
+            ]
+        )
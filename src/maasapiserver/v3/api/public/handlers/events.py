@@ -4,11 +4,14 @@
 from fastapi import Depends
 
 from maasapiserver.common.api.base import Handler, handler
+from maasapiserver.common.middlewares.db import read_replica
 from maasapiserver.v3.api import services
 from maasapiserver.v3.api.public.models.requests.events import (
     EventsFiltersParams,
 )
-from maasapiserver.v3.api.public.models.requests.query import PaginationParams
+from maasapiserver.v3.api.public.models.requests.query import (
+    CursorPaginationParams,
+)
 from maasapiserver.v3.api.public.models.responses.events import (
     EventResponse,
     EventsListResponse,
@@ -41,28 +44,43 @@ class EventsHandler(Handler):
                 check_permissions(
                     openfga_permission=MAASResourceEntitlement.CAN_VIEW_GLOBAL_ENTITIES
                 )
-            )
+            ),
+            Depends(read_replica),
         ],
     )
     async def list_events(
         self,
-        pagination_params: PaginationParams = Depends(),  # noqa: B008
+        pagination_params: CursorPaginationParams = Depends(),  # noqa: B008
         filters: EventsFiltersParams = Depends(),  # noqa: B008
         services: ServiceCollectionV3 = Depends(services),  # noqa: B008
     ) -> EventsListResponse:
-        events = await services.events.list(
-            page=pagination_params.page,
-            size=pagination_params.size,
-            query=QuerySpec(where=filters.to_clause()),
-        )
+        query = QuerySpec(where=filters.to_clause())
         next_link = None
-        if events.has_next(pagination_params.page, pagination_params.size):
-            next_link = (
-                f"{V3_API_PREFIX}/events?"
-                f"{pagination_params.to_next_href_format()}"
+        if pagination_params.use_cursor:
+            events = await services.events.list_by_cursor(
+                size=pagination_params.size,
+                token=pagination_params.token,
+                query=query,
+                with_total=pagination_params.count,
             )
-            if query_filters := filters.to_href_format():
-                next_link += f"&{query_filters}"
+            if events.next_token:
+                next_params = pagination_params.to_next_cursor_href_format(
+                    events.next_token
+                )
+                next_link = f"{V3_API_PREFIX}/events?{next_params}"
+        else:
+            events = await services.events.list(
+                page=pagination_params.page,
+                size=pagination_params.size,
+                query=query,
+            )
+            if events.has_next(pagination_params.page, pagination_params.size):
+                next_link = (
+                    f"{V3_API_PREFIX}/events?"
+                    f"{pagination_params.to_next_href_format()}"
+                )
+        if next_link and (query_filters := filters.to_href_format()):
+            next_link += f"&{query_filters}"
         return EventsListResponse(
             items=[
                 EventResponse.from_model(event, f"{V3_API_PREFIX}/events")
@@ -7,8 +7,12 @@ from maasapiserver.common.api.base import Handler, handler
 from maasapiserver.common.api.models.responses.errors import (
     NotFoundBodyResponse,
 )
+from maasapiserver.common.middlewares.db import read_replica
 from maasapiserver.v3.api import services
-from maasapiserver.v3.api.public.models.requests.query import PaginationParams
+from maasapiserver.v3.api.public.models.requests.query import (
+    CursorPaginationParams,
+    PaginationParams,
+)
 from maasapiserver.v3.api.public.models.responses.machines import (
     MachineResponse,
     MachinesListResponse,
@@ -58,12 +62,13 @@ class MachinesHandler(Handler):
                         RbacPermission.ADMIN_MACHINES,
                     },
                 )
-            )
+            ),
+            Depends(read_replica),
         ],
     )
     async def list_machines(
         self,
-        pagination_params: PaginationParams = Depends(),  # noqa: B008
+        pagination_params: CursorPaginationParams = Depends(),  # noqa: B008
         services: ServiceCollectionV3 = Depends(services),  # noqa: B008
         authenticated_user: AuthenticatedUser = Depends(  # noqa: B008
             get_authenticated_user
@@ -131,11 +136,32 @@ class MachinesHandler(Handler):
 
         query = QuerySpec(where=where_clause)
 
-        machines = await services.machines.list(
-            page=pagination_params.page,
-            size=pagination_params.size,
-            query=query,
-        )
+        next_link = None
+        if pagination_params.use_cursor:
+            machines = await services.machines.list_by_cursor(
+                size=pagination_params.size,
+                token=pagination_params.token,
+                query=query,
+                with_total=pagination_params.count,
+            )
+            if machines.next_token:
+                next_params = pagination_params.to_next_cursor_href_format(
+                    machines.next_token
+                )
+                next_link = f"{V3_API_PREFIX}/machines?{next_params}"
+        else:
+            machines = await services.machines.list(
+                page=pagination_params.page,
+                size=pagination_params.size,
+                query=query,
+            )
+            if machines.has_next(
+                pagination_params.page, pagination_params.size
+            ):
+                next_link = (
+                    f"{V3_API_PREFIX}/machines?"
+                    f"{pagination_params.to_next_href_format()}"
+                )
         return MachinesListResponse(
             items=[
                 MachineResponse.from_model(
@@ -145,14 +171,7 @@ class MachinesHandler(Handler):
                 for machine in machines.items
             ],
             total=machines.total,
-            next=(
-                f"{V3_API_PREFIX}/machines?"
-                f"{pagination_params.to_next_href_format()}"
-                if machines.has_next(
-                    pagination_params.page, pagination_params.size
-                )
-                else None
-            ),
+            next=next_link,
         )
 
     @handler(
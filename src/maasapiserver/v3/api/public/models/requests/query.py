@@ -1,4 +1,4 @@
-# Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+# Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
 from fastapi import Query
@@ -17,3 +17,37 @@ class PaginationParams(BaseModel):
 
     def to_next_href_format(self) -> str:
         return f"page={self.page + 1}&size={self.size}"
+
+
+class CursorPaginationParams(PaginationParams):
+    """Pagination parameters for endpoints that also support keyset pagination.
+
+    Passing a `token` (empty for the first page) switches to keyset pagination:
+    every page costs the same no matter how deep it is, and the total is only
+    counted if `count` is set.
+    """
+
+    token: str | None = Field(
+        Query(
+            default=None,
+            description="The token of the page to fetch. Use an empty "
+            "token for the first page and then follow the `next` links.",
+        )
+    )
+    count: bool = Field(
+        Query(
+            default=False,
+            description="Whether to count the total number of items when "
+            "using token pagination.",
+        )
+    )
+
+    @property
+    def use_cursor(self) -> bool:
+        return self.token is not None
+
+    def to_next_cursor_href_format(self, next_token: str) -> str:
+        href = f"token={next_token}&size={self.size}"
+        if self.count:
+            href += "&count=true"
+        return href
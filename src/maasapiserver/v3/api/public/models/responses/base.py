@@ -1,4 +1,4 @@
-# Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+# Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
 from typing import Any, Dict, Generic, Sequence, TypeVar
@@ -50,14 +50,15 @@ T = TypeVar("T")
 
 class PaginatedResponse(BaseModel, Generic[T]):
     """
-    Base class for offset-paginated responses.
-    Derived classes should overwrite the items property
+    Base class for paginated responses.
+    Derived classes should overwrite the items property.
+    The total is omitted for token-paginated responses unless it was requested.
     """
 
     model_config = ConfigDict(populate_by_name=True)
 
     items: Sequence[T]
-    total: int
+    total: int | None = Field(default=None)
     next: str | None = Field(default=None)
 
 
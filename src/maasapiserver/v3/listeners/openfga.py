@@ -0,0 +1,25 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from asyncpg import Connection
+
+from maascommon.openfga.cache import DECISION_CACHE
+from maasservicelayer.db.listeners import PostgresListener
+
+
+class OpenFGATuplesPostgresListener(PostgresListener):
+    """Drop the cached OpenFGA decisions when tuples change.
+
+    The notification is sent once the transaction changing the tuples has
+    been committed, by any process (e.g. the region).
+    """
+
+    OPENFGA_TUPLE_CHANNEL = "openfga_tuple"
+
+    def __init__(self):
+        super().__init__(self.OPENFGA_TUPLE_CHANNEL)
+
+    def handler(
+        self, connection: Connection, pid: int, channel: str, payload: str
+    ):
+        DECISION_CACHE.invalidate()
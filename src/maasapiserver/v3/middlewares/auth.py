@@ -4,16 +4,16 @@
 import abc
 from datetime import timedelta
 import json
-from typing import Awaitable, Callable, Dict, Sequence
+from typing import Dict, Sequence
 
-from fastapi import Request, Response
+from fastapi import Request
 from macaroonbakery import bakery
 import macaroonbakery._utils as utils
 from pymacaroons import Macaroon
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
 import structlog
 
+from maasapiserver.common.middlewares.asgi import on_response_start
 from maasapiserver.common.utils.http import extract_absolute_uri
 from maasapiserver.v3.auth.cookie_manager import (
     EncryptedCookieManager,
@@ -581,7 +581,7 @@ class AuthenticationProvidersCache:
         return len(self.jwt_authentication_providers_cache)
 
 
-class V3AuthenticationMiddleware(BaseHTTPMiddleware):
+class V3AuthenticationMiddleware:
     """
     If the request targets a v3 endpoint and provides a bearer token we verify the token and add the AuthenticatedUser to
     the request context. Otherwise, we just forward the request to the next middleware.
@@ -592,19 +592,35 @@ class V3AuthenticationMiddleware(BaseHTTPMiddleware):
         app: ASGIApp,
         providers_cache: AuthenticationProvidersCache,
     ):
-        super().__init__(app)
+        self.app = app
         self.providers_cache = providers_cache
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
         # Just pass through the request if it's not for a V3 handler. The other V2 endpoints have another authentication
         # architecture/mechanism.
         if not request.url.path.startswith(V3_API_PREFIX):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
+
+        await self.authenticate(request)
+
+        # Bind the response to the cookie manager to set any pending cookies.
+        await self.app(
+            scope,
+            receive,
+            on_response_start(
+                send, request.state.cookie_manager.bind_response
+            ),
+        )
 
+    async def authenticate(self, request: Request) -> None:
         encryptor = await request.state.services.external_oauth.get_encryptor()
         cookie_manager = EncryptedCookieManager(request, encryptor)
         request.state.cookie_manager = cookie_manager
@@ -638,12 +654,6 @@ class V3AuthenticationMiddleware(BaseHTTPMiddleware):
                 user_id=user.username,
             )
 
-        response = await call_next(request)
-
-        # Bind the response to the cookie manager to set any pending cookies.
-        request.state.cookie_manager.bind_response(response)
-        return response
-
     async def _jwt_authentication(
         self, request: Request, auth_header: str
     ) -> AuthenticatedUser:
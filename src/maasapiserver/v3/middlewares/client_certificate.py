@@ -1,46 +1,51 @@
-#  Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+#  Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
 """
 Middleware for extracting client certificate information from TLS connections.
 """
 
-from typing import Awaitable, Callable
-
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 import structlog
 
 logger = structlog.getLogger(__name__)
 
 
-class RequireClientCertMiddleware(BaseHTTPMiddleware):
+class RequireClientCertMiddleware:
     """
     Middleware that enforces client certificate authentication by checking
     for the presence of a Common Name (CN) in the TLS connection metadata.
     """
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # skip client cert check for agent enrollment endpoint
         if (
-            request.scope["path"].endswith("/agents:enroll")
-            and request.scope["method"] == "POST"
+            scope["path"].endswith("/agents:enroll")
+            and scope["method"] == "POST"
         ):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # The internal API server is using a special version of uvicorn to always include the tls info inside the context,
         # so we can assume it's there.
-        cn = request.scope["extensions"].get("tls", {}).get("client_cn", None)
+        cn = scope["extensions"].get("tls", {}).get("client_cn", None)
         if cn is None:
-            return JSONResponse(
+            response = JSONResponse(
                 {"detail": "Client certificate required."},
                 status_code=403,
             )
+            await response(scope, receive, send)
+            return
 
-        request.scope["client_cn"] = cn
-        return await call_next(request)
+        scope["client_cn"] = cn
+        await self.app(scope, receive, send)
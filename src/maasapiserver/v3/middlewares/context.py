@@ -1,14 +1,14 @@
 #  Copyright 2024 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import Awaitable, Callable
-
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
 import structlog
 
+from maasapiserver.common.middlewares.asgi import (
+    on_response_start,
+    ResponseStart,
+)
 from maascommon.tracing import get_or_set_trace_id, set_trace_id
 from maasservicelayer.context import Context
 
@@ -17,17 +17,20 @@ logger = structlog.getLogger()
 TRACE_ID_HEADER_KEY = "MAAS-trace-id"
 
 
-class ContextMiddleware(BaseHTTPMiddleware):
+class ContextMiddleware:
     """Injects the Context object in the request state."""
 
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+        request = Request(scope)
         trace_id = request.headers.get(TRACE_ID_HEADER_KEY, None)
         if trace_id:
             set_trace_id(trace_id)
@@ -49,12 +52,13 @@ class ContextMiddleware(BaseHTTPMiddleware):
             request_remote_ip=request.headers.get("x-real-ip"),
             useragent=request.headers.get("user-agent"),
         )
-        response = await call_next(request)
 
-        logger.info(
-            "End processing request",
-            status_code=response.status_code,
-            elapsed_time_seconds=context.get_elapsed_time_seconds(),
-        )
-        response.headers[TRACE_ID_HEADER_KEY] = trace_id
-        return response
+        def finalize(response: ResponseStart) -> None:
+            logger.info(
+                "End processing request",
+                status_code=response.status_code,
+                elapsed_time_seconds=context.get_elapsed_time_seconds(),
+            )
+            response.headers[TRACE_ID_HEADER_KEY] = trace_id
+
+        await self.app(scope, receive, on_response_start(send, finalize))
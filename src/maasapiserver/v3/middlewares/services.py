@@ -1,12 +1,8 @@
 #  Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import Awaitable, Callable
-
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from maasapiserver.v3.constants import V3_API_PREFIX
 from maasservicelayer.services import CacheForServices, ServiceCollectionV3
@@ -19,7 +15,7 @@ async def services(
     return request.state.services
 
 
-class ServicesMiddleware(BaseHTTPMiddleware):
+class ServicesMiddleware:
     """Injects the V3 services in the request context if the request targets a v3 endpoint."""
 
     def __init__(
@@ -27,21 +23,18 @@ class ServicesMiddleware(BaseHTTPMiddleware):
         app: ASGIApp,
         cache: CacheForServices,
     ):
-        super().__init__(app)
+        self.app = app
         self.services_cache = cache
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        # Just pass through the request if it's not a V3 endpoint.
-        if not request.url.path.startswith(V3_API_PREFIX):
-            return await call_next(request)
-
-        services = await ServiceCollectionV3.produce(
-            request.state.context,
-            cache=self.services_cache,
-        )
-        request.state.services = services
-        return await call_next(request)
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] == "http":
+            request = Request(scope)
+            # Just pass through the request if it's not a V3 endpoint.
+            if request.url.path.startswith(V3_API_PREFIX):
+                request.state.services = await ServiceCollectionV3.produce(
+                    request.state.context,
+                    cache=self.services_cache,
+                )
+        await self.app(scope, receive, send)
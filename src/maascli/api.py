@@ -4,15 +4,24 @@
 """Interact with a remote MAAS server."""
 
 import argparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from contextlib import suppress
+from datetime import timedelta
 from functools import partial
+from hashlib import sha256
 import http.client
+from itertools import chain
 import json
 from operator import itemgetter
+import os
 from pathlib import Path
 import re
+import shutil
 import sys
+import tempfile
 from textwrap import dedent, fill, wrap
+import threading
+import time
 from urllib.parse import urljoin, urlparse
 
 import httplib2
@@ -33,6 +42,23 @@ from maascli.utils import (
     try_import_module,
 )
 
+_http_clients = threading.local()
+
+
+def get_http_client(ca_certs=None, insecure=False):
+    """Return an `httplib2.Http` client for the current thread.
+
+    The clients are reused, so that the connections to the server are kept
+    open between requests. They aren't thread-safe, hence one per thread.
+    """
+    clients = _http_clients.__dict__.setdefault("clients", {})
+    client = clients.get((ca_certs, insecure))
+    if client is None:
+        client = clients[ca_certs, insecure] = httplib2.Http(
+            ca_certs=ca_certs, disable_ssl_certificate_validation=insecure
+        )
+    return client
+
 
 def http_request(
     url,
@@ -45,9 +71,7 @@ def http_request(
 ):
     """Issue an http request."""
     if client is None:
-        client = httplib2.Http(
-            ca_certs=ca_certs, disable_ssl_certificate_validation=insecure
-        )
+        client = get_http_client(ca_certs=ca_certs, insecure=insecure)
     try:
         # XXX mpontillo 2015-12-15: Should force input to be in bytes here.
         # This calls into httplib2, which is going to call a parser which
@@ -273,6 +297,180 @@ class Action(Command):
         auth.sign_request(uri, headers)
 
 
+def read_operations(stream):
+    """Read the operations for `BatchCommand` from `stream`.
+
+    The operations are either a JSON array, or JSON objects, one per line.
+
+    :return: An iterator of ``operation, error`` tuples, where ``error`` is
+        set when the operation can't be decoded.
+    """
+    first_line = ""
+    for first_line in stream:
+        if first_line.strip():
+            break
+    if first_line.lstrip().startswith("["):
+        try:
+            operations = json.loads(first_line + stream.read())
+        except ValueError as error:
+            yield None, f"Invalid JSON: {error}"
+        else:
+            for operation in operations:
+                yield operation, None
+        return
+    for line in filter(str.strip, chain([first_line], stream)):
+        try:
+            yield json.loads(line), None
+        except ValueError as error:
+            yield None, f"Invalid JSON: {error}"
+
+
+class BatchCommand(Command):
+    """Run API calls in bulk, concurrently.
+
+    The calls are read from FILE, or from the standard input, as a JSON
+    array, or as JSON objects, one per line, e.g.:
+
+      {"resource": "machine", "action": "power-parameters",
+       "params": {"system_id": "abc123"}}
+      {"resource": "tag", "action": "update-nodes",
+       "params": {"name": "gpu"}, "data": {"add": ["abc123", "def456"]}}
+
+    `params` holds the positional arguments of the command, and `data` its
+    name=value arguments. A list passes an argument once per item.
+
+    The results are written to the standard output as they complete, as
+    JSON objects, one per line. Each one has the `index` of the call in
+    the input, and either its HTTP `status` and `result`, or the `error`
+    that prevented the call from being made.
+    """
+
+    def __init__(self, parser, profile, cache=None):
+        super().__init__(parser)
+        self.profile = profile
+        self.cache = CommandTreeCache() if cache is None else cache
+        parser.add_argument(
+            "file",
+            metavar="FILE",
+            nargs="?",
+            type=argparse.FileType("r"),
+            default="-",
+            help="File to read the calls from, the standard input by default.",
+        )
+        parser.add_argument(
+            "-j",
+            "--parallel",
+            type=int,
+            default=8,
+            help="Number of calls to run concurrently (default: 8).",
+        )
+        parser.add_argument(
+            "-k",
+            "--insecure",
+            action="store_true",
+            help="Disable SSL certificate check",
+            default=False,
+        )
+
+    def prepare_request(self, operation):
+        """Return the URI, method, body and headers for `operation`."""
+        if not isinstance(operation, dict):
+            raise CommandError("Expected a JSON object.")
+        resource_name = operation.get("resource")
+        if resource_name not in self.cache.get_index(self.profile):
+            raise CommandError(f"Unknown resource: {resource_name}")
+        handler = self.cache.get_handler(self.profile, resource_name)
+        actions = {
+            safe_name(action["name"]): action for action in handler["actions"]
+        }
+        action = actions.get(operation.get("action"))
+        if action is None:
+            raise CommandError(
+                f"Unknown action for {resource_name}: "
+                f"{operation.get('action')}"
+            )
+        params = operation.get("params") or {}
+        missing = [param for param in handler["params"] if param not in params]
+        if missing:
+            raise CommandError(f"Missing params: {', '.join(missing)}")
+        data = []
+        for name, values in (operation.get("data") or {}).items():
+            if not isinstance(values, list):
+                values = [values]
+            data.extend(
+                (name, value if isinstance(value, str) else json.dumps(value))
+                for value in values
+            )
+        maas_url = urlparse(self.profile["url"])
+        uri = "{}://{}{}".format(
+            maas_url.scheme,
+            maas_url.netloc,
+            handler["path"].format(**params),
+        )
+        uri, body, headers = Action.prepare_payload(
+            action["op"], action["method"], uri, data
+        )
+        headers = dict(headers)
+        if self.profile["credentials"] is not None:
+            Action.sign(uri, headers, self.profile["credentials"])
+        return uri, action["method"], body, headers
+
+    def __call__(self, options):
+        if options.parallel < 1:
+            raise CommandError("--parallel must be at least 1.")
+        ca_certs = materialize_certificate(self.profile)
+        failed = False
+
+        def call(uri, method, body, headers):
+            try:
+                response, content = http_request(
+                    uri,
+                    method,
+                    body=body,
+                    headers=headers,
+                    ca_certs=ca_certs,
+                    insecure=options.insecure,
+                )
+            except (CommandError, OSError, httplib2.HttpLib2Error) as error:
+                return {"error": str(error)}
+            try:
+                result = json.loads(content)
+            except ValueError:
+                result = content.decode("utf-8", errors="replace")
+            return {"status": response.status, "result": result}
+
+        def write(index, result):
+            nonlocal failed
+            failed = failed or result.get("status", 0) // 100 != 2
+            print(json.dumps({"index": index, **result}), flush=True)
+
+        with ThreadPoolExecutor(options.parallel) as executor:
+            pending = {}
+            operations = read_operations(options.file)
+            for index, (operation, error) in enumerate(operations):
+                if error is None:
+                    try:
+                        request = self.prepare_request(operation)
+                    except CommandError as prepare_error:
+                        error = str(prepare_error)
+                if error is not None:
+                    write(index, {"error": error})
+                    continue
+                pending[executor.submit(call, *request)] = index
+                # Don't read ahead of the calls being made.
+                if len(pending) >= 2 * options.parallel:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        write(pending.pop(future), future.result())
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(pending.pop(future), future.result())
+
+        if failed:
+            raise CommandError(2)
+
+
 class ActionHelp(argparse.Action):
     """Custom "help" function for an action `ArgumentParser`.
 
@@ -445,8 +643,8 @@ def register_handler(profile, handler, parser):
     register_actions(profile, handler, handler_parser)
 
 
-def register_resources(profile, parser):
-    """Register a profile's resources."""
+def get_handler_defs(profile):
+    """Return the definitions of a profile's handlers, sorted by name."""
     anonymous = profile["credentials"] is None
     description = profile["description"]
     resources = description["resources"]
@@ -483,8 +681,143 @@ def register_resources(profile, parser):
             }
         )
 
-    for handler in sorted(handler_defs, key=itemgetter("handler_name")):
+    return sorted(handler_defs, key=itemgetter("handler_name"))
+
+
+class CommandTreeCache:
+    """On-disk cache of the handlers of the profiles.
+
+    The handlers for an API description are stored in a directory named
+    after the hash of the description, with one file per handler and an
+    index of their help titles. A command only reads the handler it uses,
+    and refreshing the description switches to a new directory.
+    """
+
+    # Bump when the format of the cached files changes.
+    version = 1
+
+    # Directories that weren't written to for this long are removed.
+    max_age = timedelta(days=30)
+
+    def __init__(self, path=None):
+        if path is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or "~/.cache"
+            path = Path(cache_home).expanduser() / "maascli"
+        self.path = Path(path)
+        self._handler_defs = {}
+
+    def get_tree_path(self, profile):
+        """Return the directory for the profile's handlers, if cacheable."""
+        description_hash = profile["description"].get("hash")
+        if description_hash is None:
+            return None
+        key = json.dumps(
+            [self.version, description_hash, profile["credentials"] is None]
+        )
+        return self.path / sha256(key.encode("utf-8")).hexdigest()
+
+    def get_index(self, profile):
+        """Return a dict mapping the profile's handler names to their help
+        titles, sorted by name."""
+        tree_path = self.get_tree_path(profile)
+        if tree_path is not None:
+            with suppress(OSError, ValueError):
+                return json.loads((tree_path / "index.json").read_bytes())
+        handler_defs = get_handler_defs(profile)
+        self._handler_defs[profile["name"]] = {
+            handler["handler_name"]: handler for handler in handler_defs
+        }
+        index = {
+            handler["handler_name"]: parse_docstring(handler["doc"])[0]
+            for handler in handler_defs
+        }
+        if tree_path is not None:
+            with suppress(OSError):
+                self._write(tree_path, index, handler_defs)
+        return index
+
+    def get_handler(self, profile, handler_name):
+        """Return the definition of one of the profile's handlers."""
+        handler_defs = self._handler_defs.get(profile["name"])
+        if handler_defs is None:
+            tree_path = self.get_tree_path(profile)
+            if tree_path is not None:
+                with suppress(OSError, ValueError):
+                    return json.loads(
+                        (tree_path / f"{handler_name}.json").read_bytes()
+                    )
+            handler_defs = self._handler_defs[profile["name"]] = {
+                handler["handler_name"]: handler
+                for handler in get_handler_defs(profile)
+            }
+        return handler_defs[handler_name]
+
+    def _write(self, tree_path, index, handler_defs):
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self._prune()
+        # Write to a temporary directory first, since other commands might
+        # be reading the cache.
+        tmp_path = Path(tempfile.mkdtemp(dir=self.path, prefix=".tmp-"))
+        try:
+            (tmp_path / "index.json").write_text(json.dumps(index))
+            for handler in handler_defs:
+                (tmp_path / f"{handler['handler_name']}.json").write_text(
+                    json.dumps(handler)
+                )
+            tmp_path.rename(tree_path)
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def _prune(self):
+        expired = time.time() - self.max_age.total_seconds()
+        for path in self.path.iterdir():
+            with suppress(OSError):
+                if path.stat().st_mtime < expired:
+                    shutil.rmtree(path, ignore_errors=True)
+
+
+def register_resources(profile, parser, argv=None, cache=None):
+    """Register a profile's resources.
+
+    If the remaining command-line arguments are given in `argv`, only the
+    resource they name is registered along with its actions. When they
+    don't name a resource, the resources are registered without actions,
+    so that they can be listed, along with the `batch` command.
+    """
+    if cache is None:
+        cache = CommandTreeCache()
+    if argv is None:
+        handler_defs = get_handler_defs(profile)
+        for handler in handler_defs:
+            register_handler(profile, handler, parser)
+        handler_names = {handler["handler_name"] for handler in handler_defs}
+        if "batch" not in handler_names:
+            register_batch(profile, parser, cache)
+        return
+
+    index = cache.get_index(profile)
+    resource_name = argv[0] if argv else None
+    if resource_name in index:
+        handler = cache.get_handler(profile, resource_name)
         register_handler(profile, handler, parser)
+    else:
+        for handler_name, help_title in index.items():
+            parser.subparsers.add_parser(
+                handler_name, help=help_title, description=help_title
+            )
+        if "batch" not in index:
+            register_batch(profile, parser, cache)
+
+
+def register_batch(profile, parser, cache=None):
+    """Register a profile's `batch` command."""
+    help_title, help_body = parse_docstring(BatchCommand)
+    batch_parser = parser.subparsers.add_parser(
+        "batch", help=help_title, description=help_title, epilog=help_body
+    )
+    batch_parser.set_defaults(
+        execute=BatchCommand(batch_parser, profile, cache=cache)
+    )
 
 
 profile_help_paragraphs = [
@@ -506,10 +839,20 @@ profile_help = "\n\n".join(
 )
 
 
-def register_api_commands(parser):
-    """Register all profiles as subcommands on `parser`."""
+def register_api_commands(parser, argv=None):
+    """Register all profiles as subcommands on `parser`.
+
+    If the command-line arguments are given in `argv` and they name a
+    profile, only the commands for that profile are registered, and only
+    as much of them as is needed to parse the arguments.
+    """
+    if argv is not None:
+        argv = [arg for arg in argv if not arg.startswith("-")]
     with suppress(FileNotFoundError), ProfileConfig.open() as config:
-        for profile_name in config:
+        profile_names = list(config)
+        if argv and argv[0] in profile_names:
+            profile_names = [argv[0]]
+        for profile_name in profile_names:
             profile = config[profile_name]
             profile_parser = parser.subparsers.add_parser(
                 profile["name"],
@@ -520,7 +863,10 @@ def register_api_commands(parser):
                 ),
                 epilog=profile_help,
             )
-            register_resources(profile, profile_parser)
+            if argv is None:
+                register_resources(profile, profile_parser)
+            elif argv and argv[0] == profile_name:
+                register_resources(profile, profile_parser, argv[1:])
 
 
 def materialize_certificate(profile, cert_dir="~/.maascli.certs"):
@@ -35,16 +35,22 @@ class ProfileConfig:
         This cache is needed to enforce a consistent view. Without it, the list
         of items can be out of sync with the items actually in the database
         leading to KeyErrors when traversing the profiles.
+
+        The profiles are only decoded when accessed, since the API
+        descriptions they hold are large and most commands only use one.
         """
         with self.cursor() as cursor:
             query = cursor.execute("SELECT name, data FROM profiles")
-            return {name: json.loads(data) for name, data in query.fetchall()}
+            return dict(query.fetchall())
 
     def __iter__(self):
         return iter(self.cache)
 
     def __getitem__(self, name):
-        return self.cache[name]
+        data = self.cache[name]
+        if isinstance(data, (str, bytes)):
+            data = self.cache[name] = json.loads(data)
+        return data
 
     def __setitem__(self, name, data):
         with self.cursor() as cursor:
@@ -84,7 +84,7 @@ def prepare_parser(argv):
         epilog="https://maas.io/",
     )
     register_cli_commands(parser)
-    api.register_api_commands(parser)
+    api.register_api_commands(parser, argv[1:])
     parser.add_argument(
         "--debug", action="store_true", default=False, help=argparse.SUPPRESS
     )
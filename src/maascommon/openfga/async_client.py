@@ -13,14 +13,24 @@ from maascommon.openfga.base import (
     OpenFGAEntitlementResourceType,
     PoolResourceEntitlements,
 )
+from maascommon.openfga.cache import (
+    DECISION_CACHE,
+    MISSING,
+    OpenFGADecisionCache,
+)
 
 
 class OpenFGAClient(BaseOpenFGAClient):
     """Asynchronous client for interacting with OpenFGA API."""
 
-    def __init__(self, unix_socket: str | None = None):
+    def __init__(
+        self,
+        unix_socket: str | None = None,
+        cache: OpenFGADecisionCache | None = None,
+    ):
         super().__init__(unix_socket)
         self.client = self._init_client()
+        self.cache = DECISION_CACHE if cache is None else cache
 
     def _init_client(self) -> httpx.AsyncClient:
         return httpx.AsyncClient(
@@ -34,6 +44,17 @@ class OpenFGAClient(BaseOpenFGAClient):
         await self.client.aclose()
 
     async def _check(self, user_id: int, relation: str, obj: str) -> bool:
+        key = ("check", user_id, relation, obj)
+        allowed = self.cache.get(key)
+        if allowed is MISSING:
+            generation = self.cache.generation
+            allowed = await self._fetch_check(user_id, relation, obj)
+            self.cache.set(key, allowed, generation)
+        return allowed
+
+    async def _fetch_check(
+        self, user_id: int, relation: str, obj: str
+    ) -> bool:
         response = await self.client.post(
             f"/stores/{OPENFGA_STORE_ID}/check",
             json={
@@ -50,6 +71,20 @@ class OpenFGAClient(BaseOpenFGAClient):
 
     async def _list_objects(
         self, user_id: int, relation: str, obj_type: str
+    ) -> list[int]:
+        key = ("list-objects", user_id, relation, obj_type)
+        objects = self.cache.get(key)
+        if objects is MISSING:
+            generation = self.cache.generation
+            objects = await self._fetch_list_objects(
+                user_id, relation, obj_type
+            )
+            self.cache.set(key, tuple(objects), generation)
+            return objects
+        return list(objects)
+
+    async def _fetch_list_objects(
+        self, user_id: int, relation: str, obj_type: str
     ) -> list[int]:
         response = await self.client.post(
             f"/stores/{OPENFGA_STORE_ID}/list-objects",
@@ -0,0 +1,101 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import time
+from typing import Any, Callable, Hashable
+
+# Sentinel returned by `OpenFGADecisionCache.get` on a miss, since cached
+# decisions can legitimately be falsy (a denied check, an empty list).
+MISSING = object()
+
+
+@dataclass(frozen=True, slots=True)
+class OpenFGADecisionCacheStats:
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class OpenFGADecisionCache:
+    """Bounded cache of OpenFGA decisions with a time-to-live.
+
+    Entries are keyed by (kind, user, relation, object) so that `check` and
+    `list-objects` answers never collide. When the cache is full, the least
+    recently used entry is evicted.
+
+    A tuple change can affect decisions for any user (e.g. through group
+    membership), so `invalidate` drops everything rather than trying to work
+    out which entries are affected. It's called once the change has been
+    committed, by the writer and by every process listening for tuple
+    changes. The TTL bounds how long a decision can stay stale if a
+    notification is missed.
+
+    Each `invalidate` bumps `generation`. A decision fetched while the cache
+    got invalidated may predate the change, so `set` drops it when given the
+    generation observed before the fetch.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        ttl: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached decision for `key`, or `MISSING`."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            del self._entries[key]
+        self._misses += 1
+        return MISSING
+
+    def set(
+        self, key: Hashable, value: Any, generation: int | None = None
+    ) -> None:
+        if self.maxsize <= 0:
+            return
+        if generation is not None and generation != self._generation:
+            return
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop all the cached decisions."""
+        self._entries.clear()
+        self._generation += 1
+
+    def stats(self) -> OpenFGADecisionCacheStats:
+        return OpenFGADecisionCacheStats(
+            hits=self._hits, misses=self._misses, size=len(self._entries)
+        )
+
+
+# Shared by all the async clients in the process, so that decisions are
+# reused across requests.
+DECISION_CACHE = OpenFGADecisionCache()
@@ -1,11 +1,12 @@
 # Copyright 2025 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
+from bisect import bisect_left, bisect_right
 from ipaddress import IPv4Address, IPv6Address
 import re
 from typing import Iterable, List, Optional
 
-from netaddr import EUI, IPAddress, IPNetwork, IPRange, IPSet
+from netaddr import EUI, IPAddress, IPNetwork, IPRange
 from netaddr.core import NotRegisteredError
 
 from maascommon.enums.ipranges import IPRangePurpose
@@ -148,68 +149,62 @@ class MAASIPRange(IPRange):
     ):
         # we receive an ipaddress address but we have to translate it to a netaddr one.
         return cls(
-            start=IPAddress(str(start_ip)),
-            end=IPAddress(str(end_ip)),
+            start=IPAddress(int(start_ip), start_ip.version),
+            end=IPAddress(int(end_ip), end_ip.version),
             purpose=set(purpose),
         )
 
 
 def _combine_overlapping_maasipranges(
     ranges: Iterable[MAASIPRange],
-) -> List[MAASIPRange]:
+) -> List[list]:
     """Returns the specified ranges after combining any overlapping ranges.
 
     Given a sorted list of `MAASIPRange` objects, returns a new (sorted)
     list where any adjacent overlapping ranges have been combined into a single
-    range.
+    range. Ranges are returned as `[first, last, purpose, version, iprange]`
+    lists, where `iprange` is the original `MAASIPRange` if it's unchanged.
     """
     new_ranges = []
-    previous_min = None
-    previous_max = None
+    previous = None
     for item in ranges:
-        if previous_min is not None and previous_max is not None:
+        first, last = item.first, item.last
+        if previous is not None:
             # Check for an overlapping range.
-            min_overlaps = previous_min <= item.first <= previous_max
-            max_overlaps = previous_min <= item.last <= previous_max
+            min_overlaps = previous[0] <= first <= previous[1]
+            max_overlaps = previous[0] <= last <= previous[1]
             if min_overlaps or max_overlaps:
-                previous = new_ranges.pop()
-                item = make_iprange(
-                    min(item.first, previous_min),
-                    max(item.last, previous_max),
-                    previous.purpose | item.purpose,
-                )
-        previous_min = item.first
-        previous_max = item.last
-        new_ranges.append(item)
+                previous[0] = min(first, previous[0])
+                previous[1] = max(last, previous[1])
+                previous[2] = previous[2] | item.purpose
+                previous[4] = None
+                continue
+        previous = [first, last, item.purpose, item.version, item]
+        new_ranges.append(previous)
     return new_ranges
 
 
-def _coalesce_adjacent_purposes(
-    ranges: Iterable[MAASIPRange],
-) -> List[MAASIPRange]:
+def _coalesce_adjacent_purposes(ranges: Iterable[list]) -> List[list]:
     """Combines and returns adjacent ranges that have an identical purpose.
 
-    Given a sorted list of `MAASIPRange` objects, returns a new (sorted)
-    list where any adjacent ranges with identical purposes have been combined
-    into a single range.
+    Given a sorted list of ranges, as returned by
+    `_combine_overlapping_maasipranges`, returns a new (sorted) list where any
+    adjacent ranges with identical purposes have been combined into a single
+    range.
     """
     new_ranges = []
-    previous_first = None
-    previous_last = None
-    previous_purpose = None
+    previous = None
     for item in ranges:
-        if previous_purpose is not None and previous_last is not None:
+        if previous is not None:
             adjacent_and_identical = (
-                item.first == (previous_last + 1)
-                and item.purpose == previous_purpose
+                item[0] == previous[1] + 1 and item[2] == previous[2]
             )
             if adjacent_and_identical:
-                new_ranges.pop()
-                item = make_iprange(previous_first, item.last, item.purpose)
-        previous_first = item.first
-        previous_last = item.last
-        previous_purpose = item.purpose
-        new_ranges.append(item)
+                previous[1] = item[1]
+                previous[4] = None
+                continue
+        previous = item
+        new_ranges.append(previous)
     return new_ranges
 
 
@@ -223,13 +218,48 @@ def _normalize_ipranges(ranges: Iterable) -> List[MAASIPRange]:
         if not isinstance(item, MAASIPRange):
             item = MAASIPRange(item)
         new_ranges.append(item)
-    return sorted(new_ranges)
+    # The sort key is computed once per range, rather than for each
+    # comparison. Sorted runs, such as the ranges of two `MAASIPSet`s, are
+    # merged in linear time.
+    return sorted(new_ranges, key=IPRange.sort_key)
+
+
+def _make_maasiprange(first: int, last: int, version: int, purpose):
+    """Returns a `MAASIPRange` from the integer values of its addresses."""
+    return MAASIPRange(
+        IPAddress(first, version), IPAddress(last, version), purpose=purpose
+    )
+
+
+def _merge_intervals(ranges: Iterable) -> List[tuple]:
+    """Returns the (version, first, last) intervals covered by `ranges`.
+
+    The intervals are sorted, with the overlapping and adjacent ranges
+    combined.
+    """
+    intervals = []
+    for item in ranges:
+        if not isinstance(item, (IPRange, IPNetwork)):
+            item = IPNetwork(item)
+        intervals.append((item.version, item.first, item.last))
+    intervals.sort()
+    merged = []
+    for version, first, last in intervals:
+        if merged and merged[-1][0] == version and first <= merged[-1][2] + 1:
+            if last > merged[-1][2]:
+                merged[-1] = (version, merged[-1][1], last)
+        else:
+            merged.append((version, first, last))
+    return merged
 
 
 class MAASIPSet(set):
     """
     This class has been moved from `provisioningserver.utils.network` and the
     relevant tests are still there.
+
+    The ranges are sorted, and don't overlap. Their first and last addresses
+    are also kept in arrays, so that addresses are found by bisection.
     """
 
     def __init__(
@@ -238,7 +268,7 @@ class MAASIPSet(set):
         self.cidr = cidr
         self.ranges = ranges
         self._condense()
-        super().__init__(set(self.ranges))
+        super().__init__(self.ranges)
 
     def _condense(self):
         """Condenses the `ranges` ivar in this `MAASIPSet` by:
@@ -246,10 +276,37 @@ class MAASIPSet(set):
         (1) Ensuring range set is is sorted list of MAASIPRange objects.
         (2) De-duplicate set by combining overlapping IP ranges.
         (3) Combining adjacent ranges with an identical purpose.
+
+        The ranges are combined as integers, and only the combined ranges
+        are created again.
         """
-        self.ranges = _normalize_ipranges(self.ranges)
-        self.ranges = _combine_overlapping_maasipranges(self.ranges)
-        self.ranges = _coalesce_adjacent_purposes(self.ranges)
+        ranges = _combine_overlapping_maasipranges(
+            _normalize_ipranges(self.ranges)
+        )
+        self.ranges = [
+            (
+                _make_maasiprange(first, last, version, purpose)
+                if iprange is None
+                else iprange
+            )
+            for first, last, purpose, version, iprange in (
+                _coalesce_adjacent_purposes(ranges)
+            )
+        ]
+        self._firsts = [item.first for item in self.ranges]
+        self._lasts = [item.last for item in self.ranges]
+        # The ranges are sorted by version first, the addresses only increase
+        # within the ranges of each version.
+        self._ipv4_count = sum(1 for item in self.ranges if item.version == 4)
+        self._purposes = set().union(*(item.purpose for item in self.ranges))
+
+    def _runs(self, version=None):
+        """The (start, stop) indices of the ranges of each IP version."""
+        if version == 4:
+            return [(0, self._ipv4_count)]
+        if version == 6:
+            return [(self._ipv4_count, len(self.ranges))]
+        return [(0, self._ipv4_count), (self._ipv4_count, len(self.ranges))]
 
     def __ior__(self, other):
         """Return self |= other."""
@@ -268,18 +325,15 @@ class MAASIPSet(set):
         within that range.)
         """
         if isinstance(search, IPRange):
-            for item in self.ranges:
-                if (
-                    item.first <= search.first <= item.last
-                    and item.first <= search.last <= item.last
-                ):
-                    return item
+            first, last = search.first, search.last
         else:
-            addr = IPAddress(search)
-            addr = int(addr)
-            for item in self.ranges:
-                if item.first <= addr <= item.last:
-                    return item
+            first = last = int(IPAddress(search))
+        for start, stop in self._runs():
+            # The last range starting before the address is the only one
+            # that can contain it.
+            index = bisect_right(self._firsts, first, start, stop) - 1
+            if index >= start and first <= last <= self._lasts[index]:
+                return self.ranges[index]
         return None
 
     @property
@@ -324,10 +378,7 @@ class MAASIPSet(set):
         """Returns True if the specified purpose is found inside any of the
         ranges in this set, otherwise returns False.
         """
-        for item in self.ranges:
-            if purpose in item.purpose:
-                return True
-        return False
+        return purpose in self._purposes
 
     def get_first_unused_ip(self) -> Optional[int]:
         """Returns the integer value of the first unused IP address in the set."""
@@ -380,7 +431,7 @@ class MAASIPSet(set):
         Exclude the network (and broadcast, if applicable) addresses from
         the set of addresses considered "unused".
         """
-        ip_set = IPSet(network)
+        first, last = network.first, network.last
         # Skip the network address, if this is a network
         prefixlen = network.prefixlen
         if (
@@ -389,31 +440,47 @@ class MAASIPSet(set):
             or network.version == 6
             and prefixlen not in (127, 128)
         ):
-            ip_set.remove(network.first)
+            first += 1
         # Skip the broadcast address, if this is an IPv4 network
         if network.version == 4 and prefixlen not in (31, 32):
-            ip_set.remove(network.last)
-        return self._get_unused_ranges(ip_set, purpose)
+            last -= 1
+        return self._get_unused_ranges(
+            [(network.version, first, last)], purpose
+        )
 
     def get_unused_ranges_for_range(
         self, ranges: list[MAASIPRange], purpose=IPRANGE_PURPOSE.UNUSED
     ) -> "MAASIPSet":
         """Calculates unused ranges with respect to a list of ranges."""
-        ip_set = IPSet(ranges)
-        return self._get_unused_ranges(ip_set, purpose)
+        return self._get_unused_ranges(_merge_intervals(ranges), purpose)
 
     def _get_unused_ranges(
-        self, ip_set: IPSet, purpose=IPRANGE_PURPOSE.UNUSED
+        self, intervals: list[tuple], purpose=IPRANGE_PURPOSE.UNUSED
     ) -> "MAASIPSet":
         """Calculates and returns a list of unused IP ranges, based on
-        the supplied range of desired addresses.
+        the supplied (version, first, last) intervals of desired addresses.
+
+        The intervals and the ranges are both sorted, so the gaps are found
+        in a single pass over the ranges.
         """
-        used_ip_set = IPSet(self.ranges)
-        unused_ip_set = ip_set.difference(used_ip_set)
-        unused_ranges = [
-            make_iprange(r.first, r.last, purpose)
-            for r in unused_ip_set.iter_ipranges()
-        ]
+        unused_ranges = []
+        for version, first, last in intervals:
+            [(start, stop)] = self._runs(version)
+            # Skip the ranges ending before the interval.
+            index = bisect_left(self._lasts, first, start, stop)
+            while index < stop and self._firsts[index] <= last:
+                if self._firsts[index] > first:
+                    unused_ranges.append(
+                        _make_maasiprange(
+                            first, self._firsts[index] - 1, version, purpose
+                        )
+                    )
+                first = max(first, self._lasts[index] + 1)
+                index += 1
+            if first <= last:
+                unused_ranges.append(
+                    _make_maasiprange(first, last, version, purpose)
+                )
         return MAASIPSet(unused_ranges)
 
     def get_full_range(self, cidr: IPNetwork) -> "MAASIPSet":
@@ -14,6 +14,12 @@ DOWNLOAD_TIMEOUT = timedelta(hours=2)
 FETCH_IMAGE_METADATA_TIMEOUT = timedelta(minutes=10)
 CLEANUP_TIMEOUT = timedelta(minutes=1)
 MAX_SOURCES = 5
+# Large files are downloaded in parts of this size, from several sources at
+# once, so that an interrupted download can be resumed part by part.
+DOWNLOAD_PART_SIZE = 256 * 2**20
+MAX_PARALLEL_PARTS = 4
+# How much data a part downloads between progress checkpoints.
+DOWNLOAD_CHECKPOINT_SIZE = 64 * 2**20
 
 DOWNLOAD_BOOTRESOURCE_WORKFLOW_NAME = "download-bootresource"
 SYNC_BOOTRESOURCES_WORKFLOW_NAME = "sync-bootresources"
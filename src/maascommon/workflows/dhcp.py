@@ -8,6 +8,9 @@ from typing import Any, Optional
 CONFIGURE_DHCP_FOR_AGENT_WORKFLOW_NAME = "configure-dhcp-for-agent"
 CONFIGURE_DHCP_WORKFLOW_NAME = "configure-dhcp"
 
+# Signals names
+CONFIGURE_DHCP_FOR_AGENT_SIGNAL_NAME = "configure-dhcp-for-agent-update"
+
 
 # Workflows parameters
 @dataclass
@@ -43,5 +46,29 @@ def merge_configure_dhcp_param(
         ip_range_ids=ensure_list(old.ip_range_ids)
         + ensure_list(new.ip_range_ids),
         reserved_ip_ids=ensure_list(old.reserved_ip_ids)
-        + ensure_list(new.ip_range_ids),
+        + ensure_list(new.reserved_ip_ids),
+    )
+
+
+def merge_configure_dhcp_for_agent_param(
+    old: ConfigureDHCPForAgentParam, new: ConfigureDHCPForAgentParam
+) -> ConfigureDHCPForAgentParam:
+    if old.full_reload or new.full_reload:
+        # A full reload applies all the changes.
+        return ConfigureDHCPForAgentParam(
+            system_id=old.system_id, full_reload=True
+        )
+
+    def merge_ids(
+        old_ids: list[int] | None, new_ids: list[int] | None
+    ) -> list[int]:
+        return sorted(set(old_ids or []) | set(new_ids or []))
+
+    return ConfigureDHCPForAgentParam(
+        system_id=old.system_id,
+        full_reload=False,
+        static_ip_addr_ids=merge_ids(
+            old.static_ip_addr_ids, new.static_ip_addr_ids
+        ),
+        reserved_ip_ids=merge_ids(old.reserved_ip_ids, new.reserved_ip_ids),
     )
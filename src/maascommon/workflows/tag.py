@@ -7,6 +7,7 @@ from lxml import etree  # pyright: ignore [reportAttributeAccessIssue]
 
 # Workflows names
 TAG_EVALUATION_WORKFLOW_NAME = "tag-evaluation"
+TAGS_EVALUATION_WORKFLOW_NAME = "tags-evaluation"
 
 """Based on a study on the performance of the tag evaluation query, the time
 estimated for comparing a XPath expression over ten of thousands of nodes can be
@@ -30,3 +31,34 @@ class TagEvaluationParam:
         # it will raise an error. The validation aims to avoid potential SQL
         # injection attacks.
         etree.XPath(self.tag_definition)
+
+
+@dataclass(frozen=True)
+class TagDefinition:
+    tag_id: int
+    tag_definition: str
+
+    def __post_init__(self):
+        # See TagEvaluationParam.
+        etree.XPath(self.tag_definition)
+
+
+@dataclass(frozen=True)
+class TagsEvaluationParam:
+    """Evaluate several tags in a single pass over the nodes."""
+
+    tags: list[TagDefinition]
+    batch_size: int = TAG_EVALUATION_BATCH_SIZE
+
+
+def tags_evaluation_workflow_id(tags: list[TagDefinition]) -> str:
+    """Return the ID of the workflow evaluating `tags`.
+
+    The ID only depends on the set of tags, so that evaluating the same tags
+    again replaces the evaluation in progress, while the evaluations of
+    other tags are left alone. Evaluations of overlapping sets of tags can
+    run at the same time, but only the results for the current definition of
+    a tag are written.
+    """
+    tag_ids = sorted({tag.tag_id for tag in tags})
+    return f"{TAGS_EVALUATION_WORKFLOW_NAME}:{','.join(map(str, tag_ids))}"
@@ -75,6 +75,7 @@ from maasserver.forms.filesystem import (
     MountNonStorageFilesystemForm,
     UnmountNonStorageFilesystemForm,
 )
+from maasserver.machine_inventory import find_machine_for_acquisition
 from maasserver.models import (
     Config,
     Domain,
@@ -2463,8 +2464,14 @@ class MachinesHandler(NodesHandler, PowersMixin):
                     request.user
                 )
             )
-            machines, storage, interfaces = form.filter_nodes(machines)
-            machine = get_first(machines)
+            if verbose:
+                # The verbose output lists the matches for all the machines.
+                machines, storage, interfaces = form.filter_nodes(machines)
+                machine = get_first(machines)
+            else:
+                machine, storage, interfaces = find_machine_for_acquisition(
+                    form, machines
+                )
             system_id = get_optional_param(
                 request.POST, "system_id", default=None
             )
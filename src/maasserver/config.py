@@ -103,6 +103,40 @@ class RegionConfiguration(Configuration, metaclass=RegionConfigurationMeta):
         "Number of keeaplives that can be lost before connection is reset.",
         Int(if_missing=2),
     )
+    database_pool_size = ConfigurationOption(
+        "database_pool_size",
+        "The number of database connections kept open by the v3 API server.",
+        Int(if_missing=3, accept_python=False, min=1),
+    )
+    database_pool_max_overflow = ConfigurationOption(
+        "database_pool_max_overflow",
+        "The number of database connections the v3 API server can open "
+        "beyond database_pool_size when all of them are in use.",
+        Int(if_missing=10, accept_python=False, min=0),
+    )
+    database_pool_timeout = ConfigurationOption(
+        "database_pool_timeout",
+        "How long (in seconds) the v3 API server waits for a database "
+        "connection to be available.",
+        Int(if_missing=30, accept_python=False, min=1),
+    )
+    database_pool_pre_ping = ConfigurationOption(
+        "database_pool_pre_ping",
+        "Whether the v3 API server checks that a database connection is "
+        "still alive before using it.",
+        OneWayStringBool(if_missing=False),
+    )
+    database_replica_host = ConfigurationOption(
+        "database_replica_host",
+        "The address of a PostgreSQL read replica. When set, the v3 API "
+        "server runs some read-only requests on it.",
+        UnicodeString(if_missing="", accept_python=False),
+    )
+    database_replica_port = ConfigurationOption(
+        "database_replica_port",
+        "The port of the PostgreSQL read replica, database_port if unset.",
+        Int(if_missing=None, accept_python=False, min=1, max=65535),
+    )
 
     # Vault options.
     vault_url = ConfigurationOption(
@@ -4,10 +4,12 @@
 """DNS management module."""
 
 from collections import defaultdict
+from dataclasses import dataclass, field
 
 from django.conf import settings
-from netaddr import IPAddress, IPNetwork
+from netaddr import INET_PTON, IPAddress, IPNetwork, valid_ipv4, valid_ipv6
 
+from maascommon.enums.dns import DnsUpdateAction
 from maasserver.dns.zonegenerator import (
     InternalDomain,
     InternalDomainResourse,
@@ -24,14 +26,20 @@ from maasserver.models.interface import Interface
 from maasserver.models.node import RackController
 from maasserver.models.subnet import Subnet
 from provisioningserver.dns.actions import (
+    bind_reconfigure,
     bind_reload,
     bind_reload_with_retries,
+    bind_reload_zones,
     bind_write_configuration,
     bind_write_options,
     bind_write_zones,
 )
 from provisioningserver.dns.config import DynamicDNSUpdate
-from provisioningserver.dns.zoneconfig import DNSReverseZoneConfig
+from provisioningserver.dns.nsupdate import DNSUpdateError
+from provisioningserver.dns.zoneconfig import (
+    DNSReverseZoneConfig,
+    DomainConfigBase,
+)
 from provisioningserver.logger import get_maas_logger, LegacyLogger
 from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
 from provisioningserver.utils.shell import ExternalProcessError
@@ -40,6 +48,66 @@ maaslog = get_maas_logger("dns")
 log = LegacyLogger()
 
 
+@dataclass
+class DirtyZones:
+    """The zones affected by a set of DNS publications."""
+
+    # Names of the forward zones to regenerate.
+    domains: set[str] = field(default_factory=set)
+    # Addresses whose reverse zones have to be regenerated, or None if all
+    # the reverse zones have to be.
+    addresses: set[str] | None = field(default_factory=set)
+
+
+class ZoneCache:
+    """The zones written by the last DNS update in this process.
+
+    An incremental update only regenerates the zones affected by the
+    changes, and takes the other ones from here to write BIND's
+    configuration. Only the zone names and paths are kept, not the records.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.serial = None
+        self._forward = {}
+        self._reverse = {}
+
+    def update(self, zones, serial, reverse_spans=None):
+        """Store the zones written for `serial`.
+
+        :param reverse_spans: The networks whose reverse zones have been
+            regenerated, or None if all the zones have been.
+        """
+        if reverse_spans is None:
+            self._forward.clear()
+            self._reverse.clear()
+        else:
+            self._reverse = {
+                network: zone
+                for network, zone in self._reverse.items()
+                if not any(
+                    network in span or span in network
+                    for span in reverse_spans
+                )
+            }
+        for zone in zones:
+            cached = DomainConfigBase(zone.domain, zone.zone_info)
+            if isinstance(zone, DNSReverseZoneConfig):
+                self._reverse[zone._network] = cached
+            else:
+                self._forward[zone.domain] = cached
+        self.serial = serial
+
+    def zones(self):
+        return [*self._forward.values(), *self._reverse.values()]
+
+
+ZONE_CACHE = ZoneCache()
+
+
 def current_zone_serial():
     return "%0.10d" % DNSPublication.objects.get_most_recent().serial
 
@@ -54,6 +122,48 @@ def dns_force_reload():
     DNSPublication(source="Force reload").save()
 
 
+def _get_zone_names(zones):
+    return {zi.zone_name for zone in zones for zi in zone.zone_info}
+
+
+def get_dirty_zones(since_serial):
+    """Return the zones changed by the DNS publications after `since_serial`.
+
+    :return: A `DirtyZones`, or None if some of the changes can't be tracked
+        down to specific zones, and all of them have to be regenerated.
+    """
+    # Publications are garbage collected oldest first: if the one for
+    # `since_serial` is still there, none of the following ones is gone.
+    last = (
+        DNSPublication.objects.filter(serial=since_serial)
+        .order_by("-id")
+        .first()
+    )
+    if last is None:
+        return None
+    dirty = DirtyZones()
+    updates = DNSPublication.objects.filter(id__gt=last.id).values_list(
+        "update", flat=True
+    )
+    for update in updates:
+        # See `DNSPublicationManager.create_for_config_update` for the format.
+        action, *fields = update.split(" ")
+        if action == DnsUpdateAction.RELOAD or len(fields) < 3:
+            return None
+        zone, _, rtype, *rest = fields
+        dirty.domains.add(zone)
+        if rtype not in ("A", "AAAA") or dirty.addresses is None:
+            continue
+        answer = rest[-1] if rest else ""
+        if valid_ipv4(answer, INET_PTON) or valid_ipv6(answer, INET_PTON):
+            dirty.addresses.add(answer)
+        else:
+            # The address isn't known (e.g. all the addresses of a name have
+            # been removed), so any reverse zone can be affected.
+            dirty.addresses = None
+    return dirty
+
+
 def forward_domains_to_forwarded_zones(forward_domains):
     # converted to a list of tuple to keep model within maasserver code
     return [
@@ -80,6 +190,7 @@ def dns_update_all_zones(
     dynamic_updates=None,
     requires_reload=False,
     serial=None,
+    since_serial=None,
 ):
     """Update all zone files for all domains.
 
@@ -98,6 +209,11 @@ def dns_update_all_zones(
 
     :param requires_reload: If true, dynamic updates are ignored and a full reload will occur
     :type requires_reload: bool
+
+    :param since_serial: The serial of the zones currently served. If given,
+        only the zones changed by the publications after it are regenerated
+        and reloaded, if possible.
+    :type since_serial: str
     """
     if not is_dns_enabled():
         return
@@ -119,20 +235,62 @@ def dns_update_all_zones(
     )
     if serial is None:
         serial = current_zone_serial()
+
+    dirty = None
+    if (
+        since_serial is not None
+        and requires_reload
+        and ZONE_CACHE.serial is not None
+        and int(ZONE_CACHE.serial) == int(since_serial)
+    ):
+        dirty = get_dirty_zones(since_serial)
+    reverse_spans = None
+    if dirty is None:
+        zone_domains, zone_subnets = domains, subnets
+    else:
+        zone_domains = [
+            domain for domain in domains if domain.name in dirty.domains
+        ]
+        if dirty.addresses is None:
+            zone_subnets = subnets
+        else:
+            zone_subnets, reverse_spans = (
+                ZoneGenerator.get_reverse_zone_subnets(
+                    subnets, dirty.addresses
+                )
+            )
+        log.info(
+            f"Regenerating {len(zone_domains)} domains and "
+            f"{len(zone_subnets)} subnets changed since serial {since_serial}"
+        )
+
     zones = ZoneGenerator(
-        domains,
-        subnets,
+        zone_domains,
+        zone_subnets,
         default_ttl,
         serial,
+        # The internal domain is always written, as it holds the serial
+        # the zones are compared against.
         internal_domains=[get_internal_domain()],
         dynamic_updates=dynamic_updates,
         force_config_write=requires_reload,
     ).as_list()
     try:
         bind_write_zones(zones)
-    except ExternalProcessError:  # dynamic update failed
+    except (ExternalProcessError, DNSUpdateError):  # dynamic update failed
         reloaded = False
 
+    if dirty is None:
+        ZONE_CACHE.update(zones, serial)
+        all_zones = zones
+    else:
+        previous_zone_names = _get_zone_names(ZONE_CACHE.zones())
+        ZONE_CACHE.update(zones, serial, reverse_spans=reverse_spans)
+        all_zones = ZONE_CACHE.zones()
+    if not reloaded:
+        # The zone files might not match the cache anymore.
+        ZONE_CACHE.clear()
+
     # We should not be calling bind_write_options() here; call-sites should be
     # making a separate call. It's a historical legacy, where many sites now
     # expect this side-effect from calling dns_update_all_zones_now(), and
@@ -148,7 +306,7 @@ def dns_update_all_zones(
     # where the "trusted" ACL ended up in the same configuration file as the
     # zone stanzas, and so both need to be rewritten at the same time.
     bind_write_configuration(
-        zones,
+        all_zones,
         trusted_networks=get_trusted_networks(),
         allow_only_trusted_transfers=allow_only_trusted_transfers,
         forwarded_zones=forwarded_zones,
@@ -160,7 +318,19 @@ def dns_update_all_zones(
                 requires_reload = True
                 break
 
-    if requires_reload:
+    if dirty is not None:
+        # Only the zones that have been written need to be reloaded. BIND
+        # has to load its configuration again first if zones have been added
+        # or removed.
+        if _get_zone_names(all_zones) != previous_zone_names:
+            try:
+                bind_reconfigure()
+            except ExternalProcessError:
+                reloaded = False
+        reloaded = (
+            bind_reload_zones(sorted(_get_zone_names(zones))) and reloaded
+        )
+    elif requires_reload:
         # Reloading with retries may be a legacy from Celery days, or it may be
         # necessary to recover from races during start-up. We're not sure if it is
         # actually needed but it seems safer to maintain this behaviour until we
@@ -4,17 +4,21 @@
 from argparse import ArgumentParser
 import random
 import time
+from unittest.mock import MagicMock
 
 from django.conf import settings
 import dns.resolver
 from netaddr import IPAddress, IPNetwork
 
+from maascommon.enums.dns import DnsUpdateAction
 from maasserver.config import RegionConfiguration
 from maasserver.dns import config as dns_config_module
 from maasserver.dns.config import (
     current_zone_serial,
+    DirtyZones,
     dns_force_reload,
     forward_domains_to_forwarded_zones,
+    get_dirty_zones,
     get_internal_domain,
     get_resource_name_for_subnet,
     get_reverse_zone_for_answer,
@@ -22,6 +26,7 @@ from maasserver.dns.config import (
     get_trusted_networks,
     get_upstream_dns,
     process_dns_update_notify,
+    ZoneCache,
 )
 from maasserver.dns.config import (
     dns_update_all_zones as wrapped_dns_update_all_zones,
@@ -445,6 +450,149 @@ class TestDNSConfigModifications(TestDNSServer):
         )
         reload_call.assert_called_once()
 
+    def test_dns_update_all_zones_only_reloads_changed_zones(self):
+        self.patch(settings, "DNS_CONNECT", True)
+        self.patch(dns_config_module, "ZONE_CACHE", ZoneCache())
+        domain = factory.make_Domain()
+        other_domain = factory.make_Domain()
+        subnet = factory.make_Subnet(cidr="10.0.1.0/24")
+        node, static = self.create_node_with_static_ip(
+            domain=domain, subnet=subnet
+        )
+        dns_update_all_zones(
+            reload_timeout=RELOAD_TIMEOUT, requires_reload=True
+        )
+        since_serial = current_zone_serial()
+        DNSPublication.objects.create_for_config_update(
+            source="test",
+            action=DnsUpdateAction.INSERT,
+            label=node.hostname,
+            rtype="A",
+            zone=domain.name,
+            answer=str(static.ip),
+        )
+        bind_reload = self.patch(dns_config_module, "bind_reload")
+        bind_reload_zones = self.patch(
+            dns_config_module,
+            "bind_reload_zones",
+            MagicMock(wraps=dns_config_module.bind_reload_zones),
+        )
+
+        dns_update_all_zones(
+            reload_timeout=RELOAD_TIMEOUT,
+            requires_reload=True,
+            since_serial=since_serial,
+        )
+
+        bind_reload.assert_not_called()
+        bind_reload_zones.assert_called_once_with(
+            sorted(
+                [
+                    domain.name,
+                    Config.objects.get_config("maas_internal_domain"),
+                    "1.0.10.in-addr.arpa",
+                ]
+            )
+        )
+        self.assertNotIn(other_domain.name, bind_reload_zones.call_args[0][0])
+        self.assertDNSMatches(node.hostname, domain.name, static.ip)
+        # BIND's configuration still includes all the zones.
+        with open(compose_config_path(DNSConfig.target_file_name), "r") as fh:
+            self.assertIn(other_domain.name, fh.read())
+
+    def test_dns_update_all_zones_full_reload_without_zone_cache(self):
+        self.patch(settings, "DNS_CONNECT", True)
+        self.patch(dns_config_module, "ZONE_CACHE", ZoneCache())
+        since_serial = current_zone_serial()
+        dns_force_reload()
+        get_dirty_zones = self.patch(dns_config_module, "get_dirty_zones")
+        bind_reload = self.patch(dns_config_module, "bind_reload")
+        dns_update_all_zones(
+            reload_timeout=RELOAD_TIMEOUT,
+            requires_reload=True,
+            since_serial=since_serial,
+        )
+        get_dirty_zones.assert_not_called()
+        bind_reload.assert_called_once_with(timeout=RELOAD_TIMEOUT)
+
+
+class TestGetDirtyZones(MAASServerTestCase):
+    def test_returns_changed_zones(self):
+        since_serial = DNSPublication.objects.get_most_recent().serial
+        DNSPublication.objects.create_for_config_update(
+            source="test",
+            action=DnsUpdateAction.INSERT,
+            label="foo",
+            rtype="A",
+            zone="example.com",
+            ttl=30,
+            answer="10.0.0.1",
+        )
+        DNSPublication.objects.create_for_config_update(
+            source="test",
+            action=DnsUpdateAction.DELETE,
+            label="bar",
+            rtype="AAAA",
+            zone="example.org",
+            answer="2001:db8::1",
+        )
+        DNSPublication.objects.create_for_config_update(
+            source="test",
+            action=DnsUpdateAction.INSERT,
+            label="baz",
+            rtype="TXT",
+            zone="example.net",
+            answer="text",
+        )
+        self.assertEqual(
+            DirtyZones(
+                domains={"example.com", "example.org", "example.net"},
+                addresses={"10.0.0.1", "2001:db8::1"},
+            ),
+            get_dirty_zones(since_serial),
+        )
+
+    def test_all_reverse_zones_if_address_is_unknown(self):
+        since_serial = DNSPublication.objects.get_most_recent().serial
+        DNSPublication.objects.create_for_config_update(
+            source="test",
+            action=DnsUpdateAction.DELETE,
+            label="foo",
+            rtype="A",
+            zone="example.com",
+        )
+        self.assertEqual(
+            DirtyZones(domains={"example.com"}, addresses=None),
+            get_dirty_zones(since_serial),
+        )
+
+    def test_returns_none_for_reload(self):
+        since_serial = DNSPublication.objects.get_most_recent().serial
+        DNSPublication.objects.create_for_config_update(
+            source="test",
+            action=DnsUpdateAction.INSERT,
+            label="foo",
+            rtype="A",
+            zone="example.com",
+            answer="10.0.0.1",
+        )
+        dns_force_reload()
+        self.assertIsNone(get_dirty_zones(since_serial))
+
+    def test_returns_none_if_publication_is_gone(self):
+        publication = DNSPublication.objects.get_most_recent()
+        since_serial = publication.serial
+        DNSPublication.objects.create_for_config_update(
+            source="test",
+            action=DnsUpdateAction.INSERT,
+            label="foo",
+            rtype="A",
+            zone="example.com",
+            answer="10.0.0.1",
+        )
+        publication.delete()
+        self.assertIsNone(get_dirty_zones(since_serial))
+
 
 class TestDNSDynamicIPAddresses(TestDNSServer):
     """Allocated nodes with IP addresses in the dynamic range get a DNS
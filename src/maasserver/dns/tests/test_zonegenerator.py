@@ -736,6 +736,54 @@ class TestZoneGenerator(MAASServerTestCase):
         assertIsReverseZoneWithDomain(self, rev2, default_domain.name, "10/24")
 
 
+class TestGetReverseZoneSubnets(MAASServerTestCase):
+    def test_selects_subnets_of_addresses(self):
+        subnet1 = factory.make_Subnet(cidr="10.0.1.0/24")
+        factory.make_Subnet(cidr="10.0.2.0/24")
+        subnets, spans = ZoneGenerator.get_reverse_zone_subnets(
+            Subnet.objects.all(), ["10.0.1.5"]
+        )
+        self.assertEqual([subnet1], subnets)
+        self.assertEqual([IPNetwork("10.0.1.0/24")], spans)
+
+    def test_includes_subnets_sharing_glue_zone(self):
+        subnet1 = factory.make_Subnet(
+            cidr="10.0.1.0/26", rdns_mode=RDNS_MODE.RFC2317
+        )
+        subnet2 = factory.make_Subnet(
+            cidr="10.0.1.64/26", rdns_mode=RDNS_MODE.RFC2317
+        )
+        factory.make_Subnet(cidr="10.0.2.0/24")
+        subnets, spans = ZoneGenerator.get_reverse_zone_subnets(
+            Subnet.objects.all(), ["10.0.1.5"]
+        )
+        self.assertCountEqual([subnet1, subnet2], subnets)
+        self.assertEqual(
+            [
+                IPNetwork("10.0.1.0/24"),
+                IPNetwork("10.0.1.0/26"),
+                IPNetwork("10.0.1.64/26"),
+            ],
+            spans,
+        )
+
+    def test_includes_overlapping_subnets(self):
+        subnet1 = factory.make_Subnet(cidr="10.0.0.0/16")
+        subnet2 = factory.make_Subnet(cidr="10.0.1.0/24")
+        factory.make_Subnet(cidr="10.1.0.0/24")
+        subnets, _ = ZoneGenerator.get_reverse_zone_subnets(
+            Subnet.objects.all(), ["10.0.1.5"]
+        )
+        self.assertCountEqual([subnet1, subnet2], subnets)
+
+    def test_no_addresses(self):
+        factory.make_Subnet(cidr="10.0.1.0/24")
+        self.assertEqual(
+            ([], []),
+            ZoneGenerator.get_reverse_zone_subnets(Subnet.objects.all(), []),
+        )
+
+
 class TestZoneGeneratorTTL(MAASTransactionServerTestCase):
     """Tests for TTL in :class:ZoneGenerator`."""
 
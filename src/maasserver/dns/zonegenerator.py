@@ -476,6 +476,59 @@ class ZoneGenerator:
 
         return rfc2317_glue
 
+    @staticmethod
+    def _get_reverse_zone_spans(network: IPNetwork) -> list[IPNetwork]:
+        """Return the networks covered by the reverse zones of `network`."""
+        spans = [network]
+        # Small networks can end up in the RFC2317 glue zone of their /24
+        # (or /124 for IPv6), together with the other small networks there.
+        if network.version == 4 and network.prefixlen > 24:
+            spans.append(IPNetwork(f"{network.network}/24").cidr)
+        elif network.version == 6 and network.prefixlen > 124:
+            spans.append(IPNetwork(f"{network.network}/124").cidr)
+        return spans
+
+    @staticmethod
+    def get_reverse_zone_subnets(
+        subnets: Iterable[Subnet], addresses: Iterable[IPAddress]
+    ) -> tuple[list[Subnet], list[IPNetwork]]:
+        """Return the subnets to regenerate the reverse zones for `addresses`.
+
+        Reverse zones of overlapping subnets (and RFC2317 glue zones) are
+        generated together, so any subnet that shares a zone with the subnets
+        of `addresses` is included as well.
+
+        :return: A tuple of the subnets, and the networks covered by their
+            reverse zones.
+        """
+        networks = {subnet: IPNetwork(subnet.cidr) for subnet in subnets}
+        addresses = [IPAddress(address) for address in addresses]
+        selected = {
+            subnet
+            for subnet, network in networks.items()
+            if any(address in network for address in addresses)
+        }
+        spans = {
+            span
+            for subnet in selected
+            for span in ZoneGenerator._get_reverse_zone_spans(networks[subnet])
+        }
+        found = True
+        while found:
+            found = False
+            for subnet, network in networks.items():
+                if subnet not in selected and any(
+                    network in span or span in network for span in spans
+                ):
+                    selected.add(subnet)
+                    spans.update(
+                        ZoneGenerator._get_reverse_zone_spans(network)
+                    )
+                    found = True
+        return [subnet for subnet in networks if subnet in selected], sorted(
+            spans
+        )
+
     @staticmethod
     def _find_glue_nets(
         network: IPNetwork,
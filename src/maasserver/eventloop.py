@@ -169,6 +169,20 @@ def make_SyslogService():
     return syslog.RegionSyslogService(reactor)
 
 
+def make_SecretCacheService(postgresListener):
+    from maasserver.regiondservices.secret_cache import SecretCacheService
+
+    return SecretCacheService(postgresListener)
+
+
+def make_MachineInventoryService(postgresListener):
+    from maasserver.regiondservices.machine_inventory import (
+        MachineInventoryService,
+    )
+
+    return MachineInventoryService(postgresListener)
+
+
 def make_HTTPService(postgresListener):
     from maasserver.regiondservices import http
 
@@ -375,6 +389,21 @@ class RegionEventLoop:
             "factory": make_ActiveDiscoveryService,
             "requires": ["postgres-listener-worker"],
         },
+        "secret-cache-master": {
+            "only_on_master": True,
+            "factory": make_SecretCacheService,
+            "requires": ["postgres-listener-master"],
+        },
+        "secret-cache-worker": {
+            "only_on_master": False,
+            "factory": make_SecretCacheService,
+            "requires": ["postgres-listener-worker"],
+        },
+        "machine-inventory": {
+            "only_on_master": False,
+            "factory": make_MachineInventoryService,
+            "requires": ["postgres-listener-worker"],
+        },
         "reverse-dns": {
             "only_on_master": True,
             "factory": make_ReverseDNSService,
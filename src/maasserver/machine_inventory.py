@@ -0,0 +1,349 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""In-memory inventory of the machines that can be allocated.
+
+Allocating a machine evaluates all the constraints in the database, for all
+the machines. The inventory keeps the attributes used by the most common
+constraints for the machines in the Ready state, so that the candidates can
+be found in memory. The candidates are then checked against the database
+with the full set of constraints, which means that a stale inventory can
+only make allocation pick a more expensive machine or fall back to the
+full query, never allocate a machine that doesn't match.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from threading import Lock
+import time
+from typing import Callable, Iterable
+
+from maasserver.enum import NODE_STATUS
+from maasserver.models import BlockDevice, Machine, Partition
+from maasserver.node_constraint_filter_forms import (
+    get_storage_constraints_from_string,
+)
+from maasserver.utils.orm import get_first
+from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
+
+
+@dataclass(frozen=True, slots=True)
+class InventoryMachine:
+    """The attributes of a machine used to match constraints."""
+
+    id: int
+    system_id: str
+    architecture: str | None
+    cpu_count: int
+    memory: int
+    pool: str | None
+    zone: str | None
+    tags: frozenset[str]
+    # The (size, tags) of the block devices and partitions.
+    storage: tuple[tuple[int, frozenset[str]], ...]
+    vlans: frozenset[int]
+    fabrics: frozenset[str]
+    fabric_classes: frozenset[str]
+    subnets: frozenset[int]
+
+    @property
+    def cost(self) -> float:
+        # Same as `AcquireNodeForm.reorder_nodes_by_cost`.
+        return self.cpu_count + self.memory / 1024.0
+
+    def has_storage(self, size: int, tags: Iterable[str]) -> bool:
+        tags = set(tags)
+        return any(
+            device_size >= size and tags <= device_tags
+            for device_size, device_tags in self.storage
+        )
+
+
+def _ids(values):
+    return {getattr(value, "id", value) for value in values}
+
+
+def _match_any(attr, values, machine):
+    return getattr(machine, attr) in values
+
+
+def _match_gte(attr, values, machine):
+    return getattr(machine, attr) >= min(values)
+
+
+def _match_all_of(attr, values, machine):
+    return values <= getattr(machine, attr)
+
+
+def _match_any_of(attr, values, machine):
+    return not values.isdisjoint(getattr(machine, attr))
+
+
+# Maps a form field to the machine attribute and how it's matched, for the
+# constraints that the inventory can evaluate. These mirror
+# `FilterNodeForm.NODE_FILTERS` and `FilterNodeForm.NODE_EXCLUDES`.
+INVENTORY_FILTERS = {
+    "system_id": ("system_id", _match_any),
+    "zone": ("zone", _match_any),
+    "pool": ("pool", _match_any),
+    "mem": ("memory", _match_gte),
+    "cpu_count": ("cpu_count", _match_gte),
+    "arch": ("architecture", _match_any),
+    "tags": ("tags", _match_all_of),
+    "vlans": ("vlans", _match_any_of),
+    "fabrics": ("fabrics", _match_any_of),
+    "fabric_classes": ("fabric_classes", _match_any_of),
+    "subnets": ("subnets", _match_all_of),
+}
+
+INVENTORY_EXCLUDES = {
+    "not_system_id": ("system_id", _match_any),
+    "not_in_zone": ("zone", _match_any),
+    "not_in_pool": ("pool", _match_any),
+    "not_arch": ("architecture", _match_any),
+    "not_tags": ("tags", _match_any_of),
+    "not_vlans": ("vlans", _match_any_of),
+    "not_fabrics": ("fabrics", _match_any_of),
+    "not_fabric_classes": ("fabric_classes", _match_any_of),
+    "not_subnets": ("subnets", _match_any_of),
+}
+
+# Fields whose values are model instances, matched by ID.
+_OBJECT_FIELDS = frozenset(("vlans", "not_vlans", "subnets", "not_subnets"))
+
+
+def _get_conditions(cleaned_data, filters):
+    conditions = []
+    for field, (attr, match) in filters.items():
+        values = cleaned_data.get(field)
+        if not values:
+            continue
+        if field in _OBJECT_FIELDS:
+            values = _ids(values)
+        elif match is not _match_gte:
+            # NULL never matches in the database.
+            values = set(values) - {None}
+        conditions.append((attr, match, values))
+    return conditions
+
+
+class MachineInventory:
+    """Index of the Ready machines, kept current by `invalidate`.
+
+    The inventory is loaded on first use, and fully reloaded every `ttl`
+    seconds in case a change was missed, e.g. because it was read from a
+    snapshot taken before it was committed. In between, the machines that
+    are invalidated are reloaded on the next lookup.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.enabled = False
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+        self._machines = None
+        self._loaded_at = None
+        self._dirty = set()
+
+    def invalidate(self, *system_ids: str) -> None:
+        """Reload the given machines on the next lookup."""
+        with self._lock:
+            self._dirty.update(system_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._machines = None
+            self._dirty.clear()
+
+    def get_machines(self) -> dict[str, InventoryMachine]:
+        """Return the Ready machines, keyed by system ID.
+
+        This must be called from within a transaction.
+        """
+        with self._lock:
+            machines = self._machines
+            now = self._clock()
+            if machines is None or now - self._loaded_at >= self.ttl:
+                self._dirty.clear()
+                machines = self._load()
+                self._loaded_at = now
+            elif self._dirty:
+                dirty, self._dirty = self._dirty, set()
+                machines = {
+                    system_id: machine
+                    for system_id, machine in machines.items()
+                    if system_id not in dirty
+                }
+                machines.update(self._load(dirty))
+            self._machines = machines
+            return machines
+
+    def get_candidates(self, cleaned_data: dict) -> list[int]:
+        """Return the IDs of the machines matching the constraints in
+        `cleaned_data`, cheapest first.
+
+        Only the constraints in `INVENTORY_FILTERS`, `INVENTORY_EXCLUDES` and
+        the sizes and tags of `storage` are evaluated. The candidates need
+        to be checked against the full set of constraints.
+        """
+        filters = _get_conditions(cleaned_data, INVENTORY_FILTERS)
+        excludes = _get_conditions(cleaned_data, INVENTORY_EXCLUDES)
+        storage = cleaned_data.get("storage")
+        storage = (
+            get_storage_constraints_from_string(storage) if storage else None
+        ) or []
+        storage = [
+            (size, set(tags or ()) - {"partition"})
+            for _, size, tags in storage
+        ]
+        candidates = [
+            machine
+            for machine in self.get_machines().values()
+            if all(
+                match(attr, values, machine) for attr, match, values in filters
+            )
+            and not any(
+                match(attr, values, machine)
+                for attr, match, values in excludes
+            )
+            and all(machine.has_storage(size, tags) for size, tags in storage)
+        ]
+        candidates.sort(key=lambda machine: (machine.cost, machine.id))
+        return [machine.id for machine in candidates]
+
+    def _load(self, system_ids=None):
+        machines = Machine.objects.filter(status=NODE_STATUS.READY)
+        if system_ids is not None:
+            machines = machines.filter(system_id__in=system_ids)
+        rows = list(
+            machines.values_list(
+                "id",
+                "system_id",
+                "architecture",
+                "cpu_count",
+                "memory",
+                "pool__name",
+                "zone__name",
+            )
+        )
+        ids = [row[0] for row in rows]
+        tags = defaultdict(set)
+        for node_id, name in Machine.objects.filter(
+            id__in=ids, tags__isnull=False
+        ).values_list("id", "tags__name"):
+            tags[node_id].add(name)
+        storage = defaultdict(list)
+        for node_id, size, device_tags in BlockDevice.objects.filter(
+            node_config__node_id__in=ids
+        ).values_list("node_config__node_id", "size", "tags"):
+            storage[node_id].append((size, frozenset(device_tags or ())))
+        for node_id, size, device_tags in Partition.objects.filter(
+            partition_table__block_device__node_config__node_id__in=ids
+        ).values_list(
+            "partition_table__block_device__node_config__node_id",
+            "size",
+            "tags",
+        ):
+            storage[node_id].append((size, frozenset(device_tags or ())))
+        vlans = defaultdict(set)
+        fabrics = defaultdict(set)
+        fabric_classes = defaultdict(set)
+        for node_id, vlan_id, fabric, fabric_class in Machine.objects.filter(
+            id__in=ids, current_config__interface__vlan__isnull=False
+        ).values_list(
+            "id",
+            "current_config__interface__vlan_id",
+            "current_config__interface__vlan__fabric__name",
+            "current_config__interface__vlan__fabric__class_type",
+        ):
+            vlans[node_id].add(vlan_id)
+            fabrics[node_id].add(fabric)
+            fabric_classes[node_id].add(fabric_class)
+        subnets = defaultdict(set)
+        for node_id, subnet_id in Machine.objects.filter(
+            id__in=ids,
+            current_config__interface__ip_addresses__subnet__isnull=False,
+        ).values_list(
+            "id", "current_config__interface__ip_addresses__subnet_id"
+        ):
+            subnets[node_id].add(subnet_id)
+        return {
+            system_id: InventoryMachine(
+                id=node_id,
+                system_id=system_id,
+                architecture=architecture,
+                cpu_count=cpu_count,
+                memory=memory,
+                pool=pool,
+                zone=zone,
+                tags=frozenset(tags[node_id]),
+                storage=tuple(storage[node_id]),
+                vlans=frozenset(vlans[node_id]),
+                fabrics=frozenset(fabrics[node_id]),
+                fabric_classes=frozenset(fabric_classes[node_id]),
+                subnets=frozenset(subnets[node_id]),
+            )
+            for (
+                node_id,
+                system_id,
+                architecture,
+                cpu_count,
+                memory,
+                pool,
+                zone,
+            ) in rows
+        }
+
+
+# Enabled by `MachineInventoryService` in the region processes that listen
+# to machine changes.
+MACHINE_INVENTORY = MachineInventory()
+
+
+def find_machine_for_acquisition(
+    form, machines, inventory=MACHINE_INVENTORY, limit=50
+):
+    """Return the cheapest of `machines` matching the constraints in `form`.
+
+    If the inventory is enabled, only the `limit` cheapest candidates it
+    finds are checked against the database. The full query is used when
+    none of them matches.
+
+    :return: A (machine, storage, interfaces) tuple, like the result of
+        `AcquireNodeForm.filter_nodes`, but with the first matching machine,
+        or None.
+    """
+    if inventory.enabled:
+        candidates = inventory.get_candidates(form.cleaned_data)[:limit]
+        if candidates:
+            filtered, storage, interfaces = form.filter_nodes(
+                machines.filter(id__in=candidates), node_ids=candidates
+            )
+            machine = get_first(filtered)
+            # Lock the machine, since it was chosen from an inventory that
+            # might not reflect the latest changes.
+            if (
+                machine is not None
+                and Machine.objects.filter(
+                    id=machine.id, status=NODE_STATUS.READY
+                )
+                .select_for_update()
+                .exists()
+            ):
+                PROMETHEUS_METRICS.update(
+                    "maas_machine_inventory_lookups",
+                    "inc",
+                    labels={"result": "hit"},
+                )
+                return machine, storage, interfaces
+        PROMETHEUS_METRICS.update(
+            "maas_machine_inventory_lookups",
+            "inc",
+            labels={"result": "miss"},
+        )
+    filtered, storage, interfaces = form.filter_nodes(machines)
+    return get_first(filtered), storage, interfaces
@@ -42,6 +42,7 @@ __all__ = [
     "IPRange",
     "LicenseKey",
     "Machine",
+    "MachineSummary",
     "MDNS",
     "Neighbour",
     "Node",
@@ -153,6 +154,7 @@ from maasserver.models.interface import (
 )
 from maasserver.models.iprange import IPRange
 from maasserver.models.licensekey import LicenseKey
+from maasserver.models.machinesummary import MachineSummary
 from maasserver.models.mdns import MDNS
 from maasserver.models.neighbour import Neighbour
 from maasserver.models.node import (
@@ -180,16 +180,20 @@ class BMC(CleanSave, TimestampedModel):
         """Save this BMC."""
         super().save(*args, **kwargs)
 
-    def get_power_parameters(self):
-        from maasserver.secrets import SecretManager
+    def get_power_parameters(self, secret=None):
+        """Return the power parameters, including the secret ones.
 
-        power_parameters = self.power_parameters or {}
-        return {
-            **power_parameters,
-            **SecretManager().get_composite_secret(
+        :param secret: The power parameters secret for this BMC, if it has
+            already been fetched; see `SecretManager.get_composite_secrets`.
+        """
+        if secret is None:
+            from maasserver.secrets import SecretManager
+
+            secret = SecretManager().get_composite_secret(
                 "power-parameters", obj=self.as_bmc(), default={}
-            ),
-        }
+            )
+        power_parameters = self.power_parameters or {}
+        return {**power_parameters, **secret}
 
     def set_power_parameters(self, power_parameters):
         power_parameters, secrets = sanitise_power_parameters(
@@ -0,0 +1,57 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Model definition for a `MachineSummary`."""
+
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import (
+    BigIntegerField,
+    CharField,
+    DO_NOTHING,
+    IntegerField,
+    Model,
+    OneToOneField,
+    TextField,
+)
+
+
+class MachineSummary(Model):
+    """The denormalized data the machine listing is built from.
+
+    Note that this class is backed by the `maasserver_machinesummary` table,
+    which is maintained by database triggers. Any updates to this model must
+    be reflected in an alembic database migration.
+    """
+
+    class Meta:
+        verbose_name = "Machine summary"
+        verbose_name_plural = "Machine summaries"
+        # this is a trigger-maintained table
+        managed = False
+
+    node = OneToOneField(
+        "Node",
+        primary_key=True,
+        db_column="node_id",
+        related_name="summary",
+        editable=False,
+        on_delete=DO_NOTHING,
+    )
+    fqdn = TextField(editable=False)
+    domain_name = CharField(max_length=256, editable=False, null=True)
+    pool_name = CharField(max_length=256, editable=False, null=True)
+    zone_name = CharField(max_length=256, editable=False, null=True)
+    owner = CharField(max_length=150, editable=False, null=True)
+    parent = CharField(max_length=41, editable=False, null=True)
+    power_type = CharField(max_length=10, editable=False, null=True)
+    tags = ArrayField(BigIntegerField(), editable=False)
+    physical_disk_count = IntegerField(editable=False)
+    storage = BigIntegerField(editable=False, null=True)
+    fabrics = ArrayField(TextField(), editable=False)
+    spaces = ArrayField(TextField(), editable=False)
+    extra_macs = ArrayField(TextField(), editable=False)
+    pxe_mac = TextField(editable=False, null=True)
+    boot_vlan_id = BigIntegerField(editable=False, null=True)
+    boot_vlan_name = CharField(max_length=256, editable=False, null=True)
+    boot_fabric_id = IntegerField(editable=False, null=True)
+    boot_fabric_name = CharField(max_length=256, editable=False, null=True)
@@ -3,15 +3,20 @@
 
 """Model definition for Neighbour."""
 
+from django.db import connection
 from django.db.models import (
     CASCADE,
+    F,
     ForeignKey,
     GenericIPAddressField,
     IntegerField,
     Manager,
     TextField,
+    UniqueConstraint,
 )
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
+from django.utils import timezone
 
 from maascommon.utils.network import get_mac_organization
 from maasserver.fields import MAC_VALIDATOR
@@ -112,6 +117,123 @@ class NeighbourManager(Manager, NeighbourQueriesMixin):
             deleted = True
         return deleted
 
+    def record_neighbours(self, observations) -> None:
+        """Record a batch of neighbour observations.
+
+        This has the same effect as calling `Interface.update_neighbour` for
+        each observation, but uses one query to remove the bindings that
+        moved to another MAC address and one `INSERT ... ON CONFLICT` query
+        to create or refresh the observed bindings.
+
+        :param observations: An iterable of (interface, ip, mac, time, vid)
+            tuples, in the order they were observed.
+        """
+        # Only the last MAC address observed for an (interface, ip, vid) is
+        # kept, as it would replace the earlier ones. Repeated observations
+        # of the same binding are counted.
+        bindings = {}
+        for interface, ip, mac, time, vid in observations:
+            key = (interface.id, ip, vid)
+            binding = bindings.get(key)
+            if binding is not None and binding[1] == mac:
+                count = binding[3] + 1
+                time = max(time, binding[2])
+            else:
+                count = 1
+            bindings[key] = (interface, mac, time, count)
+        if not bindings:
+            return
+
+        interfaces = {
+            interface.id: interface for interface, *_ in bindings.values()
+        }
+        rows = [
+            (interface_id, ip, mac, vid, time, count)
+            for (interface_id, ip, vid), (_, mac, time, count) in (
+                bindings.items()
+            )
+        ]
+        interface_ids, ips, macs, vids, times, counts = (
+            list(column) for column in zip(*rows)
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                self._sql_delete_moved_neighbours,
+                [interface_ids, ips, macs, vids],
+            )
+            moved = set()
+            for interface_id, ip, vid, old_mac, new_mac in cursor.fetchall():
+                moved.add((interface_id, ip, vid))
+                maaslog.info(
+                    "%s: IP address %s%s moved from %s to %s"
+                    % (
+                        interfaces[interface_id].get_log_string(),
+                        ip,
+                        self.get_vid_log_snippet(vid),
+                        old_mac,
+                        new_mac,
+                    )
+                )
+            now = timezone.now()
+            cursor.execute(
+                self._sql_upsert_neighbours,
+                [
+                    now,
+                    now,
+                    interface_ids,
+                    ips,
+                    macs,
+                    vids,
+                    times,
+                    counts,
+                ],
+            )
+            for interface_id, ip, vid, mac, created in cursor.fetchall():
+                # A binding that moved has already been logged.
+                if created and (interface_id, ip, vid) not in moved:
+                    maaslog.info(
+                        f"{interfaces[interface_id].get_log_string()}: "
+                        "New MAC, IP binding "
+                        f"observed{self.get_vid_log_snippet(vid)}: "
+                        f"{mac}, {ip}"
+                    )
+
+    _sql_delete_moved_neighbours = """\
+    DELETE FROM maasserver_neighbour AS neighbour
+    USING unnest(%s::bigint[], %s::inet[], %s::text[], %s::integer[])
+      AS observed(interface_id, ip, mac_address, vid)
+    WHERE neighbour.interface_id = observed.interface_id
+      AND neighbour.ip = observed.ip
+      AND neighbour.vid IS NOT DISTINCT FROM observed.vid
+      AND neighbour.mac_address IS DISTINCT FROM observed.mac_address
+    RETURNING
+      neighbour.interface_id, host(neighbour.ip), neighbour.vid,
+      neighbour.mac_address, observed.mac_address
+    """
+
+    # The conflict target matches the unique index on the neighbour table,
+    # which treats a NULL VID as a value so that untagged bindings conflict
+    # too. A row inserted by this statement has a zero `xmax`.
+    _sql_upsert_neighbours = """\
+    INSERT INTO maasserver_neighbour AS neighbour (
+      created, updated, interface_id, ip, mac_address, vid, "time", count
+    )
+    SELECT %s::timestamptz, %s::timestamptz, observed.*
+    FROM unnest(
+      %s::bigint[], %s::inet[], %s::text[], %s::integer[], %s::integer[],
+      %s::integer[]
+    ) AS observed(interface_id, ip, mac_address, vid, "time", count)
+    ON CONFLICT (interface_id, (COALESCE(vid, -1)), mac_address, ip)
+    DO UPDATE SET
+      "time" = EXCLUDED."time",
+      count = neighbour.count + EXCLUDED.count,
+      updated = EXCLUDED.updated
+    RETURNING
+      neighbour.interface_id, host(neighbour.ip), neighbour.vid,
+      neighbour.mac_address, neighbour.xmax = 0
+    """
+
     def get_by_updated_with_related_nodes(self):
         """Returns a `QuerySet` of neighbours, while also selecting related
         interfaces and nodes.
@@ -137,7 +259,16 @@ class Neighbour(CleanSave, TimestampedModel):
     class Meta:
         verbose_name = "Neighbour"
         verbose_name_plural = "Neighbours"
-        unique_together = ("interface", "vid", "mac_address", "ip")
+        constraints = [
+            # Untagged neighbours (without a VID) are unique too.
+            UniqueConstraint(
+                F("interface"),
+                Coalesce("vid", -1),
+                F("mac_address"),
+                F("ip"),
+                name="maasserver_neighbour_interface_vid_mac_ip_uniq",
+            ),
+        ]
 
     # Observed IP address.
     ip = GenericIPAddressField(
@@ -1570,16 +1570,20 @@ class Node(CleanSave, TimestampedModel):
     def power_type(self):
         return "" if self.bmc is None else self.bmc.power_type
 
-    def get_instance_power_parameters(self):
-        from maasserver.secrets import SecretManager
+    def get_instance_power_parameters(self, secret=None):
+        """Return the instance power parameters, including the secret ones.
 
-        power_parameters = self.instance_power_parameters or {}
-        return {
-            **power_parameters,
-            **SecretManager().get_composite_secret(
+        :param secret: The power parameters secret for this node, if it has
+            already been fetched; see `SecretManager.get_composite_secrets`.
+        """
+        if secret is None:
+            from maasserver.secrets import SecretManager
+
+            secret = SecretManager().get_composite_secret(
                 "power-parameters", obj=self.as_node(), default={}
-            ),
-        }
+            )
+        power_parameters = self.instance_power_parameters or {}
+        return {**power_parameters, **secret}
 
     def set_instance_power_parameters(self, power_parameters):
         power_parameters, secrets = sanitise_power_parameters(
@@ -3232,9 +3236,15 @@ class Node(CleanSave, TimestampedModel):
         else:
             return self.license_key
 
-    def get_effective_power_parameters(self):
-        """Return effective power parameters, including any defaults."""
-        power_params = self.get_power_parameters().copy()
+    def get_effective_power_parameters(self, power_parameters=None):
+        """Return effective power parameters, including any defaults.
+
+        :param power_parameters: The result of `get_power_parameters`, if it
+            has already been computed.
+        """
+        if power_parameters is None:
+            power_parameters = self.get_power_parameters()
+        power_params = power_parameters.copy()
 
         power_params.setdefault("system_id", self.system_id)
         # TODO: This default ought to be in the virsh template.
@@ -3247,7 +3257,7 @@ class Node(CleanSave, TimestampedModel):
 
         return power_params
 
-    def get_effective_power_info(self):
+    def get_effective_power_info(self, power_parameters=None):
         """Get information on how to control this node's power.
 
         Returns a ``(can-be-started, can-be-stopped, power-type,
@@ -3261,9 +3271,11 @@ class Node(CleanSave, TimestampedModel):
         to control this node's power, but there are *no* guarantees. The same
         goes for ``can-be-stopped``.
 
+        :param power_parameters: The result of `get_power_parameters`, if it
+            has already been computed.
         :return: :py:class:`PowerInfo` (a `namedtuple`)
         """
-        power_params = self.get_effective_power_parameters()
+        power_params = self.get_effective_power_parameters(power_parameters)
         try:
             power_type = self.get_effective_power_type()
         except UnknownPowerType:
@@ -6803,24 +6815,36 @@ class Controller(Node):
             Neighbour data is gathered directly from the ARP monitoring process
             running on each rack interface.
         """
+        # Circular imports.
+        from maasserver.models.neighbour import Neighbour
+
         # Determine which interfaces' neighbours need updating.
         interface_set = {neighbour["interface"] for neighbour in neighbours}
         interfaces = Interface.objects.get_interface_dict_for_node(
             self, names=interface_set, fetch_fabric_vlan=True
         )
+        observations = []
+        reported_vids = set()
         for neighbour in neighbours:
             interface = interfaces.get(neighbour["interface"], None)
             if interface is not None:
                 vid = neighbour.get("vid", None)
                 if interface.neighbour_discovery_state:
-                    interface.update_neighbour(
-                        neighbour["ip"],
-                        neighbour["mac"],
-                        neighbour["time"],
-                        vid=vid,
+                    observations.append(
+                        (
+                            interface,
+                            neighbour["ip"],
+                            neighbour["mac"],
+                            neighbour["time"],
+                            vid,
+                        )
                     )
                 if vid is not None:
-                    interface.report_vid(vid, ip=neighbour["ip"])
+                    reported_vid = (interface.id, vid, neighbour["ip"])
+                    if reported_vid not in reported_vids:
+                        reported_vids.add(reported_vid)
+                        interface.report_vid(vid, ip=neighbour["ip"])
+        Neighbour.objects.record_neighbours(observations)
 
     def report_mdns_entries(self, entries):
         """Update the mDNS entries on this controller.
@@ -10,15 +10,24 @@ from lxml import etree
 from temporalio.common import WorkflowIDReusePolicy
 from twisted.internet import reactor
 
-from maascommon.workflows.tag import TAG_EVALUATION_WORKFLOW_NAME
+from maascommon.workflows.tag import (
+    TagDefinition,
+    tags_evaluation_workflow_id,
+    TAGS_EVALUATION_WORKFLOW_NAME,
+    TagsEvaluationParam,
+)
 from maasserver.models.cleansave import CleanSave
 from maasserver.models.timestampedmodel import TimestampedModel
 from maasserver.workflow import start_workflow
-from maastemporalworker.workflow.tag_evaluation import TagEvaluationParam
 from provisioningserver.logger import get_maas_logger
 
 maaslog = get_maas_logger("tag")
 
+# The definitions of the tags waiting to be evaluated, by tag ID. This is
+# only used from the reactor thread. Tags that are saved together are
+# evaluated by a single workflow.
+_tags_to_evaluate = {}
+
 
 class Tag(CleanSave, TimestampedModel):
     """A `Tag` is a label applied to a `Node`.
@@ -107,19 +116,16 @@ class Tag(CleanSave, TimestampedModel):
         """
         Evaluate a tag searching for matches between the tag provided and the
         nodes in MAAS.
+
+        The evaluation is started on the next iteration of the reactor,
+        together with the evaluation of any other tag queued until then.
         """
         maaslog.info(
             "Tag (id=%d) is being evaluated against all nodes.", self.id
         )
-        param = TagEvaluationParam(self.id, self.definition)
-
-        start_workflow(
-            workflow_name=TAG_EVALUATION_WORKFLOW_NAME,
-            workflow_id="tag-evaluation",
-            task_queue="region",
-            id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
-            param=param,
-        )
+        if not _tags_to_evaluate:
+            reactor.callLater(0, _start_tags_evaluation)
+        _tags_to_evaluate[self.id] = self.definition
 
     def _populate_nodes_now(self):
         """Find all nodes that match this tag, and update them, now.
@@ -135,3 +141,19 @@ class Tag(CleanSave, TimestampedModel):
             # Do the work here and now in this thread. This is probably a
             # terrible mistake... unless you're testing.
             populate_tag_for_multiple_nodes(self, Node.objects.all())
+
+
+def _start_tags_evaluation() -> None:
+    """Start the evaluation of the queued tags against all nodes."""
+    tags = [
+        TagDefinition(tag_id, definition)
+        for tag_id, definition in sorted(_tags_to_evaluate.items())
+    ]
+    _tags_to_evaluate.clear()
+    start_workflow(
+        workflow_name=TAGS_EVALUATION_WORKFLOW_NAME,
+        workflow_id=tags_evaluation_workflow_id(tags),
+        task_queue="region",
+        id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
+        param=TagsEvaluationParam(tags),
+    )
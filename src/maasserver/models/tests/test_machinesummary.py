@@ -0,0 +1,159 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Tests for the MachineSummary model."""
+
+from maasserver.enum import NODE_TYPE
+from maasserver.models import Interface, MachineSummary, Node
+from maasserver.testing.factory import factory
+from maasserver.testing.testcase import MAASServerTestCase
+
+
+class TestMachineSummary(MAASServerTestCase):
+    def get_summary(self, machine):
+        return MachineSummary.objects.get(node_id=machine.id)
+
+    def test_created_with_machine(self):
+        domain = factory.make_Domain()
+        pool = factory.make_ResourcePool()
+        owner = factory.make_User()
+        machine = factory.make_Machine(
+            domain=domain, pool=pool, owner=owner, with_boot_disk=False
+        )
+        summary = self.get_summary(machine)
+        self.assertEqual(machine.fqdn, summary.fqdn)
+        self.assertEqual(domain.name, summary.domain_name)
+        self.assertEqual(pool.name, summary.pool_name)
+        self.assertEqual(machine.zone.name, summary.zone_name)
+        self.assertEqual(owner.username, summary.owner)
+        self.assertEqual(machine.power_type, summary.power_type)
+        self.assertEqual(0, summary.physical_disk_count)
+        self.assertIsNone(summary.storage)
+
+    def test_not_created_for_other_nodes(self):
+        device = factory.make_Node(node_type=NODE_TYPE.DEVICE)
+        self.assertFalse(
+            MachineSummary.objects.filter(node_id=device.id).exists()
+        )
+
+    def test_removed_when_no_longer_a_machine(self):
+        machine = factory.make_Machine()
+        machine.node_type = NODE_TYPE.DEVICE
+        machine.save()
+        self.assertFalse(
+            MachineSummary.objects.filter(node_id=machine.id).exists()
+        )
+
+    def test_removed_with_machine(self):
+        machine = factory.make_Machine()
+        machine_id = machine.id
+        machine.delete()
+        self.assertFalse(
+            MachineSummary.objects.filter(node_id=machine_id).exists()
+        )
+
+    def test_follows_renames(self):
+        machine = factory.make_Machine()
+        machine.hostname = factory.make_name("host")
+        machine.save()
+        machine.domain.name = factory.make_name("domain")
+        machine.domain.save()
+        machine.pool.name = factory.make_name("pool")
+        machine.pool.save()
+        machine.zone.name = factory.make_name("zone")
+        machine.zone.save()
+        summary = self.get_summary(machine)
+        self.assertEqual(
+            f"{machine.hostname}.{machine.domain.name}", summary.fqdn
+        )
+        self.assertEqual(machine.pool.name, summary.pool_name)
+        self.assertEqual(machine.zone.name, summary.zone_name)
+
+    def test_follows_owner(self):
+        owner = factory.make_User()
+        machine = factory.make_Machine()
+        self.assertIsNone(self.get_summary(machine).owner)
+        machine.owner = owner
+        machine.save()
+        self.assertEqual(owner.username, self.get_summary(machine).owner)
+        owner.username = factory.make_name("user")
+        owner.save()
+        self.assertEqual(owner.username, self.get_summary(machine).owner)
+
+    def test_follows_tags(self):
+        machine = factory.make_Machine()
+        tag1 = factory.make_Tag()
+        tag2 = factory.make_Tag()
+        machine.tags.add(tag1, tag2)
+        self.assertEqual(
+            sorted([tag1.id, tag2.id]), self.get_summary(machine).tags
+        )
+        machine.tags.remove(tag1)
+        self.assertEqual([tag2.id], self.get_summary(machine).tags)
+
+    def test_follows_physical_block_devices(self):
+        machine = factory.make_Machine(with_boot_disk=False)
+        device1 = factory.make_PhysicalBlockDevice(node=machine)
+        device2 = factory.make_PhysicalBlockDevice(node=machine)
+        summary = self.get_summary(machine)
+        self.assertEqual(2, summary.physical_disk_count)
+        self.assertEqual(device1.size + device2.size, summary.storage)
+        device1.delete()
+        summary = self.get_summary(machine)
+        self.assertEqual(1, summary.physical_disk_count)
+        self.assertEqual(device2.size, summary.storage)
+
+    def test_follows_interfaces(self):
+        machine = factory.make_Machine()
+        fabric = factory.make_Fabric()
+        space = factory.make_Space()
+        vlan = factory.make_VLAN(fabric=fabric, space=space)
+        boot_interface = factory.make_Interface(node=machine, vlan=vlan)
+        machine.boot_interface = boot_interface
+        machine.save()
+        extra_interface = factory.make_Interface(node=machine, vlan=vlan)
+        summary = self.get_summary(machine)
+        self.assertEqual(str(boot_interface.mac_address), summary.pxe_mac)
+        self.assertEqual(
+            [str(extra_interface.mac_address)], summary.extra_macs
+        )
+        self.assertEqual(vlan.id, summary.boot_vlan_id)
+        self.assertEqual(fabric.name, summary.boot_fabric_name)
+        self.assertEqual([fabric.name], summary.fabrics)
+        self.assertEqual([space.name], summary.spaces)
+
+        fabric.name = factory.make_name("fabric")
+        fabric.save()
+        space.name = factory.make_name("space")
+        space.save()
+        summary = self.get_summary(machine)
+        self.assertEqual(fabric.name, summary.boot_fabric_name)
+        self.assertEqual([fabric.name], summary.fabrics)
+        self.assertEqual([space.name], summary.spaces)
+
+        extra_interface.delete()
+        self.assertEqual([], self.get_summary(machine).extra_macs)
+
+    def test_follows_bulk_updates(self):
+        zone = factory.make_Zone()
+        machines = [factory.make_Machine() for _ in range(10)]
+        Node.objects.filter(
+            id__in=[machine.id for machine in machines]
+        ).update(zone=zone)
+        self.assertEqual(
+            [zone.name] * len(machines),
+            [self.get_summary(machine).zone_name for machine in machines],
+        )
+
+    def test_follows_bulk_deletes(self):
+        vlan = factory.make_VLAN()
+        machines = [factory.make_Machine() for _ in range(10)]
+        for machine in machines:
+            factory.make_Interface(node=machine, vlan=vlan)
+        for machine in machines:
+            self.assertIn(vlan.fabric.name, self.get_summary(machine).fabrics)
+        Interface.objects.filter(vlan=vlan).delete()
+        for machine in machines:
+            self.assertNotIn(
+                vlan.fabric.name, self.get_summary(machine).fabrics
+            )
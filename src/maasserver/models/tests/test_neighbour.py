@@ -3,11 +3,134 @@
 
 """Tests for the Neighbour model."""
 
+import datetime
+import random
+
+from django.utils import timezone
+from fixtures import FakeLogger
+
+from maasserver.enum import INTERFACE_TYPE
+from maasserver.models import Neighbour
 from maasserver.testing.factory import factory
 from maasserver.testing.testcase import MAASServerTestCase
+from maastesting.djangotestcase import count_queries
 
 
 class TestNeighbourModel(MAASServerTestCase):
     def test_mac_organization(self):
         neighbour = factory.make_Neighbour(mac_address="48:51:b7:00:00:00")
         self.assertEqual(neighbour.mac_organization, "Intel Corporate")
+
+
+class TestRecordNeighbours(MAASServerTestCase):
+    def make_observation(self, interface, ip=None, mac=None, vid=None):
+        if ip is None:
+            ip = factory.make_ipv4_address()
+        if mac is None:
+            mac = factory.make_mac_address()
+        return (interface, ip, mac, random.randint(0, 200000000), vid)
+
+    def test_creates_neighbours(self):
+        iface = factory.make_Interface(INTERFACE_TYPE.PHYSICAL)
+        observations = [
+            self.make_observation(iface),
+            self.make_observation(iface, vid=random.randint(1, 4094)),
+        ]
+        Neighbour.objects.record_neighbours(observations)
+        self.assertCountEqual(
+            [
+                (iface, ip, mac, time, vid, 1)
+                for _, ip, mac, time, vid in observations
+            ],
+            [
+                (n.interface, n.ip, n.mac_address, n.time, n.vid, n.count)
+                for n in Neighbour.objects.all()
+            ],
+        )
+
+    def test_updates_existing_neighbours(self):
+        iface = factory.make_Interface(INTERFACE_TYPE.PHYSICAL)
+        observations = [
+            self.make_observation(iface),
+            self.make_observation(iface, vid=random.randint(1, 4094)),
+        ]
+        Neighbour.objects.record_neighbours(observations)
+        yesterday = timezone.now() - datetime.timedelta(days=1)
+        Neighbour.objects.update(updated=yesterday)
+        observations = [
+            (interface, ip, mac, time + 1, vid)
+            for interface, ip, mac, time, vid in observations
+        ]
+        Neighbour.objects.record_neighbours(observations)
+        self.assertEqual(2, Neighbour.objects.count())
+        for _, ip, _, time, _ in observations:
+            neighbour = Neighbour.objects.get(ip=ip)
+            self.assertEqual(time, neighbour.time)
+            self.assertEqual(2, neighbour.count)
+            self.assertGreater(neighbour.updated, yesterday)
+
+    def test_counts_repeated_observations(self):
+        iface = factory.make_Interface(INTERFACE_TYPE.PHYSICAL)
+        interface, ip, mac, time, vid = self.make_observation(iface)
+        Neighbour.objects.record_neighbours(
+            [
+                (interface, ip, mac, time, vid),
+                (interface, ip, mac, time + 1, vid),
+            ]
+        )
+        neighbour = Neighbour.objects.get()
+        self.assertEqual(2, neighbour.count)
+        self.assertEqual(time + 1, neighbour.time)
+
+    def test_replaces_moved_neighbours(self):
+        iface = factory.make_Interface(INTERFACE_TYPE.PHYSICAL)
+        interface, ip, mac, time, vid = self.make_observation(iface)
+        Neighbour.objects.record_neighbours([(interface, ip, mac, time, vid)])
+        new_mac = factory.make_mac_address()
+        with FakeLogger("maas.neighbour") as maaslog:
+            Neighbour.objects.record_neighbours(
+                [(interface, ip, new_mac, time + 1, vid)]
+            )
+        neighbour = Neighbour.objects.get()
+        self.assertEqual(new_mac, neighbour.mac_address)
+        self.assertEqual(1, neighbour.count)
+        self.assertIn(f": IP address {ip} moved from {mac}", maaslog.output)
+        self.assertNotIn("New MAC, IP binding", maaslog.output)
+
+    def test_keeps_last_mac_observed_for_ip(self):
+        iface = factory.make_Interface(INTERFACE_TYPE.PHYSICAL)
+        interface, ip, mac, time, vid = self.make_observation(iface)
+        new_mac = factory.make_mac_address()
+        Neighbour.objects.record_neighbours(
+            [
+                (interface, ip, mac, time, vid),
+                (interface, ip, new_mac, time + 1, vid),
+            ]
+        )
+        self.assertEqual(new_mac, Neighbour.objects.get().mac_address)
+
+    def test_logs_new_bindings(self):
+        iface = factory.make_Interface(INTERFACE_TYPE.PHYSICAL)
+        interface, ip, mac, time, vid = self.make_observation(iface)
+        with FakeLogger("maas.neighbour") as maaslog:
+            Neighbour.objects.record_neighbours(
+                [(interface, ip, mac, time, vid)]
+            )
+            Neighbour.objects.record_neighbours(
+                [(interface, ip, mac, time + 1, vid)]
+            )
+        self.assertEqual(
+            1, maaslog.output.count(f"New MAC, IP binding observed: {mac}")
+        )
+
+    def test_uses_constant_number_of_queries(self):
+        iface = factory.make_Interface(INTERFACE_TYPE.PHYSICAL)
+        observations = [self.make_observation(iface) for _ in range(10)]
+        count, _ = count_queries(
+            Neighbour.objects.record_neighbours, observations
+        )
+        self.assertEqual(2, count)
+
+    def test_does_nothing_without_observations(self):
+        count, _ = count_queries(Neighbour.objects.record_neighbours, [])
+        self.assertEqual(0, count)
@@ -11150,24 +11150,22 @@ class TestControllerUpdateDiscoveryState(MAASServerTestCase):
 
 
 class TestReportNeighbours(MAASServerTestCase):
-    def test_no_update_neighbours_calls_if_discovery_disabled(self):
+    def test_no_neighbours_recorded_if_discovery_disabled(self):
         rack = factory.make_RackController()
         factory.make_Interface(name="eth0", node=rack)
-        update_neighbour = self.patch(
-            interface_module.Interface, "update_neighbour"
-        )
+        record_neighbours = self.patch(Neighbour.objects, "record_neighbours")
         neighbours = [
             {
                 "interface": "eth0",
                 "mac": factory.make_mac_address(),
                 "ip": factory.make_ipv4_address(),
-                "time": timezone.now(),
+                "time": random.randint(0, 200000000),
             },
         ]
         rack.report_neighbours(neighbours)
-        update_neighbour.assert_not_called()
+        record_neighbours.assert_called_once_with([])
 
-    def test_calls_update_neighbour_for_each_neighbour(self):
+    def test_records_neighbours_in_one_batch(self):
         rack = factory.make_RackController()
         if1 = factory.make_Interface(name="eth0", node=rack)
         if1.neighbour_discovery_state = True
@@ -11175,26 +11173,49 @@ class TestReportNeighbours(MAASServerTestCase):
         if2 = factory.make_Interface(name="eth1", node=rack)
         if2.neighbour_discovery_state = True
         if2.save()
-        update_neighbour = self.patch(
-            interface_module.Interface, "update_neighbour"
-        )
+        record_neighbours = self.patch(Neighbour.objects, "record_neighbours")
         neighbours = [
             {
                 "interface": "eth0",
                 "mac": factory.make_mac_address(),
                 "ip": factory.make_ipv4_address(),
-                "time": timezone.now(),
+                "time": random.randint(0, 200000000),
             },
             {
                 "interface": "eth1",
                 "mac": factory.make_mac_address(),
                 "ip": factory.make_ipv4_address(),
-                "time": timezone.now(),
+                "time": random.randint(0, 200000000),
             },
         ]
         rack.report_neighbours(neighbours)
-        update_neighbour.assert_has_calls(
-            [call(n["ip"], n["mac"], n["time"], vid=None) for n in neighbours]
+        record_neighbours.assert_called_once_with(
+            [
+                (iface, n["ip"], n["mac"], n["time"], None)
+                for iface, n in zip((if1, if2), neighbours)
+            ]
+        )
+
+    def test_records_neighbours(self):
+        rack = factory.make_RackController()
+        iface = factory.make_Interface(name="eth0", node=rack)
+        iface.neighbour_discovery_state = True
+        iface.save()
+        neighbours = [
+            {
+                "interface": "eth0",
+                "mac": factory.make_mac_address(),
+                "ip": factory.make_ipv4_address(),
+                "time": random.randint(0, 200000000),
+            }
+            for _ in range(3)
+        ]
+        rack.report_neighbours(neighbours)
+        self.assertCountEqual(
+            [(n["ip"], n["mac"]) for n in neighbours],
+            Neighbour.objects.filter(interface=iface).values_list(
+                "ip", "mac_address"
+            ),
         )
 
     def test_calls_report_vid_for_each_vid(self):
@@ -11202,7 +11223,7 @@ class TestReportNeighbours(MAASServerTestCase):
         factory.make_Interface(name="eth0", node=rack)
         factory.make_Interface(name="eth1", node=rack)
         # Just make this a no-op for simplicity.
-        self.patch(interface_module.Interface, "update_neighbour")
+        self.patch(Neighbour.objects, "record_neighbours")
         report_vid = self.patch(interface_module.Interface, "report_vid")
         neighbours = [
             {
@@ -11225,6 +11246,25 @@ class TestReportNeighbours(MAASServerTestCase):
             [call(3, ip=neighbours[0]["ip"]), call(7, ip=neighbours[1]["ip"])]
         )
 
+    def test_calls_report_vid_once_for_each_vid_and_ip(self):
+        rack = factory.make_RackController()
+        factory.make_Interface(name="eth0", node=rack)
+        self.patch(Neighbour.objects, "record_neighbours")
+        report_vid = self.patch(interface_module.Interface, "report_vid")
+        ip = factory.make_ipv4_address()
+        neighbours = [
+            {
+                "interface": "eth0",
+                "ip": ip,
+                "time": random.randint(0, 200000000),
+                "mac": factory.make_mac_address(),
+                "vid": 3,
+            }
+            for _ in range(3)
+        ]
+        rack.report_neighbours(neighbours)
+        report_vid.assert_called_once_with(3, ip=ip)
+
     def test_does_not_updates_fabric_of_existing_vlan(self):
         rack = factory.make_RackController()
         observing_fabric = factory.make_Fabric()
@@ -4,7 +4,14 @@
 from unittest.mock import ANY, Mock
 
 from django.core.exceptions import ValidationError
-
+from temporalio.common import WorkflowIDReusePolicy
+from twisted.internet.task import Clock
+
+from maascommon.workflows.tag import (
+    TagDefinition,
+    TAGS_EVALUATION_WORKFLOW_NAME,
+    TagsEvaluationParam,
+)
 from maasserver import populate_tags
 from maasserver.models import tag as tag_module
 from maasserver.models.tag import Tag
@@ -146,6 +153,50 @@ class TestTagPopulateNodesLater(MAASServerTestCase):
         tag._populate_nodes_later.assert_called_once_with()
 
 
+class TestTagUpdateTagNodeRelations(MAASServerTestCase):
+    def test_tags_are_evaluated_by_one_workflow(self):
+        clock = self.patch(tag_module, "reactor", Clock())
+        start_workflow = self.patch(tag_module, "start_workflow")
+        tags = [
+            factory.make_Tag(definition=definition, populate=False)
+            for definition in ("//node", "//lldp")
+        ]
+
+        for tag in tags:
+            tag._update_tag_node_relations()
+        start_workflow.assert_not_called()
+        clock.advance(0)
+
+        tag_definitions = [
+            TagDefinition(tag.id, tag.definition) for tag in tags
+        ]
+        start_workflow.assert_called_once_with(
+            workflow_name=TAGS_EVALUATION_WORKFLOW_NAME,
+            workflow_id=f"tags-evaluation:{tags[0].id},{tags[1].id}",
+            task_queue="region",
+            id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
+            param=TagsEvaluationParam(tag_definitions),
+        )
+
+    def test_latest_definition_is_evaluated(self):
+        clock = self.patch(tag_module, "reactor", Clock())
+        start_workflow = self.patch(tag_module, "start_workflow")
+        tag = factory.make_Tag(definition="//node", populate=False)
+
+        tag._update_tag_node_relations()
+        tag.definition = "//lldp"
+        tag._update_tag_node_relations()
+        clock.advance(0)
+
+        start_workflow.assert_called_once_with(
+            workflow_name=TAGS_EVALUATION_WORKFLOW_NAME,
+            workflow_id=f"tags-evaluation:{tag.id}",
+            task_queue="region",
+            id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
+            param=TagsEvaluationParam([TagDefinition(tag.id, "//lldp")]),
+        )
+
+
 class TestTagPopulateNodesNow(MAASServerTestCase):
     def test_populates_if_tag_is_defined(self):
         populate_multiple = self.patch_autospec(
@@ -1213,21 +1213,24 @@ class FilterNodeForm(forms.Form):
             constraint for constraint in constraints if constraint is not None
         )
 
-    def filter_nodes(self, nodes):
+    def filter_nodes(self, nodes, node_ids=None):
         """Return the subset of nodes that match the form's constraints.
 
         :param nodes:  The set of nodes on which the form should apply
             constraints.
         :type nodes: `django.db.models.query.QuerySet`
+        :param node_ids: If given, the IDs of the only nodes that can match,
+            so that storage and interface constraints are evaluated for
+            those nodes only.
         :return: A QuerySet of the nodes that match the form's constraints.
         :rtype: `django.db.models.query.QuerySet`
         """
         filtered_nodes = self._apply_filters(nodes)
         compatible_nodes, filtered_nodes = self.filter_by_storage(
-            filtered_nodes
+            filtered_nodes, node_ids=node_ids
         )
         compatible_interfaces, filtered_nodes = self.filter_by_interfaces(
-            filtered_nodes
+            filtered_nodes, node_ids=node_ids
         )
         return filtered_nodes, compatible_nodes, compatible_interfaces
 
@@ -1259,21 +1262,26 @@ class FilterNodeForm(forms.Form):
                 )
         return qs
 
-    def filter_by_interfaces(self, filtered_nodes):
+    def filter_by_interfaces(self, filtered_nodes, node_ids=None):
         compatible_interfaces = {}
         interfaces_label_map = self.cleaned_data.get("interfaces")
         if interfaces_label_map is not None:
-            result = nodes_by_interface(interfaces_label_map)
+            include_filter = None
+            if node_ids is not None:
+                include_filter = {"node_config__node_id__in": node_ids}
+            result = nodes_by_interface(
+                interfaces_label_map, include_filter=include_filter
+            )
             if result.node_ids is not None:
                 filtered_nodes = filtered_nodes.filter(id__in=result.node_ids)
                 compatible_interfaces = result.label_map
         return compatible_interfaces, filtered_nodes
 
-    def filter_by_storage(self, filtered_nodes):
+    def filter_by_storage(self, filtered_nodes, node_ids=None):
         compatible_nodes = {}  # Maps node/storage to named storage constraints
         storage = self.cleaned_data.get("storage")
         if storage:
-            compatible_nodes = nodes_by_storage(storage)
+            compatible_nodes = nodes_by_storage(storage, node_ids=node_ids)
             node_ids = list(compatible_nodes)
             if node_ids is not None:
                 filtered_nodes = filtered_nodes.filter(id__in=node_ids)
@@ -1310,8 +1318,8 @@ class AcquireNodeForm(FilterNodeForm):
         super().__init__(*args, **kwargs)
         self.node_filters.update(self.ACQUIRE_CONDs)
 
-    def filter_nodes(self, nodes):
-        result = super().filter_nodes(nodes)
+    def filter_nodes(self, nodes, node_ids=None):
+        result = super().filter_nodes(nodes, node_ids=node_ids)
         filtered_nodes, compatible_nodes, compatible_interfaces = result
         filtered_nodes = self.reorder_nodes_by_cost(filtered_nodes)
         return filtered_nodes, compatible_nodes, compatible_interfaces
@@ -1815,7 +1823,11 @@ class FreeTextFilterNodeForm(ReadNodesForm):
             specifiers.append("&&".join(opts))
         return specifiers
 
-    def filter_by_interfaces(self, filtered_nodes):
+    # Free-text filters leave the nodes unfiltered when no interface or
+    # storage matches, so they are always evaluated for all the nodes and
+    # `node_ids` is ignored.
+
+    def filter_by_interfaces(self, filtered_nodes, node_ids=None):
         specifiers = self.cleaned_data.get("interfaces")
         node_ids = set()
         for spec in specifiers:
@@ -1870,7 +1882,7 @@ class FreeTextFilterNodeForm(ReadNodesForm):
                 )
         return constraints
 
-    def filter_by_storage(self, filtered_nodes):
+    def filter_by_storage(self, filtered_nodes, node_ids=None):
         storage = self.cleaned_data.get("storage")
         node_ids = []
         for size, tags in storage:
@@ -4,6 +4,7 @@
 """Preseed generation."""
 
 from collections import namedtuple
+from copy import copy
 import json
 import os.path
 from shlex import quote
@@ -54,6 +55,7 @@ from maasserver.utils.curtin import (
 from maasserver.utils.osystems import get_release_version_from_string
 from metadataserver.user_data.snippets import get_snippet_context
 from provisioningserver.logger import get_maas_logger, LegacyLogger
+from provisioningserver.utils.fs import FileCache
 from provisioningserver.utils.url import compose_URL
 
 maaslog = get_maas_logger("preseed")
@@ -837,25 +839,37 @@ def compose_filename(elements):
     return "_".join(elements)
 
 
-def get_preseed_template(filenames):
-    """Get the path and content for the first template found.
+def find_preseed_template(filenames):
+    """Get the path of the first template found.
 
     :param filenames: An iterable of relative filenames.
     """
     assert not isinstance(filenames, (bytes, str))
     assert all(isinstance(filename, str) for filename in filenames)
     for location in settings.PRESEED_TEMPLATE_LOCATIONS:
+        try:
+            listing = _preseed_template_listings.get(location)
+        except OSError:
+            continue  # Ignore.
         for filename in filenames:
-            filepath = os.path.join(location, filename)
-            try:
-                with open(filepath, encoding="utf-8") as stream:
-                    content = stream.read()
-            except OSError:
-                pass  # Ignore.
-            else:
-                return filepath, content
-    else:
-        return None, None
+            if filename in listing:
+                return os.path.join(location, filename)
+    return None
+
+
+def get_preseed_template(filenames):
+    """Get the path and content for the first template found.
+
+    :param filenames: An iterable of relative filenames.
+    """
+    filepath = find_preseed_template(filenames)
+    if filepath is not None:
+        try:
+            with open(filepath, encoding="utf-8") as stream:
+                return filepath, stream.read()
+        except OSError:
+            pass  # Ignore.
+    return None, None
 
 
 def get_escape_singleton():
@@ -880,6 +894,17 @@ class PreseedTemplate(tempita.Template):
     )
 
 
+# The templates are parsed once, and the template locations listed once,
+# rather than for every preseed. They're loaded again when they change, so
+# that preseeds can still be customised without restarting MAAS.
+_preseed_templates = FileCache(
+    lambda path: PreseedTemplate.from_filename(path, encoding="UTF-8")
+)
+_preseed_template_listings = FileCache(
+    lambda location: frozenset(os.listdir(location))
+)
+
+
 class TemplateNotFoundError(Exception):
     """The template has not been found."""
 
@@ -906,14 +931,14 @@ def load_preseed_template(node, prefix, osystem="", release=""):
         filenames = list(
             get_preseed_filenames(node, name, osystem, release, default)
         )
-        filepath, content = get_preseed_template(filenames)
+        filepath = find_preseed_template(filenames)
         if filepath is None:
             raise TemplateNotFoundError(name)
-        # This is where the closure happens: pass `get_template` when
-        # instanciating PreseedTemplate.
-        return PreseedTemplate(
-            content, name=filepath, get_template=get_template
-        )
+        # The parsed template is shared, only `get_template` is specific to
+        # the node. This is where the closure happens.
+        template = copy(_preseed_templates.get(filepath))
+        template.get_template = get_template
+        return template
 
     return get_template(prefix, None, default=True)
 
@@ -75,11 +75,14 @@ class DNSReloadService(TimerService):
         if local_serial is None:
             return dns_update_all_zones(requires_reload=True)
         else:
-            # If the local serial is behind the one in the db, reload.
+            # If the local serial is behind the one in the db, reload the
+            # zones that changed since.
             current_serial = current_zone_serial()
             if int(local_serial) < int(current_serial):
                 return dns_update_all_zones(
-                    requires_reload=True, serial=current_serial
+                    requires_reload=True,
+                    serial=current_serial,
+                    since_serial=local_serial,
                 )
             else:
                 log.info(
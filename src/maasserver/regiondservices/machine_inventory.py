@@ -0,0 +1,49 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Machine inventory service for the region controller."""
+
+from contextlib import suppress
+
+from twisted.application.service import Service
+
+from maasserver.listener import (
+    PostgresListenerService,
+    PostgresListenerUnregistrationError,
+)
+from maasserver.machine_inventory import MACHINE_INVENTORY, MachineInventory
+
+
+class MachineInventoryService(Service):
+    """Enable the machine inventory while machine changes are listened to.
+
+    Machines that are created or updated, including changes to their tags,
+    storage and interfaces, are reloaded on the next lookup. Deleted
+    machines are dropped the same way.
+    """
+
+    def __init__(
+        self,
+        postgresListener: PostgresListenerService = None,
+        inventory: MachineInventory = MACHINE_INVENTORY,
+    ):
+        super().__init__()
+        self.listener = postgresListener
+        self.inventory = inventory
+
+    def startService(self):
+        super().startService()
+        if self.listener is not None:
+            self.listener.register("machine", self._consume_event)
+            self.inventory.enabled = True
+
+    def stopService(self):
+        self.inventory.enabled = False
+        self.inventory.clear()
+        if self.listener is not None:
+            with suppress(PostgresListenerUnregistrationError):
+                self.listener.unregister("machine", self._consume_event)
+        return super().stopService()
+
+    def _consume_event(self, action, system_id):
+        self.inventory.invalidate(system_id)
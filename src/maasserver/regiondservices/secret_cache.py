@@ -0,0 +1,51 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Secrets cache service for the region controller."""
+
+from contextlib import suppress
+
+from twisted.application.service import Service
+
+from maasserver.listener import (
+    PostgresListenerService,
+    PostgresListenerUnregistrationError,
+)
+from maasserver.secrets import SECRET_CACHE, SecretCache
+
+
+class SecretCacheService(Service):
+    """Enable the secrets cache while changes are being listened to.
+
+    The database notifies the path of each secret that is created, updated
+    or deleted on the `sys_secret` channel, and the cached value for that
+    path is dropped.
+    """
+
+    def __init__(
+        self,
+        postgresListener: PostgresListenerService = None,
+        cache: SecretCache = SECRET_CACHE,
+        maxsize: int = 4096,
+    ):
+        super().__init__()
+        self.listener = postgresListener
+        self.cache = cache
+        self.maxsize = maxsize
+
+    def startService(self):
+        super().startService()
+        if self.listener is not None:
+            self.listener.register("sys_secret", self._consume_event)
+            self.cache.maxsize = self.maxsize
+
+    def stopService(self):
+        self.cache.maxsize = 0
+        self.cache.clear()
+        if self.listener is not None:
+            with suppress(PostgresListenerUnregistrationError):
+                self.listener.unregister("sys_secret", self._consume_event)
+        return super().stopService()
+
+    def _consume_event(self, channel, path):
+        self.cache.invalidate(path)
@@ -107,7 +107,9 @@ class TestDNSReloadService(MAASTransactionServerTestCase):
         dns_update_all_zones_mock = self.patch(dns, "dns_update_all_zones")
         yield service._tryUpdate()
         dns_update_all_zones_mock.assert_called_once_with(
-            requires_reload=True, serial="0000000005"
+            requires_reload=True,
+            serial="0000000005",
+            since_serial="0000000004",
         )
 
     @wait_for_reactor
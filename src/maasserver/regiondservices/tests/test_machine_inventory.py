@@ -0,0 +1,55 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from unittest.mock import Mock
+
+from maasserver.machine_inventory import MACHINE_INVENTORY, MachineInventory
+from maasserver.regiondservices.machine_inventory import (
+    MachineInventoryService,
+)
+from maastesting.testcase import MAASTestCase
+
+
+class TestMachineInventoryService(MAASTestCase):
+    def test_uses_global_inventory_by_default(self):
+        service = MachineInventoryService()
+        self.assertIs(MACHINE_INVENTORY, service.inventory)
+
+    def test_start_enables_inventory_and_registers(self):
+        listener = Mock()
+        inventory = MachineInventory()
+        service = MachineInventoryService(listener, inventory=inventory)
+        service.startService()
+        self.addCleanup(service.stopService)
+        self.assertTrue(inventory.enabled)
+        listener.register.assert_called_once_with(
+            "machine", service._consume_event
+        )
+
+    def test_start_without_listener_keeps_inventory_disabled(self):
+        inventory = MachineInventory()
+        service = MachineInventoryService(inventory=inventory)
+        service.startService()
+        self.addCleanup(service.stopService)
+        self.assertFalse(inventory.enabled)
+
+    def test_stop_disables_inventory_and_unregisters(self):
+        listener = Mock()
+        inventory = MachineInventory()
+        service = MachineInventoryService(listener, inventory=inventory)
+        service.startService()
+        inventory._machines = {}
+        service.stopService()
+        self.assertFalse(inventory.enabled)
+        self.assertIsNone(inventory._machines)
+        listener.unregister.assert_called_once_with(
+            "machine", service._consume_event
+        )
+
+    def test_event_invalidates_machine(self):
+        inventory = MachineInventory()
+        service = MachineInventoryService(Mock(), inventory=inventory)
+        service.startService()
+        self.addCleanup(service.stopService)
+        service._consume_event("update", "abcdef")
+        self.assertEqual({"abcdef"}, inventory._dirty)
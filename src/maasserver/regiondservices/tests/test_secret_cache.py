@@ -0,0 +1,57 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from unittest.mock import Mock
+
+from maasserver.regiondservices.secret_cache import SecretCacheService
+from maasserver.secrets import NOT_CACHED, SECRET_CACHE, SecretCache
+from maastesting.testcase import MAASTestCase
+
+
+class TestSecretCacheService(MAASTestCase):
+    def test_uses_global_cache_by_default(self):
+        service = SecretCacheService()
+        self.assertIs(SECRET_CACHE, service.cache)
+
+    def test_start_enables_cache_and_registers(self):
+        listener = Mock()
+        cache = SecretCache()
+        service = SecretCacheService(listener, cache=cache, maxsize=10)
+        service.startService()
+        self.addCleanup(service.stopService)
+        self.assertEqual(10, cache.maxsize)
+        listener.register.assert_called_once_with(
+            "sys_secret", service._consume_event
+        )
+
+    def test_start_without_listener_keeps_cache_disabled(self):
+        cache = SecretCache()
+        service = SecretCacheService(cache=cache)
+        service.startService()
+        self.addCleanup(service.stopService)
+        self.assertEqual(0, cache.maxsize)
+
+    def test_stop_disables_cache_and_unregisters(self):
+        listener = Mock()
+        cache = SecretCache()
+        service = SecretCacheService(listener, cache=cache)
+        service.startService()
+        cache.set("global/tls", {"key": "value"})
+        service.stopService()
+        self.assertEqual(0, cache.maxsize)
+        cache.maxsize = 10
+        self.assertIs(NOT_CACHED, cache.get("global/tls"))
+        listener.unregister.assert_called_once_with(
+            "sys_secret", service._consume_event
+        )
+
+    def test_event_invalidates_path(self):
+        cache = SecretCache()
+        service = SecretCacheService(Mock(), cache=cache)
+        service.startService()
+        self.addCleanup(service.stopService)
+        cache.set("global/tls", {"key": "value"})
+        cache.set("global/omapi-key", {"secret": "value"})
+        service._consume_event("sys_secret", "global/tls")
+        self.assertIs(NOT_CACHED, cache.get("global/tls"))
+        self.assertEqual({"secret": "value"}, cache.get("global/omapi-key"))
@@ -3,6 +3,8 @@
 
 """RPC helpers relating to events."""
 
+from netaddr import IPAddress, valid_ipv4, valid_ipv6
+
 from maasserver.enum import INTERFACE_TYPE
 from maasserver.models import Event, EventType, Interface, Node
 from maasserver.utils.orm import transactional
@@ -129,3 +131,55 @@ def send_event_ip_address(ip_address, type_name, description, timestamp):
             description=description,
             created=timestamp,
         )
+
+
+@synchronous
+@transactional
+def send_events(events, timestamp):
+    """Send a batch of events, each using an IP address.
+
+    for :py:class:`~provisioningserver.rpc.region.SendEvents`.
+
+    Nodes and event types are resolved with one query each, and the events
+    are inserted in bulk. Events for unknown event types or nodes are
+    dropped.
+    """
+    event_types = EventType.objects.in_bulk(
+        {event["type_name"] for event in events}, field_name="name"
+    )
+    ip_addresses = {
+        event["ip_address"]: IPAddress(event["ip_address"])
+        for event in events
+        if valid_ipv4(event["ip_address"]) or valid_ipv6(event["ip_address"])
+    }
+    node_ids = {
+        IPAddress(ip): node_id
+        for ip, node_id in Node.objects.filter(
+            current_config__interface__ip_addresses__ip__in=[
+                str(ip) for ip in ip_addresses.values()
+            ]
+        ).values_list("current_config__interface__ip_addresses__ip", "id")
+    }
+    new_events = []
+    for event in events:
+        event_type = event_types.get(event["type_name"])
+        node_id = node_ids.get(ip_addresses.get(event["ip_address"]))
+        if event_type is None or node_id is None:
+            log.debug(
+                "Event '{type}: {description}' sent for non-existent "
+                "node with IP address '{ip_address}' or unknown event type.",
+                type=event["type_name"],
+                description=event["description"],
+                ip_address=event["ip_address"],
+            )
+            continue
+        new_events.append(
+            Event(
+                node_id=node_id,
+                type=event_type,
+                description=event["description"],
+                created=timestamp,
+                updated=timestamp,
+            )
+        )
+    Event.objects.bulk_create(new_events)
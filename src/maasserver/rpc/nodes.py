@@ -11,6 +11,7 @@ __all__ = [
 ]
 
 from datetime import timedelta
+from itertools import islice
 import json
 
 from django.contrib.auth.models import User
@@ -23,6 +24,7 @@ from maasserver.enum import NODE_STATUS
 from maasserver.forms import AdminMachineWithMACAddressesForm
 from maasserver.models import Node, PhysicalInterface, RackController
 from maasserver.models.timestampedmodel import now
+from maasserver.secrets import SecretManager
 from maasserver.utils.orm import transactional
 from provisioningserver.drivers.power.registry import PowerDriverRegistry
 from provisioningserver.rpc.exceptions import (
@@ -52,12 +54,15 @@ def mark_node_failed(system_id, error_description):
         raise NodeStateViolation(e)  # noqa: B904
 
 
-def _gen_cluster_nodes_power_parameters(nodes, limit):
+def _gen_cluster_nodes_power_parameters(nodes, limit, batch_size=100):
     """Generate power parameters for `nodes`.
 
     These fulfil a subset of the return schema for the RPC call for
     :py:class:`~provisioningserver.rpc.region.ListNodePowerParameters`.
 
+    Nodes, their BMCs and their secrets are fetched `batch_size` nodes at a
+    time, so the number of queries does not grow with the number of nodes.
+
     :return: A generator yielding `dict`s.
     """
     five_minutes_ago = now() - timedelta(minutes=5)
@@ -75,16 +80,39 @@ def _gen_cluster_nodes_power_parameters(nodes, limit):
         .order_by(F("power_state_queried").asc(nulls_first=True), "system_id")
         .distinct()
     )
-    for node in qs[:limit]:
-        power_info = node.get_effective_power_info()
-        if power_info.power_type is not None:
-            yield {
-                "system_id": node.system_id,
-                "hostname": node.hostname,
-                "power_state": node.power_state,
-                "power_type": power_info.power_type,
-                "context": power_info.power_parameters,
+    nodes = qs.select_related("bmc")[:limit].iterator(chunk_size=batch_size)
+    while batch := list(islice(nodes, batch_size)):
+        # Fetch the power parameters secrets for the whole batch at once,
+        # instead of once for each node and once again for its BMC. Batches
+        # are resolved lazily so that nothing more is fetched once the
+        # consumer has enough.
+        secrets = SecretManager()
+        node_secrets = secrets.get_composite_secrets(
+            "power-parameters",
+            [node.as_node() for node in batch],
+            default={},
+        )
+        bmc_secrets = secrets.get_composite_secrets(
+            "power-parameters",
+            {node.bmc.as_bmc() for node in batch},
+            default={},
+        )
+        for node in batch:
+            power_parameters = {
+                **node.bmc.get_power_parameters(secret=bmc_secrets[node.bmc]),
+                **node.get_instance_power_parameters(
+                    secret=node_secrets[node]
+                ),
             }
+            power_info = node.get_effective_power_info(power_parameters)
+            if power_info.power_type is not None:
+                yield {
+                    "system_id": node.system_id,
+                    "hostname": node.hostname,
+                    "power_state": node.power_state,
+                    "power_type": power_info.power_type,
+                    "context": power_info.power_parameters,
+                }
 
 
 def _gen_up_to_json_limit(things, limit):
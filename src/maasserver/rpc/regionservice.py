@@ -44,7 +44,7 @@ from maasserver.rpc.services import update_services
 from maasserver.secrets import SecretManager, SecretNotFound
 from maasserver.security import get_shared_secret
 from maasserver.utils.orm import is_retryable_failure, transactional
-from maasserver.utils.threads import deferToDatabase
+from maasserver.utils.threads import deferToDatabase, Lane, lane
 from provisioningserver.logger import LegacyLogger
 from provisioningserver.prometheus.metrics import (
     GLOBAL_LABELS,
@@ -123,17 +123,20 @@ class Region(SecuredRPCProtocol):
         Implementation of
         :py:class:`~provisioningserver.rpc.region.GetBootConfig`.
         """
-        return deferToDatabase(
-            boot.get_config,
-            system_id,
-            local_ip,
-            remote_ip,
-            arch=arch,
-            subarch=subarch,
-            mac=mac,
-            hardware_uuid=hardware_uuid,
-            bios_boot_method=bios_boot_method,
-        )
+        # Nodes are waiting for this to boot, so don't queue it behind
+        # other work.
+        with lane(Lane.BOOT):
+            return deferToDatabase(
+                boot.get_config,
+                system_id,
+                local_ip,
+                remote_ip,
+                arch=arch,
+                subarch=subarch,
+                mac=mac,
+                hardware_uuid=hardware_uuid,
+                bios_boot_method=bios_boot_method,
+            )
 
     @region.MarkNodeFailed.responder
     def mark_node_failed(self, system_id, error_description):
@@ -155,7 +158,11 @@ class Region(SecuredRPCProtocol):
         Implementation of
         :py:class:`~provisioningserver.rpc.region.ListNodePowerParameters`.
         """
-        d = deferToDatabase(nodes.list_cluster_nodes_power_parameters, uuid)
+        # The rack asks again until it gets an empty list, so fill each
+        # response up to the size limit rather than to a number of nodes.
+        d = deferToDatabase(
+            nodes.list_cluster_nodes_power_parameters, uuid, limit=None
+        )
         d.addCallback(lambda nodes: {"nodes": nodes})
         return d
 
@@ -238,6 +245,21 @@ class Region(SecuredRPCProtocol):
         # Don't wait for the record to be written.
         return succeed({})
 
+    @region.SendEvents.responder
+    def send_events(self, **kwargs):
+        """send_events()
+
+        Implementation of
+        :py:class:`~provisioningserver.rpc.region.SendEvents`.
+        """
+        # The `events` argument is taken from `kwargs` so that it doesn't
+        # shadow the `events` module.
+        timestamp = timezone.now()
+        dbtasks = eventloop.services.getServiceNamed("database-tasks")
+        dbtasks.addTask(events.send_events, kwargs["events"], timestamp)
+        # Don't wait for the records to be written.
+        return succeed({})
+
     @region.ReportForeignDHCPServer.responder
     def report_foreign_dhcp_server(
         self, system_id, interface_name, dhcp_ip=None
@@ -4,6 +4,8 @@
 
 import logging
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from maasserver.enum import INTERFACE_TYPE
@@ -179,3 +181,102 @@ class TestSendEventIPAddress(MAASServerTestCase):
             description=description,
             created=timestamp,
         )
+
+
+class TestSendEvents(MAASServerTestCase):
+    def make_event(self, ip_address, type_name, description=None):
+        if description is None:
+            description = factory.make_name("description")
+        return {
+            "ip_address": str(ip_address),
+            "type_name": type_name,
+            "description": description,
+        }
+
+    def test_creates_events_for_nodes(self):
+        event_type = factory.make_EventType()
+        node1 = factory.make_Node(interface=True)
+        node2 = factory.make_Node(interface=True)
+        ip1 = factory.make_StaticIPAddress(
+            interface=node1.current_config.interface_set.first()
+        )
+        ip2 = factory.make_StaticIPAddress(
+            interface=node2.current_config.interface_set.first()
+        )
+        timestamp = timezone.now()
+        events.send_events(
+            [
+                self.make_event(ip1.ip, event_type.name, "foo"),
+                self.make_event(ip2.ip, event_type.name, "bar"),
+                self.make_event(ip1.ip, event_type.name, "baz"),
+            ],
+            timestamp,
+        )
+        self.assertCountEqual(
+            [
+                (node1.id, "foo", timestamp),
+                (node2.id, "bar", timestamp),
+                (node1.id, "baz", timestamp),
+            ],
+            Event.objects.filter(type=event_type).values_list(
+                "node_id", "description", "created"
+            ),
+        )
+
+    def test_resolves_nodes_and_event_types_in_bulk(self):
+        event_type = factory.make_EventType()
+        nodes = [factory.make_Node(interface=True) for _ in range(3)]
+        batch = [
+            self.make_event(
+                factory.make_StaticIPAddress(
+                    interface=node.current_config.interface_set.first()
+                ).ip,
+                event_type.name,
+            )
+            for node in nodes
+        ]
+        with CaptureQueriesContext(connection) as captured:
+            events.send_events(batch, timezone.now())
+        # One query for the event types, one for the nodes, one for the
+        # insert.
+        self.assertEqual(3, len(captured))
+
+    def test_skips_unknown_event_types_and_nodes(self):
+        event_type = factory.make_EventType()
+        node = factory.make_Node(interface=True)
+        ip = factory.make_StaticIPAddress(
+            interface=node.current_config.interface_set.first()
+        )
+        events.send_events(
+            [
+                self.make_event(ip.ip, event_type.name, "foo"),
+                self.make_event(ip.ip, factory.make_name("type")),
+                self.make_event(factory.make_ip_address(), event_type.name),
+                self.make_event("not-an-ip", event_type.name),
+            ],
+            timezone.now(),
+        )
+        self.assertEqual(
+            ["foo"],
+            list(Event.objects.values_list("description", flat=True)),
+        )
+
+    def test_creates_one_event_for_node_with_bridge_interface(self):
+        event_type = factory.make_EventType()
+        node = factory.make_Node(interface=True)
+        eth0 = node.get_boot_interface()
+        factory.make_Interface(
+            INTERFACE_TYPE.BRIDGE,
+            node=node,
+            mac_address=eth0.mac_address,
+            parents=[eth0],
+        )
+        ip = factory.make_StaticIPAddress()
+        for interface in node.current_config.interface_set.all():
+            ip.interface_set.add(interface)
+        events.send_events(
+            [self.make_event(ip.ip, event_type.name)], timezone.now()
+        )
+        self.assertEqual(
+            [node.id], list(Event.objects.values_list("node_id", flat=True))
+        )
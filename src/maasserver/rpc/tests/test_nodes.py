@@ -27,6 +27,7 @@ from maasserver.rpc.nodes import (
     update_node_power_state,
 )
 from maasserver.rpc.testing.fixtures import MockLiveRegionToClusterRPCFixture
+from maasserver.secrets import SecretManager
 from maasserver.testing.architecture import make_usable_architecture
 from maasserver.testing.eventloop import (
     RegionEventLoopFixture,
@@ -38,6 +39,7 @@ from maasserver.testing.testcase import (
     MAASTransactionServerTestCase,
 )
 from maasserver.utils.orm import post_commit_hooks, reload_object
+from maastesting.djangotestcase import count_queries
 from maastesting.twisted import always_succeed_with
 from metadataserver.builtin_scripts import load_builtin_scripts
 from provisioningserver.drivers.power.registry import PowerDriverRegistry
@@ -475,6 +477,43 @@ class TestListClusterNodesPowerParameters(MAASServerTestCase):
             [node.system_id for node in nodes_in_order], system_ids
         )
 
+    def test_includes_secret_power_parameters(self):
+        rack = factory.make_RackController()
+        node = self.make_Node(bmc_connected_to=rack)
+        power_pass = factory.make_string()
+        power_id = factory.make_name("power_id")
+        secrets = SecretManager()
+        secrets.set_composite_secret(
+            "power-parameters", {"power_pass": power_pass}, obj=node.bmc
+        )
+        secrets.set_composite_secret(
+            "power-parameters", {"power_id": power_id}, obj=node.as_node()
+        )
+
+        [power_parameters] = list_cluster_nodes_power_parameters(
+            rack.system_id
+        )
+        self.assertEqual(power_pass, power_parameters["context"]["power_pass"])
+        self.assertEqual(power_id, power_parameters["context"]["power_id"])
+
+    def test_query_count_does_not_grow_with_nodes(self):
+        rack = factory.make_RackController()
+        for _ in range(3):
+            self.make_Node(bmc_connected_to=rack)
+        count_3, power_parameters = count_queries(
+            list_cluster_nodes_power_parameters, rack.system_id
+        )
+        self.assertEqual(3, len(power_parameters))
+
+        for _ in range(6):
+            self.make_Node(bmc_connected_to=rack)
+        Node.objects.update(power_state_queried=None)
+        count_9, power_parameters = count_queries(
+            list_cluster_nodes_power_parameters, rack.system_id
+        )
+        self.assertEqual(9, len(power_parameters))
+        self.assertEqual(count_3, count_9)
+
     def test_returns_at_most_60kiB_of_JSON(self):
         # Configure the rack controller subnet to be very large so it
         # can hold that many BMC connected to the interface for the rack
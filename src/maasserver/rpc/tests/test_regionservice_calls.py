@@ -66,6 +66,7 @@ from provisioningserver.rpc.region import (
     RequestRackRefresh,
     SendEvent,
     SendEventMACAddress,
+    SendEvents,
     UpdateNodePowerState,
     UpdateServices,
 )
@@ -757,6 +758,73 @@ class TestRegionProtocol_SendEventMACAddress(MAASTransactionServerTestCase):
         )
 
 
+class TestRegionProtocol_SendEvents(MAASTransactionServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.useFixture(RegionEventLoopFixture("database-tasks"))
+
+    def test_send_events_is_registered(self):
+        protocol = Region()
+        responder = protocol.locateResponder(SendEvents.commandName)
+        self.assertIsNotNone(responder)
+
+    @transactional
+    def make_node_with_ip(self):
+        node = factory.make_Node(interface=True)
+        ip = factory.make_StaticIPAddress(
+            interface=node.current_config.interface_set.first()
+        )
+        return node.system_id, ip.ip
+
+    @transactional
+    def get_events(self, type_name):
+        return list(
+            Event.objects.filter(type__name=type_name).values_list(
+                "node__system_id", "description", "created"
+            )
+        )
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_send_events_stores_events_with_timestamp_received(self):
+        timestamp = timezone.now() - timedelta(seconds=randint(99, 99999))
+        self.patch(regionservice, "timezone").now.return_value = timestamp
+        name = factory.make_name("type_name")
+        yield deferToDatabase(transactional(factory.make_EventType), name=name)
+        system_id1, ip1 = yield deferToDatabase(self.make_node_with_ip)
+        system_id2, ip2 = yield deferToDatabase(self.make_node_with_ip)
+
+        yield eventloop.start()
+        try:
+            response = yield call_responder(
+                Region(),
+                SendEvents,
+                {
+                    "events": [
+                        {
+                            "ip_address": ip1,
+                            "type_name": name,
+                            "description": "foo",
+                        },
+                        {
+                            "ip_address": ip2,
+                            "type_name": name,
+                            "description": "bar",
+                        },
+                    ]
+                },
+            )
+        finally:
+            yield eventloop.reset()
+
+        self.assertEqual({}, response)
+        events = yield deferToDatabase(self.get_events, name)
+        self.assertCountEqual(
+            [(system_id1, "foo", timestamp), (system_id2, "bar", timestamp)],
+            events,
+        )
+
+
 class TestRegionProtocol_UpdateServices(MAASTransactionServerTestCase):
     def setUp(self):
         super().setUp()
@@ -1,11 +1,16 @@
 # Copyright 2022-2025 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import Any, Literal, NamedTuple, Optional
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+import time
+from typing import Any, Callable, Iterable, Literal, NamedTuple, Optional
 
 from django.db.models import Model
 
 from maasserver.models import BMC, Node, RootKey, Secret, VaultSecret
+from maasserver.utils.orm import post_commit
 from maasserver.vault import (
     get_region_vault_client_if_enabled,
     UnknownSecretPath,
@@ -27,6 +32,7 @@ from maasservicelayer.models.secrets import (
     TLSSecret,
     VCenterPasswordSecret,
 )
+from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
 
 SIMPLE_SECRET_KEY = "secret"
 
@@ -103,6 +109,112 @@ GLOBAL_SECRETS = frozenset(
 
 UNSET = object()
 
+# Markers used by `SecretCache`: the path is not in the cache, or the cache
+# knows that there is no secret at that path.
+NOT_CACHED = object()
+NOT_FOUND = object()
+
+
+class SecretCache:
+    """Bounded cache of secret values, keyed by path, with a time-to-live.
+
+    Missing secrets are cached too (as `NOT_FOUND`), since many objects don't
+    have a value for a secret and would otherwise be looked up every time.
+
+    The cache is disabled (`maxsize` is 0) until `SecretCacheService` starts,
+    since it relies on the `sys_secret` database notifications to drop entries
+    for secrets changed by other processes. The TTL bounds how long a value
+    can be stale if a notification is missed.
+
+    Paths being written by a transaction in this process are not cached
+    until the transaction ends (see `begin_write`), so that a value that is
+    not committed yet, and may never be, is never cached.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        ttl: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # Number of uncommitted writes to each path.
+        self._writes: dict[str, int] = {}
+        # Secrets are read from the database threads.
+        self._lock = Lock()
+
+    def get(self, path: str) -> Any:
+        """Return the cached value for `path`, `NOT_FOUND` or `NOT_CACHED`."""
+        if self.maxsize <= 0:
+            return NOT_CACHED
+        with self._lock:
+            entry = None if path in self._writes else self._entries.get(path)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(path)
+                else:
+                    del self._entries[path]
+                    entry = None
+        PROMETHEUS_METRICS.update(
+            "maas_secret_cache_lookups",
+            "inc",
+            labels={"result": "miss" if entry is None else "hit"},
+        )
+        if entry is None:
+            return NOT_CACHED
+        if value is NOT_FOUND:
+            return value
+        # Callers may modify the returned value.
+        return deepcopy(value)
+
+    def set(self, path: str, value: Any):
+        if self.maxsize <= 0:
+            return
+        if value is not NOT_FOUND:
+            value = deepcopy(value)
+        with self._lock:
+            if path in self._writes:
+                return
+            self._entries[path] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *paths: str):
+        """Drop the cached values for `paths`."""
+        with self._lock:
+            for path in paths:
+                self._entries.pop(path, None)
+
+    def begin_write(self, *paths: str):
+        """Drop `paths` and stop caching them until `end_write` is called."""
+        with self._lock:
+            for path in paths:
+                self._writes[path] = self._writes.get(path, 0) + 1
+                self._entries.pop(path, None)
+
+    def end_write(self, *paths: str):
+        """Cache `paths` again, once all the writes to them have ended."""
+        with self._lock:
+            for path in paths:
+                count = self._writes.pop(path, 0) - 1
+                if count > 0:
+                    self._writes[path] = count
+                self._entries.pop(path, None)
+
+    def clear(self):
+        """Drop all the cached values."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by all the `SecretManager`s in the process.
+SECRET_CACHE = SecretCache()
+
 
 class SecretManager:
     """Handle operations on secrets."""
@@ -120,6 +232,7 @@ class SecretManager:
     ):
         """Create or update a secret."""
         path = self._get_secret_path(name, obj=obj)
+        self._uncache_until_transaction_ends(path)
         if self._vault_client:
             self._vault_client.set(path, value)
             VaultSecret.objects.update_or_create(
@@ -141,6 +254,7 @@ class SecretManager:
     def delete_secret(self, name: str, obj: Optional[Model] = None):
         """Delete a secret, either global or for a model instance."""
         path = self._get_secret_path(name, obj=obj)
+        self._uncache_until_transaction_ends(path)
         if self._vault_client:
             VaultSecret.objects.filter(path=path).update(deleted=True)
         else:
@@ -153,6 +267,7 @@ class SecretManager:
             model_secret.get_secret_path(name, obj)
             for name in model_secret.secret_names
         )
+        self._uncache_until_transaction_ends(*paths)
         if self._vault_client:
             VaultSecret.objects.filter(path__in=paths).update(deleted=True)
         else:
@@ -169,18 +284,51 @@ class SecretManager:
         The secret can be either global or for a model instance.
         """
         path = self._get_secret_path(name, obj=obj)
-        try:
-            if self._vault_client:
-                vault_secret = VaultSecret.objects.filter(path=path).first()
-                if not vault_secret or vault_secret.deleted:
-                    raise SecretNotFound(path)
-                return self._get_secret_from_vault(path)
-
-            return self._get_secret_from_db(path)
-        except SecretNotFound:
+        value = SECRET_CACHE.get(path)
+        if value is NOT_CACHED:
+            try:
+                value = self._get_secret(path)
+            except SecretNotFound:
+                value = NOT_FOUND
+            SECRET_CACHE.set(path, value)
+        if value is NOT_FOUND:
             if default is UNSET:
-                raise
+                raise SecretNotFound(path)
             return default
+        return value
+
+    def get_composite_secrets(
+        self,
+        name: str,
+        objs: Iterable[Model],
+        default: Any = UNSET,
+    ) -> dict[Model, Any]:
+        """Return the values for a secret of several model instances.
+
+        Secrets stored in the database are read with a single query. With
+        Vault, a single query finds which of the secrets exist, and only
+        those are fetched from Vault. Cached values are used when available.
+        """
+        paths = {self._get_secret_path(name, obj=obj): obj for obj in objs}
+        values = {path: SECRET_CACHE.get(path) for path in paths}
+        uncached = [
+            path for path, value in values.items() if value is NOT_CACHED
+        ]
+        if uncached:
+            fetched = self._get_secrets(uncached)
+            for path in uncached:
+                values[path] = fetched.get(path, NOT_FOUND)
+                SECRET_CACHE.set(path, values[path])
+
+        secrets = {}
+        for path, obj in paths.items():
+            if values[path] is not NOT_FOUND:
+                secrets[obj] = values[path]
+            elif default is UNSET:
+                raise SecretNotFound(path)
+            else:
+                secrets[obj] = default
+        return secrets
 
     def get_simple_secret(
         self,
@@ -202,6 +350,24 @@ class SecretManager:
             return default
         return secret[SIMPLE_SECRET_KEY]
 
+    def _uncache_until_transaction_ends(self, *paths: str):
+        """Don't cache `paths` until the current transaction ends.
+
+        The new values are read from the database or Vault in the meantime,
+        by this transaction and by the others. Once it's committed or rolled
+        back, the paths are dropped from the cache again, in case a value
+        that has just become stale was cached by then.
+        """
+        if SECRET_CACHE.maxsize <= 0:
+            # Nothing is cached, and post-commit hooks might never run.
+            return
+        SECRET_CACHE.begin_write(*paths)
+
+        def end_write(result):
+            SECRET_CACHE.end_write(*paths)
+
+        post_commit(end_write)
+
     def _get_secret_path(self, name: str, obj: Optional[Model] = None) -> str:
         if obj is not None:
             try:
@@ -214,12 +380,39 @@ class SecretManager:
             raise UnknownSecret(name)
         return f"global/{name}"
 
+    def _get_secret(self, path: str):
+        if self._vault_client:
+            vault_secret = VaultSecret.objects.filter(path=path).first()
+            if not vault_secret or vault_secret.deleted:
+                raise SecretNotFound(path)
+            return self._get_secret_from_vault(path)
+        return self._get_secret_from_db(path)
+
+    def _get_secrets(self, paths: list[str]) -> dict[str, Any]:
+        """Return the values of the secrets that exist among `paths`."""
+        if not self._vault_client:
+            return dict(
+                Secret.objects.filter(path__in=paths).values_list(
+                    "path", "value"
+                )
+            )
+        values = {}
+        for path in VaultSecret.objects.filter(
+            path__in=paths, deleted=False
+        ).values_list("path", flat=True):
+            try:
+                values[path] = self._get_secret_from_vault(path)
+            except SecretNotFound:
+                pass
+        return values
+
     def _get_secret_from_db(self, path: str):
         try:
             return Secret.objects.get(path=path).value
         except Secret.DoesNotExist:
             raise SecretNotFound(path)  # noqa: B904
 
+    @PROMETHEUS_METRICS.record_call_latency("maas_vault_secret_read_latency")
     def _get_secret_from_vault(self, path: str):
         try:
             return self._vault_client.get(path)
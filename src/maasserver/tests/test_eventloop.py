@@ -29,6 +29,10 @@ from maasserver.regiondservices import ntp, service_monitor_service, syslog
 from maasserver.regiondservices.certificate_expiration_check import (
     CertificateExpirationCheckService,
 )
+from maasserver.regiondservices.machine_inventory import (
+    MachineInventoryService,
+)
+from maasserver.regiondservices.secret_cache import SecretCacheService
 from maasserver.regiondservices.vault_secrets_cleanup import (
     VaultSecretsCleanupService,
 )
@@ -631,6 +635,42 @@ class TestFactories(MAASServerTestCase):
             eventloop.make_VaultSecretsCleanupService,
         )
 
+    def test_make_SecretCacheService(self):
+        service = eventloop.make_SecretCacheService(
+            FakePostgresListenerService()
+        )
+        self.assertIsInstance(service, SecretCacheService)
+        # It is registered as a factory in both the master and the workers,
+        # with a dependency on their postgres-listener.
+        for name, listener, only_on_master in (
+            ("secret-cache-master", "postgres-listener-master", True),
+            ("secret-cache-worker", "postgres-listener-worker", False),
+        ):
+            factory_info = eventloop.loop.factories[name]
+            self.assertIs(
+                eventloop.make_SecretCacheService, factory_info["factory"]
+            )
+            self.assertEqual([listener], factory_info["requires"])
+            self.assertEqual(only_on_master, factory_info["only_on_master"])
+
+    def test_make_MachineInventoryService(self):
+        service = eventloop.make_MachineInventoryService(
+            FakePostgresListenerService()
+        )
+        self.assertIsInstance(service, MachineInventoryService)
+        # It is registered as a factory in the workers, which serve the API.
+        self.assertEqual(
+            eventloop.make_MachineInventoryService,
+            eventloop.loop.factories["machine-inventory"]["factory"],
+        )
+        self.assertFalse(
+            eventloop.loop.factories["machine-inventory"]["only_on_master"]
+        )
+        self.assertEqual(
+            ["postgres-listener-worker"],
+            eventloop.loop.factories["machine-inventory"]["requires"],
+        )
+
 
 class TestDisablingDatabaseConnections(MAASServerTestCase):
     @wait_for_reactor
@@ -0,0 +1,238 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from maasserver.enum import NODE_STATUS
+from maasserver.machine_inventory import (
+    find_machine_for_acquisition,
+    MachineInventory,
+)
+from maasserver.models import Machine
+from maasserver.node_constraint_filter_forms import AcquireNodeForm
+from maasserver.testing.factory import factory
+from maasserver.testing.testcase import MAASServerTestCase
+from maastesting.djangotestcase import count_queries
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def get_cleaned_data(**constraints):
+    form = AcquireNodeForm(data=constraints)
+    assert form.is_valid(), form.errors
+    return form.cleaned_data
+
+
+class TestMachineInventory(MAASServerTestCase):
+    def test_loads_ready_machines(self):
+        machine = factory.make_Machine(status=NODE_STATUS.READY)
+        factory.make_Machine(status=NODE_STATUS.DEPLOYED)
+        inventory = MachineInventory()
+        self.assertEqual([machine.system_id], list(inventory.get_machines()))
+
+    def test_loads_machine_attributes(self):
+        machine = factory.make_Machine(
+            status=NODE_STATUS.READY, with_boot_disk=False
+        )
+        tag = factory.make_Tag()
+        machine.tags.add(tag)
+        factory.make_PhysicalBlockDevice(
+            node=machine, size=10 * 1000**3, tags=["ssd"]
+        )
+        subnet = factory.make_Subnet()
+        interface = factory.make_Interface(node=machine, vlan=subnet.vlan)
+        factory.make_StaticIPAddress(interface=interface, subnet=subnet)
+        entry = MachineInventory().get_machines()[machine.system_id]
+        self.assertEqual(machine.id, entry.id)
+        self.assertEqual(machine.architecture, entry.architecture)
+        self.assertEqual(machine.cpu_count, entry.cpu_count)
+        self.assertEqual(machine.memory, entry.memory)
+        self.assertEqual(machine.pool.name, entry.pool)
+        self.assertEqual(machine.zone.name, entry.zone)
+        self.assertEqual({tag.name}, entry.tags)
+        self.assertEqual(((10 * 1000**3, frozenset(["ssd"])),), entry.storage)
+        self.assertEqual({subnet.vlan.id}, entry.vlans)
+        self.assertEqual({subnet.vlan.fabric.name}, entry.fabrics)
+        self.assertEqual({subnet.id}, entry.subnets)
+
+    def test_loads_with_constant_number_of_queries(self):
+        for _ in range(3):
+            factory.make_Machine(status=NODE_STATUS.READY)
+        count_3, _ = count_queries(MachineInventory().get_machines)
+        for _ in range(3):
+            factory.make_Machine(status=NODE_STATUS.READY)
+        count_6, _ = count_queries(MachineInventory().get_machines)
+        self.assertEqual(count_3, count_6)
+
+    def test_reloads_invalidated_machines_only(self):
+        machine = factory.make_Machine(status=NODE_STATUS.READY)
+        other = factory.make_Machine(status=NODE_STATUS.READY)
+        inventory = MachineInventory()
+        inventory.get_machines()
+        machine.status = NODE_STATUS.DEPLOYED
+        machine.save()
+        other.cpu_count += 1
+        other.save()
+        inventory.invalidate(machine.system_id)
+        machines = inventory.get_machines()
+        self.assertEqual([other.system_id], list(machines))
+        # The other machine wasn't reloaded.
+        self.assertNotEqual(
+            other.cpu_count, machines[other.system_id].cpu_count
+        )
+
+    def test_reloads_everything_after_ttl(self):
+        clock = FakeClock()
+        inventory = MachineInventory(ttl=10, clock=clock)
+        inventory.get_machines()
+        machine = factory.make_Machine(status=NODE_STATUS.READY)
+        self.assertEqual({}, inventory.get_machines())
+        clock.now += 10
+        self.assertEqual([machine.system_id], list(inventory.get_machines()))
+
+    def test_get_candidates_sorted_by_cost(self):
+        expensive = factory.make_Machine(
+            status=NODE_STATUS.READY, cpu_count=8, memory=8192
+        )
+        cheap = factory.make_Machine(
+            status=NODE_STATUS.READY, cpu_count=1, memory=1024
+        )
+        self.assertEqual(
+            [cheap.id, expensive.id],
+            MachineInventory().get_candidates(get_cleaned_data()),
+        )
+
+    def test_get_candidates_filters(self):
+        tag = factory.make_Tag()
+        zone = factory.make_Zone()
+        machine = factory.make_Machine(
+            status=NODE_STATUS.READY, cpu_count=4, memory=4096, zone=zone
+        )
+        machine.tags.add(tag)
+        factory.make_Machine(status=NODE_STATUS.READY, cpu_count=1)
+        factory.make_Machine(status=NODE_STATUS.READY, cpu_count=4, memory=1)
+        factory.make_Machine(
+            status=NODE_STATUS.READY, cpu_count=4, memory=4096
+        )
+        self.assertEqual(
+            [machine.id],
+            MachineInventory().get_candidates(
+                get_cleaned_data(
+                    cpu_count=4, mem=4096, tags=[tag.name], zone=zone.name
+                )
+            ),
+        )
+
+    def test_get_candidates_excludes(self):
+        tag = factory.make_Tag()
+        machine = factory.make_Machine(status=NODE_STATUS.READY)
+        excluded = factory.make_Machine(status=NODE_STATUS.READY)
+        excluded.tags.add(tag)
+        self.assertEqual(
+            [machine.id],
+            MachineInventory().get_candidates(
+                get_cleaned_data(not_tags=[tag.name])
+            ),
+        )
+
+    def test_get_candidates_checks_storage_sizes_and_tags(self):
+        machine = factory.make_Machine(
+            status=NODE_STATUS.READY, with_boot_disk=False
+        )
+        factory.make_PhysicalBlockDevice(
+            node=machine, size=20 * 1000**3, tags=["ssd"]
+        )
+        small = factory.make_Machine(
+            status=NODE_STATUS.READY, with_boot_disk=False
+        )
+        factory.make_PhysicalBlockDevice(
+            node=small, size=5 * 1000**3, tags=["ssd"]
+        )
+        rotary = factory.make_Machine(
+            status=NODE_STATUS.READY, with_boot_disk=False
+        )
+        factory.make_PhysicalBlockDevice(
+            node=rotary, size=20 * 1000**3, tags=["rotary"]
+        )
+        self.assertEqual(
+            [machine.id],
+            MachineInventory().get_candidates(
+                get_cleaned_data(storage="10(ssd)")
+            ),
+        )
+
+
+class TestFindMachineForAcquisition(MAASServerTestCase):
+    def make_form(self, **constraints):
+        form = AcquireNodeForm(data=constraints)
+        self.assertTrue(form.is_valid(), form.errors)
+        return form
+
+    def test_uses_full_query_when_disabled(self):
+        machine = factory.make_Machine(status=NODE_STATUS.READY)
+        inventory = MachineInventory()
+        get_candidates = self.patch(inventory, "get_candidates")
+        found, _, _ = find_machine_for_acquisition(
+            self.make_form(), Machine.objects.all(), inventory=inventory
+        )
+        self.assertEqual(machine, found)
+        get_candidates.assert_not_called()
+
+    def test_returns_cheapest_candidate(self):
+        factory.make_Machine(
+            status=NODE_STATUS.READY, cpu_count=8, memory=8192
+        )
+        cheap = factory.make_Machine(
+            status=NODE_STATUS.READY, cpu_count=1, memory=1024
+        )
+        inventory = MachineInventory()
+        inventory.enabled = True
+        found, _, _ = find_machine_for_acquisition(
+            self.make_form(),
+            Machine.objects.filter(status=NODE_STATUS.READY),
+            inventory=inventory,
+        )
+        self.assertEqual(cheap, found)
+
+    def test_checks_candidates_against_all_constraints(self):
+        cheap = factory.make_Machine(
+            status=NODE_STATUS.READY, cpu_count=1, memory=1024
+        )
+        machine = factory.make_Machine(
+            status=NODE_STATUS.READY, cpu_count=8, memory=8192
+        )
+        inventory = MachineInventory()
+        inventory.enabled = True
+        found, _, _ = find_machine_for_acquisition(
+            self.make_form(),
+            Machine.objects.exclude(id=cheap.id),
+            inventory=inventory,
+        )
+        self.assertEqual(machine, found)
+
+    def test_falls_back_to_full_query_for_missing_machines(self):
+        inventory = MachineInventory()
+        inventory.enabled = True
+        inventory.get_machines()
+        # The inventory didn't get notified of the new machine yet.
+        machine = factory.make_Machine(status=NODE_STATUS.READY)
+        found, _, _ = find_machine_for_acquisition(
+            self.make_form(),
+            Machine.objects.filter(status=NODE_STATUS.READY),
+            inventory=inventory,
+        )
+        self.assertEqual(machine, found)
+
+    def test_returns_none_without_match(self):
+        inventory = MachineInventory()
+        inventory.enabled = True
+        found, storage, interfaces = find_machine_for_acquisition(
+            self.make_form(),
+            Machine.objects.filter(status=NODE_STATUS.READY),
+            inventory=inventory,
+        )
+        self.assertIsNone(found)
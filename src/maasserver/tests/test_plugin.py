@@ -113,8 +113,10 @@ class TestRegionWorkerServiceMaker(TestServiceMaker):
         self.assertIsInstance(service, MultiService)
         expected_services = {
             "database-tasks",
+            "machine-inventory",
             "postgres-listener-worker",
             "rpc",
+            "secret-cache-worker",
             "status-worker",
             "web",
             "ipc-worker",
@@ -146,8 +148,10 @@ class TestRegionWorkerServiceMaker(TestServiceMaker):
         self.assertIsInstance(service, MultiService)
         expected_services = {
             "database-tasks",
+            "machine-inventory",
             "postgres-listener-worker",
             "rpc",
+            "secret-cache-worker",
             "status-worker",
             "web",
             "ipc-worker",
@@ -242,6 +246,7 @@ class TestRegionMasterServiceMaker(TestServiceMaker):
             "networks-monitor",
             "reverse-dns",
             "reverse-proxy",
+            "secret-cache-master",
             "certificate-expiration-check",
             "ntp",
             "syslog",
@@ -347,8 +352,10 @@ class TestRegionAllInOneServiceMaker(TestServiceMaker):
         expected_services = {
             # Worker services.
             "database-tasks",
+            "machine-inventory",
             "postgres-listener-worker",
             "rpc",
+            "secret-cache-worker",
             "service-monitor",
             "status-worker",
             "version-check",
@@ -369,6 +376,7 @@ class TestRegionAllInOneServiceMaker(TestServiceMaker):
             "active-discovery",
             "reverse-dns",
             "reverse-proxy",
+            "secret-cache-master",
             "vault-secrets-cleanup",
             "certificate-expiration-check",
             "ntp",
@@ -97,6 +97,7 @@ from maasserver.third_party_drivers import DriversConfig
 from maasserver.utils.curtin import curtin_supports_webhook_events
 from maastesting.http import make_HttpRequest
 from maastesting.testcase import MAASTestCase
+from maastesting.utils import age_file
 from provisioningserver.utils.enum import map_enum
 
 
@@ -595,6 +596,39 @@ class TestLoadPreseedTemplate(MAASServerTestCase):
         template = load_preseed_template(node, prefix)
         self.assertEqual(master_content, template.substitute())
 
+    def test_load_preseed_template_shares_parsed_template(self):
+        prefix = factory.make_string()
+        self.create_template(self.location, prefix)
+        age_file(os.path.join(self.location, prefix), 10)
+        age_file(self.location, 10)
+        template1 = load_preseed_template(factory.make_Node(), prefix)
+        template2 = load_preseed_template(factory.make_Node(), prefix)
+        self.assertIsNot(template1, template2)
+        self.assertIs(template1._parsed, template2._parsed)
+        self.assertIsNot(template1.get_template, template2.get_template)
+
+    def test_load_preseed_template_reloads_changed_template(self):
+        prefix = factory.make_string()
+        self.create_template(self.location, prefix)
+        age_file(os.path.join(self.location, prefix), 10)
+        age_file(self.location, 10)
+        node = factory.make_Node()
+        load_preseed_template(node, prefix)
+        content = self.create_template(self.location, prefix)
+        template = load_preseed_template(node, prefix)
+        self.assertEqual(content, template.substitute())
+
+    def test_load_preseed_template_finds_new_template(self):
+        prefix = factory.make_string()
+        self.create_template(self.location, GENERIC_FILENAME)
+        age_file(os.path.join(self.location, GENERIC_FILENAME), 10)
+        age_file(self.location, 10)
+        node = factory.make_Node()
+        load_preseed_template(node, prefix)
+        content = self.create_template(self.location, prefix)
+        template = load_preseed_template(node, prefix)
+        self.assertEqual(content, template.substitute())
+
     def test_load_preseed_template_parent_lookup_doesnt_include_default(self):
         # The lookup for parent templates does not include the default
         # 'generic' file.
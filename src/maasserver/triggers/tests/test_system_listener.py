@@ -10,6 +10,7 @@ from django.db import connection as db_connection
 from django.utils import timezone
 from twisted.internet.defer import inlineCallbacks
 
+from maasserver.models import Secret
 from maasserver.models.signals.testing import SignalsDisabled
 from maasserver.testing.factory import factory
 from maasserver.testing.testcase import MAASTransactionServerTestCase
@@ -852,3 +853,59 @@ class TestRBACResourcePoolListener(
         self.assertEqual("resource-pool", change.resource_type)
         self.assertEqual(pool.id, change.resource_id)
         self.assertEqual(pool.name, change.resource_name)
+
+
+class TestSecretListener(
+    MAASTransactionServerTestCase, TransactionalHelpersMixin
+):
+    """End-to-end test for the secret triggers code."""
+
+    @transactional
+    def set_secret(self, path, value):
+        Secret.objects.update_or_create(path=path, defaults={"value": value})
+
+    @transactional
+    def delete_secret(self, path):
+        Secret.objects.filter(path=path).delete()
+
+    @inlineCallbacks
+    def capture_notification(self, func, *args):
+        dv = DeferredValue()
+        listener = self.make_listener_without_delay()
+        listener.register("sys_secret", lambda *args: dv.set(args))
+        yield listener.startService()
+        try:
+            yield deferToDatabase(func, *args)
+            notification = yield dv.get(timeout=2)
+        finally:
+            yield listener.stopService()
+        return notification
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_sends_message_for_secret_insert(self):
+        path = f"global/{factory.make_name('secret')}"
+        notification = yield self.capture_notification(
+            self.set_secret, path, {"a": 1}
+        )
+        self.assertEqual(("sys_secret", path), notification)
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_sends_message_for_secret_update(self):
+        path = f"global/{factory.make_name('secret')}"
+        yield deferToDatabase(self.set_secret, path, {"a": 1})
+        notification = yield self.capture_notification(
+            self.set_secret, path, {"a": 2}
+        )
+        self.assertEqual(("sys_secret", path), notification)
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_sends_message_for_secret_delete(self):
+        path = f"global/{factory.make_name('secret')}"
+        yield deferToDatabase(self.set_secret, path, {"a": 1})
+        notification = yield self.capture_notification(
+            self.delete_secret, path
+        )
+        self.assertEqual(("sys_secret", path), notification)
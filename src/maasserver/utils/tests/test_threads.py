@@ -4,11 +4,14 @@
 """Tests for `maasserver.utils.threads`."""
 
 import random
-from unittest.mock import sentinel
+import threading
+from unittest.mock import ANY, call, Mock, sentinel
 
 from django.db import connection
 from twisted.internet import reactor
 from twisted.internet.defer import DeferredSemaphore, inlineCallbacks
+from twisted.internet.task import Clock
+from twisted.python.failure import Failure
 
 from maasserver.testing.testcase import MAASServerTestCase
 from maasserver.utils import orm, threads
@@ -28,6 +31,7 @@ class TestMakeFunctions(MAASTestCase):
         self.assertIs(pool.context.contextFactory, orm.TotallyDisconnected)
         self.assertEqual(threads.max_threads_for_default_pool, pool.max)
         self.assertEqual(0, pool.min)
+        self.assertFalse(pool.adaptive)
 
     def test_make_default_pool_accepts_max_threads_setting(self):
         maxthreads = random.randint(1, 1000)
@@ -41,6 +45,7 @@ class TestMakeFunctions(MAASTestCase):
         self.assertIs(pool.context.contextFactory, orm.FullyConnected)
         self.assertEqual(threads.max_threads_for_database_pool, pool.max)
         self.assertEqual(0, pool.min)
+        self.assertTrue(pool.adaptive)
 
     def test_make_database_pool_accepts_max_threads_setting(self):
         maxthreads = random.randint(1, 1000)
@@ -63,6 +68,192 @@ class TestMakeFunctions(MAASTestCase):
         self.assertEqual(maxthreads, pool.lock.limit)
 
 
+class TestInstrumentedThreadPool(MAASTestCase):
+    def setUp(self):
+        super().setUp()
+        self.metrics = self.patch(threads, "PROMETHEUS_METRICS")
+
+    def run_tasks(self, pool, tasks):
+        """Queue `tasks` as (lane, func) tuples, then run them all.
+
+        :return: The (success, result) of each task, in the order they ran.
+        """
+        results = []
+        done = threading.Event()
+
+        def onResult(success, result):
+            results.append((success, result))
+            if len(results) == len(tasks):
+                done.set()
+
+        for priority, func in tasks:
+            with threads.lane(priority):
+                pool.callInThreadWithCallback(onResult, func)
+        pool.start()
+        self.addCleanup(pool.stop)
+        self.assertTrue(done.wait(10))
+        return results
+
+    def test_runs_tasks_by_lane(self):
+        pool = threads.InstrumentedThreadPool(0, 1, "test")
+        results = self.run_tasks(
+            pool,
+            [
+                (threads.Lane.DEFAULT, lambda: "default-1"),
+                (threads.Lane.DEFAULT, lambda: "default-2"),
+                (threads.Lane.BOOT, lambda: "boot"),
+            ],
+        )
+        self.assertEqual(
+            [(True, "boot"), (True, "default-1"), (True, "default-2")],
+            results,
+        )
+
+    def test_passes_failure_to_onResult(self):
+        def fail():
+            raise ZeroDivisionError()
+
+        pool = threads.InstrumentedThreadPool(0, 1, "test")
+        [(success, result)] = self.run_tasks(
+            pool, [(threads.Lane.DEFAULT, fail)]
+        )
+        self.assertFalse(success)
+        self.assertIsInstance(result, Failure)
+        self.assertIsInstance(result.value, ZeroDivisionError)
+
+    def test_passes_failure_entering_context_to_onResult(self):
+        entered = []
+
+        class FailsFirstTime:
+            def __enter__(self):
+                entered.append(self)
+                if len(entered) == 1:
+                    raise ZeroDivisionError()
+
+            def __exit__(self, *exc_info):
+                pass
+
+        pool = threads.InstrumentedThreadPool(
+            0, 1, "test", contextFactory=FailsFirstTime
+        )
+        [(success1, result1), (success2, result2)] = self.run_tasks(
+            pool,
+            [
+                (threads.Lane.DEFAULT, lambda: "first"),
+                (threads.Lane.DEFAULT, lambda: "second"),
+            ],
+        )
+        self.assertFalse(success1)
+        self.assertIsInstance(result1, Failure)
+        self.assertIsInstance(result1.value, ZeroDivisionError)
+        self.assertEqual((True, "second"), (success2, result2))
+
+    def test_reports_metrics(self):
+        def task():
+            return sentinel.result
+
+        pool = threads.InstrumentedThreadPool(0, 1, "test")
+        self.run_tasks(pool, [(threads.Lane.BOOT, task)])
+        self.metrics.update.assert_has_calls(
+            [
+                call(
+                    "maas_thread_pool_queue_depth",
+                    "set",
+                    value=1,
+                    labels={"pool": "test", "lane": "boot"},
+                ),
+                call(
+                    "maas_thread_pool_queue_depth",
+                    "set",
+                    value=0,
+                    labels={"pool": "test", "lane": "boot"},
+                ),
+                call(
+                    "maas_thread_pool_busy_threads",
+                    "set",
+                    value=1,
+                    labels={"pool": "test"},
+                ),
+                call(
+                    "maas_thread_pool_saturation",
+                    "set",
+                    value=1.0,
+                    labels={"pool": "test"},
+                ),
+                call(
+                    "maas_thread_pool_wait_time",
+                    "observe",
+                    value=ANY,
+                    labels={"pool": "test", "lane": "boot"},
+                ),
+                call(
+                    "maas_thread_pool_busy_threads",
+                    "set",
+                    value=0,
+                    labels={"pool": "test"},
+                ),
+                call(
+                    "maas_thread_pool_saturation",
+                    "set",
+                    value=0.0,
+                    labels={"pool": "test"},
+                ),
+                call(
+                    "maas_thread_pool_run_time",
+                    "observe",
+                    value=ANY,
+                    labels={
+                        "pool": "test",
+                        "caller": f"{__name__}.{task.__qualname__}",
+                    },
+                ),
+            ]
+        )
+
+    def make_pool_with_workers(self, minthreads, idle, busy, peak):
+        pool = threads.InstrumentedThreadPool(minthreads, 10, "test")
+        pool._team = Mock()
+        pool._team.statistics.return_value = Mock(
+            idleWorkerCount=idle, busyWorkerCount=busy
+        )
+        pool._busy = busy
+        pool._peak = peak
+        return pool
+
+    def test_adapt_stops_workers_not_needed(self):
+        pool = self.make_pool_with_workers(0, idle=3, busy=1, peak=2)
+        pool.adapt()
+        pool._team.shrink.assert_called_once_with(2)
+        self.assertEqual(1, pool._peak)
+
+    def test_adapt_keeps_min_workers(self):
+        pool = self.make_pool_with_workers(4, idle=3, busy=1, peak=1)
+        pool.adapt()
+        pool._team.shrink.assert_not_called()
+
+    def test_adapt_stops_only_idle_workers(self):
+        pool = self.make_pool_with_workers(0, idle=1, busy=3, peak=0)
+        pool.adapt()
+        pool._team.shrink.assert_called_once_with(1)
+
+    def test_adaptive_pool_adapts_periodically(self):
+        clock = Clock()
+        pool = threads.InstrumentedThreadPool(
+            0, 1, "test", adaptive=True, interval=10, clock=clock
+        )
+        adapt = self.patch(pool, "adapt")
+        pool.start()
+        self.addCleanup(pool.stop)
+        adapt.assert_not_called()
+        clock.advance(10)
+        adapt.assert_called_once_with()
+
+    def test_lane_is_reset_on_exit(self):
+        with threads.lane(threads.Lane.BOOT):
+            self.assertIs(threads.Lane.BOOT, threads._current_lane.get())
+        self.assertIs(threads.Lane.DEFAULT, threads._current_lane.get())
+
+
 class TestInstallFunctions(MAASTestCase):
     """Tests for the `install_*` functions."""
 
@@ -12,23 +12,38 @@ pools to limit the number of connections each `regiond` process will consume.
 __all__ = [
     "callOutToDatabase",
     "deferToDatabase",
+    "InstrumentedThreadPool",
     "install_database_pool",
     "install_database_unpool",
     "install_default_pool",
+    "Lane",
+    "lane",
     "make_database_pool",
     "make_default_pool",
 ]
 
+from collections import deque
+from contextlib import contextmanager
+import contextvars
+from enum import IntEnum
+import threading
+import time
+
 from django.conf import settings
 from twisted.internet import reactor, threads
 from twisted.internet.defer import DeferredSemaphore
+from twisted.internet.task import LoopingCall
+from twisted.python import context, threadpool
+from twisted.python.failure import Failure
 
+from maascommon.tracing import get_or_set_trace_id
 from maasserver.utils.orm import (
     count_queries,
     FullyConnected,
     TotallyDisconnected,
 )
 from provisioningserver.logger import LegacyLogger
+from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
 from provisioningserver.utils.twisted import (
     asynchronous,
     FOREVER,
@@ -49,6 +64,221 @@ max_threads_for_default_pool = 50
 # PostgreSQL connection (default is 100 connections).
 max_threads_for_database_pool = 9
 
+# How often, in seconds, an adaptive pool stops the workers that were not
+# needed since the last check.
+adaptive_pool_interval = 30
+
+
+class Lane(IntEnum):
+    """Priority lanes for thread-pool tasks, most urgent first."""
+
+    # Calls that nodes are waiting on while booting, e.g. `GetBootConfig`.
+    BOOT = 0
+    DEFAULT = 1
+
+
+_current_lane = contextvars.ContextVar(
+    "thread_pool_lane", default=Lane.DEFAULT
+)
+
+
+@contextmanager
+def lane(priority):
+    """Queue the tasks scheduled in this context in the `priority` lane."""
+    token = _current_lane.set(priority)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+def _get_caller_name(func):
+    # `ThreadUnpool.wrapFuncInContext` and `functools.partial` both keep the
+    # wrapped function in `func`.
+    func = getattr(func, "func", func)
+    name = getattr(func, "__qualname__", None) or type(func).__qualname__
+    module = getattr(func, "__module__", None)
+    return name if module is None else f"{module}.{name}"
+
+
+class _Task:
+    __slots__ = (
+        "onResult",
+        "func",
+        "args",
+        "kwargs",
+        "lane",
+        "context",
+        "twisted_context",
+        "queued_at",
+    )
+
+    def __init__(self, onResult, func, args, kwargs, priority):
+        self.onResult = onResult
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.lane = priority
+        # Like `ThreadPool.callInThreadWithCallback`, run the task in the
+        # context it was scheduled from.
+        self.context = contextvars.copy_context()
+        tracker = context.theContextTracker
+        self.twisted_context = tracker.currentContext().contexts[-1]
+        self.queued_at = time.monotonic()
+
+
+class InstrumentedThreadPool(ThreadPool):
+    """Thread-pool that runs tasks by priority and reports its usage.
+
+    Tasks are queued in the lane that is current when they're scheduled (see
+    `lane`), and each worker runs the oldest task of the most urgent lane.
+    The queue depth, the time spent waiting for a worker, the time spent
+    running each caller and the share of busy workers are reported to
+    Prometheus.
+
+    Workers are started on demand, up to `maxthreads`. When `adaptive` is
+    set, the idle workers that were not needed in the last `interval` seconds
+    are also stopped, down to `minthreads`, releasing their resources, e.g.
+    their database connections.
+    """
+
+    def __init__(
+        self,
+        minthreads=5,
+        maxthreads=20,
+        name=None,
+        contextFactory=None,
+        adaptive=False,
+        interval=adaptive_pool_interval,
+        clock=None,
+    ):
+        super().__init__(minthreads, maxthreads, name, contextFactory)
+        self.adaptive = adaptive
+        self.interval = interval
+        self.clock = reactor if clock is None else clock
+        self._lock = threading.Lock()
+        self._queues = {priority: deque() for priority in Lane}
+        self._busy = 0
+        self._peak = 0
+        self._adapter = None
+
+    def start(self):
+        super().start()
+        if self.adaptive and self._adapter is None:
+            self._adapter = LoopingCall(self.adapt)
+            self._adapter.clock = self.clock
+            self._adapter.start(self.interval, now=False)
+
+    def stop(self):
+        if self._adapter is not None:
+            self._adapter.stop()
+            self._adapter = None
+        super().stop()
+
+    def adapt(self):
+        """Stop the idle workers not needed since the last call."""
+        with self._lock:
+            needed, self._peak = max(self.min, self._peak), self._busy
+        idle = self._team.statistics().idleWorkerCount
+        surplus = min(idle, self.workers - needed)
+        if surplus > 0:
+            self._team.shrink(surplus)
+
+    def callInThreadWithCallback(self, onResult, func, *args, **kwargs):
+        """See :class:`twisted.python.threadpool.ThreadPool`.
+
+        The task is queued in the current lane, and the pool is asked to
+        run the next task in priority order.
+        """
+        if self.joined:
+            return
+        # The task keeps the trace ID, see `ThreadPool`.
+        get_or_set_trace_id()
+        task = _Task(onResult, func, args, kwargs, _current_lane.get())
+        with self._lock:
+            queue = self._queues[task.lane]
+            queue.append(task)
+            depth = len(queue)
+        self._reportQueueDepth(task.lane, depth)
+        # `ThreadPool` would enter the worker context before `_runNext` is
+        # called and only log a failure to do so, leaving the task queued and
+        # its caller waiting. `_runNext` enters it instead, once it has taken
+        # the task off the queue.
+        threadpool.ThreadPool.callInThreadWithCallback(
+            self, None, self._runNext
+        )
+
+    def _runNext(self):
+        # There is one call to this for each queued task, so there is always
+        # a task to run.
+        with self._lock:
+            queue = next(queue for queue in self._queues.values() if queue)
+            task = queue.popleft()
+            depth = len(queue)
+            self._busy += 1
+            self._peak = max(self._peak, self._busy)
+            busy = self._busy
+        started_at = time.monotonic()
+        self._reportQueueDepth(task.lane, depth)
+        self._reportBusy(busy)
+        PROMETHEUS_METRICS.update(
+            "maas_thread_pool_wait_time",
+            "observe",
+            value=started_at - task.queued_at,
+            labels={"pool": self.name, "lane": task.lane.name.lower()},
+        )
+        try:
+            self.context.enter()
+            result = task.context.run(
+                context.call,
+                task.twisted_context,
+                task.func,
+                *task.args,
+                **task.kwargs,
+            )
+        except BaseException:
+            result, ok = Failure(), False
+        else:
+            ok = True
+        finally:
+            with self._lock:
+                self._busy -= 1
+                busy = self._busy
+            self._reportBusy(busy)
+            PROMETHEUS_METRICS.update(
+                "maas_thread_pool_run_time",
+                "observe",
+                value=time.monotonic() - started_at,
+                labels={
+                    "pool": self.name,
+                    "caller": _get_caller_name(task.func),
+                },
+            )
+        if task.onResult is not None:
+            task.onResult(ok, result)
+        elif not ok:
+            log.err(result, "Failure when calling out to thread.")
+
+    def _reportQueueDepth(self, priority, depth):
+        PROMETHEUS_METRICS.update(
+            "maas_thread_pool_queue_depth",
+            "set",
+            value=depth,
+            labels={"pool": self.name, "lane": priority.name.lower()},
+        )
+
+    def _reportBusy(self, busy):
+        labels = {"pool": self.name}
+        PROMETHEUS_METRICS.update(
+            "maas_thread_pool_busy_threads", "set", value=busy, labels=labels
+        )
+        PROMETHEUS_METRICS.update(
+            "maas_thread_pool_saturation",
+            "set",
+            value=busy / self.max if self.max else 1.0,
+            labels=labels,
+        )
+
 
 def make_default_pool(maxthreads=max_threads_for_default_pool):
     """Create a general thread-pool for non-database activity.
@@ -56,7 +286,9 @@ def make_default_pool(maxthreads=max_threads_for_default_pool):
     Its sole consumer is the old-school web application, i.e. the plain HTTP
     service. All threads are fully connected to the database.
     """
-    return ThreadPool(0, maxthreads, "default", TotallyDisconnected)
+    return InstrumentedThreadPool(
+        0, maxthreads, "default", TotallyDisconnected
+    )
 
 
 def make_database_pool(maxthreads=max_threads_for_database_pool):
@@ -64,9 +296,12 @@ def make_database_pool(maxthreads=max_threads_for_database_pool):
 
     Its consumer are the old-school web application, i.e. the plain HTTP and
     HTTP API services, and the WebSocket service, for the responsive web UI.
-    All threads are fully connected to the database.
+    All threads are fully connected to the database. The pool is adaptive,
+    so that idle workers don't hold on to database connections.
     """
-    return ThreadPool(0, maxthreads, "database", FullyConnected)
+    return InstrumentedThreadPool(
+        0, maxthreads, "database", FullyConnected, adaptive=True
+    )
 
 
 def make_database_unpool(maxthreads=max_threads_for_database_pool):
@@ -198,6 +198,11 @@ class Handler(metaclass=HandlerMetaclass):
         # correct notifications based on what items the client has.
         if "loaded_pks" not in self.cache:
             self.cache["loaded_pks"] = set()
+        # Set by `WebSocketFactory.onNotify` to a dict shared by all the
+        # handlers built for a single notification, so that the object is
+        # only loaded and dehydrated once per user rather than once per
+        # connected client.
+        self.notify_cache = None
 
     def full_dehydrate(self, obj, for_list: bool = False) -> dict:
         """Convert the given object into a dictionary.
@@ -335,12 +340,31 @@ class Handler(metaclass=HandlerMetaclass):
         return obj
 
     def _get_object(self, params: dict, permission=None):
-        """Get object by using the `pk` in `params`."""
+        """Get object by using the `pk` in `params`.
+
+        While processing a notification, the object is shared through
+        `notify_cache` with the other handlers of the same user.
+        """
         if self._meta.pk not in params:
             raise HandlerValidationError(
                 {self._meta.pk: ["This field is required"]}
             )
         pk = params[self._meta.pk]
+        if self.notify_cache is None:
+            return self._load_object(pk, permission)
+        key = ("object", self.user.id, pk, permission)
+        if key not in self.notify_cache:
+            try:
+                cached = (self._load_object(pk, permission), None)
+            except (HandlerDoesNotExistError, HandlerPermissionError) as e:
+                cached = (None, e)
+            self.notify_cache[key] = cached
+        obj, error = self.notify_cache[key]
+        if error is not None:
+            raise error
+        return obj
+
+    def _load_object(self, pk, permission=None):
         try:
             obj = self.get_queryset(for_list=False).get(**{self._meta.pk: pk})
         except self._meta.object_class.DoesNotExist:
@@ -860,10 +884,7 @@ class Handler(metaclass=HandlerMetaclass):
                 return None
 
         self.user.refresh_from_db()
-        try:
-            obj = self.listen(channel, action, pk)
-        except HandlerDoesNotExistError:
-            obj = None
+        obj = self.listen_for_notify(channel, action, pk)
         if action == "create" and obj is not None:
             if pk in self.cache["loaded_pks"]:
                 # The user already knows about this node, so its not a create
@@ -904,7 +925,7 @@ class Handler(metaclass=HandlerMetaclass):
             return (
                 self._meta.handler_name,
                 action,
-                self.full_dehydrate(obj, for_list=False),
+                self.dehydrate_for_notify(obj, pk, for_list=False),
             )
         else:
             # Not active so only send the data like it was comming from
@@ -912,8 +933,31 @@ class Handler(metaclass=HandlerMetaclass):
             return (
                 self._meta.handler_name,
                 action,
-                self.full_dehydrate(obj, for_list=True),
+                self.dehydrate_for_notify(obj, pk, for_list=True),
+            )
+
+    def listen_for_notify(self, channel, action, pk):
+        """Return the object for `pk` as seen by this client, or None.
+
+        `listen` is called for each handler, since it can depend on the
+        state of the client, but the object it loads is shared through
+        `notify_cache` with the other handlers of the same user.
+        """
+        try:
+            return self.listen(channel, action, pk)
+        except HandlerDoesNotExistError:
+            return None
+
+    def dehydrate_for_notify(self, obj, pk, for_list=False):
+        """Return `full_dehydrate` of `obj`, shared through `notify_cache`."""
+        if self.notify_cache is None:
+            return self.full_dehydrate(obj, for_list=for_list)
+        key = ("dehydrate", self.user.id, pk, for_list)
+        if key not in self.notify_cache:
+            self.notify_cache[key] = self.full_dehydrate(
+                obj, for_list=for_list
             )
+        return self.notify_cache[key]
 
     def listen(self, channel, action, pk):
         """Called when the handler listens for events on channels with
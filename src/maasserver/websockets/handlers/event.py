@@ -91,10 +91,7 @@ class EventHandler(TimestampedModelHandler):
         # Only care about create everything else is ignored.
         if action != "create":
             return None
-        try:
-            obj = self.listen(channel, action, pk)
-        except HandlerDoesNotExistError:
-            return None
+        obj = self.listen_for_notify(channel, action, pk)
         if obj is None:
             return None
         if obj.node_id not in self.cache["node_ids"]:
@@ -105,5 +102,5 @@ class EventHandler(TimestampedModelHandler):
         return (
             self._meta.handler_name,
             action,
-            self.full_dehydrate(obj, for_list=True),
+            self.dehydrate_for_notify(obj, pk, for_list=True),
         )
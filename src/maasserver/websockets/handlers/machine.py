@@ -11,13 +11,9 @@ from operator import itemgetter
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db.models import (
     Case,
-    CharField,
-    Count,
     F,
-    IntegerField,
     OuterRef,
     Subquery,
-    Sum,
     TextField,
     Value,
     When,
@@ -129,18 +125,11 @@ class MachineHandler(NodeHandler):
                 "partitiontable_set__partitions"
             )
         )
-        node_total_storage_query_set = (
-            Machine.objects.select_related("current_config")
-            .annotate(
-                storage=Sum(
-                    "current_config__blockdevice__physicalblockdevice__size"
-                )
-            )
-            .filter(pk=OuterRef("pk"))
-        )
         list_queryset = (
             Machine.objects.all()
-            .select_related("owner", "zone", "domain", "bmc", "current_config")
+            .select_related(
+                "owner", "zone", "domain", "bmc", "current_config", "summary"
+            )
             .prefetch_related(
                 "current_config__blockdevice_set__physicalblockdevice__"
                 "partitiontable_set__partitions"
@@ -182,48 +171,28 @@ class MachineHandler(NodeHandler):
                     )
                     .values("message")[:1]
                 ),
-                physical_disk_count=Count(
-                    "current_config__blockdevice__physicalblockdevice",
-                    distinct=True,
-                ),
-                total_storage=Subquery(
-                    node_total_storage_query_set.values("storage"),
-                    output_field=IntegerField(),
-                ),
+                physical_disk_count=F("summary__physical_disk_count"),
+                total_storage=F("summary__storage"),
                 pxe_mac=F("boot_interface__mac_address"),
-                fabric_name=F("boot_interface__vlan__fabric__name"),
-                node_fqdn=Concat(
-                    "hostname",
-                    Value("."),
-                    "domain__name",
-                    output_field=CharField(),
-                ),
+                fabric_name=F("summary__boot_fabric_name"),
+                node_fqdn=F("summary__fqdn"),
                 simple_status=_build_simple_status_q(),
             )
         )
 
         use_sqlalchemy_list = (
             Machine.objects.all()
-            .select_related("owner", "zone", "domain", "bmc", "current_config")
+            .select_related(
+                "owner", "zone", "domain", "bmc", "current_config", "summary"
+            )
             .prefetch_related("pool")
             .prefetch_related("current_config__interface_set")
             .annotate(
-                physical_disk_count=Count(
-                    "current_config__blockdevice__physicalblockdevice",
-                    distinct=True,
-                ),
-                total_storage=Subquery(
-                    node_total_storage_query_set.values("storage"),
-                    output_field=IntegerField(),
-                ),
+                physical_disk_count=F("summary__physical_disk_count"),
+                total_storage=F("summary__storage"),
                 pxe_mac=F("boot_interface__mac_address"),
-                fabric_name=F("boot_interface__vlan__fabric__name"),
-                node_fqdn=Concat(
-                    "hostname",
-                    Value("."),
-                    "domain__name",
-                    output_field=CharField(),
-                ),
+                fabric_name=F("summary__boot_fabric_name"),
+                node_fqdn=F("summary__fqdn"),
                 simple_status=_build_simple_status_q(),
             )
         )
@@ -375,6 +344,18 @@ class MachineHandler(NodeHandler):
             ),
         )
 
+    def _get_group_expr(self, key):
+        """Get grouping expression for key, from the machine summary."""
+        if key == "pool":
+            return "summary__pool_name"
+        elif key == "domain":
+            return "summary__domain_name"
+        elif key == "zone":
+            return "summary__zone_name"
+        elif key == "owner":
+            return "summary__owner"
+        return super()._get_group_expr(key)
+
     def dehydrate(self, obj, data, for_list=False):
         """Add extra fields to `data`."""
         data = super().dehydrate(obj, data, for_list=for_list)
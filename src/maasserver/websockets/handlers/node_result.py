@@ -277,10 +277,7 @@ class NodeResultHandler(TimestampedModelHandler):
 
     def on_listen(self, channel, action, pk):
         """Called by the protocol when a channel notification occurs."""
-        try:
-            obj = self.listen(channel, action, pk)
-        except HandlerDoesNotExistError:
-            return None
+        obj = self.listen_for_notify(channel, action, pk)
         if obj is None:
             return None
         if obj.script_set.node.system_id not in self.cache["system_ids"]:
@@ -291,5 +288,5 @@ class NodeResultHandler(TimestampedModelHandler):
         return (
             self._meta.handler_name,
             action,
-            self.full_dehydrate(obj, for_list=True),
+            self.dehydrate_for_notify(obj, pk, for_list=True),
         )
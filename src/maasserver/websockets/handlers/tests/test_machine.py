@@ -814,6 +814,23 @@ class TestMachineHandler(MAASServerTestCase):
         self.assertEqual(ret["commissioning_status"]["passed"], num_scripts)
         self.assertEqual(ret["testing_status"]["passed"], num_scripts)
 
+    def test_on_listen_shares_notify_cache_between_clients(self):
+        owner = factory.make_User()
+        node = factory.make_Machine(owner=owner)
+        loading = MachineHandler(owner, {}, None)
+        loading.cache["loaded_pks"].add(node.system_id)
+        # The same user in another tab, without the machine loaded.
+        other = MachineHandler(owner, {}, None)
+        notify_cache = {}
+        loading.notify_cache = other.notify_cache = notify_cache
+        self.assertIsNone(other.on_listen("machine", "update", node.system_id))
+        name, action, data = loading.on_listen(
+            "machine", "update", node.system_id
+        )
+        self.assertEqual(("machine", "update"), (name, action))
+        self.assertEqual(node.system_id, data["system_id"])
+        self.assertNotIn(node.system_id, other.cache["loaded_pks"])
+
     def test_dehydrate_owner_empty_when_None(self):
         owner = factory.make_User()
         handler = MachineHandler(owner, {}, None)
@@ -456,18 +456,36 @@ class WebSocketFactory(Factory):
 
     @inlineCallbacks
     def onNotify(self, handler_class, channel, action, obj_id):
-        for client in self.clients:
-            handler = client.buildHandler(handler_class)
-            data = yield deferToDatabase(
-                self.processNotify, handler, channel, action, obj_id
-            )
-            if data is not None:
+        clients = list(self.clients)
+        if not clients:
+            return
+        notifications = yield deferToDatabase(
+            self.processNotify, handler_class, clients, channel, action, obj_id
+        )
+        for client, data in notifications:
+            # The client might have gone away while the notification was
+            # being processed.
+            if data is not None and client in self.clients:
                 (name, client_action, data) = data
                 client.sendNotify(name, client_action, data)
 
     @transactional
-    def processNotify(self, handler, channel, action, obj_id):
-        return handler.on_listen(channel, action, obj_id)
+    def processNotify(self, handler_class, clients, channel, action, obj_id):
+        """Process a notification for all `clients` in a single transaction.
+
+        The handlers built for each client share a `notify_cache`, so the
+        object is loaded and dehydrated once per user; the per-client state
+        (loaded and active pks) is still applied by each handler.
+        """
+        notify_cache = {}
+        notifications = []
+        for client in clients:
+            handler = client.buildHandler(handler_class)
+            handler.notify_cache = notify_cache
+            notifications.append(
+                (client, handler.on_listen(channel, action, obj_id))
+            )
+        return notifications
 
     def registerRPCEvents(self):
         """Register for connected and disconnected events from the RPC
@@ -1004,6 +1004,64 @@ class TestHandler(MAASServerTestCase, FakeNodesHandlerMixin):
         )
         mock_dehydrate.assert_called_once_with(node, for_list=False)
 
+    def test_on_listen_shares_object_and_dehydrate_via_notify_cache(self):
+        node = factory.make_Node()
+        handler = self.make_nodes_handler()
+        other_handler = type(handler)(handler.user, {}, handler.request)
+        notify_cache = {}
+        handler.notify_cache = other_handler.notify_cache = notify_cache
+        mock_load = self.patch(type(handler), "_load_object")
+        mock_load.return_value = node
+        mock_dehydrate = self.patch(type(handler), "full_dehydrate")
+        mock_dehydrate.return_value = sentinel.data
+        for each in (handler, other_handler):
+            self.assertEqual(
+                each.on_listen(sentinel.channel, "update", node.system_id),
+                (handler._meta.handler_name, "create", sentinel.data),
+            )
+            self.assertIn(node.system_id, each.cache["loaded_pks"])
+        mock_load.assert_called_once()
+        mock_dehydrate.assert_called_once()
+
+    def test_on_listen_calls_listen_for_each_handler(self):
+        node = factory.make_Node()
+        handler = self.make_nodes_handler()
+        other_handler = type(handler)(handler.user, {}, handler.request)
+        notify_cache = {}
+        handler.notify_cache = other_handler.notify_cache = notify_cache
+        mock_listen = self.patch(type(handler), "listen")
+        mock_listen.return_value = None
+        handler.on_listen(sentinel.channel, "update", node.system_id)
+        other_handler.on_listen(sentinel.channel, "update", node.system_id)
+        self.assertEqual(2, mock_listen.call_count)
+
+    def test_on_listen_shares_missing_object_via_notify_cache(self):
+        handler = self.make_nodes_handler()
+        other_handler = type(handler)(handler.user, {}, handler.request)
+        notify_cache = {}
+        handler.notify_cache = other_handler.notify_cache = notify_cache
+        mock_load = self.patch(type(handler), "_load_object")
+        mock_load.side_effect = HandlerDoesNotExistError()
+        for each in (handler, other_handler):
+            self.assertIsNone(
+                each.on_listen(sentinel.channel, "update", sentinel.pk)
+            )
+        mock_load.assert_called_once()
+
+    def test_on_listen_does_not_share_notify_cache_between_users(self):
+        node = factory.make_Node()
+        handler = self.make_nodes_handler()
+        other_user = factory.make_User()
+        other_handler = type(handler)(other_user, {}, handler.request)
+        notify_cache = {}
+        handler.notify_cache = other_handler.notify_cache = notify_cache
+        mock_load = self.patch(type(handler), "_load_object")
+        mock_load.return_value = node
+        self.patch(type(handler), "full_dehydrate")
+        handler.on_listen(sentinel.channel, "update", node.system_id)
+        other_handler.on_listen(sentinel.channel, "update", node.system_id)
+        self.assertEqual(2, mock_load.call_count)
+
     def test_listen_calls_get_object_with_pk_on_other_actions(self):
         handler = self.make_nodes_handler()
         mock_get_object = self.patch(handler, "get_object")
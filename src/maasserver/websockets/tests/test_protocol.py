@@ -909,6 +909,51 @@ class TestWebSocketFactoryTransactional(
         )
         mock_sendNotify.assert_called_with(name, action, data)
 
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_onNotify_shares_notify_cache_between_clients(self):
+        user = yield deferToDatabase(self.make_user)
+        protocol, factory = self.make_protocol_with_factory(user=user)
+        other_protocol = factory.buildProtocol(None)
+        other_protocol.transport = MagicMock()
+        other_protocol.user = user
+        factory.clients.append(other_protocol)
+        self.addCleanup(lambda: other_protocol.connectionLost(""))
+        notify_caches = []
+
+        class FakeHandler(Handler):
+            class Meta:
+                handler_name = maas_factory.make_name("handler")
+
+            def on_listen(self, channel, action, pk):
+                notify_caches.append(self.notify_cache)
+                return None
+
+        yield factory.onNotify(
+            FakeHandler, sentinel.channel, sentinel.action, sentinel.obj_id
+        )
+        self.assertEqual(2, len(notify_caches))
+        self.assertIsNotNone(notify_caches[0])
+        self.assertIs(notify_caches[0], notify_caches[1])
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_onNotify_skips_clients_gone_while_processing(self):
+        user = yield deferToDatabase(self.make_user)
+        protocol, factory = self.make_protocol_with_factory(user=user)
+        mock_class = MagicMock()
+
+        def on_listen(channel, action, obj_id):
+            factory.clients.remove(protocol)
+            return (sentinel.name, action, sentinel.data)
+
+        mock_class.return_value.on_listen.side_effect = on_listen
+        mock_sendNotify = self.patch(protocol, "sendNotify")
+        yield factory.onNotify(
+            mock_class, sentinel.channel, sentinel.action, sentinel.obj_id
+        )
+        mock_sendNotify.assert_not_called()
+
     @wait_for_reactor
     @inlineCallbacks
     def test_updateRackController_calls_onNotify_for_controller_update(self):
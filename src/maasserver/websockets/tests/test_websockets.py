@@ -158,6 +158,32 @@ class TestFrameHelpers(MAASTestCase):
         self.assertEqual(len(frames), 0)
         self.assertEqual(frame, [b"\x81\x827\xfa"])
 
+    def test_parseMaskedTextInChunks(self):
+        """
+        L{_parseFrames} handles a masked frame split over several chunks,
+        keeping the chunks as they are until the frame is complete.
+        """
+        frame = [b"\x81", b"\x857\xfa", b"!=\x7f\x9f"]
+        frames = list(_parseFrames(frame))
+        self.assertEqual(len(frames), 0)
+        self.assertEqual(frame, [b"\x81", b"\x857\xfa", b"!=\x7f\x9f"])
+        frame.append(b"MQX\x81")
+        frames = list(_parseFrames(frame))
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(frames[0], (CONTROLS.TEXT, b"Hello", True))
+        self.assertEqual(frame, [b"\x81"])
+
+    def test_parseMaskedHugeText(self):
+        """
+        L{_parseFrames} unmasks frames longer than 64 kB.
+        """
+        key = b"\x37\xfa\x21\x3d"
+        text = b"Hello" * 20000
+        frame = [_makeFrame(text, CONTROLS.TEXT, True, mask=key)]
+        frames = list(_parseFrames(frame))
+        self.assertEqual(frames, [(CONTROLS.TEXT, text, True)])
+        self.assertEqual(frame, [])
+
     def test_parseUnmaskedTextFragments(self):
         """
         Fragmented masked packets are handled.
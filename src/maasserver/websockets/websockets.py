@@ -26,7 +26,6 @@ __all__ = [
 import base64
 from enum import IntEnum
 from hashlib import sha1
-from itertools import cycle
 from struct import pack, unpack
 from typing import List, Sequence
 
@@ -109,16 +108,29 @@ def _mask(buf: bytes, key: bytes) -> bytes:
     """
     Mask or unmask a buffer of bytes with a masking key.
 
+    The whole buffer is XORed at once as a single integer, rather than byte
+    by byte, since client payloads can be large.
+
     @type buf: C{bytes}
-    @param buf: A buffer of bytes.
+    @param buf: A buffer of bytes, or any object supporting the buffer
+        protocol, such as a C{memoryview}.
 
     @type key: C{bytes}
     @param key: The masking key. Must be exactly four bytes.
 
-    @rtype: C{str}
+    @rtype: C{bytes}
     @return: A masked buffer of bytes.
     """
-    return bytes((b ^ k) for b, k in zip(buf, cycle(key), strict=False))
+    length = len(buf)
+    if length == 0:
+        return b""
+    repeats, remainder = divmod(length, 4)
+    key = bytes(key)
+    keystream = key * repeats + key[:remainder]
+    masked = int.from_bytes(buf, "little") ^ int.from_bytes(
+        keystream, "little"
+    )
+    return masked.to_bytes(length, "little")
 
 
 def _makeFrame(buf: bytes, opcode, fin: bool, mask: bytes = None) -> bytes:
@@ -174,90 +186,147 @@ def _makeFrame(buf: bytes, opcode, fin: bool, mask: bytes = None) -> bytes:
     return frame
 
 
-def _parseFrames(frameBuffer: List[bytes], needMask: bool = True):
+# The largest possible frame header: 2 bytes of flags and length, 8 bytes of
+# extended length and 4 bytes of masking key.
+_MAX_HEADER_LENGTH = 14
+
+
+def _parseHeader(payload, start: int, needMask: bool):
     """
-    Parse frames in a highly compliant manner. It modifies C{frameBuffer}
-    removing the parsed content from it.
+    Parse the header of the frame starting at C{start} in C{payload}.
 
-    @param frameBuffer: A buffer of bytes.
-    @type frameBuffer: C{list}
+    @param payload: A buffer of bytes, or a C{memoryview} of one.
+
+    @param start: The offset of the frame in C{payload}.
+    @type start: C{int}
 
     @param needMask: If C{True}, refuse any frame which is not masked.
     @type needMask: C{bool}
+
+    @return: A C{(opcode, fin, key, offset, length)} tuple, where C{key} is
+        C{None} for unmasked frames, C{offset} is the size of the header and
+        C{length} the size of the frame data; or C{None} if C{payload} doesn't
+        contain the whole header yet.
     """
-    start = 0
-    payload = b"".join(frameBuffer)
+    available = len(payload) - start
 
-    while True:
-        # If there's not at least two bytes in the buffer, bail.
-        if len(payload) - start < 2:
-            break
+    # If there's not at least two bytes in the buffer, bail.
+    if available < 2:
+        return None
 
-        # Grab the header. This single byte holds some flags and an opcode
-        header = payload[start]
-        if header & 0x70:
-            # At least one of the reserved flags is set. Pork chop sandwiches!
-            raise _WSException("Reserved flag in frame (%d)" % (header,))
+    # Grab the header. This single byte holds some flags and an opcode
+    header = payload[start]
+    if header & 0x70:
+        # At least one of the reserved flags is set. Pork chop sandwiches!
+        raise _WSException("Reserved flag in frame (%d)" % (header,))
 
-        fin = header & 0x80
+    fin = header & 0x80
 
-        # Get the opcode, and translate it to a local enum which we actually
-        # care about.
-        opcode = header & 0xF
-        try:
-            opcode = CONTROLS(opcode)
-        except ValueError:
-            raise _WSException("Unknown opcode %d in frame" % opcode)  # noqa: B904
+    # Get the opcode, and translate it to a local enum which we actually
+    # care about.
+    opcode = header & 0xF
+    try:
+        opcode = CONTROLS(opcode)
+    except ValueError:
+        raise _WSException("Unknown opcode %d in frame" % opcode)  # noqa: B904
 
-        # Get the payload length and determine whether we need to look for an
-        # extra length.
-        length = payload[start + 1]
-        masked = length & 0x80
+    # Get the payload length and determine whether we need to look for an
+    # extra length.
+    length = payload[start + 1]
+    masked = length & 0x80
 
-        if not masked and needMask:
-            # The client must mask the data sent
-            raise _WSException("Received data not masked")
+    if not masked and needMask:
+        # The client must mask the data sent
+        raise _WSException("Received data not masked")
 
-        length &= 0x7F
+    length &= 0x7F
 
-        # The offset we'll be using to walk through the frame. We use this
-        # because the offset is variable depending on the length and mask.
-        offset = 2
+    # The offset we'll be using to walk through the frame. We use this
+    # because the offset is variable depending on the length and mask.
+    offset = 2
 
-        # Extra length fields.
-        if length == 0x7E:
-            if len(payload) - start < 4:
-                break
+    # Extra length fields.
+    if length == 0x7E:
+        if available < 4:
+            return None
 
-            length = payload[start + 2 : start + 4]
-            length = unpack(">H", length)[0]
-            offset += 2
-        elif length == 0x7F:
-            if len(payload) - start < 10:
-                break
+        length = unpack(">H", payload[start + 2 : start + 4])[0]
+        offset += 2
+    elif length == 0x7F:
+        if available < 10:
+            return None
+
+        # Protocol bug: The top bit of this long long *must* be cleared;
+        # that is, it is expected to be interpreted as signed.
+        length = unpack(">Q", payload[start + 2 : start + 10])[0]
+        offset += 8
+
+    key = None
+    if masked:
+        if available - offset < 4:
+            # This is not strictly necessary, but it's more explicit so
+            # that we don't create an invalid key.
+            return None
+
+        key = payload[start + offset : start + offset + 4]
+        offset += 4
 
-            # Protocol bug: The top bit of this long long *must* be cleared;
-            # that is, it is expected to be interpreted as signed.
-            length = payload[start + 2 : start + 10]
-            length = unpack(">Q", length)[0]
-            offset += 8
+    return opcode, bool(fin), key, offset, length
 
-        if masked:
-            if len(payload) - (start + offset) < 4:
-                # This is not strictly necessary, but it's more explicit so
-                # that we don't create an invalid key.
+
+def _parseFrames(frameBuffer: List[bytes], needMask: bool = True):
+    """
+    Parse frames in a highly compliant manner. It modifies C{frameBuffer}
+    removing the parsed content from it.
+
+    When C{frameBuffer} holds several chunks, they are only joined once the
+    first frame is complete, so that a large frame arriving over many reads
+    isn't copied again on every read. Frame data is sliced out of a
+    C{memoryview} of the buffer.
+
+    @param frameBuffer: A buffer of bytes.
+    @type frameBuffer: C{list}
+
+    @param needMask: If C{True}, refuse any frame which is not masked.
+    @type needMask: C{bool}
+    """
+    if not frameBuffer:
+        return
+
+    if len(frameBuffer) > 1:
+        head = b""
+        for chunk in frameBuffer:
+            head += chunk[: _MAX_HEADER_LENGTH - len(head)]
+            if len(head) == _MAX_HEADER_LENGTH:
                 break
+        parsed = _parseHeader(head, 0, needMask)
+        if parsed is None:
+            return
+        _, _, _, offset, length = parsed
+        if sum(len(chunk) for chunk in frameBuffer) < offset + length:
+            return
+        payload = b"".join(frameBuffer)
+    else:
+        payload = frameBuffer[0]
 
-            key = payload[start + offset : start + offset + 4]
-            offset += 4
+    view = memoryview(payload)
+    start = 0
 
-        if len(payload) - (start + offset) < length:
+    while True:
+        parsed = _parseHeader(view, start, needMask)
+        if parsed is None:
             break
 
-        data = payload[start + offset : start + offset + length]
+        opcode, fin, key, offset, length = parsed
+        if len(view) - (start + offset) < length:
+            break
 
-        if masked:
+        data = view[start + offset : start + offset + length]
+
+        if key is not None:
             data = _mask(data, key)
+        else:
+            data = bytes(data)
 
         if opcode == CONTROLS.CLOSE:
             if len(data) >= 2:
@@ -268,10 +337,12 @@ def _parseFrames(frameBuffer: List[bytes], needMask: bool = True):
                 # No reason given; use generic data.
                 data = STATUSES.NONE, b""
 
-        yield opcode, data, bool(fin)
+        yield opcode, data, fin
         start += offset + length
 
-    if len(payload) > start:
+    if start == 0:
+        frameBuffer[:] = [payload]
+    elif len(payload) > start:
         frameBuffer[:] = [payload[start:]]
     else:
         frameBuffer[:] = []
@@ -22,8 +22,8 @@ class Context:
         self._start_timestamp = time.time()
         self._end_timestamp = None
         self._connection = connection
-        # A placeholder ATM. This is the place where all the services can append the post commits hooks to be executed after
-        # the transaction has been committed.
+        # This is the place where all the services can append the post commits hooks to be executed after the transaction
+        # has been committed. The API server runs them, see TransactionMiddleware.
         self._post_commit_hooks = []
 
     def set_connection(self, connection: AsyncConnection | Connection):
@@ -6,7 +6,7 @@ import json
 
 from pydantic_core import to_jsonable_python
 from sqlalchemy import URL
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 
 @dataclass
@@ -16,6 +16,13 @@ class DatabaseConfig:
     username: str | None = None
     password: str | None = None
     port: int | None = None
+    pool_size: int = 3
+    pool_max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_pre_ping: bool = False
+    # An optional read replica, with the same database and credentials.
+    replica_host: str | None = None
+    replica_port: int | None = None
 
     @property
     def dsn(self) -> URL:
@@ -28,6 +35,14 @@ class DatabaseConfig:
             password=self.password,
         )
 
+    @property
+    def replica_dsn(self) -> URL | None:
+        if not self.replica_host:
+            return None
+        return self.dsn.set(
+            host=self.replica_host, port=self.replica_port or self.port
+        )
+
 
 def custom_json_serializer(obj, *args, **kwargs):
     return json.dumps(to_jsonable_python(obj), *args, **kwargs)
@@ -36,12 +51,32 @@ def custom_json_serializer(obj, *args, **kwargs):
 class Database:
     def __init__(self, config: DatabaseConfig, echo: bool = False):
         self.config = config
-        self.engine = create_async_engine(
-            config.dsn,
+        self.engine = self._create_engine(
+            config.dsn, echo, isolation_level="REPEATABLE READ"
+        )
+        # Shares the pool of `engine`, for transactions that only need each
+        # query to see the data committed before it.
+        self.read_engine = self.engine.execution_options(
+            isolation_level="READ COMMITTED"
+        )
+        self.replica_engine = None
+        if (replica_dsn := config.replica_dsn) is not None:
+            self.replica_engine = self._create_engine(
+                replica_dsn,
+                echo,
+                isolation_level="READ COMMITTED",
+                execution_options={"postgresql_readonly": True},
+            )
+
+    def _create_engine(self, dsn: URL, echo: bool, **kwargs) -> AsyncEngine:
+        return create_async_engine(
+            dsn,
             echo=echo,
-            isolation_level="REPEATABLE READ",
-            # Limit the connection pool size to 3 for the time being.
-            pool_size=3,
+            pool_size=self.config.pool_size,
+            max_overflow=self.config.pool_max_overflow,
+            pool_timeout=self.config.pool_timeout,
+            pool_pre_ping=self.config.pool_pre_ping,
             # Custom json serializer to handle pydantic models
             json_serializer=custom_json_serializer,
+            **kwargs,
         )
@@ -0,0 +1,46 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Create the table caching the XML output of script results
+
+Revision ID: 0038
+Revises: 0037
+Create Date: 2026-10-16 00:00:00.000000+00:00
+
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0038"
+down_revision: str | None = "0037"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # SQLAlchemy has no type for the PostgreSQL `xml` type, so the table is
+    # created with plain SQL.
+    #
+    # `updated` is the `updated` timestamp of the script result the document
+    # was decoded from; the entry is stale once they differ. `document` is
+    # NULL when the output is not a well-formed XML document.
+    op.execute(
+        """
+        CREATE TABLE maasserver_scriptresultxml (
+            script_result_id bigint NOT NULL PRIMARY KEY
+                REFERENCES maasserver_scriptresult(id)
+                ON DELETE CASCADE
+                DEFERRABLE INITIALLY DEFERRED,
+            updated timestamp with time zone NOT NULL,
+            document xml NULL
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    # we don't support migration downgrade
+    pass
@@ -0,0 +1,68 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Register triggers notifying secret changes
+
+Revision ID: 0039
+Revises: 0038
+Create Date: 2026-10-16 00:00:00.000000+00:00
+
+"""
+
+from textwrap import dedent
+from typing import Sequence
+
+from alembic import op
+
+from maasservicelayer.db.alembic.triggers import (
+    register_procedure,
+    register_trigger,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "0039"
+down_revision: str | None = "0038"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def render_sys_secret_procedure(proc_name, on_delete=False):
+    """Render a database procedure with name `proc_name` that notifies the
+    path of a secret that changed.
+
+    Region processes cache secrets, and drop the entry for the path when
+    they receive the notification.
+
+    :param proc_name: Name of the procedure.
+    :param on_delete: True when procedure will be used as a delete trigger.
+    """
+    entry = "OLD" if on_delete else "NEW"
+    return dedent(
+        f"""\
+        CREATE OR REPLACE FUNCTION {proc_name}() RETURNS trigger AS $$
+        BEGIN
+          PERFORM pg_notify('sys_secret', {entry}.path);
+          RETURN {entry};
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def upgrade() -> None:
+    register_procedure(op, render_sys_secret_procedure("sys_secret_insert"))
+    register_procedure(op, render_sys_secret_procedure("sys_secret_update"))
+    register_procedure(
+        op, render_sys_secret_procedure("sys_secret_delete", on_delete=True)
+    )
+    # Secrets are stored in maasserver_secret, or in Vault with their path
+    # tracked in maasserver_vaultsecret.
+    for table in ("maasserver_secret", "maasserver_vaultsecret"):
+        register_trigger(op, table, "sys_secret_insert", "insert")
+        register_trigger(op, table, "sys_secret_update", "update")
+        register_trigger(op, table, "sys_secret_delete", "delete")
+
+
+def downgrade() -> None:
+    # we don't support migration downgrade
+    pass
@@ -0,0 +1,56 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Make neighbours without a VID unique per interface, MAC and IP
+
+Revision ID: 0040
+Revises: 0039
+Create Date: 2026-10-16 00:00:00.000000+00:00
+
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0040"
+down_revision: str | None = "0039"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # The unique constraint didn't apply to untagged neighbours, since NULL
+    # VIDs are distinct from each other, so duplicates might exist. Keep the
+    # most recent one.
+    op.execute(
+        """
+        DELETE FROM maasserver_neighbour AS duplicate
+        USING maasserver_neighbour AS neighbour
+        WHERE duplicate.vid IS NULL
+          AND neighbour.vid IS NULL
+          AND duplicate.interface_id = neighbour.interface_id
+          AND duplicate.mac_address = neighbour.mac_address
+          AND duplicate.ip = neighbour.ip
+          AND duplicate.id < neighbour.id
+        """
+    )
+    # The index replaces the constraint, and is the conflict target used to
+    # record neighbours in bulk.
+    op.drop_constraint(
+        "maasserver_neighbour_interface_id_vid_mac_add_a35f7098_uniq",
+        "maasserver_neighbour",
+    )
+    op.execute(
+        """
+        CREATE UNIQUE INDEX maasserver_neighbour_interface_vid_mac_ip_uniq
+        ON maasserver_neighbour
+        USING btree (interface_id, COALESCE(vid, -1), mac_address, ip)
+        """
+    )
+
+
+def downgrade() -> None:
+    # we don't support migration downgrade
+    pass
@@ -0,0 +1,583 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Create the machine summary table, kept current by triggers
+
+Revision ID: 0041
+Revises: 0040
+Create Date: 2026-10-17 00:00:00.000000+00:00
+
+"""
+
+from textwrap import dedent, indent
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from maasservicelayer.db.alembic.triggers import register_procedure
+
+# revision identifiers, used by Alembic.
+revision: str = "0041"
+down_revision: str | None = "0040"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SUMMARY_COLUMNS = (
+    "fqdn",
+    "domain_name",
+    "pool_name",
+    "zone_name",
+    "owner",
+    "parent",
+    "power_type",
+    "tags",
+    "physical_disk_count",
+    "storage",
+    "fabrics",
+    "spaces",
+    "extra_macs",
+    "pxe_mac",
+    "boot_vlan_id",
+    "boot_vlan_name",
+    "boot_fabric_id",
+    "boot_fabric_name",
+)
+
+UPSERT_COLUMNS = ",\n        ".join(
+    f"{column} = EXCLUDED.{column}" for column in SUMMARY_COLUMNS
+)
+UPSERT_CHANGED = "\n        OR ".join(
+    f"summary.{column} IS DISTINCT FROM EXCLUDED.{column}"
+    for column in SUMMARY_COLUMNS
+)
+
+# Recompute the summary of the given nodes. Rows are upserted, rather than
+# deleted and inserted again, so that concurrent refreshes of the same node
+# don't conflict. Rows that don't change aren't written either, so that they
+# don't cause serialization failures in concurrent transactions. Nodes that
+# aren't machines (NODE_TYPE.MACHINE is 0), or don't exist anymore, are
+# removed from the summary.
+machinesummary_refresh = dedent(
+    f"""\
+    CREATE OR REPLACE FUNCTION machinesummary_refresh(node_ids bigint[])
+    RETURNS void AS $$
+    BEGIN
+      INSERT INTO maasserver_machinesummary AS summary (
+        node_id, {", ".join(SUMMARY_COLUMNS)}
+      )
+      SELECT
+        node.id,
+        concat(node.hostname, '.', domain.name),
+        domain.name,
+        pool.name,
+        zone.name,
+        owner.username,
+        parent.system_id,
+        bmc.power_type,
+        coalesce(tags.ids, '{{}}'),
+        storage.disk_count,
+        storage.size,
+        coalesce(vlans.fabrics, '{{}}'),
+        coalesce(vlans.spaces, '{{}}'),
+        coalesce(extra_macs.macs, '{{}}'),
+        CASE
+          WHEN node.boot_interface_id IS NOT NULL
+          THEN boot_interface.mac_address
+          ELSE interfaces.first_mac
+        END,
+        boot_vlan.id,
+        boot_vlan.name,
+        boot_fabric.id,
+        boot_fabric.name
+      FROM maasserver_node AS node
+      LEFT JOIN maasserver_domain AS domain ON domain.id = node.domain_id
+      LEFT JOIN maasserver_resourcepool AS pool ON pool.id = node.pool_id
+      LEFT JOIN maasserver_zone AS zone ON zone.id = node.zone_id
+      LEFT JOIN auth_user AS owner ON owner.id = node.owner_id
+      LEFT JOIN maasserver_node AS parent ON parent.id = node.parent_id
+      LEFT JOIN maasserver_bmc AS bmc ON bmc.id = node.bmc_id
+      LEFT JOIN maasserver_interface AS boot_interface
+        ON boot_interface.id = node.boot_interface_id
+      LEFT JOIN maasserver_vlan AS boot_vlan
+        ON boot_vlan.id = boot_interface.vlan_id
+      LEFT JOIN maasserver_fabric AS boot_fabric
+        ON boot_fabric.id = boot_vlan.fabric_id
+      LEFT JOIN LATERAL (
+        SELECT array_agg(node_tag.tag_id ORDER BY node_tag.tag_id) AS ids
+        FROM maasserver_node_tags AS node_tag
+        WHERE node_tag.node_id = node.id
+      ) AS tags ON true
+      LEFT JOIN LATERAL (
+        SELECT count(*) AS disk_count, sum(device.size) AS size
+        FROM maasserver_physicalblockdevice AS physical
+        JOIN maasserver_blockdevice AS device
+          ON device.id = physical.blockdevice_ptr_id
+        WHERE device.node_config_id = node.current_config_id
+      ) AS storage ON true
+      LEFT JOIN LATERAL (
+        SELECT
+          min(interface.id) AS first_id,
+          min(interface.mac_address) AS first_mac
+        FROM maasserver_interface AS interface
+        WHERE interface.node_config_id = node.current_config_id
+      ) AS interfaces ON true
+      LEFT JOIN LATERAL (
+        SELECT array_agg(DISTINCT interface.mac_address) AS macs
+        FROM maasserver_interface AS interface
+        WHERE interface.node_config_id = node.current_config_id
+          AND interface.type = 'physical'
+          AND interface.id != coalesce(
+            node.boot_interface_id, interfaces.first_id
+          )
+      ) AS extra_macs ON true
+      LEFT JOIN LATERAL (
+        SELECT
+          array_agg(DISTINCT fabric.name) AS fabrics,
+          array_agg(DISTINCT space.name) FILTER (
+            WHERE space.id IS NOT NULL
+          ) AS spaces
+        FROM maasserver_vlan AS vlan
+        JOIN maasserver_fabric AS fabric ON fabric.id = vlan.fabric_id
+        LEFT JOIN maasserver_space AS space ON space.id = vlan.space_id
+        WHERE vlan.id IN (
+          SELECT interface.vlan_id
+          FROM maasserver_interface AS interface
+          WHERE interface.node_config_id = node.current_config_id
+          UNION
+          SELECT subnet.vlan_id
+          FROM maasserver_interface AS interface
+          JOIN maasserver_interface_ip_addresses AS link
+            ON link.interface_id = interface.id
+          JOIN maasserver_staticipaddress AS ip
+            ON ip.id = link.staticipaddress_id
+          JOIN maasserver_subnet AS subnet ON subnet.id = ip.subnet_id
+          WHERE interface.node_config_id = node.current_config_id
+        )
+      ) AS vlans ON true
+      WHERE node.id = ANY(node_ids) AND node.node_type = 0
+      ON CONFLICT (node_id) DO UPDATE SET
+        {UPSERT_COLUMNS}
+      WHERE
+        {UPSERT_CHANGED};
+
+      DELETE FROM maasserver_machinesummary AS summary
+      WHERE summary.node_id = ANY(node_ids)
+        AND NOT EXISTS (
+          SELECT 1 FROM maasserver_node AS node
+          WHERE node.id = summary.node_id AND node.node_type = 0
+        );
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+)
+
+# The nodes with an interface on one of the VLANs, or an IP address in one of
+# their subnets.
+machinesummary_vlan_nodes = dedent(
+    """\
+    CREATE OR REPLACE FUNCTION machinesummary_vlan_nodes(vlan_ids bigint[])
+    RETURNS SETOF bigint AS $$
+      SELECT config.node_id
+      FROM maasserver_interface AS interface
+      JOIN maasserver_nodeconfig AS config
+        ON config.id = interface.node_config_id
+      WHERE interface.vlan_id = ANY(vlan_ids)
+      UNION
+      SELECT config.node_id
+      FROM maasserver_subnet AS subnet
+      JOIN maasserver_staticipaddress AS ip ON ip.subnet_id = subnet.id
+      JOIN maasserver_interface_ip_addresses AS link
+        ON link.staticipaddress_id = ip.id
+      JOIN maasserver_interface AS interface
+        ON interface.id = link.interface_id
+      JOIN maasserver_nodeconfig AS config
+        ON config.id = interface.node_config_id
+      WHERE subnet.vlan_id = ANY(vlan_ids)
+    $$ LANGUAGE sql STABLE;
+    """
+)
+
+INTERFACE_NODE = """
+    SELECT config.node_id
+    FROM maasserver_interface AS interface
+    JOIN maasserver_nodeconfig AS config
+      ON config.id = interface.node_config_id
+    WHERE interface.id = entry.interface_id
+"""
+
+# (table, procedure, event, fields, query returning the IDs of the nodes to
+# refresh). The query is run for each row changed by the statement, which is
+# `entry`. For updates, `entry` is the new row and `previous` the old one, and
+# only the rows where one of `fields` changed are considered.
+MACHINESUMMARY_TRIGGERS = (
+    (
+        "maasserver_node",
+        "machinesummary_node_insert",
+        "insert",
+        None,
+        "SELECT entry.id",
+    ),
+    (
+        "maasserver_node",
+        "machinesummary_node_update",
+        "update",
+        [
+            "hostname",
+            "domain_id",
+            "pool_id",
+            "zone_id",
+            "owner_id",
+            "parent_id",
+            "bmc_id",
+            "boot_interface_id",
+            "current_config_id",
+            "node_type",
+        ],
+        "SELECT entry.id",
+    ),
+    (
+        "maasserver_domain",
+        "machinesummary_domain_update",
+        "update",
+        ["name"],
+        "SELECT id FROM maasserver_node WHERE domain_id = entry.id",
+    ),
+    (
+        "maasserver_resourcepool",
+        "machinesummary_resourcepool_update",
+        "update",
+        ["name"],
+        "SELECT id FROM maasserver_node WHERE pool_id = entry.id",
+    ),
+    (
+        "maasserver_zone",
+        "machinesummary_zone_update",
+        "update",
+        ["name"],
+        "SELECT id FROM maasserver_node WHERE zone_id = entry.id",
+    ),
+    (
+        "auth_user",
+        "machinesummary_user_update",
+        "update",
+        ["username"],
+        "SELECT id FROM maasserver_node WHERE owner_id = entry.id",
+    ),
+    (
+        "maasserver_bmc",
+        "machinesummary_bmc_update",
+        "update",
+        ["power_type"],
+        "SELECT id FROM maasserver_node WHERE bmc_id = entry.id",
+    ),
+    (
+        "maasserver_node_tags",
+        "machinesummary_nodetag_insert",
+        "insert",
+        None,
+        "SELECT entry.node_id",
+    ),
+    (
+        "maasserver_node_tags",
+        "machinesummary_nodetag_delete",
+        "delete",
+        None,
+        "SELECT entry.node_id",
+    ),
+    # A physical block device is inserted after its block device, and is
+    # deleted with it.
+    (
+        "maasserver_physicalblockdevice",
+        "machinesummary_physblockdevice_insert",
+        "insert",
+        None,
+        """
+        SELECT config.node_id
+        FROM maasserver_blockdevice AS device
+        JOIN maasserver_nodeconfig AS config
+          ON config.id = device.node_config_id
+        WHERE device.id = entry.blockdevice_ptr_id
+        """,
+    ),
+    (
+        "maasserver_blockdevice",
+        "machinesummary_blockdevice_update",
+        "update",
+        ["size", "node_config_id"],
+        """
+        SELECT node_id FROM maasserver_nodeconfig
+        WHERE id IN (entry.node_config_id, previous.node_config_id)
+        """,
+    ),
+    (
+        "maasserver_blockdevice",
+        "machinesummary_blockdevice_delete",
+        "delete",
+        None,
+        """
+        SELECT node_id FROM maasserver_nodeconfig
+        WHERE id = entry.node_config_id
+        """,
+    ),
+    (
+        "maasserver_interface",
+        "machinesummary_interface_insert",
+        "insert",
+        None,
+        """
+        SELECT node_id FROM maasserver_nodeconfig
+        WHERE id = entry.node_config_id
+        """,
+    ),
+    (
+        "maasserver_interface",
+        "machinesummary_interface_update",
+        "update",
+        ["vlan_id", "mac_address", "type", "node_config_id"],
+        """
+        SELECT node_id FROM maasserver_nodeconfig
+        WHERE id IN (entry.node_config_id, previous.node_config_id)
+        """,
+    ),
+    (
+        "maasserver_interface",
+        "machinesummary_interface_delete",
+        "delete",
+        None,
+        """
+        SELECT node_id FROM maasserver_nodeconfig
+        WHERE id = entry.node_config_id
+        """,
+    ),
+    (
+        "maasserver_interface_ip_addresses",
+        "machinesummary_interfaceip_insert",
+        "insert",
+        None,
+        INTERFACE_NODE,
+    ),
+    (
+        "maasserver_interface_ip_addresses",
+        "machinesummary_interfaceip_delete",
+        "delete",
+        None,
+        INTERFACE_NODE,
+    ),
+    (
+        "maasserver_staticipaddress",
+        "machinesummary_staticipaddress_update",
+        "update",
+        ["subnet_id"],
+        """
+        SELECT config.node_id
+        FROM maasserver_interface_ip_addresses AS link
+        JOIN maasserver_interface AS interface
+          ON interface.id = link.interface_id
+        JOIN maasserver_nodeconfig AS config
+          ON config.id = interface.node_config_id
+        WHERE link.staticipaddress_id = entry.id
+        """,
+    ),
+    (
+        "maasserver_subnet",
+        "machinesummary_subnet_update",
+        "update",
+        ["vlan_id"],
+        """
+        SELECT config.node_id
+        FROM maasserver_staticipaddress AS ip
+        JOIN maasserver_interface_ip_addresses AS link
+          ON link.staticipaddress_id = ip.id
+        JOIN maasserver_interface AS interface
+          ON interface.id = link.interface_id
+        JOIN maasserver_nodeconfig AS config
+          ON config.id = interface.node_config_id
+        WHERE ip.subnet_id = entry.id
+        """,
+    ),
+    (
+        "maasserver_vlan",
+        "machinesummary_vlan_update",
+        "update",
+        ["name", "fabric_id", "space_id"],
+        "SELECT machinesummary_vlan_nodes(ARRAY[entry.id])",
+    ),
+    (
+        "maasserver_fabric",
+        "machinesummary_fabric_update",
+        "update",
+        ["name"],
+        """
+        SELECT machinesummary_vlan_nodes(
+          ARRAY(SELECT id FROM maasserver_vlan WHERE fabric_id = entry.id)
+        )
+        """,
+    ),
+    (
+        "maasserver_space",
+        "machinesummary_space_update",
+        "update",
+        ["name"],
+        """
+        SELECT machinesummary_vlan_nodes(
+          ARRAY(SELECT id FROM maasserver_vlan WHERE space_id = entry.id)
+        )
+        """,
+    ),
+)
+
+
+def render_machinesummary_procedure(proc_name, event, fields, node_ids):
+    """Render a database procedure with name `proc_name` that refreshes the
+    summary of the machines returned by the `node_ids` query.
+
+    The procedure is run once per statement, and refreshes the machines for
+    all the changed rows at once, which it finds in the `new_rows` and
+    `old_rows` transition tables.
+
+    :param proc_name: Name of the procedure.
+    :param event: The event the procedure is used for.
+    :param fields: For updates, the fields that affect the summary.
+    :param node_ids: Query returning the IDs of the nodes to refresh.
+    """
+    where = ""
+    if event == "insert":
+        rows = "new_rows AS entry"
+    elif event == "delete":
+        rows = "old_rows AS entry"
+    else:
+        rows = (
+            "new_rows AS entry\n"
+            "    JOIN old_rows AS previous ON previous.id = entry.id"
+        )
+        where = "\n    WHERE " + "\n      OR ".join(
+            f"entry.{field} IS DISTINCT FROM previous.{field}"
+            for field in fields
+        )
+    node_ids = indent(dedent(node_ids).strip(), " " * 6)
+    return dedent(
+        """\
+        CREATE OR REPLACE FUNCTION {proc_name}() RETURNS trigger AS $$
+        DECLARE
+          node_ids bigint[];
+        BEGIN
+          node_ids := ARRAY(
+            SELECT DISTINCT node.id
+            FROM {rows}
+            CROSS JOIN LATERAL (
+        {node_ids}
+            ) AS node(id){where}
+          );
+          IF cardinality(node_ids) > 0 THEN
+            PERFORM machinesummary_refresh(node_ids);
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    ).format(proc_name=proc_name, rows=rows, node_ids=node_ids, where=where)
+
+
+def register_machinesummary_trigger(op, table, proc_name, event):
+    """(Re-)create the statement-level trigger calling `proc_name` on `table`.
+
+    The trigger is named like the ones of `register_trigger`.
+    """
+    trigger_name = f"{table.removeprefix('maasserver_')}_{proc_name}"
+    transition_tables = {
+        "insert": "NEW TABLE AS new_rows",
+        "update": "NEW TABLE AS new_rows OLD TABLE AS old_rows",
+        "delete": "OLD TABLE AS old_rows",
+    }[event]
+    register_procedure(
+        op,
+        dedent(
+            f"""\
+            DROP TRIGGER IF EXISTS {trigger_name} ON {table};
+            CREATE TRIGGER {trigger_name}
+            AFTER {event.upper()} ON {table}
+            REFERENCING {transition_tables}
+            FOR EACH STATEMENT
+            EXECUTE PROCEDURE {proc_name}();
+            """
+        ),
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "maasserver_machinesummary",
+        sa.Column(
+            "node_id",
+            sa.BigInteger(),
+            sa.ForeignKey(
+                "maasserver_node.id",
+                deferrable=True,
+                initially="DEFERRED",
+                ondelete="CASCADE",
+            ),
+            nullable=False,
+        ),
+        sa.Column("fqdn", sa.Text(), nullable=False),
+        sa.Column("domain_name", sa.String(length=256), nullable=True),
+        sa.Column("pool_name", sa.String(length=256), nullable=True),
+        sa.Column("zone_name", sa.String(length=256), nullable=True),
+        sa.Column("owner", sa.String(length=150), nullable=True),
+        sa.Column("parent", sa.String(length=41), nullable=True),
+        sa.Column("power_type", sa.String(length=10), nullable=True),
+        sa.Column("tags", postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column("physical_disk_count", sa.Integer(), nullable=False),
+        sa.Column("storage", sa.BigInteger(), nullable=True),
+        sa.Column("fabrics", postgresql.ARRAY(sa.Text()), nullable=False),
+        sa.Column("spaces", postgresql.ARRAY(sa.Text()), nullable=False),
+        sa.Column("extra_macs", postgresql.ARRAY(sa.Text()), nullable=False),
+        sa.Column("pxe_mac", sa.Text(), nullable=True),
+        sa.Column("boot_vlan_id", sa.BigInteger(), nullable=True),
+        sa.Column("boot_vlan_name", sa.String(length=256), nullable=True),
+        sa.Column("boot_fabric_id", sa.Integer(), nullable=True),
+        sa.Column("boot_fabric_name", sa.String(length=256), nullable=True),
+        sa.PrimaryKeyConstraint("node_id"),
+    )
+    # The keys the machine listing is sorted and grouped by.
+    for column in (
+        "fqdn",
+        "domain_name",
+        "pool_name",
+        "zone_name",
+        "owner",
+        "physical_disk_count",
+        "storage",
+        "boot_fabric_name",
+    ):
+        op.create_index(
+            f"maasserver_machinesummary_{column}_idx",
+            "maasserver_machinesummary",
+            [column],
+            unique=False,
+        )
+
+    register_procedure(op, machinesummary_refresh)
+    register_procedure(op, machinesummary_vlan_nodes)
+    for table, proc_name, event, fields, node_ids in MACHINESUMMARY_TRIGGERS:
+        register_procedure(
+            op,
+            render_machinesummary_procedure(
+                proc_name, event, fields, node_ids
+            ),
+        )
+        register_machinesummary_trigger(op, table, proc_name, event)
+
+    op.execute(
+        """
+        SELECT machinesummary_refresh(
+          ARRAY(SELECT id FROM maasserver_node WHERE node_type = 0)
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    # we don't support migration downgrade
+    pass
@@ -0,0 +1,61 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Register a trigger notifying OpenFGA tuple changes
+
+Revision ID: 0042
+Revises: 0041
+Create Date: 2026-10-17 00:00:00.000000+00:00
+
+"""
+
+from textwrap import dedent
+from typing import Sequence
+
+from alembic import op
+
+from maasservicelayer.db.alembic.triggers import register_procedure
+
+# revision identifiers, used by Alembic.
+revision: str = "0042"
+down_revision: str | None = "0041"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # The API server caches OpenFGA decisions and drops them all when it
+    # receives the notification, so one per statement is enough. Postgres
+    # delivers it only once the transaction has been committed.
+    register_procedure(
+        op,
+        dedent(
+            """\
+            CREATE OR REPLACE FUNCTION openfga_tuple_notify()
+            RETURNS trigger AS $$
+            BEGIN
+              PERFORM pg_notify('openfga_tuple', '');
+              RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        ),
+    )
+    register_procedure(
+        op,
+        dedent(
+            """\
+            DROP TRIGGER IF EXISTS tuple_openfga_tuple_notify
+            ON openfga.tuple;
+            CREATE TRIGGER tuple_openfga_tuple_notify
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON openfga.tuple
+            FOR EACH STATEMENT
+            EXECUTE PROCEDURE openfga_tuple_notify();
+            """
+        ),
+    )
+
+
+def downgrade() -> None:
+    # we don't support migration downgrade
+    pass
@@ -38,11 +38,13 @@ from maasservicelayer.exceptions.constants import (
     UNIQUE_CONSTRAINT_VIOLATION_TYPE,
 )
 from maasservicelayer.models.base import (
+    CursorListResult,
     ListResult,
     MaasBaseModel,
     MaasTimestampedBaseModel,
     ResourceBuilder,
 )
+from maasservicelayer.utils.cursor import decode_cursor, encode_cursor
 from maasservicelayer.utils.date import utcnow
 
 
@@ -208,15 +210,23 @@ class ReadOnlyRepository(Repository, Generic[T]):
         result = (await self.execute_stmt(stmt)).all()
         return [self.get_model_factory()(**row._asdict()) for row in result]
 
-    async def list(
-        self, page: int, size: int, query: QuerySpec | None = None
-    ) -> ListResult[T]:
+    def total_statement(self, query: QuerySpec | None = None) -> Select[Any]:
+        """
+        The statement counting the resources matched by `query`, used by the list methods.
+        """
         total_stmt = select(count()).select_from(self.get_repository_table())
         if query:
             # Don't apply the order by clause in the total_stmt
             where_query = QuerySpec(where=query.where)
             total_stmt = where_query.enrich_stmt(total_stmt)
-        total = (await self.execute_stmt(total_stmt)).scalar_one()
+        return total_stmt
+
+    async def list(
+        self, page: int, size: int, query: QuerySpec | None = None
+    ) -> ListResult[T]:
+        total = (
+            await self.execute_stmt(self.total_statement(query))
+        ).scalar_one()
 
         stmt = (
             self.select_all_statement()
@@ -235,6 +245,50 @@ class ReadOnlyRepository(Repository, Generic[T]):
             total=total,
         )
 
+    async def list_by_cursor(
+        self,
+        size: int,
+        token: str | None = None,
+        query: QuerySpec | None = None,
+        with_total: bool = False,
+    ) -> CursorListResult[T]:
+        """
+        Keyset pagination: fetch the `size` resources following the one encoded in `token`, ordered by id descending.
+
+        Unlike `list`, the cost of a page doesn't depend on how deep it is, since the query seeks on the primary key
+        instead of skipping rows with OFFSET, and the total is only counted if `with_total` is set. The order by clause of
+        `query`, if any, is ignored as the token only records the position in the id order.
+        """
+        table = self.get_repository_table()
+        where_query = QuerySpec(where=query.where) if query else QuerySpec()
+
+        stmt = (
+            self.select_all_statement()
+            .order_by(desc(table.c.id))
+            # Fetch an extra row to know whether there is a next page.
+            .limit(size + 1)
+        )
+        if token:
+            stmt = stmt.where(table.c.id < decode_cursor(token, "id", int))
+        stmt = where_query.enrich_stmt(stmt)
+
+        result = (await self.execute_stmt(stmt)).all()
+        items = [
+            self.get_model_factory()(**row._asdict()) for row in result[:size]
+        ]
+        next_token = None
+        if len(result) > size:
+            next_token = encode_cursor("id", items[-1].id)
+
+        total = None
+        if with_total:
+            total = (
+                await self.execute_stmt(self.total_statement(where_query))
+            ).scalar_one()
+        return CursorListResult[T](
+            items=items, next_token=next_token, total=total
+        )
+
     async def list_all(self, query: QuerySpec | None = None) -> List[T]:
         # Please, prefer not to use this method. It's here just as a utility for v2 endpoints that need to use the service layer.
         stmt = self.select_all_statement().order_by(
@@ -3,7 +3,7 @@
 
 from typing import Type
 
-from sqlalchemy import delete, insert, select, Table
+from sqlalchemy import delete, insert, select, Table, tuple_
 from sqlalchemy.sql.operators import eq
 
 from maascommon.enums.ipaddress import IpAddressType
@@ -72,6 +72,40 @@ class DNSResourceRepository(BaseRepository[DNSResource]):
         result = (await self.execute_stmt(stmt)).all()
         return [DNSResource(**row._asdict()) for row in result]
 
+    async def get_dnsresources_in_domain_for_ips(
+        self, domain: Domain, staticipaddress_ids: list[int]
+    ) -> list[tuple[DNSResource, int]]:
+        """Same as `get_dnsresources_in_domain_for_ip` for many IPs.
+
+        Returns a (DNS resource, IP id) pair for each link between them.
+        """
+        stmt = (
+            select(
+                DNSResourceTable,
+                DNSResourceIPAddressTable.c.staticipaddress_id,
+            )
+            .select_from(DNSResourceTable)
+            .join(
+                DNSResourceIPAddressTable,
+                DNSResourceIPAddressTable.c.dnsresource_id
+                == DNSResourceTable.c.id,
+            )
+            .filter(
+                DNSResourceTable.c.domain_id == domain.id,
+                DNSResourceIPAddressTable.c.staticipaddress_id.in_(
+                    staticipaddress_ids
+                ),
+            )
+        )
+
+        result = (await self.execute_stmt(stmt)).all()
+        links = []
+        for row in result:
+            res = row._asdict()
+            staticipaddress_id = res.pop("staticipaddress_id")
+            links.append((DNSResource(**res), staticipaddress_id))
+        return links
+
     async def get_ips_for_dnsresource(
         self,
         dnsrr_id: int,
@@ -117,6 +151,18 @@ class DNSResourceRepository(BaseRepository[DNSResource]):
         )
         await self.execute_stmt(remove_relation_stmt)
 
+    async def remove_ip_relations(
+        self, relations: list[tuple[int, int]]
+    ) -> None:
+        """Remove the (DNS resource id, IP id) `relations`."""
+        stmt = delete(DNSResourceIPAddressTable).where(
+            tuple_(
+                DNSResourceIPAddressTable.c.dnsresource_id,
+                DNSResourceIPAddressTable.c.staticipaddress_id,
+            ).in_(relations)
+        )
+        await self.execute_stmt(stmt)
+
     async def link_ip(self, dnsrr_id: int, ip_id: int) -> None:
         stmt = insert(DNSResourceIPAddressTable).values(
             dnsresource_id=dnsrr_id, staticipaddress_id=ip_id
@@ -178,6 +224,40 @@ class DNSResourceRepository(BaseRepository[DNSResource]):
         result = (await self.execute_stmt(stmt)).all()
         return [DNSResource(**row._asdict()) for row in result]
 
+    async def unlink_ips_from_all_dnsresources(
+        self, staticipaddress_ids: list[int]
+    ) -> None:
+        """Remove all DNS resource associations for the IP addresses."""
+        stmt = delete(DNSResourceIPAddressTable).where(
+            DNSResourceIPAddressTable.c.staticipaddress_id.in_(
+                staticipaddress_ids
+            )
+        )
+        await self.execute_stmt(stmt)
+
+    async def get_dnsresources_for_ips(
+        self, staticipaddress_ids: list[int]
+    ) -> list[DNSResource]:
+        """Get all DNS resources linked to any of the IP addresses."""
+        stmt = (
+            select(DNSResourceTable)
+            .select_from(DNSResourceTable)
+            .join(
+                DNSResourceIPAddressTable,
+                DNSResourceIPAddressTable.c.dnsresource_id
+                == DNSResourceTable.c.id,
+            )
+            .filter(
+                DNSResourceIPAddressTable.c.staticipaddress_id.in_(
+                    staticipaddress_ids
+                ),
+            )
+            .distinct()
+        )
+
+        result = (await self.execute_stmt(stmt)).all()
+        return [DNSResource(**row._asdict()) for row in result]
+
     async def get_dnsresources_without_ips(
         self, dnsresource_ids: list[int]
     ) -> list[int]:
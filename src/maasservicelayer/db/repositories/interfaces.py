@@ -1,7 +1,7 @@
-#  Copyright 2024 Canonical Ltd.  This software is licensed under the
+#  Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import Any, List, Type
+from typing import Any, Iterable, List, Type
 
 from sqlalchemy import delete, desc, insert, Select, select, Table
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -132,6 +132,30 @@ class InterfaceRepository(BaseRepository):
             ]
         ]
 
+    async def get_interfaces_for_macs(
+        self, macs: Iterable[str]
+    ) -> dict[str, List[Interface]]:
+        """
+        Same as `get_interfaces_for_mac` for a batch of MACs, with a single query.
+
+        The result is keyed by normalised MAC address; MACs without interfaces are not in it.
+        """
+        normalised_macs = {normalise_macaddress(mac) for mac in macs}
+        if not normalised_macs:
+            return {}
+        stmt = self._select_all_statement().filter(
+            InterfaceTable.c.mac_address.in_(normalised_macs)
+        )
+
+        result = (await self.execute_stmt(stmt)).all()
+        interfaces: dict[str, List[Interface]] = {}
+        for row in result:
+            interface = Interface(**build_interface_links(row._asdict()))  # pyright: ignore [reportArgumentType]
+            interfaces.setdefault(
+                normalise_macaddress(str(interface.mac_address)), []
+            ).append(interface)
+        return interfaces
+
     async def get_interfaces_in_fabric(
         self, fabric_id: int
     ) -> List[Interface]:
@@ -1,8 +1,8 @@
-# Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+# Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
 from operator import eq
-from typing import Type
+from typing import Iterable, Type
 
 import netaddr
 from pydantic import IPvAnyAddress
@@ -109,3 +109,47 @@ class IPRangesRepository(BaseRepository[IPRange]):
                 return iprange
 
         return None
+
+    async def get_dynamic_ranges_for_ips(
+        self, subnet_ips: Iterable[tuple[int, IPvAnyAddress]]
+    ) -> dict[tuple[int, IPvAnyAddress], IPRange]:
+        """
+        Same as `get_dynamic_range_for_ip` for a batch of (subnet id, IP) pairs, with a single query.
+
+        Pairs without a range are not in the returned dict.
+        """
+        subnet_ips = list(subnet_ips)
+        if not subnet_ips:
+            return {}
+        stmt = (
+            select(IPRangeTable)
+            .select_from(IPRangeTable)
+            .filter(
+                IPRangeTable.c.subnet_id.in_(
+                    {subnet_id for subnet_id, _ in subnet_ips}
+                )
+            )
+            .order_by(IPRangeTable.c.id)
+        )
+        result = (await self.execute_stmt(stmt)).all()
+
+        ranges_by_subnet: dict[int, list[tuple[netaddr.IPRange, IPRange]]] = {}
+        for row in result:
+            iprange = IPRange(**row._asdict())
+            ranges_by_subnet.setdefault(iprange.subnet_id, []).append(
+                (
+                    netaddr.IPRange(
+                        str(iprange.start_ip), str(iprange.end_ip)
+                    ),
+                    iprange,
+                )
+            )
+
+        ipranges = {}
+        for subnet_id, ip in subnet_ips:
+            netaddr_ip = netaddr.IPAddress(str(ip))
+            for netaddr_range, iprange in ranges_by_subnet.get(subnet_id, ()):
+                if netaddr_ip in netaddr_range:
+                    ipranges[(subnet_id, ip)] = iprange
+                    break
+        return ipranges
@@ -100,11 +100,8 @@ class MachinesRepository(AbstractNodesRepository[Machine]):
             .where(eq(NodeTable.c.node_type, NodeTypeEnum.MACHINE))
         )
 
-    async def list(
-        self, page: int, size: int, query: QuerySpec | None = None
-    ) -> ListResult[Machine]:
-        # Override the default implementation because we have to specialize the `total_stmt` query. If we realise this is a
-        # common use case, we might think about an abstraction at BaseRepository level.
+    def total_statement(self, query: QuerySpec | None = None) -> Select[Any]:
+        # Override the default implementation because we have to count only the machines.
         total_stmt = (
             select(count())
             .select_from(NodeTable)
@@ -112,23 +109,7 @@ class MachinesRepository(AbstractNodesRepository[Machine]):
         )
         if query:
             total_stmt = query.enrich_stmt(total_stmt)
-        total = (await self.execute_stmt(total_stmt)).scalar_one()
-
-        stmt = (
-            self.select_all_statement()
-            .order_by(desc(self.get_repository_table().c.id))
-            .offset((page - 1) * size)
-            .limit(size)
-        )
-        if query:
-            stmt = query.enrich_stmt(stmt)
-        result = (await self.execute_stmt(stmt)).all()
-        return ListResult[Machine](
-            items=[
-                self.get_model_factory()(**row._asdict()) for row in result
-            ],
-            total=total,
-        )
+        return total_stmt
 
     async def list_machine_usb_devices(
         self, system_id: str, page: int, size: int
@@ -28,6 +28,10 @@ class NodeClauseFactory(ClauseFactory):
     def with_hostname(cls, hostname: str | None) -> Clause:
         return Clause(condition=eq(NodeTable.c.hostname, hostname))
 
+    @classmethod
+    def with_hostnames(cls, hostnames: list[str]) -> Clause:
+        return Clause(condition=NodeTable.c.hostname.in_(hostnames))
+
     @classmethod
     def with_system_id(cls, system_id: str) -> Clause:
         return Clause(condition=eq(NodeTable.c.system_id, system_id))
@@ -32,6 +32,10 @@ class StaticIPAddressClauseFactory(ClauseFactory):
     def with_id(cls, id: int) -> Clause:
         return Clause(condition=eq(StaticIPAddressTable.c.id, id))
 
+    @classmethod
+    def with_ids(cls, ids: list[int]) -> Clause:
+        return Clause(condition=StaticIPAddressTable.c.id.in_(ids))
+
     @classmethod
     def with_node_type(cls, type: NodeTypeEnum) -> Clause:
         return Clause(condition=eq(NodeTable.c.node_type, type))
@@ -265,6 +269,16 @@ class StaticIPAddressRepository(BaseRepository):
         )
         await self.execute_stmt(stmt)
 
+    async def unlink_many_from_interfaces(
+        self, staticipaddress_ids: list[int]
+    ) -> None:
+        stmt = delete(InterfaceIPAddressTable).where(
+            InterfaceIPAddressTable.c.staticipaddress_id.in_(
+                staticipaddress_ids
+            )
+        )
+        await self.execute_stmt(stmt)
+
     async def get_ips_for_interfaces_without_other_links(
         self, interface_ids: list[int]
     ) -> list[StaticIPAddress]:
@@ -1,11 +1,12 @@
-# Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+# Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
-from ipaddress import IPv4Address, IPv6Address
+from ipaddress import ip_network, IPv4Address, IPv6Address
 from operator import eq
-from typing import List, Type
+from typing import Iterable, List, Type
 
-from sqlalchemy import desc, join, or_, select, Table
+from sqlalchemy import any_, desc, join, literal, or_, select, Table
+from sqlalchemy.dialects.postgresql import ARRAY, INET
 
 from maascommon.enums.subnet import RdnsMode
 from maasservicelayer.db.filters import Clause, ClauseFactory, QuerySpec
@@ -105,6 +106,76 @@ class SubnetsRepository(BaseRepository[Subnet]):
         del res["dhcp_on"]
         return Subnet(**res)
 
+    async def find_best_subnets_for_ips(
+        self, ips: Iterable[IPv4Address | IPv6Address]
+    ) -> dict[IPv4Address | IPv6Address, Subnet]:
+        """
+        Same as `find_best_subnet_for_ip` for a batch of IPs, with a single query.
+
+        Subnets are matched in memory by looking up the network of each IP for every prefix length in use, so the cost
+        doesn't grow with the number of subnets. When several subnets contain an IP, the ones on a VLAN with DHCP enabled
+        come first, then the most specific one. IPs without a subnet are not in the returned dict.
+        """
+        lookup_ips = {}
+        for ip in ips:
+            if isinstance(ip, IPv6Address) and ip.ipv4_mapped is not None:
+                lookup_ips[ip] = ip.ipv4_mapped
+            else:
+                lookup_ips[ip] = ip
+        if not lookup_ips:
+            return {}
+
+        # Only the subnets containing some of the IPs are loaded.
+        stmt = (
+            select(
+                SubnetTable,
+                VlanTable.c.dhcp_on,
+            )
+            .select_from(SubnetTable)
+            .join(
+                VlanTable,
+                VlanTable.c.id == SubnetTable.c.vlan_id,
+            )
+            .where(
+                SubnetTable.c.cidr.op(">>")(
+                    any_(literal(list(set(lookup_ips.values())), ARRAY(INET)))
+                )
+            )
+        )
+        result = (await self.execute_stmt(stmt)).all()
+
+        # {(version, prefixlen): {network address: [(dhcp_on, subnet)]}}
+        networks: dict[
+            tuple[int, int], dict[int, list[tuple[bool, Subnet]]]
+        ] = {}
+        for row in result:
+            res = row._asdict()
+            dhcp_on = bool(res.pop("dhcp_on"))
+            subnet = Subnet(**res)
+            network = ip_network(str(subnet.cidr), strict=False)
+            networks.setdefault(
+                (network.version, network.prefixlen), {}
+            ).setdefault(int(network.network_address), []).append(
+                (dhcp_on, subnet)
+            )
+
+        subnets = {}
+        for ip, lookup_ip in lookup_ips.items():
+            ip_value = int(lookup_ip)
+            best = None
+            for (version, prefixlen), by_address in networks.items():
+                if version != lookup_ip.version:
+                    continue
+                host_bits = lookup_ip.max_prefixlen - prefixlen
+                network_address = (ip_value >> host_bits) << host_bits
+                for dhcp_on, subnet in by_address.get(network_address, ()):
+                    candidate = (dhcp_on, prefixlen)
+                    if best is None or candidate > best[0]:
+                        best = (candidate, subnet)
+            if best is not None:
+                subnets[ip] = best[1]
+        return subnets
+
     async def _pre_delete_checks(self, query: QuerySpec) -> None:
         vlan_dhcp_on_and_dynamic_ip_range = (
             select(SubnetTable)
@@ -43,7 +43,7 @@ from maasservicelayer.exceptions.catalog import (
 from maasservicelayer.exceptions.constants import (
     UNEXISTING_RESOURCE_VIOLATION_TYPE,
 )
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import CursorListResult, ListResult
 from maasservicelayer.models.usergroups import UserGroup, UserGroupsByUser
 from maasservicelayer.models.users import User, UserProfile, UserStatistics
 from maasservicelayer.utils.date import utcnow
@@ -261,6 +261,24 @@ class UsersRepository(BaseRepository[User]):
             total=total,
         )
 
+    async def list_by_cursor(
+        self,
+        size: int,
+        token: str | None = None,
+        query: QuerySpec | None = None,
+        with_total: bool = False,
+    ) -> CursorListResult[User]:
+        # Exclude the SYSTEM_USERS from the queries.
+        where = Clause(not_(UserTable.c.username.in_(SYSTEM_USERS)))
+        if query and query.where:
+            where = ClauseFactory.and_clauses([query.where, where])
+        return await super().list_by_cursor(
+            size=size,
+            token=token,
+            query=QuerySpec(where=where),
+            with_total=with_total,
+        )
+
     async def get_groups_for_users(
         self, user_ids: List[int]
     ) -> UserGroupsByUser:
@@ -26,9 +26,20 @@ from sqlalchemy import (
 )
 from sqlalchemy.dialects.postgresql import ARRAY, CIDR, INET, JSONB
 from sqlalchemy.sql.schema import PrimaryKeyConstraint
+from sqlalchemy.types import UserDefinedType
 
 METADATA = MetaData()
 
+
+class XML(UserDefinedType):
+    """The PostgreSQL `xml` type, which SQLAlchemy doesn't provide."""
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "XML"
+
+
 # NOTE:
 # Alembic autogeneration compares index names, and Django uses its own naming
 # convention for indexes—especially for pattern ops (e.g., LIKE indexes).
@@ -1025,6 +1036,55 @@ IPRangeTable = Table(
     Index("maasserver_iprange_subnet_id_de83b8f1", "subnet_id"),
 )
 
+# Denormalized machine listing, kept current by the machinesummary_*
+# triggers. See the 0041 migration.
+MachineSummaryTable = Table(
+    "maasserver_machinesummary",
+    METADATA,
+    Column(
+        "node_id",
+        BigInteger,
+        ForeignKey(
+            "maasserver_node.id",
+            deferrable=True,
+            initially="DEFERRED",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+    ),
+    Column("fqdn", Text, nullable=False),
+    Column("domain_name", String(256), nullable=True),
+    Column("pool_name", String(256), nullable=True),
+    Column("zone_name", String(256), nullable=True),
+    Column("owner", String(150), nullable=True),
+    Column("parent", String(41), nullable=True),
+    Column("power_type", String(10), nullable=True),
+    Column("tags", ARRAY(BigInteger), nullable=False),
+    Column("physical_disk_count", Integer, nullable=False),
+    Column("storage", BigInteger, nullable=True),
+    Column("fabrics", ARRAY(Text), nullable=False),
+    Column("spaces", ARRAY(Text), nullable=False),
+    Column("extra_macs", ARRAY(Text), nullable=False),
+    Column("pxe_mac", Text, nullable=True),
+    Column("boot_vlan_id", BigInteger, nullable=True),
+    Column("boot_vlan_name", String(256), nullable=True),
+    Column("boot_fabric_id", Integer, nullable=True),
+    Column("boot_fabric_name", String(256), nullable=True),
+    Index("maasserver_machinesummary_fqdn_idx", "fqdn"),
+    Index("maasserver_machinesummary_domain_name_idx", "domain_name"),
+    Index("maasserver_machinesummary_pool_name_idx", "pool_name"),
+    Index("maasserver_machinesummary_zone_name_idx", "zone_name"),
+    Index("maasserver_machinesummary_owner_idx", "owner"),
+    Index(
+        "maasserver_machinesummary_physical_disk_count_idx",
+        "physical_disk_count",
+    ),
+    Index("maasserver_machinesummary_storage_idx", "storage"),
+    Index(
+        "maasserver_machinesummary_boot_fabric_name_idx", "boot_fabric_name"
+    ),
+)
+
 MDNSTable = Table(
     "maasserver_mdns",
     METADATA,
@@ -1112,8 +1172,15 @@ NeighbourTable = Table(
         ),
         nullable=False,
     ),
-    UniqueConstraint("interface_id", "vid", "mac_address", "ip"),
     Index("maasserver_neighbour_interface_id_dd458d65", "interface_id"),
+    Index(
+        "maasserver_neighbour_interface_vid_mac_ip_uniq",
+        "interface_id",
+        func.coalesce(text("vid"), -1),
+        "mac_address",
+        "ip",
+        unique=True,
+    ),
 )
 
 NodeConfigTable = Table(
@@ -1957,6 +2024,24 @@ ScriptResultTable = Table(
     Index("metadataserver_scriptresult_interface_id_a120e25e", "interface_id"),
 )
 
+ScriptResultXmlTable = Table(
+    "maasserver_scriptresultxml",
+    METADATA,
+    Column(
+        "script_result_id",
+        BigInteger,
+        ForeignKey(
+            "maasserver_scriptresult.id",
+            ondelete="CASCADE",
+            deferrable=True,
+            initially="DEFERRED",
+        ),
+        primary_key=True,
+    ),
+    Column("updated", DateTime(timezone=True), nullable=False),
+    Column("document", XML, nullable=True),
+)
+
 ScriptSetTable = Table(
     "maasserver_scriptset",
     METADATA,
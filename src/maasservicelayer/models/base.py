@@ -27,6 +27,18 @@ class ListResult(Generic[T]):
         return bool(self.total) and page * size < self.total
 
 
+@dataclass
+class CursorListResult(Generic[T]):
+    """
+    Encapsulates a page of results fetched by keyset pagination. `next_token` is the opaque token for the next page, or
+    None on the last page. `total` is only computed when asked for, since counting is what makes deep pages expensive.
+    """
+
+    items: Sequence[T]
+    next_token: str | None
+    total: int | None = None
+
+
 class MaasBaseModel(BaseModel):
     id: int
 
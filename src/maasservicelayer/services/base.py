@@ -30,6 +30,7 @@ from maasservicelayer.exceptions.constants import (
     UNEXISTING_RESOURCE_VIOLATION_TYPE,
 )
 from maasservicelayer.models.base import (
+    CursorListResult,
     ListResult,
     MaasBaseModel,
     ResourceBuilder,
@@ -158,6 +159,17 @@ class ReadOnlyService(Service, Generic[M, ROR]):
     ) -> ListResult[M]:
         return await self.repository.list(page=page, size=size, query=query)
 
+    async def list_by_cursor(
+        self,
+        size: int,
+        token: str | None = None,
+        query: QuerySpec | None = None,
+        with_total: bool = False,
+    ) -> CursorListResult[M]:
+        return await self.repository.list_by_cursor(
+            size=size, token=token, query=query, with_total=with_total
+        )
+
     async def list_all(self, query: QuerySpec | None = None) -> List[M]:
         # Please, prefer not to use this method. It's here just as a utility for v2 endpoints that need to use the service layer.
         return await self.repository.list_all(query=query)
@@ -185,6 +185,67 @@ class DNSResourcesService(
                     answer=str(ip.ip),
                 )
 
+    async def release_dynamic_hostnames(
+        self, ips: list[StaticIPAddress]
+    ) -> None:
+        """Same as `release_dynamic_hostname` for many IPs, with a few queries."""
+        ips_by_id = {
+            ip.id: ip
+            for ip in ips
+            if ip.ip is not None
+            and ip.alloc_type == IpAddressType.DISCOVERED.value
+        }
+        if not ips_by_id:
+            return
+
+        default_domain = await self.domains_service.get_default_domain()
+
+        links = await self.repository.get_dnsresources_in_domain_for_ips(
+            default_domain, list(ips_by_id)
+        )
+        if not links:
+            return
+        await self.repository.remove_ip_relations(
+            [(dnsrr.id, ip_id) for dnsrr, ip_id in links]
+        )
+        orphaned_ids = set(
+            await self.repository.get_dnsresources_without_ips(
+                list({dnsrr.id for dnsrr, _ in links})
+            )
+        )
+        if orphaned_ids:
+            await self.repository.delete_many(
+                QuerySpec(
+                    where=DNSResourceClauseFactory.with_ids(list(orphaned_ids))
+                )
+            )
+
+        deleted_ids = set()
+        for dnsrr, ip_id in links:
+            ip = ips_by_id[ip_id]
+            assert ip.ip is not None
+            if dnsrr.id in orphaned_ids:
+                if dnsrr.id in deleted_ids:
+                    continue
+                deleted_ids.add(dnsrr.id)
+                await self.dnspublications_service.create_for_config_update(
+                    source=f"zone {default_domain.name} removed resource {dnsrr.name}",
+                    action=DnsUpdateAction.DELETE,
+                    label=dnsrr.name,
+                    zone=default_domain.name,
+                    rtype="AAAA" if ip.ip.version == 6 else "A",
+                )
+            else:
+                await self.dnspublications_service.create_for_config_update(
+                    source=f"ip {ip.ip} unlinked from resource {dnsrr.name} on zone {default_domain.name}",
+                    action=DnsUpdateAction.DELETE,
+                    label=dnsrr.name,
+                    rtype="AAAA" if ip.ip.version == 6 else "A",
+                    ttl=self._get_ttl(dnsrr, default_domain),
+                    zone=default_domain.name,
+                    answer=str(ip.ip),
+                )
+
     async def update_dynamic_hostname(
         self, ip: StaticIPAddress, hostname: str
     ) -> None:
@@ -289,6 +350,20 @@ class DNSResourcesService(
             staticipaddress_id
         )
 
+    async def get_dnsresources_for_ips(
+        self, staticipaddress_ids: list[int]
+    ) -> list[DNSResource]:
+        return await self.repository.get_dnsresources_for_ips(
+            staticipaddress_ids
+        )
+
+    async def unlink_ips_from_all_dnsresources(
+        self, staticipaddress_ids: list[int]
+    ) -> None:
+        await self.repository.unlink_ips_from_all_dnsresources(
+            staticipaddress_ids
+        )
+
     async def add_ip(
         self, sip: StaticIPAddress, label: str, domain: Domain
     ) -> None:
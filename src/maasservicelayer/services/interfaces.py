@@ -1,7 +1,7 @@
-#  Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+#  Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import List
+from typing import Iterable, List
 
 from maascommon.enums.dns import DnsUpdateAction
 from maascommon.enums.interface import InterfaceType
@@ -79,6 +79,11 @@ class InterfacesService(
     async def get_interfaces_for_mac(self, mac: str) -> List[Interface]:
         return await self.interface_repository.get_interfaces_for_mac(mac)
 
+    async def get_interfaces_for_macs(
+        self, macs: Iterable[str]
+    ) -> dict[str, List[Interface]]:
+        return await self.interface_repository.get_interfaces_for_macs(macs)
+
     async def get_interfaces_in_fabric(
         self, fabric_id: int
     ) -> List[Interface]:
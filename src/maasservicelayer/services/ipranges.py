@@ -1,7 +1,7 @@
-#  Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+#  Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from typing import List
+from typing import Iterable, List
 
 from pydantic import IPvAnyAddress
 
@@ -55,6 +55,11 @@ class IPRangesService(
     ) -> IPRange | None:
         return await self.repository.get_dynamic_range_for_ip(subnet_id, ip)
 
+    async def get_dynamic_ranges_for_ips(
+        self, subnet_ips: Iterable[tuple[int, IPvAnyAddress]]
+    ) -> dict[tuple[int, IPvAnyAddress], IPRange]:
+        return await self.repository.get_dynamic_ranges_for_ips(subnet_ips)
+
     async def pre_create_hook(self, builder: IPRangeBuilder) -> None:
         iprange = await self.exists(
             query=QuerySpec(
@@ -1,4 +1,4 @@
-#  Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+#  Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
 from datetime import datetime
@@ -8,6 +8,7 @@ from pydantic import IPvAnyAddress
 import structlog
 
 from maascommon.enums.ipaddress import IpAddressType, LeaseAction
+from maascommon.fields import normalise_macaddress
 from maascommon.utils.network import coerce_to_valid_hostname
 from maasservicelayer.builders.staticipaddress import StaticIPAddressBuilder
 from maasservicelayer.context import Context
@@ -44,6 +45,46 @@ def _is_valid_hostname(hostname):
     )
 
 
+class _DeferredLeaseWrites:
+    """Writes of a batch of leases that are applied together.
+
+    The stale addresses are deleted, and the released ones cleared, with
+    a few queries for the whole batch. Until then, the leases for the same
+    MAC address or IP address as a deferred write can't be applied.
+    """
+
+    def __init__(self):
+        self.stale_addresses: dict[int, StaticIPAddress] = {}
+        self.released_addresses: dict[int, StaticIPAddress] = {}
+        self.macs: set[str] = set()
+        self.ips: set[IPvAnyAddress] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.stale_addresses or self.released_addresses)
+
+    def depends_on(self, lease: Lease) -> bool:
+        return (
+            normalise_macaddress(lease.mac) in self.macs
+            or lease.ip in self.ips
+        )
+
+    def delete(self, lease: Lease, address: StaticIPAddress) -> None:
+        self.stale_addresses[address.id] = address
+        self.macs.add(normalise_macaddress(lease.mac))
+        self.ips.add(address.ip)  # pyright: ignore [reportArgumentType]
+
+    def release(self, lease: Lease, address: StaticIPAddress) -> None:
+        self.released_addresses[address.id] = address
+        self.macs.add(normalise_macaddress(lease.mac))
+        self.ips.add(lease.ip)
+
+    def clear(self) -> None:
+        self.stale_addresses.clear()
+        self.released_addresses.clear()
+        self.macs.clear()
+        self.ips.clear()
+
+
 class LeasesService(Service):
     def __init__(
         self,
@@ -67,7 +108,113 @@ class LeasesService(Service):
         # Get the subnet for this IP address. If no subnet exists then something
         # is wrong as we should not be receiving message about unknown subnets.
         subnet = await self.subnet_service.find_best_subnet_for_ip(lease.ip)  # pyright: ignore [reportArgumentType]
+        self._check_subnet(lease, subnet)
+        self._log_lease(lease)
+
+        # We will receive actions on all addresses in the subnet. We only want
+        # to update the addresses in the dynamic range.
+        dynamic_range = await self.iprange_service.get_dynamic_range_for_ip(
+            subnet.id,  # pyright: ignore [reportOptionalMemberAccess]
+            lease.ip,
+        )
+        if dynamic_range is None:
+            return
+
+        interfaces = await self.interface_service.get_interfaces_for_mac(
+            lease.mac
+        )
+        await self._apply_lease(lease, subnet, interfaces)  # pyright: ignore [reportArgumentType]
+
+    async def store_lease_info_batch(self, leases: list[Lease]) -> None:
+        """Store a batch of leases, in order, as `store_lease_info` would.
+
+        The subnets, dynamic ranges, interfaces and node hostnames needed by
+        the whole batch are fetched upfront with a few set-based queries,
+        instead of a handful of queries per lease. Leases outside of a
+        dynamic range are then skipped without touching the database.
+
+        The stale addresses are deleted, and the released ones cleared, for
+        the whole batch at once. A lease that depends on these writes, as it
+        is for the same MAC or IP address, first applies them.
+        """
+        subnets = await self.subnet_service.find_best_subnets_for_ips(
+            [lease.ip for lease in leases]  # pyright: ignore [reportArgumentType]
+        )
+        for lease in leases:
+            self._check_subnet(lease, subnets.get(lease.ip))  # pyright: ignore [reportArgumentType]
+
+        dynamic_ranges = await self.iprange_service.get_dynamic_ranges_for_ips(
+            (subnets[lease.ip].id, lease.ip)  # pyright: ignore [reportArgumentType]
+            for lease in leases
+        )
+        leases_in_range = [
+            lease
+            for lease in leases
+            if (subnets[lease.ip].id, lease.ip) in dynamic_ranges  # pyright: ignore [reportArgumentType]
+        ]
+        interfaces_by_mac = (
+            await self.interface_service.get_interfaces_for_macs(
+                lease.mac for lease in leases_in_range
+            )
+        )
+        node_hostnames = await self._get_node_hostnames(
+            [
+                coerce_to_valid_hostname(lease.hostname)
+                for lease in leases_in_range
+                if lease.action == LeaseAction.COMMIT
+                and _is_valid_hostname(lease.hostname)
+            ]
+        )
+
+        writes = _DeferredLeaseWrites()
+        for lease in leases:
+            self._log_lease(lease)
+            subnet = subnets[lease.ip]  # pyright: ignore [reportArgumentType]
+            if (subnet.id, lease.ip) not in dynamic_ranges:
+                continue
+            if writes.depends_on(lease):
+                await self._apply_deferred_writes(writes)
+            mac = normalise_macaddress(lease.mac)
+            # Keep track of the unknown interfaces created along the way, as
+            # later leases in the batch might be for the same MAC.
+            interfaces_by_mac[mac] = await self._apply_lease(
+                lease,
+                subnet,
+                interfaces_by_mac.get(mac, []),
+                node_hostnames=node_hostnames,
+                writes=writes,
+            )
+        await self._apply_deferred_writes(writes)
 
+    async def _apply_deferred_writes(
+        self, writes: _DeferredLeaseWrites
+    ) -> None:
+        if not writes:
+            return
+        if writes.stale_addresses:
+            # Release old DHCP hostnames, then delete the addresses.
+            await self.dnsresource_service.release_dynamic_hostnames(
+                list(writes.stale_addresses.values())
+            )
+            await self.staticipaddress_service.delete_many(
+                query=QuerySpec(
+                    where=StaticIPAddressClauseFactory.with_ids(
+                        list(writes.stale_addresses)
+                    )
+                )
+            )
+        if writes.released_addresses:
+            await self.staticipaddress_service.update_many(
+                query=QuerySpec(
+                    where=StaticIPAddressClauseFactory.with_ids(
+                        list(writes.released_addresses)
+                    )
+                ),
+                builder=StaticIPAddressBuilder(ip=None),
+            )
+        writes.clear()
+
+    def _check_subnet(self, lease: Lease, subnet: Subnet | None) -> None:
         if subnet is None:
             raise LeaseUpdateError(f"No subnet exists for: {lease.ip}")
 
@@ -78,14 +225,14 @@ class LeasesService(Service):
                 f"Family for the subnet does not match. Expected: {lease.ip_family}"
             )
 
-        created = datetime.fromtimestamp(lease.timestamp_epoch)
+    def _log_lease(self, lease: Lease) -> None:
         logger.info(
             "Lease update: %s for %s on %s at %s%s%s"
             % (
                 lease.action,
                 lease.ip,
                 lease.mac,
-                created,
+                datetime.fromtimestamp(lease.timestamp_epoch),
                 (
                     " (lease time: %ss)" % lease.lease_time_seconds
                     if lease.lease_time_seconds is not None
@@ -99,17 +246,30 @@ class LeasesService(Service):
             )
         )
 
-        # We will receive actions on all addresses in the subnet. We only want
-        # to update the addresses in the dynamic range.
-        dynamic_range = await self.iprange_service.get_dynamic_range_for_ip(
-            subnet.id, lease.ip
+    async def _get_node_hostnames(self, hostnames: list[str]) -> set[str]:
+        if not hostnames:
+            return set()
+        nodes = await self.node_service.get_many(
+            query=QuerySpec(where=NodeClauseFactory.with_hostnames(hostnames))
         )
-        if dynamic_range is None:
-            return
+        return {node.hostname for node in nodes}
 
-        interfaces = await self.interface_service.get_interfaces_for_mac(
-            lease.mac
-        )
+    async def _apply_lease(
+        self,
+        lease: Lease,
+        subnet: Subnet,
+        interfaces: list[Interface],
+        node_hostnames: set[str] | None = None,
+        writes: _DeferredLeaseWrites | None = None,
+    ) -> list[Interface]:
+        """Apply a lease in a dynamic range of `subnet` to the interfaces with its MAC.
+
+        Returns the interfaces the lease applies to, which include the
+        unknown interface created for a MAC address unknown to MAAS.
+
+        If `writes` is given, the stale and released addresses are recorded
+        in it, rather than being written right away.
+        """
         if len(interfaces) == 0:
             if lease.action == LeaseAction.COMMIT:
                 # A MAC address that is unknown to MAAS was given an IP address. Create
@@ -123,7 +283,7 @@ class LeasesService(Service):
                 ]
             else:
                 # No interfaces and not commit action so nothing needs to be done.
-                return
+                return interfaces
 
         sip = None
         # Delete all discovered IP addresses attached to all interfaces of the same
@@ -135,6 +295,9 @@ class LeasesService(Service):
         for address in old_family_addresses:
             # Release old DHCP hostnames, but only for obsolete dynamic addresses.
             if address.ip != lease.ip:
+                if writes is not None:
+                    writes.delete(lease, address)
+                    continue
                 if address.ip is not None:
                     await self.dnsresource_service.release_dynamic_hostname(
                         address
@@ -153,13 +316,17 @@ class LeasesService(Service):
                     subnet=subnet,
                     ip=lease.ip,
                     lease_time=lease.lease_time_seconds,
-                    created=created,
+                    created=datetime.fromtimestamp(lease.timestamp_epoch),
                     interfaces=interfaces,
+                    node_hostnames=node_hostnames,
                 )
             case LeaseAction.EXPIRY.value | LeaseAction.RELEASE.value:
                 # Interfaces no longer holds an active lease. Create the new object
                 # to show that it used to be connected to this subnet.
-                await self._release_lease_info(sip, interfaces, subnet)
+                await self._release_lease_info(
+                    sip, interfaces, subnet, lease=lease, writes=writes
+                )
+        return interfaces
 
     async def _commit_lease_info(
         self,
@@ -169,6 +336,7 @@ class LeasesService(Service):
         lease_time: int,
         created: datetime,
         interfaces: list[Interface],
+        node_hostnames: set[str] | None = None,
     ) -> None:
         # Hostname sent from the cluster is either blank or can be "(none)". In either of those cases we do not set the hostname.
         sip_hostname = None
@@ -190,13 +358,18 @@ class LeasesService(Service):
         await self.interface_service.link_ip(interfaces, sip)
         if sip_hostname is not None:
             # MAAS automatically manages DNS for node hostnames, so we cannot allow a DHCP client to override that.
-            hostname_belongs_to_a_node = await self.node_service.exists(
-                query=QuerySpec(
-                    where=NodeClauseFactory.with_hostname(
-                        hostname=coerce_to_valid_hostname(sip_hostname)
+            if node_hostnames is not None:
+                hostname_belongs_to_a_node = (
+                    coerce_to_valid_hostname(sip_hostname) in node_hostnames
+                )
+            else:
+                hostname_belongs_to_a_node = await self.node_service.exists(
+                    query=QuerySpec(
+                        where=NodeClauseFactory.with_hostname(
+                            hostname=coerce_to_valid_hostname(sip_hostname)
+                        )
                     )
                 )
-            )
             if hostname_belongs_to_a_node:
                 # Ensure we don't allow a DHCP hostname to override a node hostname.
                 await self.dnsresource_service.release_dynamic_hostname(sip)
@@ -210,6 +383,8 @@ class LeasesService(Service):
         sip: StaticIPAddress | None,
         interfaces: list[Interface],
         subnet: Subnet,
+        lease: Lease | None = None,
+        writes: _DeferredLeaseWrites | None = None,
     ) -> None:
         if sip is None:
             # XXX: There shouldn't be more than one StaticIPAddress
@@ -246,6 +421,9 @@ class LeasesService(Service):
                         subnet_id=subnet.id,
                     )
                 )
+        elif writes is not None and lease is not None:
+            writes.release(lease, sip)
+            sip.ip = None
         else:
             sip.ip = None
             await self.staticipaddress_service.update_by_id(
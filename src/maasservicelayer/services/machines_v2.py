@@ -3,11 +3,10 @@
 import logging
 
 from pydantic import BaseModel
-from sqlalchemy import case, desc, distinct, or_, select
+from sqlalchemy import case, desc, select
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql.expression import ColumnOperators, func
 
-from maascommon.enums.interface import InterfaceType
 from maascommon.enums.ipaddress import IpAddressType
 from maascommon.enums.node import SimplifiedNodeStatusEnum
 from maasserver.enum import (
@@ -17,28 +16,17 @@ from maasserver.enum import (
 from maasservicelayer.context import Context
 from maasservicelayer.db.repositories.base import Repository
 from maasservicelayer.db.tables import (
-    BlockDeviceTable,
-    BMCTable,
-    DomainTable,
     EventTable,
     EventTypeTable,
-    FabricTable,
     InterfaceIPAddressTable,
     InterfaceTable,
+    MachineSummaryTable,
     NodeConfigTable,
     NodeTable,
-    NodeTagTable,
-    PhysicalBlockDeviceTable,
-    ResourcePoolTable,
     ScriptResultTable,
     ScriptSetTable,
     ScriptTable,
-    SpaceTable,
     StaticIPAddressTable,
-    SubnetTable,
-    UserTable,
-    VlanTable,
-    ZoneTable,
 )
 from maasservicelayer.services.base import Service
 from metadataserver.enum import HARDWARE_TYPE, RESULT_TYPE, SCRIPT_STATUS
@@ -322,30 +310,6 @@ class MachinesV2Service(Service, Repository):
         return machine
 
     def _single_query(self, ids):
-        storage_query = (
-            select(
-                NodeTable.c.id,
-                func.count(
-                    PhysicalBlockDeviceTable.c.blockdevice_ptr_id
-                ).label("disk_count"),
-                func.sum(func.coalesce(BlockDeviceTable.c.size, 0)).label(
-                    "storage"
-                ),
-            )
-            .select_from(PhysicalBlockDeviceTable)
-            .join(
-                BlockDeviceTable,
-                BlockDeviceTable.c.id
-                == PhysicalBlockDeviceTable.c.blockdevice_ptr_id,
-            )
-            .join(
-                NodeConfigTable,
-                NodeConfigTable.c.id == BlockDeviceTable.c.node_config_id,
-            )
-            .join(NodeTable, NodeTable.c.id == NodeConfigTable.c.node_id)
-            .group_by(NodeTable.c.id)
-        ).cte("storage")
-
         interfaces_cte = (
             select(
                 NodeTable.c.id.label("node_id"),
@@ -360,74 +324,9 @@ class MachinesV2Service(Service, Repository):
                 NodeTable,
                 NodeTable.c.current_config_id == NodeConfigTable.c.id,
             )
+            .where(NodeTable.c.id.in_(ids))
         ).cte("interfaces")
 
-        vlans_cte = (
-            select(
-                VlanTable.c.id,
-                VlanTable.c.fabric_id,
-                VlanTable.c.space_id,
-                NodeTable.c.id.label("node_id"),
-            )
-            .select_from(NodeTable)
-            .join(
-                NodeConfigTable,
-                NodeTable.c.current_config_id == NodeConfigTable.c.id,
-            )
-            .join(
-                InterfaceTable,
-                NodeConfigTable.c.id == InterfaceTable.c.node_config_id,
-                isouter=True,
-            )
-            .join(
-                InterfaceIPAddressTable,
-                InterfaceTable.c.id == InterfaceIPAddressTable.c.interface_id,
-                isouter=True,
-            )
-            .join(
-                StaticIPAddressTable,
-                InterfaceIPAddressTable.c.staticipaddress_id
-                == StaticIPAddressTable.c.id,
-                isouter=True,
-            )
-            .join(
-                SubnetTable,
-                SubnetTable.c.id == StaticIPAddressTable.c.subnet_id,
-                isouter=True,
-            )
-            .join(
-                VlanTable,
-                or_(
-                    VlanTable.c.id == SubnetTable.c.vlan_id,
-                    VlanTable.c.id == InterfaceTable.c.vlan_id,
-                ),
-            )
-        ).cte("vlans")
-
-        fabrics_cte = (
-            select(
-                vlans_cte.c.node_id,
-                postgresql.array_agg(func.distinct(FabricTable.c.name)).label(
-                    "names"
-                ),
-            )
-            .select_from(FabricTable)
-            .join(vlans_cte, vlans_cte.c.fabric_id == FabricTable.c.id)
-            .group_by(vlans_cte.c.node_id)
-        ).cte("fabrics")
-
-        spaces_cte = (
-            select(
-                vlans_cte.c.node_id,
-                postgresql.array_agg(func.distinct(SpaceTable.c.name)).label(
-                    "names"
-                ),
-            )
-            .select_from(SpaceTable)
-            .join(vlans_cte, vlans_cte.c.space_id == SpaceTable.c.id)
-            .group_by(vlans_cte.c.node_id)
-        ).cte("spaces")
-
         first_boot_interface_cte = (
             select(
                 NodeTable.c.id,
@@ -442,7 +341,10 @@ class MachinesV2Service(Service, Repository):
                 InterfaceTable,
                 InterfaceTable.c.node_config_id == NodeConfigTable.c.id,
             )
-            .where(NodeTable.c.boot_interface_id == None)  # noqa: E711
+            .where(
+                NodeTable.c.id.in_(ids),
+                NodeTable.c.boot_interface_id == None,  # noqa: E711
+            )
             .group_by(NodeTable.c.id)
         ).cte("first_boot_interface")
 
@@ -463,35 +365,9 @@ class MachinesV2Service(Service, Repository):
                 first_boot_interface_cte.c.id == NodeTable.c.id,
                 isouter=True,
             )
+            .where(NodeTable.c.id.in_(ids))
         ).cte("boot_interface_ip")
 
-        extra_macs_cte = (
-            select(
-                NodeTable.c.id,
-                postgresql.array_agg(
-                    distinct(InterfaceTable.c.mac_address)
-                ).label("extra_macs"),
-            )
-            .join(
-                NodeConfigTable,
-                NodeConfigTable.c.id == NodeTable.c.current_config_id,
-            )
-            .join(
-                InterfaceTable,
-                InterfaceTable.c.node_config_id == NodeConfigTable.c.id,
-            )
-            .join(
-                boot_interface_ip_cte,
-                boot_interface_ip_cte.c.id == NodeTable.c.id,
-            )
-            .where(
-                InterfaceTable.c.id
-                != boot_interface_ip_cte.c.boot_interface_id,
-                InterfaceTable.c.type == InterfaceType.PHYSICAL,
-            )
-            .group_by(NodeTable.c.id)
-        ).cte("extra_macs")
-
         status_message_subquery = (
             select(
                 func.concat(
@@ -684,6 +560,7 @@ class MachinesV2Service(Service, Repository):
                 ScriptTable, ScriptTable.c.id == ScriptResultTable.c.script_id
             )
             .where(
+                NodeTable.c.id.in_(ids),
                 ScriptSetTable.c.result_type == RESULT_TYPE.TESTING,
                 ScriptResultTable.c.suppressed == False,  # noqa: E712
             )
@@ -1411,104 +1288,59 @@ class MachinesV2Service(Service, Repository):
             .group_by(summary_testing_status_cte.c.node_id)
         ).cte("testing_status")
 
-        tags_cte = (
-            select(
-                NodeTable.c.id,
-                postgresql.array_agg(NodeTagTable.c.tag_id).label("tag_ids"),
-            )
-            .select_from(NodeTable)
-            .join(NodeTagTable, NodeTagTable.c.node_id == NodeTable.c.id)
-            .group_by(NodeTable.c.id)
-        ).cte("machine_tags")
-
-        PXEBootInterface = InterfaceTable.alias("pxe_boot_interface")
-        pxe_mac_cte = (
-            select(
-                NodeTable.c.id,
-                # Simply take just one
-                func.min(
-                    case(
-                        (
-                            NodeTable.c.boot_interface_id.isnot(None),
-                            PXEBootInterface.c.mac_address,
-                        ),
-                        (
-                            InterfaceTable.c.id.isnot(None),
-                            InterfaceTable.c.mac_address,
-                        ),
-                        else_=None,
-                    )
-                ).label("pxe_mac"),
-            )
-            .select_from(NodeTable)
-            .join(
-                NodeConfigTable,
-                NodeTable.c.current_config_id == NodeConfigTable.c.id,
-                isouter=True,
-            )
-            .join(
-                InterfaceTable,
-                InterfaceTable.c.node_config_id == NodeConfigTable.c.id,
-                isouter=True,
-            )
-            .join(
-                PXEBootInterface,
-                PXEBootInterface.c.id == NodeTable.c.boot_interface_id,
-                isouter=True,
-            )
-            .group_by(NodeTable.c.id)
-        ).cte("pxe_mac")
-
-        MachineParent = NodeTable.alias("parent")
-        BootVlan = VlanTable.alias("boot_vlan")
-        BootInterface = InterfaceTable.alias("boot_interface")
-        BootFabric = FabricTable.alias("boot_fabric")
         stmt = (
             select(
                 NodeTable.c.id,
                 NodeTable.c.system_id,
                 NodeTable.c.hostname,
                 NodeTable.c.description,
-                DomainTable.c.id.label("domain_id"),
-                DomainTable.c.name.label("domain_name"),
-                ResourcePoolTable.c.id.label("pool_id"),
-                ResourcePoolTable.c.name.label("pool_name"),
-                func.coalesce(UserTable.c.username, "").label("owner"),
-                MachineParent.c.system_id.label("parent"),
+                NodeTable.c.domain_id,
+                MachineSummaryTable.c.domain_name,
+                NodeTable.c.pool_id,
+                MachineSummaryTable.c.pool_name,
+                func.coalesce(MachineSummaryTable.c.owner, "").label("owner"),
+                MachineSummaryTable.c.parent,
                 NodeTable.c.error_description,
-                ZoneTable.c.id.label("zone_id"),
-                ZoneTable.c.name.label("zone_name"),
+                NodeTable.c.zone_id,
+                MachineSummaryTable.c.zone_name,
                 NodeTable.c.cpu_count,
                 func.round((NodeTable.c.memory / 1024), 1).label("memory"),
                 NodeTable.c.power_state,
                 NodeTable.c.locked,
-                func.concat(
-                    NodeTable.c.hostname, ".", DomainTable.c.name
-                ).label("fqdn"),
-                func.coalesce(tags_cte.c.tag_ids, []).label("tags"),
-                func.coalesce(storage_query.c.disk_count, 0).label(
-                    "physical_disk_count"
-                ),
+                MachineSummaryTable.c.fqdn,
+                func.coalesce(MachineSummaryTable.c.tags, []).label("tags"),
+                func.coalesce(
+                    MachineSummaryTable.c.physical_disk_count, 0
+                ).label("physical_disk_count"),
                 func.coalesce(
-                    func.round((storage_query.c.storage / (1000**3)), 1), 0
+                    func.round((MachineSummaryTable.c.storage / (1000**3)), 1),
+                    0,
                 ).label("storage"),
                 NodeTable.c.architecture,
                 NodeTable.c.osystem,
                 NodeTable.c.distro_series,
                 NodeTable.c.status.label("status_code"),
                 NodeTable.c.ephemeral_deploy,
-                func.coalesce(fabrics_cte.c.names, []).label("fabrics"),
-                func.coalesce(spaces_cte.c.names, []).label("spaces"),
-                func.coalesce(extra_macs_cte.c.extra_macs, []).label(
+                func.coalesce(MachineSummaryTable.c.fabrics, []).label(
+                    "fabrics"
+                ),
+                func.coalesce(MachineSummaryTable.c.spaces, []).label(
+                    "spaces"
+                ),
+                func.coalesce(MachineSummaryTable.c.extra_macs, []).label(
                     "extra_macs"
                 ),
-                func.coalesce(pxe_mac_cte.c.pxe_mac, "").label("pxe_mac"),
-                BMCTable.c.power_type,
+                func.coalesce(MachineSummaryTable.c.pxe_mac, "").label(
+                    "pxe_mac"
+                ),
+                MachineSummaryTable.c.power_type,
                 status_message_subquery.label("status_message"),
-                BootVlan.c.id.label("boot_vlan_id"),
-                func.coalesce(BootVlan.c.name, "").label("boot_vlan_name"),
-                BootVlan.c.fabric_id.label("boot_fabric_id"),
-                BootFabric.c.name.label("boot_fabric_name"),
+                MachineSummaryTable.c.boot_vlan_id,
+                func.coalesce(MachineSummaryTable.c.boot_vlan_name, "").label(
+                    "boot_vlan_name"
+                ),
+                MachineSummaryTable.c.boot_fabric_id,
+                MachineSummaryTable.c.boot_fabric_name,
                 case(
                     (
                         ip_addresses_cte.c.ips.is_(None),
@@ -1696,65 +1528,8 @@ class MachinesV2Service(Service, Repository):
             )
             .select_from(NodeTable)
             .join(
-                DomainTable,
-                DomainTable.c.id == NodeTable.c.domain_id,
-                isouter=True,
-            )
-            .join(
-                UserTable, UserTable.c.id == NodeTable.c.owner_id, isouter=True
-            )
-            .join(
-                ResourcePoolTable,
-                ResourcePoolTable.c.id == NodeTable.c.pool_id,
-                isouter=True,
-            )
-            .join(
-                ZoneTable, ZoneTable.c.id == NodeTable.c.zone_id, isouter=True
-            )
-            .join(
-                storage_query,
-                storage_query.c.id == NodeTable.c.id,
-                isouter=True,
-            )
-            .join(
-                fabrics_cte,
-                fabrics_cte.c.node_id == NodeTable.c.id,
-                isouter=True,
-            )
-            .join(
-                spaces_cte,
-                spaces_cte.c.node_id == NodeTable.c.id,
-                isouter=True,
-            )
-            .join(
-                MachineParent,
-                MachineParent.c.id == NodeTable.c.parent_id,
-                isouter=True,
-            )
-            .join(
-                extra_macs_cte,
-                extra_macs_cte.c.id == NodeTable.c.id,
-                isouter=True,
-            )
-            .join(
-                pxe_mac_cte,
-                pxe_mac_cte.c.id == NodeTable.c.id,
-                isouter=True,
-            )
-            .join(
-                BootInterface,
-                BootInterface.c.id == NodeTable.c.boot_interface_id,
-                isouter=True,
-            )
-            .join(BMCTable, BMCTable.c.id == NodeTable.c.bmc_id, isouter=True)
-            .join(
-                BootVlan,
-                BootVlan.c.id == BootInterface.c.vlan_id,
-                isouter=True,
-            )
-            .join(
-                BootFabric,
-                BootFabric.c.id == BootVlan.c.fabric_id,
+                MachineSummaryTable,
+                MachineSummaryTable.c.node_id == NodeTable.c.id,
                 isouter=True,
             )
             .join(
@@ -1772,11 +1547,6 @@ class MachinesV2Service(Service, Repository):
                 testing_status_cte.c.id == NodeTable.c.id,
                 isouter=True,
             )
-            .join(
-                tags_cte,
-                tags_cte.c.id == NodeTable.c.id,
-                isouter=True,
-            )
             .where(NodeTable.c.id.in_(ids))
         )
         return stmt
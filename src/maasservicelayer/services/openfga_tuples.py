@@ -5,6 +5,7 @@ from dataclasses import dataclass
 
 from maascommon.openfga.async_client import OpenFGAClient
 from maascommon.openfga.base import OpenFGAEntitlementResourceType
+from maascommon.openfga.cache import DECISION_CACHE
 from maasservicelayer.builders.openfga_tuple import OpenFGATupleBuilder
 from maasservicelayer.context import Context
 from maasservicelayer.db.filters import QuerySpec
@@ -168,10 +169,23 @@ class OpenFGATupleService(Service):
     async def get_many(self, query: QuerySpec) -> list[OpenFGATuple]:
         return await self.openfga_tuple_repository.get_many(query)
 
+    async def _invalidate_decision_cache(self) -> None:
+        DECISION_CACHE.invalidate()
+
+    def _invalidate_decision_cache_on_commit(self) -> None:
+        # Invalidating before the commit would let a concurrent check cache
+        # the decision again from the old tuples. Other processes are
+        # notified by the openfga_tuple trigger once the change is committed.
+        hook = self._invalidate_decision_cache
+        if hook not in self.context.get_post_commit_hooks():
+            self.context.add_post_commit_hook(hook)
+
     async def upsert(self, builder: OpenFGATupleBuilder) -> OpenFGATuple:
+        self._invalidate_decision_cache_on_commit()
         return await self.openfga_tuple_repository.upsert(builder)
 
     async def delete_many(self, query: QuerySpec) -> None:
+        self._invalidate_decision_cache_on_commit()
         return await self.openfga_tuple_repository.delete_many(query)
 
     async def delete_pool(self, pool_id: int) -> None:
@@ -258,6 +272,7 @@ class OpenFGATupleService(Service):
             OpenFGATupleBuilder.build_user_member_group(user_id, group_id)
             for user_id in user_ids
         ]
+        self._invalidate_decision_cache_on_commit()
         await self.openfga_tuple_repository.bulk_upsert(builders)
 
     async def list_entitlements(
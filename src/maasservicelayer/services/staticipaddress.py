@@ -18,6 +18,7 @@ from maasservicelayer.db.repositories.dnsresources import (
 from maasservicelayer.db.repositories.staticipaddress import (
     StaticIPAddressRepository,
 )
+from maasservicelayer.models.dnsresources import DNSResource
 from maasservicelayer.models.fields import MacAddress
 from maasservicelayer.models.interfaces import Interface
 from maasservicelayer.models.staticipaddress import StaticIPAddress
@@ -67,7 +68,18 @@ class StaticIPAddressService(
     async def post_update_many_hook(
         self, resources: List[StaticIPAddress]
     ) -> None:
-        raise NotImplementedError("Not implemented yet.")
+        static_ip_addr_ids = [
+            resource.id
+            for resource in resources
+            if resource.alloc_type != IpAddressType.DISCOVERED
+        ]
+        if static_ip_addr_ids:
+            self.temporal_service.register_or_update_workflow_call(
+                CONFIGURE_DHCP_WORKFLOW_NAME,
+                ConfigureDHCPParam(static_ip_addr_ids=static_ip_addr_ids),
+                parameter_merge_func=merge_configure_dhcp_param,
+                wait=False,
+            )
 
     async def create_or_update(
         self, builder: StaticIPAddressBuilder
@@ -103,10 +115,16 @@ class StaticIPAddressService(
             staticipaddress_id=resource_to_be_deleted.id
         )
 
-        if not dnsresources_to_cleanup:
+        await self._cleanup_dnsresources(dnsresources_to_cleanup)
+
+    async def _cleanup_dnsresources(
+        self, dnsresources: List[DNSResource]
+    ) -> None:
+        """Delete the `dnsresources` left without IPs nor DNS data."""
+        if not dnsresources:
             return
 
-        dnsresource_ids = [dnsrr.id for dnsrr in dnsresources_to_cleanup]
+        dnsresource_ids = [dnsrr.id for dnsrr in dnsresources]
         orphaned_ids = (
             await self.dnsresources_service.get_dnsresources_without_ips(
                 dnsresource_ids
@@ -138,10 +156,44 @@ class StaticIPAddressService(
                 wait=False,
             )
 
+    async def pre_delete_many_hook(
+        self, resources: List[StaticIPAddress]
+    ) -> None:
+        # Same as `pre_delete_hook`, for all the resources at once.
+        staticipaddress_ids = [resource.id for resource in resources]
+        if not staticipaddress_ids:
+            return
+        dnsresources_to_cleanup = (
+            await self.dnsresources_service.get_dnsresources_for_ips(
+                staticipaddress_ids
+            )
+        )
+
+        await self.repository.unlink_many_from_interfaces(staticipaddress_ids)
+        await self.dnsresources_service.unlink_ips_from_all_dnsresources(
+            staticipaddress_ids
+        )
+
+        await self._cleanup_dnsresources(dnsresources_to_cleanup)
+
     async def post_delete_many_hook(
         self, resources: List[StaticIPAddress]
     ) -> None:
-        raise NotImplementedError("Not implemented yet.")
+        subnet_ids = sorted(
+            {
+                resource.subnet_id
+                for resource in resources
+                if resource.alloc_type != IpAddressType.DISCOVERED
+                and resource.subnet_id is not None
+            }
+        )
+        if subnet_ids:
+            self.temporal_service.register_or_update_workflow_call(
+                CONFIGURE_DHCP_WORKFLOW_NAME,
+                ConfigureDHCPParam(subnet_ids=subnet_ids),
+                parameter_merge_func=merge_configure_dhcp_param,
+                wait=False,
+            )
 
     async def get_discovered_ips_in_family_for_interfaces(
         self,
@@ -1,8 +1,8 @@
-# Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+# Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
 from ipaddress import IPv4Address, IPv6Address
-from typing import List
+from typing import Iterable, List
 
 from maascommon.enums.dns import DnsUpdateAction
 from maascommon.enums.ipaddress import IpAddressType
@@ -89,6 +89,11 @@ class SubnetsService(BaseService[Subnet, SubnetsRepository, SubnetBuilder]):
     ) -> Subnet | None:
         return await self.repository.find_best_subnet_for_ip(ip)
 
+    async def find_best_subnets_for_ips(
+        self, ips: Iterable[IPv4Address | IPv6Address]
+    ) -> dict[IPv4Address | IPv6Address, Subnet]:
+        return await self.repository.find_best_subnets_for_ips(ips)
+
     async def _validate_cidr(
         self, existing_resource: Subnet | None, builder: SubnetBuilder
     ):
@@ -3,10 +3,14 @@
 
 from typing import override
 
+from temporalio.common import WorkflowIDReusePolicy
+
 from maascommon.enums.events import EventTypeEnum
 from maascommon.workflows.tag import (
-    TAG_EVALUATION_WORKFLOW_NAME,
-    TagEvaluationParam,
+    TagDefinition,
+    tags_evaluation_workflow_id,
+    TAGS_EVALUATION_WORKFLOW_NAME,
+    TagsEvaluationParam,
 )
 from maasservicelayer.builders.tags import TagBuilder
 from maasservicelayer.context import Context
@@ -35,10 +39,12 @@ class TagsService(BaseService[Tag, TagsRepository, TagBuilder]):
 
     async def _start_tag_evaluation_wf(self, tag: Tag) -> None:
         if tag.definition != "":
+            tags = [TagDefinition(tag.id, tag.definition)]
             return self.temporal_service.register_workflow_call(
-                workflow_name=TAG_EVALUATION_WORKFLOW_NAME,
-                workflow_id="tag-evaluation",
-                parameter=TagEvaluationParam(tag.id, tag.definition),
+                workflow_name=TAGS_EVALUATION_WORKFLOW_NAME,
+                workflow_id=tags_evaluation_workflow_id(tags),
+                parameter=TagsEvaluationParam(tags),
+                id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
             )
 
     @override
@@ -0,0 +1,39 @@
+#  Copyright 2026 Canonical Ltd.  This software is licensed under the
+#  GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Opaque tokens for keyset (cursor) pagination."""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from maasservicelayer.exceptions.catalog import ValidationException
+
+
+def encode_cursor(sort_key: str, value: Any) -> str:
+    """Encode the sort key and the last value seen on a page into a token."""
+    payload = json.dumps({"k": sort_key, "v": value}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_key: str, value_type: type) -> Any:
+    """Decode a token built by `encode_cursor` for the given sort key.
+
+    Raises:
+        ValidationException: if the token is malformed, was built for a
+            different sort key or doesn't hold a `value_type` value.
+    """
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, value = payload["k"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        key, value = None, None
+    if key != sort_key or not isinstance(value, value_type):
+        raise ValidationException.build_for_field(
+            field="token",
+            message="The pagination token is not valid.",
+            location="query",
+        )
+    return value
@@ -6,13 +6,15 @@
 from __future__ import annotations
 
 import asyncio
-from contextlib import asynccontextmanager, contextmanager
+from contextlib import asynccontextmanager, contextmanager, suppress
+from dataclasses import asdict, dataclass, replace
 import hashlib
 from io import BufferedWriter
+import json
 import os
 import shutil
 import tarfile
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator, Awaitable, Callable, Generator
 
 import aiofiles
 import aiofiles.os
@@ -39,6 +41,112 @@ class LocalStoreAllocationFail(LocalStoreException):
     """Could not allocate space for this file"""
 
 
+@dataclass
+class DownloadProgress:
+    """Progress of a boot resource file being downloaded in parts.
+
+    The file is split in parts of `part_size` bytes (the last one can be
+    shorter), and `done` holds how many bytes of each part are stored on
+    disk, so that each part can be resumed independently.
+    """
+
+    sha256: str
+    total_size: int
+    part_size: int
+    done: list[int]
+
+    @classmethod
+    def start(
+        cls, sha256: str, total_size: int, part_size: int
+    ) -> DownloadProgress:
+        part_size = max(1, min(part_size, total_size))
+        parts = max(1, -(-total_size // part_size))
+        return cls(sha256, total_size, part_size, [0] * parts)
+
+    def part_range(self, index: int) -> tuple[int, int]:
+        """Return the start and end (exclusive) offsets of a part."""
+        start = index * self.part_size
+        return start, min(start + self.part_size, self.total_size)
+
+    def mark_downloaded(self, start: int, end: int) -> None:
+        """Record that the bytes from `start` to `end` (exclusive) are stored.
+
+        The bytes only count for a part if they extend what's already done
+        for it, since `done` is the size of the downloaded prefix.
+        """
+        for index in range(start // self.part_size, len(self.done)):
+            part_start, part_end = self.part_range(index)
+            if part_start >= end:
+                break
+            if start <= part_start + self.done[index]:
+                self.done[index] = max(
+                    self.done[index], min(end, part_end) - part_start
+                )
+
+    def part_complete(self, index: int) -> bool:
+        start, end = self.part_range(index)
+        return self.done[index] >= end - start
+
+    @property
+    def pending_parts(self) -> list[int]:
+        return [
+            index
+            for index in range(len(self.done))
+            if not self.part_complete(index)
+        ]
+
+    @property
+    def downloaded(self) -> int:
+        return sum(self.done)
+
+    @property
+    def complete(self) -> bool:
+        return self.downloaded == self.total_size
+
+
+class PartsWriter:
+    """Writes data at arbitrary offsets of a file.
+
+    Each write is positional (`pwrite`), so that the parts of a file can be
+    written concurrently without sharing a file position.
+    """
+
+    def __init__(
+        self,
+        fd: int,
+        progress: DownloadProgress,
+        save_progress: Callable[[DownloadProgress], Awaitable[None]],
+    ) -> None:
+        self._fd = fd
+        self._progress = progress
+        self._save_progress = save_progress
+        self._lock = asyncio.Lock()
+
+    async def write(self, offset: int, data: bytes) -> None:
+        loop = asyncio.get_running_loop()
+        view = memoryview(data)
+        while view:
+            written = await loop.run_in_executor(
+                None, os.pwrite, self._fd, view, offset
+            )
+            view = view[written:]
+            offset += written
+
+    async def sync(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, os.fsync, self._fd
+        )
+
+    async def checkpoint(self) -> None:
+        """Flush the written data to disk and save the progress, so that
+        the download can be resumed from here."""
+        async with self._lock:
+            # Only what has been written before syncing is durable.
+            snapshot = replace(self._progress, done=list(self._progress.done))
+            await self.sync()
+            await self._save_progress(snapshot)
+
+
 class SyncLocalBootResourceFile:
     def __init__(
         self,
@@ -57,6 +165,7 @@ class SyncLocalBootResourceFile:
         self.filename_on_disk = filename_on_disk
         self.total_size = total_size
         self.path = get_bootresource_store_path() / self.filename_on_disk
+        self.progress_path = self.path.with_name(f"{self.path.name}.progress")
 
     def __repr__(self):
         return f"<SyncLocalBootResourceFile {self.sha256} {self.filename_on_disk} {self.size}/{self.total_size}>"
@@ -70,6 +179,9 @@ class SyncLocalBootResourceFile:
 
     @property
     def complete(self) -> bool:
+        if self.progress_path.exists():
+            # Partial download, see `AsyncLocalBootResourceFile.store_parts`
+            return False
         return self.size == self.total_size
 
     @property
@@ -143,10 +255,11 @@ class SyncLocalBootResourceFile:
             )
 
     def unlink(self):
-        try:
-            os.unlink(self.path)
-        except FileNotFoundError:
-            pass
+        for path in (self.path, self.progress_path):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
 
 
 class AsyncLocalBootResourceFile:
@@ -167,6 +280,8 @@ class AsyncLocalBootResourceFile:
         self.filename_on_disk = filename_on_disk
         self.total_size = total_size
         self.path = get_bootresource_store_path() / self.filename_on_disk
+        # Tracks the progress of a partial download of the file.
+        self.progress_path = self.path.with_name(f"{self.path.name}.progress")
 
     async def size(self) -> int:
         try:
@@ -176,6 +291,10 @@ class AsyncLocalBootResourceFile:
 
     async def complete(self):
         """`content` has been completely saved."""
+        if await aiofiles.os.path.exists(self.progress_path):
+            # The file is allocated to its full size, but the download
+            # hasn't finished yet.
+            return False
         return await self.size() == self.total_size
 
     async def valid(self) -> bool:
@@ -231,6 +350,98 @@ class AsyncLocalBootResourceFile:
             await self.unlink()
             raise LocalStoreInvalidHash()
 
+    async def load_progress(self, part_size: int) -> DownloadProgress:
+        """Return the progress of a previous partial download of the file.
+
+        If there's no usable progress, a new one is started, split in parts
+        of `part_size` bytes.
+        """
+        expected = DownloadProgress.start(
+            self.sha256, self.total_size, part_size
+        )
+        try:
+            async with aiofiles.open(self.progress_path, "r") as f:
+                progress = DownloadProgress(**json.loads(await f.read()))
+        except (OSError, ValueError, TypeError):
+            return expected
+        if (
+            progress.sha256,
+            progress.total_size,
+            progress.part_size,
+            len(progress.done),
+        ) != (
+            expected.sha256,
+            expected.total_size,
+            expected.part_size,
+            len(expected.done),
+        ):
+            return expected
+        for index, done in enumerate(progress.done):
+            start, end = progress.part_range(index)
+            if not 0 <= done <= end - start:
+                return expected
+        if await self.size() != self.total_size:
+            return expected
+        return progress
+
+    async def save_progress(self, progress: DownloadProgress) -> None:
+        tmp_path = self.progress_path.with_name(
+            f"{self.progress_path.name}.tmp"
+        )
+        async with aiofiles.open(tmp_path, "w") as f:
+            await f.write(json.dumps(asdict(progress)))
+        await aiofiles.os.replace(tmp_path, self.progress_path)
+
+    @asynccontextmanager
+    async def store_parts(
+        self, progress: DownloadProgress
+    ) -> AsyncGenerator[PartsWriter]:
+        """Store file parts in the local disk (async)
+
+        Yields a writer for storing data at any offset of the file. Progress
+        is saved on exit, so that an interrupted download can be resumed with
+        `load_progress`. Once all the parts are stored, it checks whether the
+        SHA matches.
+
+        Raises:
+            LocalStoreInvalidHash: SHA256 checksum failed
+            LocalStoreAllocationFail: no sufficient free disk space
+            LocalStoreFileSizeMismatch: content written doesn't match the expected total size
+        Yields:
+            The writer for the file.
+        """
+        if progress.downloaded == 0:
+            st = await aiofiles.os.statvfs(self.path.parent)
+            free = st.f_bavail * st.f_frsize
+            if free < self.total_size:
+                raise LocalStoreAllocationFail()
+            # Mark the file as partial before allocating it.
+            await self.save_progress(progress)
+            async with aiofiles.open(self.path, "wb") as file:
+                await file.truncate(self.total_size)
+
+        fd = os.open(self.path, os.O_WRONLY)
+        writer = PartsWriter(fd, progress, self.save_progress)
+        try:
+            yield writer
+            await writer.sync()
+        except BaseException:
+            # Keep what has been downloaded so far. If the disk is failing,
+            # the progress can't be saved, and the download starts over.
+            with suppress(OSError):
+                await writer.checkpoint()
+            raise
+        finally:
+            os.close(fd)
+
+        if not progress.complete:
+            await self.unlink()
+            raise LocalStoreFileSizeMismatch()
+        await self._unlink_progress()
+        if not await self.valid():
+            await self.unlink()
+            raise LocalStoreInvalidHash()
+
     async def extract_file(self, extract_path: str):
         def sync_extract_file():
             store = get_bootresource_store_path()
@@ -251,3 +462,10 @@ class AsyncLocalBootResourceFile:
             await aiofiles.os.unlink(self.path)
         except FileNotFoundError:
             pass
+        await self._unlink_progress()
+
+    async def _unlink_progress(self):
+        try:
+            await aiofiles.os.unlink(self.progress_path)
+        except FileNotFoundError:
+            pass
@@ -86,6 +86,7 @@ from maastemporalworker.workflow.power import (
 from maastemporalworker.workflow.tag_evaluation import (
     TagEvaluationActivity,
     TagEvaluationWorkflow,
+    TagsEvaluationWorkflow,
 )
 from maastemporalworker.workflow.utils import async_retry
 from provisioningserver.utils.env import MAAS_ID
@@ -244,6 +245,7 @@ async def main() -> None:
                 PowerResetWorkflow,
                 # Tag Evaluation workflows
                 TagEvaluationWorkflow,
+                TagsEvaluationWorkflow,
                 # Operation reconciliation workflows
                 ReconcileOperationsWorkflow,
             ],
@@ -298,6 +300,7 @@ async def main() -> None:
                 msm_activity.report_config_progress,
                 # Tag evaluation activities
                 tag_evaluation_activity.evaluate_tag,
+                tag_evaluation_activity.evaluate_tags,
                 # Power state activities
                 power_activity.set_power_state,
                 # Operation status tracking activities
@@ -5,7 +5,8 @@ import asyncio
 from contextlib import suppress
 from dataclasses import replace
 from datetime import datetime, timedelta, timezone
-from typing import Any, Coroutine
+from functools import partial
+from typing import Any, Awaitable, Callable, Coroutine
 
 import httpx
 import structlog
@@ -42,6 +43,8 @@ from maascommon.workflows.bootresource import (
     DeletePendingFilesParam,
     DISK_TIMEOUT,
     DOWNLOAD_BOOTRESOURCE_WORKFLOW_NAME,
+    DOWNLOAD_CHECKPOINT_SIZE,
+    DOWNLOAD_PART_SIZE,
     DOWNLOAD_TIMEOUT,
     FETCH_IMAGE_METADATA_TIMEOUT,
     FETCH_MANIFEST_AND_UPDATE_CACHE_WORKFLOW_NAME,
@@ -50,6 +53,7 @@ from maascommon.workflows.bootresource import (
     GetLocalBootResourcesParamReturnValue,
     HEARTBEAT_TIMEOUT,
     MASTER_IMAGE_SYNC_WORKFLOW_NAME,
+    MAX_PARALLEL_PARTS,
     MAX_SOURCES,
     POST_UPDATE_BOOT_SOURCE_URL_WORKFLOW_NAME,
     PostUpdateBootSourceUrlParam,
@@ -94,9 +98,11 @@ from maasservicelayer.models.configurations import MAASUrlConfig
 from maasservicelayer.utils.buffer import ChunkBuffer
 from maasservicelayer.utils.image_local_files import (
     AsyncLocalBootResourceFile,
+    DownloadProgress,
     LocalStoreAllocationFail,
     LocalStoreFileSizeMismatch,
     LocalStoreInvalidHash,
+    PartsWriter,
 )
 from maastemporalworker.worker import REGION_TASK_QUEUE
 from maastemporalworker.workflow.activity import ActivityBase
@@ -135,6 +141,10 @@ DELETE_NOTIFICATION_ACTIVITY_NAME = "delete-notification"
 logger = structlog.get_logger()
 
 
+class RangeNotSupported(Exception):
+    """The server ignored the Range header of a request."""
+
+
 class BootResourcesActivity(ActivityBase):
     async def init(self, region_id: str):
         self.region_id = region_id
@@ -231,6 +241,95 @@ class BootResourcesActivity(ActivityBase):
                     )
         return regions_endpoints
 
+    async def _download_part(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        store: PartsWriter,
+        progress: DownloadProgress,
+        index: int,
+        on_data: Callable[[], Awaitable[None]],
+        ranges_supported: asyncio.Event,
+    ) -> None:
+        """Download the missing bytes of a part of the file from `url`.
+
+        Raises:
+            RangeNotSupported: the server sent the whole file instead of the
+                requested range. Nothing is read from the response.
+        """
+        start, end = progress.part_range(index)
+        offset = start + progress.done[index]
+        whole_file = offset == 0 and end == progress.total_size
+        if whole_file:
+            request = client.stream("GET", url)
+        else:
+            request = client.stream(
+                "GET", url, headers={"Range": f"bytes={offset}-{end - 1}"}
+            )
+        async with request as response:
+            response.raise_for_status()
+            if not whole_file:
+                if response.status_code != httpx.codes.PARTIAL_CONTENT:
+                    raise RangeNotSupported(url)
+                ranges_supported.set()
+            await self._store_response(
+                response, store, progress, offset, end, on_data
+            )
+
+    async def _download_file(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        store: PartsWriter,
+        progress: DownloadProgress,
+        on_data: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Download the whole file from `url` in a single stream."""
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            await self._store_response(
+                response, store, progress, 0, progress.total_size, on_data
+            )
+
+    async def _store_response(
+        self,
+        response: httpx.Response,
+        store: PartsWriter,
+        progress: DownloadProgress,
+        offset: int,
+        end: int,
+        on_data: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Store the body of `response` from `offset` up to `end`."""
+        # Buffer the chunks coming from the requests up to 4MB and then
+        # flush to the disk. This ensures that we keep sending the heartbeat
+        # and we do not pay the overhead of writing very small chunks
+        # to the disk every time.
+        CHUNK_SIZE = 4 * 1024 * 1024  # 4 MB
+        chunk_buffer = ChunkBuffer(CHUNK_SIZE)
+        unsaved = 0
+
+        async def flush() -> None:
+            nonlocal offset, unsaved
+            data = chunk_buffer.get_and_reset()
+            if offset + len(data) > end:
+                raise LocalStoreFileSizeMismatch()
+            await store.write(offset, data)
+            progress.mark_downloaded(offset, offset + len(data))
+            offset += len(data)
+            unsaved += len(data)
+            if unsaved >= DOWNLOAD_CHECKPOINT_SIZE:
+                await store.checkpoint()
+                unsaved = 0
+
+        async for chunk in response.aiter_bytes():
+            activity.heartbeat("Downloaded chunk")
+            await on_data()
+            if chunk_buffer.append_and_check(chunk):
+                await flush()
+        if not chunk_buffer.is_empty():
+            await flush()
+
     @activity_defn_with_context(name=DOWNLOAD_BOOTRESOURCEFILE_ACTIVITY_NAME)
     async def download_bootresourcefile(
         self, param: ResourceDownloadParam
@@ -244,10 +343,11 @@ class BootResourcesActivity(ActivityBase):
             param.sha256, param.filename_on_disk, param.total_size
         )
 
-        url = param.source_list[
-            activity.info().attempt % len(param.source_list)
-        ]
-        logger.debug(f"Downloading from {url}")
+        # Start from a different source on each attempt, so that a broken
+        # source doesn't fail all of them.
+        first = activity.info().attempt % len(param.source_list)
+        sources = param.source_list[first:] + param.source_list[:first]
+        progress = None
 
         try:
             if await lfile.valid():
@@ -258,37 +358,102 @@ class BootResourcesActivity(ActivityBase):
                 await self.report_progress(param.rfile_ids, lfile.total_size)
                 return True
 
-            headers = await self._get_extra_http_headers(url)
+            progress = await lfile.load_progress(DOWNLOAD_PART_SIZE)
+            pending = progress.pending_parts
+            if progress.downloaded:
+                logger.info(
+                    f"resuming download, {len(pending)} parts left "
+                    f"({progress.downloaded}/{progress.total_size} bytes)"
+                )
+            workers = min(MAX_PARALLEL_PARTS, len(pending))
+            clients: dict[str, httpx.AsyncClient] = {}
+            last_update = datetime.now(timezone.utc)
+            # Set once a server has answered a range request, so that the
+            # parts aren't all requested from a server ignoring Range.
+            ranges_supported = asyncio.Event()
+
+            async def report_download_progress() -> None:
+                nonlocal last_update
+                dt_now = datetime.now(timezone.utc)
+                if dt_now > (last_update + REPORT_INTERVAL):
+                    last_update = dt_now
+                    await self.report_progress(
+                        param.rfile_ids, progress.downloaded
+                    )
 
-            async with (
-                self.apiclient.make_client(param.http_proxy, headers).stream(
-                    "GET", url
-                ) as response,
-                lfile.store() as store,
-            ):
-                response.raise_for_status()
-                last_update = datetime.now(timezone.utc)
-
-                # Buffer the chunks coming from the requests up to 4MB and then
-                # flush to the disk. This ensures that we keep sending the heartbeat
-                # and we do not pay the overhead of writing very small chunks
-                # to the disk every time.
-                CHUNK_SIZE = 4 * 1024 * 1024  # 4 MB
-                chunk_buffer = ChunkBuffer(CHUNK_SIZE)
-
-                async for chunk in response.aiter_bytes():
-                    activity.heartbeat("Downloaded chunk")
-                    dt_now = datetime.now(timezone.utc)
-                    if dt_now > (last_update + REPORT_INTERVAL):
-                        await self.report_progress(
-                            param.rfile_ids, await store.tell()
+            async def from_sources(
+                first: int,
+                download: Callable[
+                    [httpx.AsyncClient, str], Coroutine[Any, Any, None]
+                ],
+            ) -> None:
+                # Try the other sources when one answers with an error.
+                error = None
+                for n in range(len(sources)):
+                    url = sources[(first + n) % len(sources)]
+                    if url not in clients:
+                        headers = await self._get_extra_http_headers(url)
+                        clients[url] = self.apiclient.make_client(
+                            param.http_proxy, headers
                         )
-                        last_update = dt_now
-                    needs_flushing = chunk_buffer.append_and_check(chunk)
-                    if needs_flushing:
-                        await store.write(chunk_buffer.get_and_reset())
-                if not chunk_buffer.is_empty():
-                    await store.write(chunk_buffer.get_and_reset())
+                    try:
+                        await download(clients[url], url)
+                    except httpx.HTTPStatusError as ex:
+                        logger.warning(f"Failed to download from {url}: {ex}")
+                        error = ex
+                    else:
+                        return
+                assert error is not None
+                raise error
+
+            async def download_parts(store: PartsWriter, first: bool) -> None:
+                if not first:
+                    await ranges_supported.wait()
+                while pending:
+                    index = pending.pop(0)
+                    logger.debug(f"Downloading part {index}")
+                    # spread the parts across the sources
+                    await from_sources(
+                        index,
+                        partial(
+                            self._download_part,
+                            store=store,
+                            progress=progress,
+                            index=index,
+                            on_data=report_download_progress,
+                            ranges_supported=ranges_supported,
+                        ),
+                    )
+
+            async with lfile.store_parts(progress) as store:
+                tasks = [
+                    asyncio.create_task(download_parts(store, n == 0))
+                    for n in range(workers)
+                ]
+                try:
+                    await asyncio.gather(*tasks)
+                except RangeNotSupported as ex:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    logger.warning(
+                        f"{ex} doesn't support range requests, "
+                        "downloading the whole file"
+                    )
+                    await from_sources(
+                        0,
+                        partial(
+                            self._download_file,
+                            store=store,
+                            progress=progress,
+                            on_data=report_download_progress,
+                        ),
+                    )
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    raise
 
             activity.heartbeat("Download finished")
 
@@ -308,6 +473,7 @@ class BootResourcesActivity(ActivityBase):
                 "No space left on disk", non_retryable=True
             ) from e
         except LocalStoreFileSizeMismatch as e:
+            await lfile.unlink()
             await self.report_progress(param.rfile_ids, 0)
             raise ApplicationError(
                 "Downloaded file size does not match expected size"
@@ -329,18 +495,36 @@ class BootResourcesActivity(ActivityBase):
             ) from ex
 
         except httpx.HTTPError as ex:
-            await lfile.unlink()
-            await self.report_progress(param.rfile_ids, 0)
+            if (
+                isinstance(ex, httpx.HTTPStatusError)
+                and ex.response.status_code
+                == httpx.codes.REQUESTED_RANGE_NOT_SATISFIABLE
+            ):
+                # the partial download doesn't match the source anymore,
+                # start over.
+                await lfile.unlink()
+                await self.report_progress(param.rfile_ids, 0)
+                raise ApplicationError(
+                    str(ex), type=ex.__class__.__name__
+                ) from ex
+            # Keep what has been downloaded, the next attempt resumes from
+            # there.
+            await self.report_progress(
+                param.rfile_ids, progress.downloaded if progress else 0
+            )
             if isinstance(ex, httpx.HTTPStatusError):
-                # 4xx and 5xx errors: most probably a misconfiguration of the images stream.
+                # 4xx and 5xx errors from all the sources: most probably a misconfiguration of the images stream.
                 # Raise a non-retryable error and let the user fix it.
                 raise ApplicationError(
                     str(ex), type=ex.__class__.__name__, non_retryable=True
                 ) from ex
             raise ApplicationError(str(ex), type=ex.__class__.__name__) from ex
         except (asyncio.CancelledError, CancelledError) as ex:
-            await lfile.unlink()
-            await self.report_progress(param.rfile_ids, 0)
+            # Keep what has been downloaded: the activity is cancelled also
+            # when heartbeats time out, and it's retried afterwards.
+            await self.report_progress(
+                param.rfile_ids, progress.downloaded if progress else 0
+            )
             # re-raise it as it is since temporal will propagate this to the parent wf
             raise ex
 
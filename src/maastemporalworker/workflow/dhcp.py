@@ -10,17 +10,19 @@ from typing import Optional
 from sqlalchemy import and_, or_, select, true
 from sqlalchemy.ext.asyncio import AsyncConnection
 from temporalio import workflow
-from temporalio.common import WorkflowIDReusePolicy
-from temporalio.exceptions import WorkflowAlreadyStartedError
+from temporalio.exceptions import FailureError, WorkflowAlreadyStartedError
+from temporalio.workflow import ParentClosePolicy
 
 from maascommon.enums.ipaddress import IpAddressType
 from maascommon.enums.ipranges import IPRangeType
 from maascommon.enums.node import NodeTypeEnum
 from maascommon.workflows.dhcp import (
+    CONFIGURE_DHCP_FOR_AGENT_SIGNAL_NAME,
     CONFIGURE_DHCP_FOR_AGENT_WORKFLOW_NAME,
     CONFIGURE_DHCP_WORKFLOW_NAME,
     ConfigureDHCPForAgentParam,
     ConfigureDHCPParam,
+    merge_configure_dhcp_for_agent_param,
 )
 from maasservicelayer.db.filters import QuerySpec
 from maasservicelayer.db.repositories.domains import DomainsClauseFactory
@@ -62,6 +64,11 @@ GET_OMAPI_KEY_TIMEOUT = timedelta(minutes=5)
 APPLY_DHCP_CONFIG_VIA_OMAPI_TIMEOUT = timedelta(minutes=5)
 RESTART_DHCP_SERVICE_TIMEOUT = timedelta(minutes=5)
 
+# Changes for an agent received within this window are applied at once.
+DHCP_UPDATE_COALESCE_WINDOW = timedelta(seconds=2)
+# The workflow for an agent completes after being idle for this long.
+DHCP_UPDATE_IDLE_TIMEOUT = timedelta(minutes=10)
+
 # Activities names
 FIND_AGENTS_FOR_UPDATE_ACTIVITY_NAME = "find-agents-for-update"
 FETCH_HOSTS_FOR_UPDATE_ACTIVITY_NAME = "fetch-hosts-for-update"
@@ -791,6 +798,30 @@ class DHCPConfigActivity(ActivityBase):
 
 @workflow.defn(name=CONFIGURE_DHCP_FOR_AGENT_WORKFLOW_NAME, sandboxed=False)
 class ConfigureDHCPForAgentWorkflow:
+    """Apply the DHCP changes for an agent.
+
+    There is one workflow per agent, with the ID `configure-dhcp:{system_id}`.
+    While it runs, further changes are sent to it with the
+    `CONFIGURE_DHCP_FOR_AGENT_SIGNAL_NAME` signal, and the changes received
+    within `DHCP_UPDATE_COALESCE_WINDOW` are applied at once. The workflow
+    completes when no change is received for `DHCP_UPDATE_IDLE_TIMEOUT`.
+    """
+
+    def __init__(self) -> None:
+        self._pending: ConfigureDHCPForAgentParam | None = None
+
+    @workflow.signal(name=CONFIGURE_DHCP_FOR_AGENT_SIGNAL_NAME)
+    async def update_signal(self, param: ConfigureDHCPForAgentParam) -> None:
+        self._queue(param)
+
+    def _queue(self, param: ConfigureDHCPForAgentParam) -> None:
+        if self._pending is None:
+            self._pending = param
+        else:
+            self._pending = merge_configure_dhcp_for_agent_param(
+                self._pending, param
+            )
+
     async def _run_internal(self, param: ConfigureDHCPForAgentParam) -> None:
         data = await workflow.execute_activity(
             "get_dhcp_data_for_agent",
@@ -809,27 +840,29 @@ class ConfigureDHCPForAgentWorkflow:
             start_to_close_timeout=FETCH_HOSTS_FOR_UPDATE_TIMEOUT,
         )
 
-    @workflow_run_with_context
-    async def run(self, param: ConfigureDHCPForAgentParam) -> None:
+    async def _apply(self, param: ConfigureDHCPForAgentParam) -> None:
         if os.environ.get("MAAS_INTERNAL_DHCP") == "1":
             await self._run_internal(param)
             return
         # When dhcpd restarts the static leases are lost unless they are present in the dhcpd config. This is why in every
         # scenario we want to update the dhcpd config.
-        await workflow.execute_activity(
+        # The agent doesn't write the config when it didn't change, and
+        # returns whether it did. Older agents return nothing.
+        changed = await workflow.execute_activity(
             APPLY_DHCP_CONFIG_VIA_FILE_ACTIVITY_NAME,
             task_queue=f"{param.system_id}@agent:main",
             start_to_close_timeout=APPLY_DHCP_CONFIG_VIA_FILE_TIMEOUT,
         )
         if param.full_reload:
-            await workflow.execute_activity(
-                RESTART_DHCP_SERVICE_ACTIVITY_NAME,
-                task_queue=f"{param.system_id}@agent:main",
-                start_to_close_timeout=RESTART_DHCP_SERVICE_TIMEOUT,
-            )
+            if changed is not False:
+                await workflow.execute_activity(
+                    RESTART_DHCP_SERVICE_ACTIVITY_NAME,
+                    task_queue=f"{param.system_id}@agent:main",
+                    start_to_close_timeout=RESTART_DHCP_SERVICE_TIMEOUT,
+                )
             # TODO call get_active_interfaces_for_agent and set config
             # directly on the agent
-        else:
+        elif param.static_ip_addr_ids or param.reserved_ip_ids:
             hosts = await workflow.execute_activity(
                 FETCH_HOSTS_FOR_UPDATE_ACTIVITY_NAME,
                 FetchHostsForUpdateParam(
@@ -855,9 +888,54 @@ class ConfigureDHCPForAgentWorkflow:
                 start_to_close_timeout=APPLY_DHCP_CONFIG_VIA_OMAPI_TIMEOUT,
             )
 
+    @workflow_run_with_context
+    async def run(self, param: ConfigureDHCPForAgentParam) -> None:
+        self._queue(param)
+        while self._pending is not None:
+            # Wait for more changes, so that they are applied at once.
+            await workflow.sleep(DHCP_UPDATE_COALESCE_WINDOW)
+            pending, self._pending = self._pending, None
+            await self._apply(pending)
+            try:
+                await workflow.wait_condition(
+                    lambda: self._pending is not None,
+                    timeout=DHCP_UPDATE_IDLE_TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                # A change might have been received along with the timeout.
+                continue
+            if workflow.info().is_continue_as_new_suggested():
+                workflow.continue_as_new(self._pending)
+
 
 @workflow.defn(name=CONFIGURE_DHCP_WORKFLOW_NAME, sandboxed=False)
 class ConfigureDHCPWorkflow:
+    async def _configure_agent(
+        self, param: ConfigureDHCPForAgentParam
+    ) -> None:
+        workflow_id = f"configure-dhcp:{param.system_id}"
+        while True:
+            try:
+                await workflow.start_child_workflow(
+                    CONFIGURE_DHCP_FOR_AGENT_WORKFLOW_NAME,
+                    param,
+                    id=workflow_id,
+                    parent_close_policy=ParentClosePolicy.ABANDON,
+                )
+                return
+            except WorkflowAlreadyStartedError:
+                pass
+            # Signals are processed in the order they are received, so the
+            # change is merged with the ones still pending for the agent.
+            try:
+                await workflow.get_external_workflow_handle(
+                    workflow_id
+                ).signal(CONFIGURE_DHCP_FOR_AGENT_SIGNAL_NAME, param)
+                return
+            except FailureError:
+                # The workflow completed in the meantime, start a new one.
+                continue
+
     @workflow_run_with_context
     async def run(self, param: ConfigureDHCPParam) -> None:
         agent_system_ids_for_update = await workflow.execute_activity(
@@ -873,33 +951,18 @@ class ConfigureDHCPWorkflow:
             or param.ip_range_ids
         )  # determine if a config file write is needed
 
-        children = []
-
-        for system_id in agent_system_ids_for_update["agent_system_ids"]:
-            try:
-                cfg_child = await workflow.start_child_workflow(
-                    CONFIGURE_DHCP_FOR_AGENT_WORKFLOW_NAME,
+        await asyncio.gather(
+            *(
+                self._configure_agent(
                     ConfigureDHCPForAgentParam(
                         system_id=system_id,
                         full_reload=full_reload,
                         static_ip_addr_ids=param.static_ip_addr_ids,
                         reserved_ip_ids=param.reserved_ip_ids,
-                    ),
-                    id=f"configure-dhcp:{system_id}",
-                )
-            # If there is already something running, we have to fallback and turn the request into a full reload and terminate
-            # the running workflow.
-            # This is because only temporal signals are guaranteed to be processed in sequence as they arrive.
-            except WorkflowAlreadyStartedError:
-                cfg_child = await workflow.start_child_workflow(
-                    CONFIGURE_DHCP_FOR_AGENT_WORKFLOW_NAME,
-                    ConfigureDHCPForAgentParam(
-                        system_id=system_id,
-                        full_reload=True,
-                    ),
-                    id=f"configure-dhcp:{system_id}",
-                    id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
+                    )
                 )
-            children.append(cfg_child)
-
-        await asyncio.gather(*children)
+                for system_id in agent_system_ids_for_update[
+                    "agent_system_ids"
+                ]
+            )
+        )
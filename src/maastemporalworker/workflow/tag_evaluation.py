@@ -21,6 +21,15 @@ The evaluation consists in matching the tag definition against the output of
 some scripts that run during the node commissioning phase. The output of those
 scripts is expected to be in XML format, and the tag definition to be a XPath
 expression.
+
+Several tags can be evaluated at once, in a single pass over the nodes. The
+decoded output of each script result is stored as an XML document in
+maasserver_scriptresultxml the first time it is evaluated, so that later
+evaluations don't have to decode it and check it is well formed again.
+
+Evaluations of different sets of tags can run at the same time. An evaluation
+doesn't write the results of a tag whose definition has changed since it was
+started, since the evaluation of the new definition writes them instead.
 """
 
 from dataclasses import dataclass
@@ -34,7 +43,10 @@ from temporalio.common import RetryPolicy
 
 from maascommon.workflows.tag import (
     TAG_EVALUATION_WORKFLOW_NAME,
+    TagDefinition,
     TagEvaluationParam,
+    TAGS_EVALUATION_WORKFLOW_NAME,
+    TagsEvaluationParam,
 )
 from maastemporalworker.workflow.activity import ActivityBase
 from maastemporalworker.workflow.utils import (
@@ -54,6 +66,7 @@ TAG_EVALUATION_ACTIVITY_TIMEOUT = timedelta(minutes=10)
 
 # Activities names
 EVALUATE_TAG_ACTIVITY_NAME = "evaluate-tag"
+EVALUATE_TAGS_ACTIVITY_NAME = "evaluate-tags"
 
 
 # Activities parameters
@@ -65,78 +78,115 @@ class TagEvaluationResult:
 
 @workflow.defn(name=TAG_EVALUATION_WORKFLOW_NAME, sandboxed=False)
 class TagEvaluationWorkflow:
-    """Temporal workflow for tag evaluation."""
+    """Temporal workflow for tag evaluation.
+
+    Kept for the workflows started by older regions. The tag is evaluated
+    like the ones of `TagsEvaluationWorkflow`.
+    """
 
     @workflow_run_with_context
     async def run(self, param: TagEvaluationParam) -> None:
         logger.info(f"Tag (id={param.tag_id}) evaluation starts.")
         result = await workflow.execute_activity(
-            "evaluate-tag",
-            arg=param,
+            EVALUATE_TAGS_ACTIVITY_NAME,
+            arg=TagsEvaluationParam(
+                [TagDefinition(param.tag_id, param.tag_definition)],
+                batch_size=param.batch_size,
+            ),
             retry_policy=RetryPolicy(maximum_attempts=3),
             start_to_close_timeout=TAG_EVALUATION_ACTIVITY_TIMEOUT,
         )
 
-        # Handle both dict and TagEvaluationResult object cases
-        if isinstance(result, dict):
-            inserted = result.get("inserted", 0)
-            deleted = result.get("deleted", 0)
-        else:
-            inserted = result.inserted
-            deleted = result.deleted
-
+        inserted, deleted = _unpack_result(result)
         logger.info(
             f"Tag (id={param.tag_id}) evaluation ends: {inserted} nodes were tagged and {deleted} nodes were untagged"
         )
 
 
-class TagEvaluationActivity(ActivityBase):
-    """Temporal activity for tag evaluation."""
+@workflow.defn(name=TAGS_EVALUATION_WORKFLOW_NAME, sandboxed=False)
+class TagsEvaluationWorkflow:
+    """Temporal workflow for evaluating several tags at once."""
 
-    @activity_defn_with_context(name=EVALUATE_TAG_ACTIVITY_NAME)
-    async def evaluate_tag(
-        self, param: TagEvaluationParam
-    ) -> TagEvaluationResult:
-        """
-        Run the tag evaluation activity as Temporal activity.
+    @workflow_run_with_context
+    async def run(self, param: TagsEvaluationParam) -> None:
+        tag_ids = [tag.tag_id for tag in param.tags]
+        logger.info(f"Tags (ids={tag_ids}) evaluation starts.")
+        result = await workflow.execute_activity(
+            EVALUATE_TAGS_ACTIVITY_NAME,
+            arg=param,
+            retry_policy=RetryPolicy(maximum_attempts=3),
+            start_to_close_timeout=TAG_EVALUATION_ACTIVITY_TIMEOUT,
+        )
 
-        The activity takes a tag definition (XPath expression), and runs it
-        against the output of some of the scripts that capture information about
-        the node. See LSHW_OUTPUT_NAME and LLDP_OUTPUT_NAME to identify those
-        scripts.
+        inserted, deleted = _unpack_result(result)
+        logger.info(
+            f"Tags (ids={tag_ids}) evaluation ends: {inserted} node-tag pairs were added and {deleted} were removed"
+        )
 
-        If there is a match, the node-tag relation is kept in the database.
-        Otherwise, it is deleted if it was already stored (this can happen if a
-        user edit the tag).
 
-        * Batch processing
-        Considering that the tag evaluation is not a critical process in MAAS,
-        we would like to avoid that this activity keeps a database transaction
-        open for too long. In that way, critical processes can make a better use
-        of a limited number of transactions.
-        See TAG_EVALUATION_BATCH_SIZE definition for more information.
-        """
-        processed_nodes = param.batch_size
-        outputs = [{"inserted": 0, "deleted": 0}]
-        pointer = -1
+def _unpack_result(result: TagEvaluationResult | dict) -> tuple[int, int]:
+    # Handle both dict and TagEvaluationResult object cases
+    if isinstance(result, dict):
+        return result.get("inserted", 0), result.get("deleted", 0)
+    return result.inserted, result.deleted
 
-        while 0 < param.batch_size == processed_nodes:
-            async with self._start_transaction() as tx:
-                stmt = f"""
-WITH batch_nodes_cte AS (
-    /* retrieve the batch of nodes to be processed
-       The pagination is done by providing the first node ID of the batch
-       (pointer) and the batch size.
+
+# Stores the decoded output of the script results of a batch of nodes as XML
+# documents, unless it's already stored for the latest version of the result.
+# The document is NULL if the output isn't a well formed XML document, so that
+# it isn't checked again either.
+STORE_SCRIPT_RESULTS_XML_STMT = """
+INSERT INTO maasserver_scriptresultxml (script_result_id, updated, document)
+SELECT
+    msr.id
+    , msr.updated
+    , CASE
+        WHEN xml_is_well_formed_document(
+            CONVERT_FROM(DECODE(msr.stdout, 'base64'), 'UTF8')::text
+        )
+        THEN CONVERT_FROM(DECODE(msr.stdout, 'base64'), 'UTF8')::xml
+    END
+FROM
+    maasserver_node mn
+INNER JOIN maasserver_scriptset mss
+    ON mn.id = mss.node_id
+INNER JOIN maasserver_scriptresult msr
+    ON mss.id = msr.script_set_id
+LEFT JOIN maasserver_scriptresultxml msrx
+    ON msr.id = msrx.script_result_id
+WHERE 1=1
+    AND mn.id = ANY(:node_ids)
+    AND mss.id = mn.current_commissioning_script_set_id
+    AND msr.status = :status
+    AND msr.script_name = ANY(:script_names)
+    AND (msrx.script_result_id IS NULL OR msrx.updated <> msr.updated)
+ON CONFLICT (script_result_id) DO UPDATE
+SET
+    updated = EXCLUDED.updated
+    , document = EXCLUDED.document
+"""
+
+EVALUATE_TAGS_STMT = """
+WITH tags_cte AS (
+    /* the tags to evaluate, as (tag_id, definition) pairs, leaving out the
+       tags whose definition has changed since the evaluation was started: a
+       later evaluation writes their results instead. The tags are locked, so
+       that they can't change until the results are written.
     */
     SELECT
-        id
-    FROM maasserver_node
-    WHERE id > {pointer}
-    ORDER BY id
-    LIMIT {param.batch_size}
+        tags.tag_id
+        , tags.definition
+    FROM UNNEST(
+        CAST(:tag_ids AS bigint[]),
+        CAST(:tag_definitions AS text[])
+    ) AS tags(tag_id, definition)
+    INNER JOIN maasserver_tag mt
+        ON mt.id = tags.tag_id
+        AND mt.definition = tags.definition
+    FOR SHARE OF mt
 ),
-batch_nodes_to_be_evaluated_cte AS (
-    /* retrieve the nodes that:
+batch_nodes_documents_cte AS (
+    /* retrieve the XML documents of the nodes in the batch that:
        - ran the LSHW_OUTPUT_NAME, LLDP_OUTPUT_NAME scripts successfully in
          their last commissioning script set
        - have a well formed script output for the LSHW_OUTPUT_NAME,
@@ -144,29 +194,22 @@ batch_nodes_to_be_evaluated_cte AS (
     */
     SELECT
         mss.node_id
-        , msr.script_name
-        , msr.stdout
+        , msrx.document
     FROM
         maasserver_node mn
     INNER JOIN maasserver_scriptset mss
         ON mn.id = mss.node_id
     INNER JOIN maasserver_scriptresult msr
         ON mss.id = msr.script_set_id
+    INNER JOIN maasserver_scriptresultxml msrx
+        ON msr.id = msrx.script_result_id
+        AND msr.updated = msrx.updated
     WHERE 1=1
-        AND mss.node_id IN (select id from batch_nodes_cte)
+        AND mn.id = ANY(:node_ids)
         AND mss.id = mn.current_commissioning_script_set_id
-        AND msr.status = {SCRIPT_STATUS.PASSED}
-        AND msr.script_name IN {LSHW_OUTPUT_NAME, LLDP_OUTPUT_NAME}
-        AND xml_is_well_formed_document(
-            CONVERT_FROM(
-                DECODE(msr.stdout, 'base64'),
-                'UTF8'
-            )::text
-        )
-    GROUP BY
-        mss.node_id
-        , msr.script_name
-        , msr.stdout
+        AND msr.status = :status
+        AND msr.script_name = ANY(:script_names)
+        AND msrx.document IS NOT NULL
 ),
 node_tag_match_cte AS (
     /* provides the results of the tag evaluation:
@@ -177,20 +220,14 @@ node_tag_match_cte AS (
            false if there is not a node-tag match
     */
     SELECT
-        node_id
-        , {param.tag_id} AS tag_id
-        , BOOL_OR(
-            XPATH_EXISTS(
-                '{param.tag_definition}',
-                CONVERT_FROM(
-                    DECODE(stdout, 'base64'),
-                    'UTF8'
-                )::xml
-            )
-        ) AS matched
-    FROM batch_nodes_to_be_evaluated_cte
+        bndc.node_id
+        , tc.tag_id
+        , BOOL_OR(XPATH_EXISTS(tc.definition, bndc.document)) AS matched
+    FROM batch_nodes_documents_cte bndc
+    CROSS JOIN tags_cte tc
     GROUP BY
-        node_id
+        bndc.node_id
+        , tc.tag_id
 ),
 node_tag_action_cte AS (
     /* given the node-tag matching information, this CTE provides the action to
@@ -241,18 +278,96 @@ insert_rows_cte AS (
 SELECT 'deleted', count(1) FROM delete_rows_cte
 UNION
 SELECT 'inserted', count(1) FROM insert_rows_cte
-UNION
-SELECT 'processed', COALESCE(count(id), 0) FROM batch_nodes_cte
-UNION
-SELECT 'pointer', max(id) FROM batch_nodes_cte
 ;
-                """
-                cursor_result = await tx.execute(text(stmt))
-                output = {k: v for k, v in cursor_result.all()}
+"""
+
+
+class TagEvaluationActivity(ActivityBase):
+    """Temporal activity for tag evaluation."""
+
+    @activity_defn_with_context(name=EVALUATE_TAG_ACTIVITY_NAME)
+    async def evaluate_tag(
+        self, param: TagEvaluationParam
+    ) -> TagEvaluationResult:
+        """
+        Run the tag evaluation activity as Temporal activity.
+
+        The activity takes a tag definition (XPath expression), and runs it
+        against the output of some of the scripts that capture information about
+        the node. See LSHW_OUTPUT_NAME and LLDP_OUTPUT_NAME to identify those
+        scripts.
+
+        If there is a match, the node-tag relation is kept in the database.
+        Otherwise, it is deleted if it was already stored (this can happen if a
+        user edit the tag).
+
+        * Batch processing
+        Considering that the tag evaluation is not a critical process in MAAS,
+        we would like to avoid that this activity keeps a database transaction
+        open for too long. In that way, critical processes can make a better use
+        of a limited number of transactions.
+        See TAG_EVALUATION_BATCH_SIZE definition for more information.
+        """
+        return await self._evaluate_tags(
+            [TagDefinition(param.tag_id, param.tag_definition)],
+            param.batch_size,
+        )
+
+    @activity_defn_with_context(name=EVALUATE_TAGS_ACTIVITY_NAME)
+    async def evaluate_tags(
+        self, param: TagsEvaluationParam
+    ) -> TagEvaluationResult:
+        """
+        Run the evaluation of several tags as Temporal activity.
+
+        This is the same as `evaluate_tag`, but all the tags are evaluated in
+        a single pass over the nodes, so that the output of the scripts is
+        retrieved once per batch of nodes rather than once per tag.
+        """
+        return await self._evaluate_tags(param.tags, param.batch_size)
+
+    async def _evaluate_tags(
+        self, tags: list[TagDefinition], batch_size: int
+    ) -> TagEvaluationResult:
+        processed_nodes = batch_size
+        outputs = [{"inserted": 0, "deleted": 0}]
+        pointer = -1
+
+        while tags and 0 < batch_size == processed_nodes:
+            async with self._start_transaction() as tx:
+                # Retrieve the batch of nodes to be processed. The pagination
+                # is done by providing the last node ID of the previous batch
+                # (pointer) and the batch size.
+                cursor_result = await tx.execute(
+                    text(
+                        "SELECT id FROM maasserver_node WHERE id > :pointer "
+                        "ORDER BY id LIMIT :batch_size"
+                    ),
+                    {"pointer": pointer, "batch_size": batch_size},
+                )
+                node_ids = cursor_result.scalars().all()
+                processed_nodes = len(node_ids)
+                if not node_ids:
+                    break
+                pointer = node_ids[-1]
 
-                processed_nodes = output.pop("processed")
-                pointer = output.pop("pointer")
-                outputs.append(output)
+                params = {
+                    "node_ids": node_ids,
+                    "status": SCRIPT_STATUS.PASSED,
+                    "script_names": [LSHW_OUTPUT_NAME, LLDP_OUTPUT_NAME],
+                }
+                await tx.execute(text(STORE_SCRIPT_RESULTS_XML_STMT), params)
+                cursor_result = await tx.execute(
+                    text(EVALUATE_TAGS_STMT),
+                    params
+                    | {
+                        "tag_ids": [tag.tag_id for tag in tags],
+                        "tag_definitions": [
+                            tag.tag_definition for tag in tags
+                        ],
+                    },
+                )
+                outputs.append({k: v for k, v in cursor_result.all()})
 
         result = TagEvaluationResult(
             **reduce(
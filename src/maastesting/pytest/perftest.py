@@ -265,6 +265,10 @@ class PerfTester:
                 tracer.dump_results(self.outdir / tracer.dump_file_name)
         self.results["tests"][name] = results
 
+    def add_results(self, name: str, results: dict[str, Any]):
+        """Add measurements taken by the test itself to the results."""
+        self.results["tests"].setdefault(name, {}).update(results)
+
     def write_results(self):
         if self.outdir:
             outfile = self.outdir / "results.json"
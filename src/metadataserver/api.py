@@ -197,10 +197,14 @@ def check_version(version):
         raise UnknownMetadataVersion("Unknown metadata version: %s" % version)
 
 
-def add_event_to_node_event_log(
-    node, origin, action, description, event_type, result=None, created=None
+def get_node_event_log_entries(
+    node, origin, action, description, event_type, result=None
 ):
-    """Add an entry to the node's event log."""
+    """Return the entries to add to the node's event log for a status message.
+
+    :return: A list of (event type name, event description) tuples, the
+        last of which is the entry for the message itself.
+    """
     if node.status == NODE_STATUS.COMMISSIONING:
         if result in ["SUCCESS", None]:
             type_name = EVENT_TYPES.NODE_COMMISSIONING_EVENT
@@ -226,28 +230,32 @@ def add_event_to_node_event_log(
     else:
         type_name = EVENT_TYPES.NODE_STATUS_EVENT
 
+    entries = []
     # Create an extra event for the machine status messages.
     if action in EVENT_STATUS_MESSAGES and event_type == "start":
-        Event.objects.register_event_and_event_type(
-            EVENT_STATUS_MESSAGES[action],
-            type_level=EVENT_DETAILS[EVENT_STATUS_MESSAGES[action]].level,
-            type_description=EVENT_DETAILS[
-                EVENT_STATUS_MESSAGES[action]
-            ].description,
+        entries.append((EVENT_STATUS_MESSAGES[action], ""))
+    entries.append((type_name, f"'{origin}' {description}"))
+    return entries
+
+
+def add_event_to_node_event_log(
+    node, origin, action, description, event_type, result=None, created=None
+):
+    """Add an entry to the node's event log."""
+    entries = get_node_event_log_entries(
+        node, origin, action, description, event_type, result
+    )
+    for type_name, event_description in entries:
+        event = Event.objects.register_event_and_event_type(
+            type_name,
+            type_level=EVENT_DETAILS[type_name].level,
+            type_description=EVENT_DETAILS[type_name].description,
             event_action=action,
+            event_description=event_description,
             system_id=node.system_id,
             created=created,
         )
-
-    return Event.objects.register_event_and_event_type(
-        type_name,
-        type_level=EVENT_DETAILS[type_name].level,
-        type_description=EVENT_DETAILS[type_name].description,
-        event_action=action,
-        event_description=f"'{origin}' {description}",
-        system_id=node.system_id,
-        created=created,
-    )
+    return event
 
 
 _EXT_TO_KEY = {".out": "stdout", ".err": "stderr", ".yaml": "result"}
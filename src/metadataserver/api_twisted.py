@@ -8,27 +8,33 @@ import bz2
 from collections import defaultdict
 from datetime import datetime, timezone
 import json
+from typing import NamedTuple
 
-from twisted.application.internet import TimerService
+from twisted.application.service import Service
 from twisted.internet import reactor
 from twisted.web.resource import Resource
 from twisted.web.server import NOT_DONE_YET
 
 from maasserver.api.utils import extract_oauth_key_from_auth_header
 from maasserver.enum import NODE_STATUS, NODE_TYPE
-from maasserver.models import Node, NodeKey
+from maasserver.models import Event, EventType, Node, NodeKey
 from maasserver.preseed import CURTIN_INSTALL_LOG
 from maasserver.utils.orm import (
     in_transaction,
+    savepoint,
     transactional,
     TransactionManagementError,
 )
 from maasserver.utils.threads import deferToDatabase
 from maasserver.workflow import signal_workflow
 from metadataserver import logger
-from metadataserver.api import add_event_to_node_event_log, process_file
+from metadataserver.api import (
+    add_event_to_node_event_log,
+    get_node_event_log_entries,
+    process_file,
+)
 from metadataserver.enum import SCRIPT_STATUS
-from provisioningserver.events import EVENT_STATUS_MESSAGES
+from provisioningserver.events import EVENT_DETAILS, EVENT_STATUS_MESSAGES
 from provisioningserver.logger import LegacyLogger
 from provisioningserver.utils.twisted import deferred
 
@@ -165,6 +171,14 @@ class StatusHandlerResource(Resource):
             request.setResponseCode(204)
             request.finish()
 
+        def _queue_full(failure, request):
+            # Too many messages are waiting to be processed; ask the node to
+            # send this one again later.
+            failure.trap(StatusWorkerQueueFull)
+            request.setResponseCode(503)
+            request.setHeader(b"Retry-After", b"%d" % self.worker.flush_delay)
+            request.finish()
+
         def _check_connection_closed(failure):
             # request.finish() might raise a RuntimeError when the client has already disconnected and we can't send the
             # response. This might happen for example when we release a machine when cloud-init reports that it has completed
@@ -175,31 +189,83 @@ class StatusHandlerResource(Resource):
                 "The request from the node was processed but the client already closed the connection.",
             )
 
-        d.addCallback(_finish, request)
+        d.addCallbacks(
+            _finish,
+            _queue_full,
+            callbackArgs=(request,),
+            errbackArgs=(request,),
+        )
         d.addErrback(_check_connection_closed)
         return NOT_DONE_YET
 
 
-class StatusWorkerService(TimerService):
-    """Service to update nodes from received status messages."""
+class NodeLogEvent(NamedTuple):
+    """An entry for a node's event log, waiting to be inserted."""
+
+    type_name: str
+    action: str
+    description: str
+    created: datetime
+
+
+class StatusWorkerQueueFull(Exception):
+    """Raised when too many status messages are waiting to be processed."""
+
+
+class StatusWorkerService(Service):
+    """Service to update nodes from received status messages.
+
+    Messages that don't need to be processed straight away are queued, and
+    flushed `flush_delay` seconds after the first one arrives, or as soon as
+    `flush_size` of them are queued. At most `max_pending` messages can be
+    waiting to be processed; beyond that they are refused with
+    `StatusWorkerQueueFull`, so that nodes are told to back off.
+    """
 
-    check_interval = 60  # Every second.
+    flush_delay = 5
+    flush_size = 1000
+    max_pending = 20000
 
     def __init__(self, dbtasks, clock=reactor):
-        # Call self._tryUpdateNodes() every self.check_interval.
-        super().__init__(self.check_interval, self._tryUpdateNodes)
+        super().__init__()
         self.dbtasks = dbtasks
         self.clock = clock
         self.queue = defaultdict(list)
+        # Messages that are queued or being processed.
+        self.pending = 0
+        self._queued = 0
+        self._flush_call = None
+
+    def stopService(self):
+        if self._flush_call is not None and self._flush_call.active():
+            self._flush_call.cancel()
+        self._flush_call = None
+        return super().stopService()
 
     def _tryUpdateNodes(self):
+        if self._flush_call is not None and self._flush_call.active():
+            self._flush_call.cancel()
+        self._flush_call = None
         if len(self.queue) != 0:
             queue, self.queue = self.queue, defaultdict(list)
+            queued, self._queued = self._queued, 0
             d = deferToDatabase(self._preProcessQueue, queue)
-            d.addCallback(self._processMessagesLater)
-            d.addErrback(log.err, "Failed to process node status messages.")
+            d.addCallback(self._processMessagesLater, queued)
+            d.addErrback(self._flushFailed, queued)
             return d
 
+    def _flushFailed(self, failure, queued):
+        self.pending -= queued
+        log.err(failure, "Failed to process node status messages.")
+
+    def _scheduleFlush(self):
+        if self._queued >= self.flush_size:
+            self._tryUpdateNodes()
+        elif self._flush_call is None:
+            self._flush_call = self.clock.callLater(
+                self.flush_delay, self._tryUpdateNodes
+            )
+
     @transactional
     def _preProcessQueue(self, queue):
         """Check authorizations.
@@ -212,13 +278,18 @@ class StatusWorkerService(TimerService):
         ).select_related("node", "token")
         return [(key.node, queue[key.token.key]) for key in keys]
 
-    def _processMessagesLater(self, tasks):
+    def _processMessagesLater(self, tasks, queued):
         # Move all messages on the queue off onto the database tasks queue.
-        # We're not going to wait for them to be processed because we can't /
-        # don't apply back-pressure to those systems that are producing these
-        # messages anyway.
+        # Messages for nodes that could not be found are dropped.
+        self.pending -= queued - sum(len(messages) for _, messages in tasks)
         for node, messages in tasks:
-            self.dbtasks.addTask(self._processMessages, node, messages)
+            d = self.dbtasks.deferTask(self._processMessages, node, messages)
+            d.addBoth(self._messagesProcessed, len(messages))
+            d.addErrback(log.err, "Unhandled failure in database task.")
+
+    def _messagesProcessed(self, result, count):
+        self.pending -= count
+        return result
 
     def _processMessages(self, node, messages):
         # Push the messages into the database, recording them for this node.
@@ -231,19 +302,61 @@ class StatusWorkerService(TimerService):
             )
         else:
             # Here we're in a database thread, with a database connection.
-            for idx, message in enumerate(messages):  # noqa: B007
-                try:
-                    exists = self._processMessage(node, message)
-                    if not exists:
-                        # Node has been deleted no reason to continue saving
-                        # the events for this node.
-                        break
-                except Exception:
-                    log.err(
-                        None,
-                        "Failed to process message "
-                        "for node: %s" % node.hostname,
-                    )
+            self._processNodeMessages(node, messages)
+
+    @transactional
+    def _processNodeMessages(self, node, messages):
+        """Process all the queued `messages` for `node` in one transaction.
+
+        The events they add to the node's event log are inserted in bulk.
+        """
+        # Validate that the node still exists since this is a new transaction.
+        try:
+            node = Node.objects.get(id=node.id)
+        except Node.DoesNotExist:
+            # Node has been deleted no reason to continue saving the events
+            # for this node.
+            return
+
+        events = []
+        for message in messages:
+            message_events = []
+            try:
+                with savepoint():
+                    self._processNodeMessage(node, message, message_events)
+            except Exception:
+                log.err(
+                    None,
+                    "Failed to process message for node: %s" % node.hostname,
+                )
+                # The changes to the database have been rolled back, but not
+                # the ones to the node, so that it's fetched again for the
+                # next messages.
+                node = Node.objects.get(id=node.id)
+            else:
+                events.extend(message_events)
+
+        event_types = {
+            type_name: EventType.objects.register(
+                type_name,
+                EVENT_DETAILS[type_name].description,
+                EVENT_DETAILS[type_name].level,
+            )
+            for type_name in {event.type_name for event in events}
+        }
+        Event.objects.bulk_create(
+            Event(
+                type=event_types[event.type_name],
+                node=node,
+                node_system_id=node.system_id,
+                node_hostname=node.hostname,
+                action=event.action,
+                description=event.description,
+                created=event.created,
+                updated=event.created,
+            )
+            for event in events
+        )
 
     @transactional
     def _processMessage(self, node, message):
@@ -252,7 +365,15 @@ class StatusWorkerService(TimerService):
             node = Node.objects.get(id=node.id)
         except Node.DoesNotExist:
             return False
+        self._processNodeMessage(node, message)
+        return True
+
+    def _processNodeMessage(self, node, message, events=None):
+        """Process `message` for `node`, in a transaction.
 
+        :param events: If given, the entries for the node's event log are
+            appended to this list as `NodeLogEvent`s instead of being saved.
+        """
         event_type = message["event_type"]
         origin = message["origin"]
         activity_name = message["name"]
@@ -265,7 +386,7 @@ class StatusWorkerService(TimerService):
         default_exit_status = 1 if failed else 0
 
         # Add this event to the node event log if 'start' or a 'failure'.
-        if event_type == "start" or failed:
+        if (event_type == "start" or failed) and events is None:
             add_event_to_node_event_log(
                 node,
                 origin,
@@ -275,6 +396,19 @@ class StatusWorkerService(TimerService):
                 result,
                 message["timestamp"],
             )
+        elif event_type == "start" or failed:
+            entries = get_node_event_log_entries(
+                node, origin, activity_name, description, event_type, result
+            )
+            events.extend(
+                NodeLogEvent(
+                    type_name,
+                    activity_name,
+                    event_description,
+                    message["timestamp"],
+                )
+                for type_name, event_description in entries
+            )
 
         # Group files together with the ScriptResult they belong.
         results = {}
@@ -437,7 +571,6 @@ class StatusWorkerService(TimerService):
 
         if save_node:
             node.save()
-        return True
 
     def _retrieve_content(self, compression, encoding, content):
         """Extract the content of the sent file."""
@@ -542,5 +675,10 @@ class StatusWorkerService(TimerService):
                 log.err, "Failed to process status message instantly."
             )
             return d
+        elif self.pending >= self.max_pending:
+            raise StatusWorkerQueueFull()
         else:
             self.queue[authorization].append(message)
+            self.pending += 1
+            self._queued += 1
+            self._scheduleFlush()
@@ -9,9 +9,10 @@ from io import BytesIO
 import json
 import random
 from unittest import TestCase
-from unittest.mock import call, Mock, sentinel
+from unittest.mock import ANY, call, Mock, sentinel
 
-from twisted.internet.defer import inlineCallbacks, succeed
+from twisted.internet.defer import fail, inlineCallbacks, succeed
+from twisted.internet.task import Clock
 from twisted.web.server import NOT_DONE_YET
 from twisted.web.test.requesthelper import DummyRequest
 
@@ -39,6 +40,7 @@ from metadataserver import api
 from metadataserver import api_twisted as api_twisted_module
 from metadataserver.api_twisted import (
     StatusHandlerResource,
+    StatusWorkerQueueFull,
     StatusWorkerService,
 )
 from metadataserver.enum import RESULT_TYPE, SCRIPT_STATUS
@@ -147,6 +149,89 @@ class TestStatusHandlerResource(MAASTestCase):
         self.assertEqual(204, request.responseCode)
         status_worker.queueMessage.assert_called_once_with(token, message)
 
+    def test_render_POST_queue_full(self):
+        status_worker = Mock()
+        status_worker.flush_delay = 5
+        status_worker.queueMessage = Mock()
+        status_worker.queueMessage.return_value = fail(StatusWorkerQueueFull())
+        resource = StatusHandlerResource(status_worker)
+        message = {
+            "event_type": factory.make_name("type"),
+            "origin": factory.make_name("origin"),
+            "name": factory.make_name("name"),
+            "description": factory.make_name("description"),
+        }
+        request = self.make_request(
+            content=json.dumps(message).encode("ascii")
+        )
+        output = resource.render_POST(request)
+        self.assertEqual(NOT_DONE_YET, output)
+        self.assertEqual(503, request.responseCode)
+        self.assertEqual(
+            [b"5"], request.responseHeaders.getRawHeaders(b"Retry-After")
+        )
+
+
+class TestStatusWorkerServiceQueue(MAASTestCase):
+    def make_message(self):
+        return {
+            "event_type": "progress",
+            "origin": factory.make_name("origin"),
+            "name": factory.make_name("name") + "/" + factory.make_name("sub"),
+            "description": factory.make_name("description"),
+            "timestamp": datetime.now(timezone.utc).timestamp(),
+        }
+
+    def test_queueMessage_flushes_after_delay(self):
+        clock = Clock()
+        worker = StatusWorkerService(sentinel.dbtasks, clock=clock)
+        mock_tryUpdateNodes = self.patch(worker, "_tryUpdateNodes")
+        worker.queueMessage(factory.make_name("token"), self.make_message())
+        worker.queueMessage(factory.make_name("token"), self.make_message())
+        clock.advance(worker.flush_delay - 1)
+        mock_tryUpdateNodes.assert_not_called()
+        clock.advance(1)
+        mock_tryUpdateNodes.assert_called_once_with()
+
+    def test_queueMessage_flushes_when_flush_size_reached(self):
+        clock = Clock()
+        worker = StatusWorkerService(sentinel.dbtasks, clock=clock)
+        worker.flush_size = 3
+        mock_tryUpdateNodes = self.patch(worker, "_tryUpdateNodes")
+        token = factory.make_name("token")
+        worker.queueMessage(token, self.make_message())
+        worker.queueMessage(token, self.make_message())
+        mock_tryUpdateNodes.assert_not_called()
+        worker.queueMessage(token, self.make_message())
+        mock_tryUpdateNodes.assert_called_once_with()
+
+    def test_queueMessage_refuses_messages_when_full(self):
+        worker = StatusWorkerService(sentinel.dbtasks, clock=Clock())
+        worker.max_pending = 2
+        token = factory.make_name("token")
+        worker.queueMessage(token, self.make_message())
+        worker.queueMessage(token, self.make_message())
+        d = worker.queueMessage(token, self.make_message())
+        self.assertRaises(StatusWorkerQueueFull, d.result.raiseException)
+        d.addErrback(lambda failure: None)
+        self.assertEqual(2, worker.pending)
+        self.assertEqual(2, len(worker.queue[token]))
+
+    def test_messages_stay_pending_until_processed(self):
+        worker = StatusWorkerService(Mock(), clock=Clock())
+        token = factory.make_name("token")
+        messages = [self.make_message() for _ in range(3)]
+        for message in messages:
+            worker.queueMessage(token, message)
+        self.assertEqual(3, worker.pending)
+        worker._processMessagesLater([(sentinel.node, messages[:2])], 3)
+        # The message for an unknown node is dropped.
+        self.assertEqual(2, worker.pending)
+        done = worker.dbtasks.deferTask.return_value
+        done.addBoth.assert_called_once_with(worker._messagesProcessed, 2)
+        worker._messagesProcessed(None, 2)
+        self.assertEqual(0, worker.pending)
+
 
 class TestStatusWorkerServiceTransactional(MAASTransactionServerTestCase):
     assertRaises = TestCase.assertRaises
@@ -175,8 +260,7 @@ class TestStatusWorkerServiceTransactional(MAASTransactionServerTestCase):
         worker = StatusWorkerService(sentinel.dbtasks, clock=sentinel.reactor)
         self.assertEqual(sentinel.dbtasks, worker.dbtasks)
         self.assertEqual(sentinel.reactor, worker.clock)
-        self.assertEqual(60, worker.step)
-        self.assertEqual((worker._tryUpdateNodes, tuple(), {}), worker.call)
+        self.assertEqual(0, worker.pending)
 
     def test_tryUpdateNodes_returns_None_when_empty_queue(self):
         worker = StatusWorkerService(sentinel.dbtasks)
@@ -191,12 +275,12 @@ class TestStatusWorkerServiceTransactional(MAASTransactionServerTestCase):
             for node, _ in nodes_with_tokens
         }
         dbtasks = Mock()
-        worker = StatusWorkerService(dbtasks)
+        worker = StatusWorkerService(dbtasks, clock=Clock())
         for node, token in nodes_with_tokens:
             for message in node_messages[node]:
                 worker.queueMessage(token.key, message)
         yield worker._tryUpdateNodes()
-        dbtasks.addTask.assert_has_calls(
+        dbtasks.deferTask.assert_has_calls(
             [
                 call(worker._processMessages, node, messages)
                 for node, messages in node_messages.items()
@@ -229,35 +313,99 @@ class TestStatusWorkerServiceTransactional(MAASTransactionServerTestCase):
     @inlineCallbacks
     def test_processMessages_doesnt_call_when_node_deleted(self):
         worker = StatusWorkerService(sentinel.dbtasks)
-        mock_processMessage = self.patch(worker, "_processMessage")
-        mock_processMessage.return_value = False
+        mock_processNodeMessage = self.patch(worker, "_processNodeMessage")
+        node = yield deferToDatabase(transactional(factory.make_Node))
+        yield deferToDatabase(transactional(node.delete))
         yield deferToDatabase(
             worker._processMessages,
-            sentinel.node,
+            node,
             [sentinel.message1, sentinel.message2],
         )
-        mock_processMessage.assert_called_once_with(
-            sentinel.node, sentinel.message1
-        )
+        mock_processNodeMessage.assert_not_called()
 
     @wait_for_reactor
     @inlineCallbacks
-    def test_processMessages_calls_processMessage(self):
+    def test_processMessages_calls_processNodeMessage(self):
         worker = StatusWorkerService(sentinel.dbtasks)
-        mock_processMessage = self.patch(worker, "_processMessage")
-        mock_processMessage.return_value = True
+        mock_processNodeMessage = self.patch(worker, "_processNodeMessage")
+        mock_processNodeMessage.side_effect = [Exception(), None]
+        node = yield deferToDatabase(transactional(factory.make_Node))
         yield deferToDatabase(
             worker._processMessages,
-            sentinel.node,
+            node,
             [sentinel.message1, sentinel.message2],
         )
-        mock_processMessage.assert_has_calls(
+        # A failing message doesn't stop the others from being processed.
+        mock_processNodeMessage.assert_has_calls(
             [
-                call(sentinel.node, sentinel.message1),
-                call(sentinel.node, sentinel.message2),
+                call(node, sentinel.message1, ANY),
+                call(node, sentinel.message2, ANY),
             ]
         )
 
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_processMessages_drops_changes_of_failed_message(self):
+        worker = StatusWorkerService(sentinel.dbtasks)
+
+        def process_node_message(node, message, events):
+            if message is sentinel.message1:
+                node.error_description = "half-applied"
+                node.save()
+                raise Exception()
+            node.error = "applied"
+            node.save()
+
+        self.patch(worker, "_processNodeMessage", process_node_message)
+        node = yield deferToDatabase(transactional(factory.make_Node))
+        yield deferToDatabase(
+            worker._processMessages,
+            node,
+            [sentinel.message1, sentinel.message2],
+        )
+        node = yield deferToDatabase(transactional(reload_object), node)
+        self.assertEqual("", node.error_description)
+        self.assertEqual("applied", node.error)
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test_processMessages_inserts_events(self):
+        worker = StatusWorkerService(sentinel.dbtasks)
+        node = yield deferToDatabase(
+            transactional(factory.make_Node),
+            status=NODE_STATUS.COMMISSIONING,
+        )
+        messages = []
+        for _ in range(3):
+            message = self.make_message()
+            message["event_type"] = "start"
+            message["name"] += "/" + factory.make_name("sub")
+            message["timestamp"] = datetime.now(timezone.utc)
+            messages.append(message)
+        yield deferToDatabase(worker._processMessages, node, messages)
+        events = yield deferToDatabase(
+            transactional(
+                lambda: list(
+                    Event.objects.filter(
+                        node=node,
+                        action__in=[message["name"] for message in messages],
+                    )
+                    .order_by("id")
+                    .values_list("action", "description")
+                )
+            )
+        )
+        self.assertEqual(
+            [
+                (
+                    message["name"],
+                    f"'{message['origin']}' {message['description']}",
+                )
+                for message in messages
+            ],
+            events,
+        )
+
     @wait_for_reactor
     @inlineCallbacks
     def test_queueMessages_processes_top_level_message_instantly(self):
@@ -8,6 +8,13 @@ from django.http import HttpResponse
 from pytest import fixture
 
 
+@fixture(autouse=True)
+def cli_cache_home(monkeypatch, tmp_path):
+    """Keep the command trees cached by the CLI out of the user's home."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path
+
+
 @fixture()
 def maas_user(factory):
     return factory.make_User()
@@ -0,0 +1,25 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from contextlib import contextmanager
+
+import pytest
+
+from maascli.config import ProfileConfig
+from maascli.parser import prepare_parser
+
+
+@pytest.mark.usefixtures("maasdb")
+def test_perf_CLI_startup(perf, cli_profile, monkeypatch):
+    @contextmanager
+    def mock_ProfileConfig_enter(*args):
+        yield {cli_profile["name"]: cli_profile}
+
+    monkeypatch.setattr(ProfileConfig, "open", mock_ProfileConfig_enter)
+
+    args = ["maas", cli_profile["name"], "machines", "read"]
+    # The first run builds the command tree cache, the second one uses it.
+    with perf.record("test_perf_CLI_startup.cold"):
+        prepare_parser(args).parse_args(args[1:])
+    with perf.record("test_perf_CLI_startup.warm"):
+        prepare_parser(args).parse_args(args[1:])
@@ -0,0 +1,33 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+import random
+
+from netaddr import IPAddress, IPNetwork
+import pytest
+
+from maascommon.utils.network import IPRangeStatistics, MAASIPRange, MAASIPSet
+
+USED_COUNT = 5000
+
+
+@pytest.mark.parametrize(
+    "cidr",
+    ["10.0.0.0/24", "10.0.0.0/16", "2001:db8::/64"],
+)
+def test_perf_subnet_statistics(perf, cidr):
+    # What the subnet page computes for a subnet with many allocations.
+    network = IPNetwork(cidr)
+    rng = random.Random(0)
+    count = min(USED_COUNT, network.size // 2)
+    used = [
+        MAASIPRange(
+            IPAddress(network.first + offset, network.version),
+            purpose="assigned-ip",
+        )
+        for offset in rng.sample(range(1, min(network.size - 1, 65535)), count)
+    ]
+
+    with perf.record(f"test_perf_subnet_statistics_{network.prefixlen}"):
+        full_range = MAASIPSet(used).get_full_range(network)
+        IPRangeStatistics(full_range).render_json(include_ranges=True)
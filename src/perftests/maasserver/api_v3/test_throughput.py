@@ -0,0 +1,85 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Throughput and tail latency of the v3 API for small JSON responses.
+
+Most of the time of these requests is spent in the middleware stack rather
+than in the handlers, so compare the results of two commits to see the
+effect of changes to the middlewares.
+"""
+
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+import pytest
+
+from maasapiserver.v3.constants import V3_API_PREFIX
+from tests.maasapiserver.fixtures.app import build_client
+
+REQUESTS = 500
+CONCURRENCY = 10
+
+
+@pytest.fixture
+async def api_client(api_app: FastAPI, db_connection):
+    # the sampledata always creates an admin user with these credentials. If you run the perftests with a different dataset, make sure to update these credentials accordingly.
+    async with build_client(
+        api_app, "http://test", "admin1", "secret"
+    ) as client:
+        yield client
+
+
+async def measure_requests(client: AsyncClient, path: str, params: dict):
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(REQUESTS):
+        queue.put_nowait(None)
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(path, params=params)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_latency": statistics.median(latencies),
+        "p99_latency": statistics.quantiles(latencies, n=100)[98],
+    }
+
+
+@pytest.mark.parametrize(
+    "name,path,params",
+    [
+        ("users_me", "/users/me", {}),
+        ("zones", "/zones", {}),
+        ("resource_pools", "/resource_pools", {}),
+        ("machines", "/machines", {"size": 50}),
+    ],
+)
+async def test_perf_APIv3_throughput(
+    perf,
+    api_client,
+    mock_maas_env,
+    openfga_server,
+    name,
+    path,
+    params,
+):
+    test_name = f"test_perf_APIv3_throughput.{name}"
+    # Warm up the caches, e.g. the services and the authentication ones.
+    response = await api_client.get(f"{V3_API_PREFIX}{path}", params=params)
+    assert response.status_code == 200
+    with perf.record(test_name):
+        results = await measure_requests(
+            api_client, f"{V3_API_PREFIX}{path}", params
+        )
+    perf.add_results(test_name, results)
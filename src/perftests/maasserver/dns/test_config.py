@@ -4,10 +4,13 @@
 from netaddr import IPNetwork
 import pytest
 
+from maascommon.enums.dns import DnsUpdateAction
 from maasserver.dns.config import (
+    current_zone_serial,
     dns_update_all_zones,
     process_dns_update_notify,
 )
+from maasserver.models.dnspublication import DNSPublication
 from provisioningserver.dns.config import DynamicDNSUpdate
 
 
@@ -31,6 +34,37 @@ def test_perf_full_dns_reload(
         dns_update_all_zones()
 
 
+@pytest.mark.usefixtures("maasdb")
+def test_perf_incremental_dns_reload(
+    perf, dns_config_path, zone_file_config_path, bind_server, factory
+):
+    domains = [factory.make_Domain() for _ in range(50)]
+    subnets = [factory.make_Subnet(cidr=f"10.0.{i}.0/24") for i in range(20)]
+    ips = [
+        factory.make_StaticIPAddress(subnet=subnets[i % 20])
+        for i in range(1000)
+    ]
+    records = [
+        factory.make_DNSResource(domain=domains[i % 50], ip_addresses=[ips[i]])
+        for i in range(1000)
+    ]
+
+    with perf.record("test_perf_incremental_dns_reload.full"):
+        dns_update_all_zones(requires_reload=True)
+
+    since_serial = current_zone_serial()
+    DNSPublication.objects.create_for_config_update(
+        source="perftest",
+        action=DnsUpdateAction.INSERT,
+        label=records[0].name,
+        rtype="A",
+        zone=domains[0].name,
+        answer=str(ips[0].ip),
+    )
+    with perf.record("test_perf_incremental_dns_reload.incremental"):
+        dns_update_all_zones(requires_reload=True, since_serial=since_serial)
+
+
 @pytest.mark.usefixtures("maasdb")
 def test_perf_generate_dns_updates(perf, factory):
     domain = factory.make_Domain()
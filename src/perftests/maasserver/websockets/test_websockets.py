@@ -0,0 +1,38 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+import os
+
+from maasserver.websockets.websockets import (
+    _makeFrame,
+    _mask,
+    _parseFrames,
+    CONTROLS,
+)
+
+# Roughly the size of a machine list request filtering on a few thousand
+# system_ids.
+PAYLOAD_SIZE = 256 * 1024
+
+
+def test_perf_websocket_mask(perf):
+    payload = os.urandom(PAYLOAD_SIZE)
+    key = os.urandom(4)
+    with perf.record("test_perf_websocket_mask"):
+        for _ in range(100):
+            _mask(payload, key)
+
+
+def test_perf_websocket_parse_chunked_frame(perf):
+    payload = os.urandom(PAYLOAD_SIZE)
+    frame = _makeFrame(payload, CONTROLS.TEXT, True, mask=os.urandom(4))
+    # Deliver the frame in reads the size of a typical TCP receive.
+    chunks = [frame[i : i + 4096] for i in range(0, len(frame), 4096)]
+    frames = []
+    with perf.record("test_perf_websocket_parse_chunked_frame"):
+        frameBuffer = []
+        for chunk in chunks:
+            frameBuffer.append(chunk)
+            frames.extend(_parseFrames(frameBuffer))
+    assert frames == [(CONTROLS.TEXT, payload, True)]
+    assert frameBuffer == []
@@ -0,0 +1,18 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from tests.maasapiserver.fixtures.db import (
+    db,
+    db_connection,
+    fixture,
+    test_config,
+)
+from tests.maasservicelayer.fixtures import services
+
+__all__ = [
+    "db",
+    "db_connection",
+    "fixture",
+    "services",
+    "test_config",
+]
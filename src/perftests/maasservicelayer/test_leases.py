@@ -0,0 +1,40 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from ipaddress import IPv4Address, IPv4Network
+
+from maascommon.enums.ipaddress import IpAddressFamily, LeaseAction
+from maascommon.enums.ipranges import IPRangeType
+from maasservicelayer.models.leases import Lease
+from tests.fixtures.factories.iprange import create_test_ip_range_entry
+from tests.fixtures.factories.subnet import create_test_subnet_entry
+
+LEASE_COUNT = 10000
+
+
+async def test_perf_store_lease_info_batch(perf, fixture, services):
+    # What the agents post after a DHCP restart on a /16.
+    network = IPv4Network("10.0.0.0/16")
+    subnet = await create_test_subnet_entry(fixture, cidr=str(network))
+    await create_test_ip_range_entry(
+        fixture,
+        subnet,
+        type=IPRangeType.DYNAMIC,
+        start_ip=str(network[1]),
+        end_ip=str(network[-2]),
+    )
+    leases = [
+        Lease(
+            action=LeaseAction.COMMIT,
+            ip_family=IpAddressFamily.IPV4,
+            hostname=f"host-{i}",
+            mac=f"02:00:00:00:{i >> 8:02x}:{i & 0xFF:02x}",
+            ip=IPv4Address(network[i + 1]),
+            timestamp_epoch=0,
+            lease_time_seconds=600,
+        )
+        for i in range(LEASE_COUNT)
+    ]
+
+    with perf.record("test_perf_store_lease_info_batch"):
+        await services.leases.store_lease_info_batch(leases)
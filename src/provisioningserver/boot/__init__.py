@@ -24,6 +24,7 @@ from provisioningserver.kernel_opts import (
 )
 from provisioningserver.logger import get_maas_logger
 from provisioningserver.utils import locate_template, tftp
+from provisioningserver.utils.fs import FileCache
 from provisioningserver.utils.network import (
     convert_host_to_uri_str,
     find_mac_via_arp,
@@ -31,6 +32,11 @@ from provisioningserver.utils.network import (
 
 maaslog = get_maas_logger("bootloaders")
 
+# The templates of all the boot methods, parsed again only when they change.
+_templates = FileCache(
+    lambda path: tempita.Template.from_filename(path, encoding="UTF-8")
+)
+
 
 @implementer(IReader)
 class BytesReader:
@@ -150,17 +156,16 @@ class BootMethod(BootMethodMetadata, metaclass=ABCMeta):
         )
         assert isinstance(self.user_class, str) or self.user_class is None
         self.get_template_dir = lru_cache(maxsize=1)(self._get_template_dir)
-        self.get_template = lru_cache(maxsize=512)(self._get_template)
 
     def _get_template_dir(self):
         """Gets the template directory for the boot method."""
         return locate_template(f"{self.template_subdir}")
 
-    def _get_template(self, purpose, arch, subarch):
+    def get_template(self, purpose, arch, subarch):
         """Gets the best avaliable template for the boot method.
 
-        Templates are loaded each time here so that they can be changed on
-        the fly without restarting the provisioning server.
+        Templates are only loaded again when they change, so that they can
+        be changed on the fly without restarting the provisioning server.
 
         :param purpose: The boot purpose, e.g. "local".
         :param arch: Main machine architecture.
@@ -171,9 +176,7 @@ class BootMethod(BootMethodMetadata, metaclass=ABCMeta):
         for filename in gen_template_filenames(purpose, arch, subarch):
             template_name = os.path.join(pxe_templates_dir, filename)
             try:
-                return tempita.Template.from_filename(
-                    template_name, encoding="UTF-8"
-                )
+                return _templates.get(template_name)
             except OSError as error:
                 if error.errno != ENOENT:
                     raise
@@ -14,6 +14,7 @@ from twisted.python import context
 from maastesting import get_testing_timeout
 from maastesting.factory import factory
 from maastesting.testcase import MAASTestCase, MAASTwistedRunTest
+from maastesting.utils import age_file
 from provisioningserver import boot
 from provisioningserver.boot import (
     BootMethod,
@@ -76,10 +77,13 @@ class TestBootMethod(MAASTestCase):
         self.assertSequenceEqual(expected, list(observed))
 
     def test_get_pxe_template(self):
+        templates_dir = self.make_dir()
         method = FakeBootMethod()
+        method.get_template_dir = lambda: templates_dir
         purpose = factory.make_name("purpose")
         arch, subarch = factory.make_names("arch", "subarch")
         filename = factory.make_name("filename")
+        factory.make_file(templates_dir, filename)
         # Set up the mocks that we've patched in.
         gen_filenames = self.patch(boot, "gen_template_filenames")
         gen_filenames.return_value = [filename]
@@ -127,7 +131,10 @@ class TestBootMethod(MAASTestCase):
     def test_get_templates_only_suppresses_ENOENT(self):
         # The IOError arising from trying to load a template that doesn't
         # exist is suppressed, but other errors are not.
+        templates_dir = self.make_dir()
+        factory.make_file(templates_dir, "config.template")
         method = FakeBootMethod()
+        method.get_template_dir = lambda: templates_dir
         from_filename = self.patch(tempita.Template, "from_filename")
         from_filename.side_effect = IOError()
         from_filename.side_effect.errno = errno.EACCES
@@ -137,6 +144,23 @@ class TestBootMethod(MAASTestCase):
             *factory.make_names("purpose", "arch", "subarch"),
         )
 
+    def test_get_template_reuses_template_until_it_changes(self):
+        templates_dir = self.make_dir()
+        method = FakeBootMethod()
+        method.get_template_dir = lambda: templates_dir
+        template_path = factory.make_file(
+            templates_dir, "config.template", contents="{{first}}"
+        )
+        age_file(template_path, 10)
+        names = factory.make_names("purpose", "arch", "subarch")
+        template = method.get_template(*names)
+        self.assertIs(template, method.get_template(*names))
+        factory.make_file(
+            templates_dir, "config.template", contents="{{second}}"
+        )
+        age_file(template_path, 5)
+        self.assertEqual("{{second}}", method.get_template(*names).content)
+
     def test_compose_template_namespace(self):
         kernel_params = make_kernel_parameters()
         method = FakeBootMethod()
@@ -0,0 +1,275 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Dynamic DNS updates (RFC 2136) to the local BIND.
+
+The updates are TSIG-signed with the nsupdate key and sent over a
+persistent TCP connection. The updates for several zones can be batched,
+so that their messages are pipelined on the connection, rather than
+running an `nsupdate` process for each zone.
+"""
+
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+import re
+import socket
+import struct
+from threading import RLock
+import time
+
+import dns.entropy
+import dns.exception
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdata
+import dns.rdataclass
+import dns.rdatatype
+import dns.tsig
+import dns.update
+
+from provisioningserver.dns.config import get_nsupdate_key_path
+from provisioningserver.logger import get_maas_logger
+from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
+
+maaslog = get_maas_logger("dns")
+
+
+MAAS_NSUPDATE_HOST = "localhost"
+MAAS_NSUPDATE_PORT = 53
+
+_KEY_RE = re.compile(r'key\s+"(?P<name>[^"]+)"\s*\{(?P<body>.*?)\}\s*;', re.S)
+_KEY_ALGORITHM_RE = re.compile(r'algorithm\s+"?(?P<algorithm>[\w.-]+)"?\s*;')
+_KEY_SECRET_RE = re.compile(r'secret\s+"(?P<secret>[^"]+)"\s*;')
+
+
+class DNSUpdateError(Exception):
+    """Raised when BIND didn't apply a dynamic update."""
+
+
+def read_tsig_key(path):
+    """Read the TSIG key from a BIND key file, as written by `tsig-keygen`."""
+    with open(path) as fh:
+        content = fh.read()
+    match = _KEY_RE.search(content)
+    if match is None:
+        raise DNSUpdateError(f"No TSIG key found in {path}")
+    body = match.group("body")
+    algorithm = _KEY_ALGORITHM_RE.search(body)
+    secret = _KEY_SECRET_RE.search(body)
+    if algorithm is None or secret is None:
+        raise DNSUpdateError(f"Invalid TSIG key in {path}")
+    return dns.tsig.Key(
+        match.group("name"),
+        secret.group("secret"),
+        algorithm.group("algorithm"),
+    )
+
+
+def _rdata(rectype, text):
+    # Names in the record data are absolute, as they are for nsupdate.
+    return dns.rdata.from_text(
+        dns.rdataclass.IN,
+        rectype,
+        text,
+        origin=dns.name.root,
+        relativize=False,
+    )
+
+
+def make_update_message(zone, updates, serial=None, ttl=30):
+    """Return the `UpdateMessage` applying `updates` to `zone`.
+
+    :param updates: `DynamicDNSUpdate`s for the zone.
+    :param serial: If set, the zone's SOA is updated with this serial.
+    :param ttl: The TTL of the added records that don't have one.
+    """
+    message = dns.update.UpdateMessage(zone)
+    for update in updates:
+        name = dns.name.from_text(update.name)
+        if update.operation == "DELETE":
+            if update.answer:
+                message.delete(name, _rdata(update.rectype, update.answer))
+            else:
+                message.delete(name, update.rectype)
+        else:
+            message.add(
+                name,
+                ttl if update.ttl is None else update.ttl,
+                _rdata(update.rectype, update.answer),
+            )
+    if serial:
+        message.add(
+            message.origin,
+            ttl,
+            _rdata(
+                "SOA",
+                f"{zone}. nobody.example.com. {serial} 600 1800 604800 {ttl}",
+            ),
+        )
+    return message
+
+
+class DNSUpdateClient:
+    """Send dynamic DNS updates to BIND over a persistent TCP connection.
+
+    Updates are sent right away, unless they're made in a `batch()`, in
+    which case they're pipelined when the batch ends.
+    """
+
+    def __init__(
+        self,
+        server=MAAS_NSUPDATE_HOST,
+        port=MAAS_NSUPDATE_PORT,
+        timeout=10.0,
+        max_in_flight=100,
+        key_path=None,
+    ):
+        self.server = server
+        self.port = port
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.key_path = key_path
+        self._sock = None
+        self._key = None
+        self._lock = RLock()
+        self._batch_depth = 0
+        self._pending = []
+
+    def update(self, zone, updates, serial=None, ttl=30):
+        """Apply `updates` to `zone`. See `make_update_message`."""
+        with self._lock:
+            self._pending.append(
+                (zone, make_update_message(zone, updates, serial, ttl))
+            )
+            if not self._batch_depth:
+                self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Pipeline the updates made in the context, when it exits."""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self.flush()
+
+    def flush(self):
+        """Send the pending updates.
+
+        :raise DNSUpdateError: if any of the updates failed. The other
+            updates are still applied.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                errors = self._send(pending)
+            except (OSError, EOFError, dns.exception.DNSException) as e:
+                self.close()
+                maaslog.error(f"dynamic update of DNS failed: {e}")
+                raise DNSUpdateError(str(e)) from e
+        if errors:
+            for zone, error in errors:
+                maaslog.error(
+                    f"dynamic update of DNS zone {zone} failed: {error}"
+                )
+            raise DNSUpdateError(
+                ", ".join(f"{zone}: {error}" for zone, error in errors)
+            )
+
+    def close(self):
+        with self._lock:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+
+    def _connect(self):
+        if self.key_path is None:
+            key_path = get_nsupdate_key_path()
+        else:
+            key_path = self.key_path
+        # Read again on reconnection, in case the key was regenerated.
+        self._key = read_tsig_key(key_path)
+        self._sock = socket.create_connection(
+            (self.server, self.port), timeout=self.timeout
+        )
+
+    def _send(self, pending):
+        """Pipeline the messages, and wait for all the responses.
+
+        :return: a list of (zone, error) for the updates that failed.
+        """
+        messages = {}
+        for zone, message in pending:
+            while message.id in messages:
+                message.id = dns.entropy.random_16()
+            messages[message.id] = (zone, message)
+
+        errors = []
+        retried = False
+        while messages:
+            if self._sock is None:
+                self._connect()
+            window = list(islice(messages, self.max_in_flight))
+            try:
+                self._exchange(messages, window, errors)
+            except (OSError, EOFError):
+                # BIND closes idle connections. The messages that weren't
+                # answered are sent again, once, on a new connection.
+                self.close()
+                if retried:
+                    raise
+                retried = True
+        return errors
+
+    def _exchange(self, messages, window, errors):
+        wire = []
+        for message_id in window:
+            _, message = messages[message_id]
+            message.use_tsig(self._key)
+            data = message.to_wire()
+            wire.append(struct.pack("!H", len(data)) + data)
+        start = time.monotonic()
+        self._sock.sendall(b"".join(wire))
+        # Responses can come out of order, they're matched by ID.
+        waiting = set(window)
+        while waiting:
+            (length,) = struct.unpack("!H", self._recv(2))
+            data = self._recv(length)
+            (message_id,) = struct.unpack("!H", data[:2])
+            if message_id not in waiting:
+                continue
+            waiting.remove(message_id)
+            zone, message = messages.pop(message_id)
+            response = dns.message.from_wire(
+                data, keyring=self._key, request_mac=message.mac
+            )
+            PROMETHEUS_METRICS.update(
+                "maas_dns_dynamic_update_latency",
+                "observe",
+                value=time.monotonic() - start,
+                labels={"zone": zone},
+            )
+            if response.rcode() != dns.rcode.NOERROR:
+                errors.append((zone, dns.rcode.to_text(response.rcode())))
+
+    def _recv(self, length):
+        data = b""
+        while len(data) < length:
+            chunk = self._sock.recv(length - len(data))
+            if not chunk:
+                raise EOFError("Connection closed by the DNS server")
+            data += chunk
+        return data
+
+
+@lru_cache(maxsize=1)
+def get_dns_update_client():
+    """Return the client used to update the local BIND."""
+    return DNSUpdateClient()
@@ -18,12 +18,7 @@ from netaddr import IPNetwork
 from maastesting.factory import factory
 from maastesting.testcase import MAASTestCase
 from provisioningserver.dns import actions
-from provisioningserver.dns.actions import (
-    get_nsupdate_key_path,
-    NSUpdateCommand,
-)
 from provisioningserver.dns.config import (
-    DynamicDNSUpdate,
     MAAS_NAMED_CONF_NAME,
     MAAS_NAMED_CONF_OPTIONS_INSIDE_NAME,
 )
@@ -263,6 +258,29 @@ class TestConfiguration(MAASTestCase):
         self.assertTrue(os.path.exists(join(zone_file_dir, forward_file_name)))
         self.assertTrue(os.path.exists(join(zone_file_dir, reverse_file_name)))
 
+    def test_bind_write_zones_batches_dynamic_updates(self):
+        patch_zone_file_config_path(self)
+        client = self.patch(actions, "get_dns_update_client").return_value
+        zones = [
+            DNSReverseZoneConfig(
+                factory.make_string(),
+                serial=random.randint(1, 100),
+                network=factory.make_ipv4_network(),
+            )
+            for _ in range(2)
+        ]
+        batch = client.batch.return_value
+        for zone in zones:
+            # The zones are written inside the batch.
+            self.patch(zone, "write_config").side_effect = lambda: (
+                batch.__exit__.assert_not_called()
+            )
+        actions.bind_write_zones(zones=zones)
+        batch.__enter__.assert_called_once_with()
+        batch.__exit__.assert_called_once_with(None, None, None)
+        for zone in zones:
+            zone.write_config.assert_called_once_with()
+
     def test_bind_write_options_sets_up_config(self):
         # bind_write_configuration_and_zones writes the config file, writes
         # the zone files, and reloads the dns service.
@@ -299,112 +317,3 @@ class TestConfiguration(MAASTestCase):
         with open(expected_options_file, "r") as fh:
             contents = fh.read()
         self.assertIn(expected_options_content, contents)
-
-
-class TestNSUpdateCommand(MAASTestCase):
-    def test_format_update_deletion(self):
-        domain = factory.make_name()
-        update = DynamicDNSUpdate(
-            operation="DELETE",
-            zone=domain,
-            name=f"{factory.make_name()}.{domain}",
-            rectype="A",
-        )
-        cmd = NSUpdateCommand(
-            domain,
-            [update],
-            serial=random.randint(1, 100),
-            ttl=random.randint(1, 100),
-        )
-        self.assertEqual(
-            f"update delete {update.name} A", cmd._format_update(update)
-        )
-
-    def test_format_update_addition(self):
-        domain = factory.make_name()
-        update = DynamicDNSUpdate(
-            operation="INSERT",
-            zone=domain,
-            name=f"{factory.make_name()}.{domain}",
-            rectype="A",
-            answer=factory.make_ip_address(),
-        )
-        ttl = random.randint(1, 100)
-        cmd = NSUpdateCommand(
-            domain, [update], serial=random.randint(1, 100), ttl=ttl
-        )
-        self.assertEqual(
-            f"update add {update.name} {ttl} A {update.answer}",
-            cmd._format_update(update),
-        )
-
-    def test_nsupdate_sends_a_single_update(self):
-        domain = factory.make_name()
-        update = DynamicDNSUpdate(
-            operation="INSERT",
-            zone=domain,
-            name=f"{factory.make_name()}.{domain}",
-            rectype="A",
-            answer=factory.make_ip_address(),
-        )
-        serial = random.randint(1, 100)
-        ttl = random.randint(1, 100)
-        cmd = NSUpdateCommand(domain, [update], serial=serial, ttl=ttl)
-        run_command = self.patch(actions, "run_command")
-        cmd.update()
-        run_command.assert_called_once_with(
-            "nsupdate",
-            "-k",
-            get_nsupdate_key_path(),
-            stdin="\n".join(
-                [
-                    "server localhost",
-                    f"zone {domain}",
-                    f"update add {update.name} {ttl} A {update.answer}",
-                    f"update add {domain} {ttl} SOA {domain}. nobody.example.com. {serial} 600 1800 604800 {ttl}",
-                    "send\n",
-                ]
-            ).encode("ascii"),
-        )
-
-    def test_nsupdate_sends_a_bulk_update(self):
-        domain = factory.make_name()
-        deletions = [
-            DynamicDNSUpdate(
-                operation="DELETE",
-                zone=domain,
-                name=f"{factory.make_name()}.{domain}",
-                rectype="A",
-            )
-            for _ in range(2)
-        ]
-        additions = [
-            DynamicDNSUpdate(
-                operation="INSERT",
-                zone=domain,
-                name=f"{factory.make_name()}.{domain}",
-                rectype="A",
-                answer=factory.make_ip_address(),
-            )
-            for _ in range(2)
-        ]
-        ttl = random.randint(1, 100)
-        cmd = NSUpdateCommand(domain, deletions + additions, ttl=ttl)
-        run_command = self.patch(actions, "run_command")
-        cmd.update()
-        expected_stdin = [
-            "server localhost",
-            f"zone {domain}",
-            f"update delete {deletions[0].name} {deletions[0].rectype}",
-            f"update delete {deletions[1].name} {deletions[1].rectype}",
-            f"update add {additions[0].name} {ttl} {additions[0].rectype} {additions[0].answer}",
-            f"update add {additions[1].name} {ttl} {additions[1].rectype} {additions[1].answer}",
-            "send\n",
-        ]
-        run_command.assert_called_once_with(
-            "nsupdate",
-            "-k",
-            get_nsupdate_key_path(),
-            "-v",
-            stdin="\n".join(expected_stdin).encode("ascii"),
-        )
@@ -0,0 +1,279 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+"""Tests for :py:module:`provisioningserver.dns.nsupdate`."""
+
+import base64
+import os
+import random
+import socket
+import struct
+import threading
+
+import dns.message
+import dns.opcode
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
+import dns.tsig
+
+from maastesting.factory import factory
+from maastesting.testcase import MAASTestCase
+from provisioningserver.dns.config import DynamicDNSUpdate
+from provisioningserver.dns.nsupdate import (
+    DNSUpdateClient,
+    DNSUpdateError,
+    make_update_message,
+    read_tsig_key,
+)
+
+SECRET = base64.b64encode(os.urandom(64)).decode("ascii")
+
+KEY_FILE = f"""\
+key "maas." {{
+\talgorithm hmac-sha512;
+\tsecret "{SECRET}";
+}};
+"""
+
+
+def make_update(operation="INSERT", zone=None, **kwargs):
+    zone = zone or factory.make_name("domain")
+    kwargs.setdefault("name", f"{factory.make_name('host')}.{zone}")
+    kwargs.setdefault("rectype", "A")
+    if operation == "INSERT":
+        kwargs.setdefault("answer", factory.make_ipv4_address())
+    return DynamicDNSUpdate(operation=operation, zone=zone, **kwargs)
+
+
+class FakeDNSServer:
+    """A DNS server answering the updates it receives over TCP.
+
+    :param rcodes: A map of zone name to the rcode of its updates.
+    :param close_after: Close the connection after answering this many
+        updates.
+    """
+
+    def __init__(self, key, rcodes=None, close_after=None):
+        self.key = key
+        self.rcodes = rcodes or {}
+        self.close_after = close_after
+        self.updates = []
+        self.connections = 0
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        # Shutting down the listener wakes up accept().
+        try:
+            self.listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.listener.close()
+        self.thread.join(5)
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return
+            self.connections += 1
+            with conn:
+                self.handle(conn)
+
+    def handle(self, conn):
+        answered = 0
+        with conn.makefile("rb") as stream:
+            while True:
+                header = stream.read(2)
+                if len(header) < 2:
+                    return
+                (length,) = struct.unpack("!H", header)
+                query = dns.message.from_wire(
+                    stream.read(length), keyring=self.key
+                )
+                self.updates.append(query)
+                response = dns.message.make_response(query)
+                response.set_rcode(
+                    self.rcodes.get(
+                        query.zone[0].name.to_text(omit_final_dot=True),
+                        dns.rcode.NOERROR,
+                    )
+                )
+                data = response.to_wire()
+                conn.sendall(struct.pack("!H", len(data)) + data)
+                answered += 1
+                if answered == self.close_after:
+                    return
+
+
+class TestReadTSIGKey(MAASTestCase):
+    def test_reads_key(self):
+        key = read_tsig_key(self.make_file(contents=KEY_FILE))
+        self.assertEqual(dns.tsig.Key("maas.", SECRET, "hmac-sha512"), key)
+
+    def test_raises_error_for_missing_key(self):
+        path = self.make_file(contents="# no key\n")
+        self.assertRaises(DNSUpdateError, read_tsig_key, path)
+
+    def test_raises_error_for_invalid_key(self):
+        path = self.make_file(contents='key "maas." { secret "c2VjcmV0"; };')
+        self.assertRaises(DNSUpdateError, read_tsig_key, path)
+
+
+class TestMakeUpdateMessage(MAASTestCase):
+    def test_adds_records(self):
+        zone = factory.make_name("domain")
+        update = make_update(zone=zone)
+        ttl = random.randint(1, 100)
+        message = make_update_message(zone, [update], ttl=ttl)
+        self.assertEqual(dns.opcode.UPDATE, message.opcode())
+        self.assertEqual(f"{zone}.", message.origin.to_text())
+        [rrset] = message.update
+        self.assertEqual(f"{update.name}.", rrset.name.to_text())
+        self.assertEqual(ttl, rrset.ttl)
+        self.assertEqual(dns.rdatatype.A, rrset.rdtype)
+        self.assertEqual([update.answer], [rdata.to_text() for rdata in rrset])
+
+    def test_adds_records_with_their_ttl(self):
+        zone = factory.make_name("domain")
+        update = make_update(zone=zone, ttl=random.randint(101, 200))
+        message = make_update_message(zone, [update], ttl=30)
+        [rrset] = message.update
+        self.assertEqual(update.ttl, rrset.ttl)
+
+    def test_names_in_records_are_absolute(self):
+        zone = "0.0.10.in-addr.arpa"
+        update = make_update(
+            zone=zone,
+            name=f"1.{zone}",
+            rectype="PTR",
+            answer=f"{factory.make_name('host')}.example.com",
+        )
+        message = make_update_message(zone, [update])
+        [rrset] = message.update
+        self.assertEqual(f"{update.answer}.", rrset[0].target.to_text())
+
+    def test_deletes_records(self):
+        zone = factory.make_name("domain")
+        deletion = make_update(operation="DELETE", zone=zone)
+        message = make_update_message(zone, [deletion])
+        [rrset] = message.update
+        self.assertEqual(f"{deletion.name}.", rrset.name.to_text())
+        self.assertEqual(dns.rdatatype.A, rrset.rdtype)
+        self.assertEqual(dns.rdataclass.ANY, rrset.deleting)
+
+    def test_deletes_a_single_record(self):
+        zone = factory.make_name("domain")
+        deletion = make_update(
+            operation="DELETE", zone=zone, answer=factory.make_ipv4_address()
+        )
+        message = make_update_message(zone, [deletion])
+        [rrset] = message.update
+        self.assertEqual(dns.rdataclass.NONE, rrset.deleting)
+        self.assertEqual(
+            [deletion.answer], [rdata.to_text() for rdata in rrset]
+        )
+
+    def test_sets_serial(self):
+        zone = factory.make_name("domain")
+        serial = random.randint(1, 100)
+        ttl = random.randint(1, 100)
+        message = make_update_message(zone, [], serial=serial, ttl=ttl)
+        [rrset] = message.update
+        self.assertEqual(f"{zone}.", rrset.name.to_text())
+        self.assertEqual(dns.rdatatype.SOA, rrset.rdtype)
+        self.assertEqual(
+            f"{zone}. nobody.example.com. {serial} 600 1800 604800 {ttl}",
+            rrset[0].to_text(),
+        )
+
+
+class TestDNSUpdateClient(MAASTestCase):
+    def setUp(self):
+        super().setUp()
+        self.key_path = self.make_file(contents=KEY_FILE)
+        self.key = read_tsig_key(self.key_path)
+
+    def make_server(self, **kwargs):
+        server = FakeDNSServer(self.key, **kwargs)
+        self.addCleanup(server.stop)
+        return server
+
+    def make_client(self, server, **kwargs):
+        client = DNSUpdateClient(
+            server="127.0.0.1",
+            port=server.port,
+            key_path=self.key_path,
+            **kwargs,
+        )
+        self.addCleanup(client.close)
+        return client
+
+    def test_update_sends_signed_update(self):
+        server = self.make_server()
+        client = self.make_client(server)
+        zone = factory.make_name("domain")
+        update = make_update(zone=zone)
+        client.update(zone, [update])
+        [query] = server.updates
+        self.assertTrue(query.had_tsig)
+        self.assertEqual(f"{zone}.", query.zone[0].name.to_text())
+        self.assertEqual(f"{update.name}.", query.update[0].name.to_text())
+
+    def test_reuses_connection(self):
+        server = self.make_server()
+        client = self.make_client(server)
+        for _ in range(3):
+            zone = factory.make_name("domain")
+            client.update(zone, [make_update(zone=zone)])
+        self.assertEqual(3, len(server.updates))
+        self.assertEqual(1, server.connections)
+
+    def test_batch_sends_updates_at_the_end(self):
+        server = self.make_server()
+        client = self.make_client(server, max_in_flight=2)
+        zones = [factory.make_name("domain") for _ in range(5)]
+        with client.batch():
+            for zone in zones:
+                client.update(zone, [make_update(zone=zone)])
+            self.assertEqual([], server.updates)
+        self.assertCountEqual(
+            [f"{zone}." for zone in zones],
+            [query.zone[0].name.to_text() for query in server.updates],
+        )
+
+    def test_reconnects_when_connection_is_closed(self):
+        server = self.make_server(close_after=1)
+        client = self.make_client(server)
+        zones = [factory.make_name("domain") for _ in range(2)]
+        for zone in zones:
+            client.update(zone, [make_update(zone=zone)])
+        self.assertEqual(2, len(server.updates))
+        self.assertEqual(2, server.connections)
+
+    def test_raises_error_for_refused_updates(self):
+        refused_zone = factory.make_name("domain")
+        server = self.make_server(rcodes={refused_zone: dns.rcode.REFUSED})
+        client = self.make_client(server)
+        zone = factory.make_name("domain")
+        with self.assertRaisesRegex(
+            DNSUpdateError, f"{refused_zone}: REFUSED"
+        ):
+            with client.batch():
+                client.update(zone, [make_update(zone=zone)])
+                client.update(refused_zone, [make_update(zone=refused_zone)])
+        # The other updates were still applied.
+        self.assertEqual(2, len(server.updates))
+
+    def test_raises_error_when_server_is_unreachable(self):
+        server = self.make_server()
+        server.stop()
+        client = self.make_client(server)
+        zone = factory.make_name("domain")
+        self.assertRaises(
+            DNSUpdateError, client.update, zone, [make_update(zone=zone)]
+        )
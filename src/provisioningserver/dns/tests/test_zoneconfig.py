@@ -18,7 +18,6 @@ from maastesting.testcase import MAASTestCase
 from provisioningserver.dns import actions
 from provisioningserver.dns.config import (
     DynamicDNSUpdate,
-    get_nsupdate_key_path,
     get_zone_file_config_dir,
 )
 from provisioningserver.dns.testing import patch_zone_file_config_path
@@ -388,7 +387,9 @@ class TestDNSForwardZoneConfig(MAASTestCase):
             dynamic_ranges=[dynamic_range],
         )
         self.patch(dns_zone_config, "get_GENERATE_directives")
-        run_command = self.patch(actions, "run_command")
+        client = self.patch(
+            provisioningserver.dns.zoneconfig, "get_dns_update_client"
+        ).return_value
         dns_zone_config.write_config()
         update = DynamicDNSUpdate.create_from_trigger(
             operation="INSERT",
@@ -406,20 +407,11 @@ class TestDNSForwardZoneConfig(MAASTestCase):
             dynamic_updates=[update],
         )
         new_dns_zone_config.write_config()
-        expected_stdin = "\n".join(
-            [
-                "server localhost",
-                f"zone {domain}",
-                f"update add {update.name} {ttl} {'A' if IPAddress(update.answer).version == 4 else 'AAAA'} {update.answer}",
-                f"update add {domain} {new_dns_zone_config.default_ttl} SOA {domain}. nobody.example.com. {new_dns_zone_config.serial} 600 1800 604800 {new_dns_zone_config.default_ttl}",
-                "send\n",
-            ]
-        )
-        run_command.assert_called_once_with(
-            "nsupdate",
-            "-k",
-            get_nsupdate_key_path(),
-            stdin=expected_stdin.encode("ascii"),
+        client.update.assert_called_once_with(
+            domain,
+            [update],
+            serial=new_dns_zone_config.serial,
+            ttl=new_dns_zone_config.default_ttl,
         )
 
     def test_dynamic_update_sets_serial_when_no_other_updates_are_present(
@@ -447,7 +439,9 @@ class TestDNSForwardZoneConfig(MAASTestCase):
             dynamic_ranges=[dynamic_range],
         )
         self.patch(dns_zone_config, "get_GENERATE_directives")
-        run_command = self.patch(actions, "run_command")
+        client = self.patch(
+            provisioningserver.dns.zoneconfig, "get_dns_update_client"
+        ).return_value
         dns_zone_config.write_config()
         new_dns_zone_config = DNSForwardZoneConfig(
             domain,
@@ -457,19 +451,11 @@ class TestDNSForwardZoneConfig(MAASTestCase):
             dynamic_ranges=[dynamic_range],
         )
         new_dns_zone_config.write_config()
-        expected_stdin = "\n".join(
-            [
-                "server localhost",
-                f"zone {domain}",
-                f"update add {domain} {new_dns_zone_config.default_ttl} SOA {domain}. nobody.example.com. {new_dns_zone_config.serial} 600 1800 604800 {new_dns_zone_config.default_ttl}",
-                "send\n",
-            ]
-        )
-        run_command.assert_called_once_with(
-            "nsupdate",
-            "-k",
-            get_nsupdate_key_path(),
-            stdin=expected_stdin.encode("ascii"),
+        client.update.assert_called_once_with(
+            domain,
+            [],
+            serial=new_dns_zone_config.serial,
+            ttl=new_dns_zone_config.default_ttl,
         )
 
     def test_full_reload_calls_freeze_thaw(self):
@@ -496,7 +482,7 @@ class TestDNSForwardZoneConfig(MAASTestCase):
             dynamic_ranges=[dynamic_range],
         )
         self.patch(dns_zone_config, "get_GENERATE_directives")
-        self.patch(actions, "run_command")
+        self.patch(provisioningserver.dns.zoneconfig, "get_dns_update_client")
         dns_zone_config.write_config()
         dns_zone_config.force_config_write = True
         dns_zone_config.write_config()
@@ -916,25 +902,16 @@ class TestDNSReverseZoneConfig(MAASTestCase):
             network=network,
             dynamic_updates=rev_updates,
         )
-        run_command = self.patch(actions, "run_command")
+        client = self.patch(
+            provisioningserver.dns.zoneconfig, "get_dns_update_client"
+        ).return_value
         zone.write_config()
         zone.write_config()
-        expected_stdin = "\n".join(
-            [
-                "server localhost",
-                "zone 0.0.10.in-addr.arpa",
-                f"update add {IPAddress(ip1).reverse_dns} {zone.default_ttl} PTR {hostname1}.{domain}",
-                f"update add {IPAddress(ip2).reverse_dns} {zone.default_ttl} PTR {hostname2}.{domain}",
-                f"update add 0.0.10.in-addr.arpa {zone.default_ttl} SOA 0.0.10.in-addr.arpa. nobody.example.com. {zone.serial} 600 1800 604800 {zone.default_ttl}",
-                "send\n",
-            ]
-        )
-        run_command.assert_called_once_with(
-            "nsupdate",
-            "-k",
-            get_nsupdate_key_path(),
-            "-v",
-            stdin=expected_stdin.encode("ascii"),
+        client.update.assert_called_once_with(
+            "0.0.10.in-addr.arpa",
+            rev_updates,
+            serial=zone.serial,
+            ttl=zone.default_ttl,
         )
 
     def test_dynamic_update_sets_serial_when_no_other_updates_are_present(
@@ -948,22 +925,16 @@ class TestDNSReverseZoneConfig(MAASTestCase):
             serial=random.randint(1, 100),
             network=network,
         )
-        run_command = self.patch(actions, "run_command")
+        client = self.patch(
+            provisioningserver.dns.zoneconfig, "get_dns_update_client"
+        ).return_value
         zone.write_config()
         zone.write_config()
-        expected_stdin = "\n".join(
-            [
-                "server localhost",
-                "zone 0.0.10.in-addr.arpa",
-                f"update add 0.0.10.in-addr.arpa {zone.default_ttl} SOA 0.0.10.in-addr.arpa. nobody.example.com. {zone.serial} 600 1800 604800 {zone.default_ttl}",
-                "send\n",
-            ]
-        )
-        run_command.assert_called_once_with(
-            "nsupdate",
-            "-k",
-            get_nsupdate_key_path(),
-            stdin=expected_stdin.encode("ascii"),
+        client.update.assert_called_once_with(
+            "0.0.10.in-addr.arpa",
+            [],
+            serial=zone.serial,
+            ttl=zone.default_ttl,
         )
 
     def test_glue_network_zone_contains_appropriate_dynamic_updates(self):
@@ -1011,44 +982,24 @@ class TestDNSReverseZoneConfig(MAASTestCase):
             network=glue_network,
             dynamic_updates=glue_rev_updates,
         )
-        expected_stdin = "\n".join(
-            [
-                "server localhost",
-                "zone 0-26.0.0.10.in-addr.arpa",
-                f"update add {IPAddress(ip1).reverse_dns.replace('0.0.10', '0-26.0.0.10')} {zone.default_ttl} PTR {hostname1}.{domain}",
-                f"update add {IPAddress(ip2).reverse_dns.replace('0.0.10', '0-26.0.0.10')} {zone.default_ttl} PTR {hostname2}.{domain}",
-                f"update add 0-26.0.0.10.in-addr.arpa {zone.default_ttl} SOA 0-26.0.0.10.in-addr.arpa. nobody.example.com. {zone.serial} 600 1800 604800 {zone.default_ttl}",
-                "send\n",
-            ]
-        )
-        glue_expected_stdin = "\n".join(
-            [
-                "server localhost",
-                "zone 0.0.10.in-addr.arpa",
-                f"update add {IPAddress(ip1).reverse_dns} {zone.default_ttl} PTR {hostname1}.{domain}",
-                f"update add {IPAddress(ip2).reverse_dns} {zone.default_ttl} PTR {hostname2}.{domain}",
-                f"update add 0.0.10.in-addr.arpa {glue_zone.default_ttl} SOA 0.0.10.in-addr.arpa. nobody.example.com. {glue_zone.serial} 600 1800 604800 {glue_zone.default_ttl}",
-                "send\n",
-            ]
-        )
-        run_command = self.patch(actions, "run_command")
+        client = self.patch(
+            provisioningserver.dns.zoneconfig, "get_dns_update_client"
+        ).return_value
         glue_zone.write_config()
         glue_zone.write_config()
-        run_command.assert_called_with(
-            "nsupdate",
-            "-k",
-            get_nsupdate_key_path(),
-            "-v",
-            stdin=glue_expected_stdin.encode("ascii"),
+        client.update.assert_called_with(
+            "0.0.10.in-addr.arpa",
+            glue_rev_updates,
+            serial=glue_zone.serial,
+            ttl=glue_zone.default_ttl,
         )
         zone.write_config()
         zone.write_config()
-        run_command.assert_called_with(
-            "nsupdate",
-            "-k",
-            get_nsupdate_key_path(),
-            "-v",
-            stdin=expected_stdin.encode("ascii"),
+        client.update.assert_called_with(
+            "0-26.0.0.10.in-addr.arpa",
+            rev_updates,
+            serial=zone.serial,
+            ttl=zone.default_ttl,
         )
 
     def test_full_reload_calls_freeze_thaw(self):
@@ -1063,7 +1014,7 @@ class TestDNSReverseZoneConfig(MAASTestCase):
             serial=random.randint(1, 100),
             network=network,
         )
-        self.patch(actions, "run_command")
+        self.patch(provisioningserver.dns.zoneconfig, "get_dns_update_client")
         zone.write_config()
         zone.force_config_write = True
         zone.write_config()
@@ -12,13 +12,14 @@ from typing import Iterator
 from netaddr import IPAddress, IPNetwork, spanning_cidr
 from netaddr.core import AddrFormatError
 
-from provisioningserver.dns.actions import freeze_thaw_zone, NSUpdateCommand
+from provisioningserver.dns.actions import freeze_thaw_zone
 from provisioningserver.dns.config import (
     compose_zone_file_config_path,
     DynamicDNSUpdate,
     render_dns_template,
     report_missing_config_dir,
 )
+from provisioningserver.dns.nsupdate import get_dns_update_client
 from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
 from provisioningserver.utils.fs import atomic_write
 from provisioningserver.utils.network import (
@@ -186,27 +187,56 @@ class DomainConfigBase:
         else:
             return True
 
-    def dynamic_update(self, zone_info, network=None):
-        nsupdate = NSUpdateCommand(
-            zone_info.zone_name,
-            [
-                update
-                for update in self._dynamic_updates
-                if update.zone == zone_info.zone_name
-                or (
-                    networks_overlap(IPNetwork(update.subnet), network)
-                    and record_for_network(update, network)
-                    if network
-                    else networks_overlap(
-                        IPNetwork(update.subnet), zone_info.subnetwork
+    def _bucket_dynamic_updates(self):
+        """The dynamic updates by zone name, bucketed in a single pass.
+
+        An update belongs to the zone it names, and to the zones with a
+        network overlapping its subnet. A PTR update only belongs to the
+        zones with a network that includes its IP.
+        """
+        zone_updates = {zi.zone_name: [] for zi in self.zone_info}
+        zone_networks = {
+            zi.subnetwork.cidr: zi.zone_name
+            for zi in self.zone_info
+            if zi.subnetwork is not None
+        }
+        prefixlens = {network.prefixlen for network in zone_networks}
+        for update in self._dynamic_updates:
+            zones = set()
+            if update.zone in zone_updates:
+                zones.add(update.zone)
+            if update.subnet and zone_networks:
+                subnet = IPNetwork(update.subnet)
+                if update.rectype == "PTR":
+                    # Look up the networks including the IP, rather than
+                    # going through all the zones.
+                    ip = IPAddress(update.ip)
+                    width = 32 if ip.version == 4 else 128
+                    candidates = (
+                        IPNetwork((ip.value, prefixlen), ip.version).cidr
+                        for prefixlen in prefixlens
+                        if prefixlen <= width
                     )
-                    and record_for_network(update, zone_info.subnetwork)
+                else:
+                    candidates = zone_networks
+                zones.update(
+                    zone_networks[network]
+                    for network in candidates
+                    if network in zone_networks
+                    and networks_overlap(subnet, network)
+                    and record_for_network(update, network)
                 )
-            ],
+            for zone in zones:
+                zone_updates[zone].append(update)
+        return zone_updates
+
+    def dynamic_update(self, zone_info, updates):
+        get_dns_update_client().update(
+            zone_info.zone_name,
+            updates,
             serial=self.serial,
             ttl=self.default_ttl,
         )
-        nsupdate.update()
 
     @classmethod
     def write_zone_file(cls, output_file, *parameters):
@@ -341,6 +371,7 @@ class DNSForwardZoneConfig(DomainConfigBase):
 
     def write_config(self):
         """Write the zone file."""
+        zone_updates = self._bucket_dynamic_updates()
         # Create GENERATE directives for IPv4 ranges.
         for zi in self.zone_info:
             generate_directives = list(
@@ -351,7 +382,7 @@ class DNSForwardZoneConfig(DomainConfigBase):
                 )
             )
             if not self.force_config_write and self.zone_file_exists(zi):
-                self.dynamic_update(zi)
+                self.dynamic_update(zi, zone_updates[zi.zone_name])
                 PROMETHEUS_METRICS.update(
                     "maas_dns_dynamic_update_count",
                     "inc",
@@ -601,6 +632,7 @@ class DNSReverseZoneConfig(DomainConfigBase):
 
     def write_config(self):
         """Write the zone file."""
+        zone_updates = self._bucket_dynamic_updates()
         # Create GENERATE directives for IPv4 ranges.
         for zi in self.zone_info:
             generate_directives = list(
@@ -613,7 +645,7 @@ class DNSReverseZoneConfig(DomainConfigBase):
                 )
             )
             if not self.force_config_write and self.zone_file_exists(zi):
-                self.dynamic_update(zi, network=zi.subnetwork)
+                self.dynamic_update(zi, zone_updates[zi.zone_name])
                 PROMETHEUS_METRICS.update(
                     "maas_dns_dynamic_update_count",
                     "inc",
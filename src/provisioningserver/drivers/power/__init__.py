@@ -9,12 +9,17 @@ import sys
 from jsonschema import validate
 from twisted.internet import reactor
 from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import TimeoutError as DeferredTimeoutError
+from twisted.internet.error import ConnectError, ConnectionLost, DNSLookupError
+from twisted.internet.error import TimeoutError as ConnectionTimeoutError
 from twisted.internet.threads import deferToThread
+from twisted.web.client import ResponseNeverReceived
 
 from provisioningserver.drivers import (
     IP_EXTRACTOR_SCHEMA,
     MULTIPLE_CHOICE_SETTING_PARAMETER_FIELD_SCHEMA,
     SETTING_PARAMETER_FIELD_SCHEMA,
+    SETTING_SCOPE,
 )
 from provisioningserver.logger import get_maas_logger
 from provisioningserver.utils.twisted import IAsynchronous, pause
@@ -28,6 +33,18 @@ UNKNOWN_POWER_TYPE = ""
 # A policy used when waiting between retries of power changes.
 DEFAULT_WAITING_POLICY = (1, 2, 2, 4, 6, 8, 12)
 
+# Errors meaning that the BMC couldn't be reached at all.
+CONNECTION_ERRORS = (
+    ConnectError,
+    ConnectionError,
+    ConnectionLost,
+    ConnectionTimeoutError,
+    DeferredTimeoutError,
+    DNSLookupError,
+    ResponseNeverReceived,
+    TimeoutError,
+)
+
 # JSON schema for what a power driver definition should look like
 JSON_POWER_DRIVER_SCHEMA = {
     "title": "Power driver setting set",
@@ -121,6 +138,10 @@ class PowerActionError(PowerError):
 class PowerDriverBase(metaclass=ABCMeta):
     """Base driver for a power driver."""
 
+    # Whether `query_many` can query several nodes behind the same BMC with
+    # a single request to the BMC.
+    can_query_many = False
+
     def __init__(self):
         super().__init__()
         validate(
@@ -219,6 +240,43 @@ class PowerDriverBase(metaclass=ABCMeta):
             calling function should ignore this error, and continue on.
         """
 
+    def query_many(self, contexts):
+        """Perform the query action for several nodes sharing a BMC.
+
+        Only called when `can_query_many` is set, and for nodes for which
+        `get_bmc_key` returns the same key.
+
+        :param contexts: A dict mapping `Node.system_id` to the power
+            settings for the node.
+        :return: A dict mapping `Node.system_id` to the status of the node.
+            Nodes whose status couldn't be determined can be left out, they
+            are then queried individually with `query`.
+        :raises PowerConnError: when the BMC can't be reached. The nodes are
+            then all reported as failed, without querying them individually.
+        """
+        raise NotImplementedError()
+
+    def get_bmc_key(self, context):
+        """Return a key identifying the BMC that `context` refers to.
+
+        Nodes with the same key can be queried together with `query_many`.
+
+        :param context: Power settings for the node.
+        :return: A hashable key, or `None` if the node can't be queried
+            together with other nodes.
+        """
+        if not self.can_query_many:
+            return None
+        key = []
+        for setting in self.settings:
+            if setting["scope"] != SETTING_SCOPE.BMC:
+                continue
+            value = context.get(setting["name"])
+            if setting["required"] and not value:
+                return None
+            key.append(str(value))
+        return tuple(key)
+
     def set_boot_order(self, system_id, context, order):
         """Set the specified boot order.
 
@@ -306,6 +364,11 @@ class PowerDriver(PowerDriverBase):
         """Implement this method for the actual implementation
         of the power reset command."""
 
+    def power_query_many(self, contexts):
+        """Implement this method, and set `can_query_many`, for drivers that
+        can query several nodes behind the same BMC at once."""
+        raise NotImplementedError()
+
     def on(self, system_id, context):
         """Performs the power on action for `system_id`.
 
@@ -364,6 +427,25 @@ class PowerDriver(PowerDriverBase):
         else:
             raise exc_info[0](exc_info[1]).with_traceback(exc_info[2])
 
+    @inlineCallbacks
+    def query_many(self, contexts):
+        """Performs the power query action for several nodes at once.
+
+        Failures are not retried. Connection errors and timeouts are raised
+        as `PowerConnError`, since querying the nodes one by one would only
+        fail the same way.
+        """
+        try:
+            if IAsynchronous.providedBy(self.power_query_many):
+                states = yield self.power_query_many(contexts)
+            else:
+                states = yield deferToThread(self.power_query_many, contexts)
+        except CONNECTION_ERRORS as error:
+            raise PowerConnError(
+                f"Could not connect to the BMC: {error}"
+            ) from error
+        return states
+
     @inlineCallbacks
     def reset(self, system_id, context):
         """Performs the power reset action for `system_id`.
@@ -33,6 +33,7 @@ class ProxmoxPowerDriver(WebhookPowerDriver):
     chassis = True
     can_probe = True
     can_set_boot_order = False
+    can_query_many = True
     description = "Proxmox"
     settings = [
         make_setting_field(
@@ -148,8 +149,7 @@ class ProxmoxPowerDriver(WebhookPowerDriver):
         d.addCallback(cb)
         return d
 
-    def _find_vm(self, system_id, context, extra_headers):
-        power_vm_name = context["power_vm_name"]
+    def _list_vms(self, system_id, context, extra_headers):
         d = self._webhook_request(
             b"GET",
             self._get_url(context, "cluster/resources", {"type": "vm"}),
@@ -164,14 +164,37 @@ class ProxmoxPowerDriver(WebhookPowerDriver):
                 raise PowerActionError(
                     "No VMs returned! Are permissions set correctly?"
                 )
-            for vm in vms:
-                if power_vm_name in (str(vm.get("vmid")), vm.get("name")):
-                    return vm
-            raise PowerActionError("Unable to find virtual machine")
+            return vms
 
         d.addCallback(cb)
         return d
 
+    def _match_vm(self, vms, power_vm_name):
+        for vm in vms:
+            if power_vm_name in (str(vm.get("vmid")), vm.get("name")):
+                return vm
+        return None
+
+    def _find_vm(self, system_id, context, extra_headers):
+        d = self._list_vms(system_id, context, extra_headers)
+
+        def cb(vms):
+            vm = self._match_vm(vms, context["power_vm_name"])
+            if vm is None:
+                raise PowerActionError("Unable to find virtual machine")
+            return vm
+
+        d.addCallback(cb)
+        return d
+
+    def _get_power_state(self, vm):
+        if vm["status"] == "running":
+            return "on"
+        elif vm["status"] == "stopped":
+            return "off"
+        else:
+            return "unknown"
+
     @asynchronous
     @inlineCallbacks
     def power_on(self, system_id, context):
@@ -211,12 +234,22 @@ class ProxmoxPowerDriver(WebhookPowerDriver):
     def power_query(self, system_id, context):
         extra_headers = yield self._login(system_id, context)
         vm = yield self._find_vm(system_id, context, extra_headers)
-        if vm["status"] == "running":
-            return "on"
-        elif vm["status"] == "stopped":
-            return "off"
-        else:
-            return "unknown"
+        return self._get_power_state(vm)
+
+    @asynchronous
+    @inlineCallbacks
+    def power_query_many(self, contexts):
+        # All the nodes share the same Proxmox credentials, so the first
+        # node's context is used to log in and list the VMs once.
+        system_id, context = next(iter(contexts.items()))
+        extra_headers = yield self._login(system_id, context)
+        vms = yield self._list_vms(system_id, context, extra_headers)
+        states = {}
+        for system_id, context in contexts.items():
+            vm = self._match_vm(vms, context["power_vm_name"])
+            if vm is not None:
+                states[system_id] = self._get_power_state(vm)
+        return states
 
     @asynchronous
     @inlineCallbacks
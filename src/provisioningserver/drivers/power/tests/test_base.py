@@ -14,7 +14,7 @@ from maastesting import get_testing_timeout
 from maastesting.factory import factory
 from maastesting.runtest import MAASTwistedRunTest
 from maastesting.testcase import MAASTestCase
-from provisioningserver.drivers import make_setting_field, power
+from provisioningserver.drivers import make_setting_field, power, SETTING_SCOPE
 from provisioningserver.drivers.power import (
     get_error_message,
     JSON_POWER_DRIVER_SCHEMA,
@@ -153,6 +153,20 @@ class TestFakePowerDriverBase(MAASTestCase):
             sentinel.context,
         )
 
+    def test_query_many_raises_not_implemented(self):
+        fake_driver = make_power_driver_base()
+        self.assertRaises(
+            NotImplementedError, fake_driver.query_many, sentinel.contexts
+        )
+
+    def test_get_bmc_key_returns_none_if_cannot_query_many(self):
+        fake_driver = make_power_driver_base(
+            settings=[make_setting_field("power_address", "Address")]
+        )
+        self.assertIsNone(
+            fake_driver.get_bmc_key({"power_address": "10.0.0.1"})
+        )
+
     def test_set_boot_order_raises_not_implemented(self):
         fake_driver = make_power_driver_base()
         self.assertRaises(
@@ -512,6 +526,79 @@ class TestPowerDriverCycle(MAASTestCase):
         )
 
 
+class TestPowerDriverQueryMany(MAASTestCase):
+    run_tests_with = MAASTwistedRunTest.make_factory(timeout=TIMEOUT)
+
+    def make_batch_driver(self):
+        driver = make_power_driver(
+            settings=[
+                make_setting_field("power_address", "Address", required=True),
+                make_setting_field("power_pass", "Password"),
+                make_setting_field(
+                    "power_id", "ID", scope=SETTING_SCOPE.NODE, required=True
+                ),
+            ]
+        )
+        driver.can_query_many = True
+        return driver
+
+    @inlineCallbacks
+    def test_returns_states(self):
+        driver = self.make_batch_driver()
+        states = {factory.make_name("system_id"): "on"}
+        power_query_many = self.patch(driver, "power_query_many")
+        power_query_many.return_value = states
+        output = yield driver.query_many(sentinel.contexts)
+        self.assertEqual(states, output)
+        power_query_many.assert_called_once_with(sentinel.contexts)
+
+    @inlineCallbacks
+    def test_raises_connection_errors_as_PowerConnError(self):
+        driver = self.make_batch_driver()
+        power_query_many = self.patch(driver, "power_query_many")
+        power_query_many.side_effect = ConnectionRefusedError()
+        with self.assertRaisesRegex(
+            PowerConnError, r"^Could not connect to the BMC: "
+        ):
+            yield driver.query_many(sentinel.contexts)
+
+    @inlineCallbacks
+    def test_raises_other_errors_unchanged(self):
+        driver = self.make_batch_driver()
+        power_query_many = self.patch(driver, "power_query_many")
+        power_query_many.side_effect = PowerActionError("boom")
+        with self.assertRaisesRegex(PowerActionError, r"^boom$"):
+            yield driver.query_many(sentinel.contexts)
+
+    def test_get_bmc_key_ignores_node_settings(self):
+        driver = self.make_batch_driver()
+        key = driver.get_bmc_key(
+            {"power_address": "10.0.0.1", "power_pass": "", "power_id": "a"}
+        )
+        self.assertIsNotNone(key)
+        self.assertEqual(
+            key,
+            driver.get_bmc_key(
+                {
+                    "power_address": "10.0.0.1",
+                    "power_pass": "",
+                    "power_id": "b",
+                }
+            ),
+        )
+
+    def test_get_bmc_key_distinguishes_bmc_settings(self):
+        driver = self.make_batch_driver()
+        self.assertNotEqual(
+            driver.get_bmc_key({"power_address": "10.0.0.1", "power_id": "a"}),
+            driver.get_bmc_key({"power_address": "10.0.0.2", "power_id": "a"}),
+        )
+
+    def test_get_bmc_key_requires_bmc_settings(self):
+        driver = self.make_batch_driver()
+        self.assertIsNone(driver.get_bmc_key({"power_id": "a"}))
+
+
 class TestPowerDriverQuery(MAASTestCase):
     run_tests_with = MAASTwistedRunTest.make_factory(timeout=TIMEOUT)
 
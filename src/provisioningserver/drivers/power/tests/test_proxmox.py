@@ -455,6 +455,61 @@ class TestProxmoxPowerDriver(MAASTestCase):
 
         self.assertEqual("unknown", status)
 
+    @inlineCallbacks
+    def test_power_query_many(self):
+        power_address = factory.make_name("power_address")
+        contexts = {
+            factory.make_name("system_id"): {
+                "power_address": power_address,
+                "power_vm_name": vm_name,
+            }
+            for vm_name in ("100", "vm-on", "missing")
+        }
+        extra_headers = {
+            factory.make_name("key").encode(): [
+                factory.make_name("value").encode()
+            ]
+        }
+        login = self.patch(self.proxmox, "_login")
+        login.return_value = succeed(extra_headers)
+        self.mock_webhook_request.return_value = succeed(
+            json.dumps(
+                {
+                    "data": [
+                        {"vmid": 100, "name": "vm-off", "status": "stopped"},
+                        {"vmid": 101, "name": "vm-on", "status": "running"},
+                    ]
+                }
+            )
+        )
+
+        states = yield self.proxmox.power_query_many(contexts)
+
+        system_ids = list(contexts)
+        self.assertEqual({system_ids[0]: "off", system_ids[1]: "on"}, states)
+        login.assert_called_once_with(system_ids[0], contexts[system_ids[0]])
+        self.mock_webhook_request.assert_called_once()
+
+    def test_get_bmc_key(self):
+        context = {
+            "power_address": factory.make_name("power_address"),
+            "power_user": factory.make_name("power_user"),
+            "power_pass": factory.make_name("power_pass"),
+            "power_vm_name": factory.make_name("power_vm_name"),
+            "power_verify_ssl": SSL_INSECURE_NO,
+        }
+        other_vm = {**context, "power_vm_name": factory.make_name("vm")}
+        other_user = {**context, "power_user": factory.make_name("user")}
+
+        key = self.proxmox.get_bmc_key(context)
+
+        self.assertIsNotNone(key)
+        self.assertEqual(key, self.proxmox.get_bmc_key(other_vm))
+        self.assertNotEqual(key, self.proxmox.get_bmc_key(other_user))
+
+    def test_get_bmc_key_without_required_settings(self):
+        self.assertIsNone(self.proxmox.get_bmc_key({}))
+
 
 class TestProxmoxProbeAndEnlist(MAASTestCase):
     run_tests_with = MAASTwistedRunTest.make_factory(timeout=TIMEOUT)
@@ -3,13 +3,15 @@
 
 """Tests for `provisioningserver.drivers.power.virsh`."""
 
+from unittest.mock import call
+
 import pexpect
 from twisted.internet.defer import inlineCallbacks
 
 from maastesting import get_testing_timeout
 from maastesting.factory import factory
 from maastesting.testcase import MAASTestCase, MAASTwistedRunTest
-from provisioningserver.drivers.power import virsh
+from provisioningserver.drivers.power import PowerConnError, virsh
 from provisioningserver.drivers.power.virsh import VirshPowerDriver
 from provisioningserver.utils.shell import (
     get_env_with_locale,
@@ -449,3 +451,49 @@ class TestVirshPowerDriver(MAASTestCase):
             virsh.VirshError, "^Unknown state: unknown$"
         ):
             yield driver.power_state_virsh(power_address, power_id)
+
+    @inlineCallbacks
+    def test_power_states_uses_one_session(self):
+        driver = VirshPowerDriver()
+        mock_login = self.patch(virsh.VirshSSH, "login")
+        mock_login.return_value = True
+        mock_state = self.patch(virsh.VirshSSH, "get_machine_state")
+        mock_state.side_effect = [
+            virsh.VirshVMState.ON,
+            virsh.VirshVMState.OFF,
+            None,
+        ]
+        power_address = factory.make_name("power_address")
+        contexts = {
+            factory.make_name("system_id"): {
+                "power_address": power_address,
+                "power_id": factory.make_name("power_id"),
+                "power_pass": "",
+            }
+            for _ in range(3)
+        }
+
+        states = yield driver.power_states_virsh(contexts)
+
+        system_ids = list(contexts)
+        self.assertEqual({system_ids[0]: "on", system_ids[1]: "off"}, states)
+        mock_login.assert_called_once_with(power_address, None)
+        mock_state.assert_has_calls(
+            [call(context["power_id"]) for context in contexts.values()]
+        )
+
+    @inlineCallbacks
+    def test_power_states_login_failure(self):
+        driver = VirshPowerDriver()
+        mock_login = self.patch(virsh.VirshSSH, "login")
+        mock_login.return_value = False
+        contexts = {
+            factory.make_name("system_id"): {
+                "power_address": factory.make_name("power_address"),
+                "power_id": factory.make_name("power_id"),
+            }
+        }
+        with self.assertRaisesRegex(
+            PowerConnError, r"^Failed to login to virsh console\.$"
+        ):
+            yield driver.power_states_virsh(contexts)
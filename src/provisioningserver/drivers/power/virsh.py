@@ -16,7 +16,7 @@ from provisioningserver.drivers import (
     make_setting_field,
     SETTING_SCOPE,
 )
-from provisioningserver.drivers.power import PowerDriver
+from provisioningserver.drivers.power import PowerConnError, PowerDriver
 from provisioningserver.logger import get_maas_logger
 from provisioningserver.path import get_path
 from provisioningserver.prometheus.metrics import PROMETHEUS_METRICS
@@ -197,6 +197,7 @@ class VirshPowerDriver(PowerDriver):
     chassis = True
     can_probe = True
     can_set_boot_order = False
+    can_query_many = True
     settings = [
         make_setting_field("power_address", "Address", required=True),
         make_setting_field(
@@ -277,6 +278,34 @@ class VirshPowerDriver(PowerDriver):
         except KeyError:
             raise VirshError("Unknown state: %s" % state)  # noqa: B904
 
+    @inlineCallbacks
+    def power_states_virsh(self, contexts):
+        """Return the power states for several VMs on the same host.
+
+        A single virsh session is used to query all the VMs.
+        """
+        context = next(iter(contexts.values()))
+        power_pass = context.get("power_pass")
+        if power_pass == "":
+            power_pass = None
+
+        conn = VirshSSH()
+        logged_in = yield deferToThread(
+            conn.login, context["power_address"], power_pass
+        )
+        if not logged_in:
+            # Nodes on the same host would fail the same way.
+            raise PowerConnError("Failed to login to virsh console.")
+
+        states = {}
+        for system_id, context in contexts.items():
+            state = yield deferToThread(
+                conn.get_machine_state, context["power_id"]
+            )
+            if state in VM_STATE_TO_POWER_STATE:
+                states[system_id] = VM_STATE_TO_POWER_STATE[state]
+        return states
+
     @asynchronous
     def power_on(self, system_id, context):
         """Power on Virsh node."""
@@ -292,6 +321,11 @@ class VirshPowerDriver(PowerDriver):
         """Power query Virsh node."""
         return self.power_state_virsh(**context)
 
+    @asynchronous
+    def power_query_many(self, contexts):
+        """Power query several Virsh nodes on the same host."""
+        return self.power_states_virsh(contexts)
+
     @asynchronous
     def power_reset(self, system_id, context):
         """Power reset Virsh node."""
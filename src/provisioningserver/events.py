@@ -3,7 +3,9 @@
 
 """Event catalog."""
 
-from twisted.internet.defer import maybeDeferred, succeed
+from twisted.internet import reactor
+from twisted.internet.defer import DeferredList, maybeDeferred, succeed
+from twisted.protocols.amp import MAX_VALUE_LENGTH, UnhandledCommand
 
 from maascommon.enums.events import EventTypeEnum
 from maascommon.events import EVENT_DETAILS_MAP
@@ -15,6 +17,7 @@ from provisioningserver.rpc.region import (
     SendEvent,
     SendEventIPAddress,
     SendEventMACAddress,
+    SendEvents,
 )
 from provisioningserver.utils.env import MAAS_ID
 from provisioningserver.utils.twisted import (
@@ -403,6 +406,143 @@ class NodeEventHub:
 nodeEventHub = NodeEventHub()
 
 
+class NodeEventBuffer:
+    """Buffer node events by IP address and send them to the region in
+    batches.
+
+    Identical events (same type, IP address and description) that are logged
+    before the buffer is flushed are coalesced into a single event. The
+    buffer is flushed `delay` seconds after the first event is added, or as
+    soon as it holds `max_size` distinct events.
+
+    The events travel as a single AMP value, which can't be longer than
+    `MAX_VALUE_LENGTH` bytes, so a flush is split into as many `SendEvents`
+    calls as needed to keep each batch under that limit.
+
+    Regions that don't know about `SendEvents` are sent the events one by
+    one through `NodeEventHub.logByIP`.
+    """
+
+    def __init__(self, hub, clock=reactor, delay=1.0, max_size=100):
+        super().__init__()
+        self.hub = hub
+        self.clock = clock
+        self.delay = delay
+        self.max_size = max_size
+        self._pending = {}
+        self._flush_call = None
+
+    @asynchronous
+    def logByIP(self, event_type, ip_address, description=""):
+        """Queue the given node event to be sent to the region.
+
+        :return: :class:`Deferred` that fires once the batch containing the
+            event has been sent.
+        """
+        key = (event_type, ip_address, description)
+        result = self._pending.get(key)
+        if result is None:
+            result = self._pending[key] = DeferredValue()
+        d = result.get()
+        if len(self._pending) >= self.max_size:
+            self.flush()
+        elif self._flush_call is None:
+            self._flush_call = self.clock.callLater(self.delay, self.flush)
+        return d
+
+    @asynchronous
+    def flush(self):
+        """Send all the buffered events to the region now.
+
+        :return: :class:`Deferred` that fires once the events have been sent.
+        """
+        if self._flush_call is not None:
+            if self._flush_call.active():
+                self._flush_call.cancel()
+            self._flush_call = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return succeed(None)
+
+        return DeferredList(
+            [
+                self._sendBatch(batch, pending)
+                for batch in self._makeBatches(list(pending))
+            ]
+        ).addCallback(lambda _: None)
+
+    def _makeBatches(self, events):
+        """Split `events` into batches that fit in one `SendEvents` call."""
+        batch, batch_size = [], 0
+        for event in events:
+            event_size = _encodedEventSize(event)
+            if batch and batch_size + event_size > MAX_VALUE_LENGTH:
+                yield batch
+                batch, batch_size = [], 0
+            batch.append(event)
+            batch_size += event_size
+        if batch:
+            yield batch
+
+    def _sendBatch(self, batch, pending):
+        d = self._sendEvents(batch)
+        d.addErrback(self._sendEventsSeparately, batch)
+
+        def notify(result):
+            for event in batch:
+                pending[event].set(result)
+
+        return d.addBoth(notify)
+
+    def _sendEvents(self, events):
+        event_types = {event_type for event_type, _, _ in events}
+        d = DeferredList(
+            [
+                self.hub.ensureEventTypeRegistered(event_type)
+                for event_type in event_types
+            ],
+            fireOnOneErrback=True,
+            consumeErrors=True,
+        )
+        # Unwrap the first failure from the `FirstError`.
+        d.addErrback(lambda failure: failure.value.subFailure)
+
+        def send(_):
+            client = getRegionClient()
+            return client(
+                SendEvents,
+                events=[_eventToArgument(event) for event in events],
+            )
+
+        return d.addCallback(send)
+
+    def _sendEventsSeparately(self, failure, events):
+        failure.trap(UnhandledCommand)
+        return DeferredList(
+            [self.hub.logByIP(*event) for event in events],
+            consumeErrors=True,
+        )
+
+
+def _eventToArgument(event):
+    event_type, ip_address, description = event
+    return {
+        "type_name": event_type,
+        "ip_address": ip_address,
+        "description": description,
+    }
+
+
+def _encodedEventSize(event):
+    """Return the number of bytes `event` takes in a `SendEvents` call."""
+    events_argument = dict(SendEvents.arguments)[b"events"]
+    return len(events_argument.toStringProto([_eventToArgument(event)], None))
+
+
+# Singleton.
+nodeEventBuffer = NodeEventBuffer(nodeEventHub)
+
+
 @asynchronous
 def send_node_event(event_type, system_id, hostname, description=""):
     """Send the given node event to the region.
@@ -443,7 +583,7 @@ def send_node_event_ip_address(event_type, ip_address, description=""):
     :param description: An optional description of the event.
     :type description: unicode
     """
-    return nodeEventHub.logByIP(event_type, ip_address, description)
+    return nodeEventBuffer.logByIP(event_type, ip_address, description)
 
 
 @asynchronous
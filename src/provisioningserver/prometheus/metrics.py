@@ -138,6 +138,64 @@ METRICS_DEFINITIONS = [
         "the time it takes MAAS to update BIND",
         ["update_type"],
     ),
+    MetricDefinition(
+        "Histogram",
+        "maas_dns_dynamic_update_latency",
+        "the time it takes BIND to apply a dynamic update per DNS zone",
+        ["zone"],
+    ),
+    MetricDefinition(
+        "Histogram",
+        "maas_vault_secret_read_latency",
+        "Latency of reading a secret from Vault",
+    ),
+    MetricDefinition(
+        "Counter",
+        "maas_secret_cache_lookups",
+        "Lookups in the region secrets cache, by result (hit or miss)",
+        ["result"],
+    ),
+    MetricDefinition(
+        "Counter",
+        "maas_machine_inventory_lookups",
+        "Machine allocations using the machine inventory, by result (hit "
+        "when a candidate matched, or miss)",
+        ["result"],
+    ),
+    MetricDefinition(
+        "Gauge",
+        "maas_thread_pool_queue_depth",
+        "Tasks waiting for a worker in a region thread-pool, by lane",
+        ["pool", "lane"],
+        multiprocess_mode="livesum",
+    ),
+    MetricDefinition(
+        "Gauge",
+        "maas_thread_pool_busy_threads",
+        "Workers running a task in a region thread-pool",
+        ["pool"],
+        multiprocess_mode="livesum",
+    ),
+    MetricDefinition(
+        "Gauge",
+        "maas_thread_pool_saturation",
+        "Share of the maximum number of workers of a region thread-pool "
+        "running a task",
+        ["pool"],
+        multiprocess_mode="livemax",
+    ),
+    MetricDefinition(
+        "Histogram",
+        "maas_thread_pool_wait_time",
+        "Time a task waited for a worker in a region thread-pool, by lane",
+        ["pool", "lane"],
+    ),
+    MetricDefinition(
+        "Histogram",
+        "maas_thread_pool_run_time",
+        "Time a task ran in a region thread-pool, by caller",
+        ["pool", "caller"],
+    ),
 ]
 
 
@@ -4,6 +4,7 @@
 """Service to periodically query the power state on this cluster's nodes."""
 
 from datetime import timedelta
+from math import ceil
 
 from twisted.application.internet import TimerService
 from twisted.internet.defer import inlineCallbacks
@@ -26,12 +27,21 @@ class NodePowerMonitorService(TimerService):
     """Service to monitor the power status of all nodes in this cluster."""
 
     check_interval = timedelta(seconds=15).total_seconds()
+    # Bounds for the number of power queries running at once. Queries to
+    # nodes behind the same BMC count as one.
     max_nodes_at_once = 5
+    max_nodes_at_once_limit = 50
+    # Portion of the interval over which the start of the queries is spread.
+    spread_ratio = 0.5
+    # Weight of the latest sweep in the query latency moving average.
+    latency_weight = 0.3
 
     def __init__(self, clock=None):
         # Call self.query_nodes() every self.check_interval.
         super().__init__(self.check_interval, self.try_query_nodes)
         self.clock = clock
+        self.concurrency = self.max_nodes_at_once
+        self.query_latency = None
 
     def try_query_nodes(self):
         """Attempt to query nodes' power states.
@@ -53,20 +63,50 @@ class NodePowerMonitorService(TimerService):
     @inlineCallbacks
     def query_nodes(self, client):
         # Get the nodes' power parameters from the region. Keep getting more
-        # power parameters until the region returns an empty list.
+        # power parameters until the region returns an empty list, so that
+        # nodes behind the same BMC can be queried together.
+        nodes = []
         while True:
             response = yield client(
                 ListNodePowerParameters, uuid=client.localIdent
             )
             power_parameters = response["nodes"]
             if len(power_parameters) > 0:
-                yield query_all_nodes(
-                    power_parameters,
-                    max_concurrency=self.max_nodes_at_once,
-                    clock=self.clock,
-                )
+                nodes.extend(power_parameters)
             else:
                 break
+        if nodes:
+            latencies = []
+            yield query_all_nodes(
+                nodes,
+                max_concurrency=self.concurrency,
+                clock=self.clock,
+                spread=self.check_interval * self.spread_ratio,
+                record_latency=latencies.append,
+            )
+            self.update_concurrency(latencies)
+
+    def update_concurrency(self, latencies):
+        """Size the concurrency for the next sweep from observed latencies.
+
+        Enough queries need to run at once for the whole sweep to complete
+        within the spread window, given the average query latency.
+        """
+        if not latencies:
+            return
+        latency = sum(latencies) / len(latencies)
+        if self.query_latency is None:
+            self.query_latency = latency
+        else:
+            self.query_latency += self.latency_weight * (
+                latency - self.query_latency
+            )
+        window = self.check_interval * self.spread_ratio
+        needed = ceil(len(latencies) * self.query_latency / window)
+        self.concurrency = max(
+            self.max_nodes_at_once,
+            min(needed, self.max_nodes_at_once_limit),
+        )
 
     def query_nodes_failed(self, failure, localIdent):
         if failure.check(NoSuchCluster):
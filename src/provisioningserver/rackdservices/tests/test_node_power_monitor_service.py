@@ -68,7 +68,7 @@ class TestNodePowerMonitorService(MAASTestCase):
 
     def test_query_nodes_calls_query_all_nodes(self):
         service = self.make_monitor_service()
-        service.max_nodes_at_once = sentinel.max_nodes_at_once
+        service.concurrency = sentinel.concurrency
 
         example_power_parameters = {
             "system_id": factory.make_UUID(),
@@ -77,6 +77,10 @@ class TestNodePowerMonitorService(MAASTestCase):
             "power_type": factory.make_name("power_type"),
             "context": {},
         }
+        other_power_parameters = {
+            **example_power_parameters,
+            "system_id": factory.make_UUID(),
+        }
 
         rpc_fixture = self.useFixture(MockClusterToRegionRPCFixture())
         proto_region, io = rpc_fixture.makeEventLoop(
@@ -84,6 +88,7 @@ class TestNodePowerMonitorService(MAASTestCase):
         )
         proto_region.ListNodePowerParameters.side_effect = [
             succeed({"nodes": [example_power_parameters]}),
+            succeed({"nodes": [other_power_parameters]}),
             succeed({"nodes": []}),
         ]
 
@@ -94,11 +99,45 @@ class TestNodePowerMonitorService(MAASTestCase):
 
         self.assertIsNone(extract_result(d))
         query_all_nodes.assert_called_once_with(
-            [example_power_parameters],
-            max_concurrency=sentinel.max_nodes_at_once,
+            [example_power_parameters, other_power_parameters],
+            max_concurrency=sentinel.concurrency,
             clock=service.clock,
+            spread=service.check_interval * service.spread_ratio,
+            record_latency=ANY,
         )
 
+    def test_update_concurrency_keeps_minimum(self):
+        service = self.make_monitor_service()
+        service.update_concurrency([0.1] * 10)
+        self.assertEqual(service.max_nodes_at_once, service.concurrency)
+
+    def test_update_concurrency_grows_with_latency(self):
+        service = self.make_monitor_service()
+        window = service.check_interval * service.spread_ratio
+        # 100 queries of 1.5s each need 20 running at once to complete
+        # within the window.
+        service.update_concurrency([window / 5] * 100)
+        self.assertEqual(20, service.concurrency)
+
+    def test_update_concurrency_is_bounded(self):
+        service = self.make_monitor_service()
+        service.update_concurrency([60] * 1000)
+        self.assertEqual(service.max_nodes_at_once_limit, service.concurrency)
+
+    def test_update_concurrency_averages_latency(self):
+        service = self.make_monitor_service()
+        service.update_concurrency([1.0])
+        service.update_concurrency([2.0])
+        self.assertAlmostEqual(
+            1.0 + service.latency_weight, service.query_latency
+        )
+
+    def test_update_concurrency_ignores_empty_sweep(self):
+        service = self.make_monitor_service()
+        service.update_concurrency([])
+        self.assertIsNone(service.query_latency)
+        self.assertEqual(service.max_nodes_at_once, service.concurrency)
+
     def test_query_nodes_copes_with_NoSuchCluster(self):
         service = self.make_monitor_service()
 
@@ -10,11 +10,17 @@ from twisted.internet import reactor
 from twisted.internet.defer import (
     DeferredList,
     DeferredSemaphore,
+    fail,
     inlineCallbacks,
     succeed,
 )
+from twisted.internet.task import deferLater
 
-from provisioningserver.drivers.power import PowerError
+from provisioningserver.drivers.power import (
+    PowerAuthError,
+    PowerConnError,
+    PowerError,
+)
 from provisioningserver.drivers.power.registry import PowerDriverRegistry
 from provisioningserver.events import EVENT_TYPES, send_node_event
 from provisioningserver.logger import get_maas_logger, LegacyLogger
@@ -100,6 +106,27 @@ def get_power_state(system_id, hostname, power_type, context, clock=reactor):
     raise exc_type(exc_value).with_traceback(exc_trace)
 
 
+@asynchronous
+def get_power_states(power_type, contexts):
+    """Return the power states of several nodes sharing a BMC.
+
+    :param contexts: A dict mapping each node's system ID to its power
+        settings.
+    :return: A dict mapping system IDs to power states. Nodes whose state
+        couldn't be determined are left out.
+    :raises PowerActionFail: When the power driver can't be used.
+    """
+    power_driver = PowerDriverRegistry.get_item(power_type)
+    if power_driver is None:
+        raise PowerActionFail("Unknown power_type '%s'" % power_type)
+    missing_packages = power_driver.detect_missing_packages()
+    if len(missing_packages):
+        raise PowerActionFail(
+            "'%s' package(s) are not installed" % ", ".join(missing_packages)
+        )
+    return power_driver.query_many(contexts)
+
+
 @inlineCallbacks
 def power_query_success(system_id, hostname, state):
     """Report a node that for which power querying has succeeded."""
@@ -183,6 +210,16 @@ def maaslog_report_failure(node, failure):
         # log.err(failure, "Failed to refresh power state.")
 
 
+def report_node_power_state(d, node):
+    """Report and log the result of a power query for `node`."""
+    d = report_power_state(d, node["system_id"], node["hostname"])
+    d.addCallbacks(
+        partial(maaslog_report_success, node),
+        partial(maaslog_report_failure, node),
+    )
+    return d
+
+
 def query_node(node, clock):
     """Calls `get_power_state` on the given node.
 
@@ -203,26 +240,127 @@ def query_node(node, clock):
             node["context"],
             clock=clock,
         )
-        d = report_power_state(d, node["system_id"], node["hostname"])
-        d.addCallbacks(
-            partial(maaslog_report_success, node),
-            partial(maaslog_report_failure, node),
-        )
-        return d
+        return report_node_power_state(d, node)
+
+
+@inlineCallbacks
+def query_node_group(nodes, clock):
+    """Query the given nodes, which share a BMC, for their power state.
 
+    A single query is made to the BMC for all the nodes; the nodes for which
+    that doesn't return a valid state are queried one by one. If the BMC
+    can't be reached or refuses the credentials, all the nodes are reported
+    as failed instead, since each query would fail the same way.
 
-def query_all_nodes(nodes, max_concurrency=5, clock=reactor):
+    :return: A deferred, which fires with the results for each node, in the
+        same format as a `DeferredList`.
+    """
+    contexts = {
+        node["system_id"]: node["context"]
+        for node in nodes
+        if node["system_id"] not in power_action_registry
+    }
+    states = {}
+    group_error = None
+    if len(contexts) > 1:
+        try:
+            states = yield get_power_states(nodes[0]["power_type"], contexts)
+        except (PowerAuthError, PowerConnError) as error:
+            group_error = error
+        except Exception as error:
+            log.debug(
+                "Failed to query {count} nodes at once, querying them "
+                "one by one: {error}",
+                count=len(contexts),
+                error=error,
+            )
+    queries = []
+    for node in nodes:
+        state = states.get(node["system_id"])
+        if state in ("on", "off", "unknown"):
+            queries.append(report_node_power_state(succeed(state), node))
+        elif group_error is not None and node["system_id"] in contexts:
+            queries.append(report_node_power_state(fail(group_error), node))
+        else:
+            queries.append(query_node(node, clock))
+    results = yield DeferredList(queries, consumeErrors=True)
+    return results
+
+
+def group_nodes_by_bmc(nodes):
+    """Group together the nodes that can be queried with one BMC request.
+
+    :return: A list of lists of nodes, in the order the nodes were given.
+    """
+    groups = {}
+    for index, node in enumerate(nodes):
+        power_driver = PowerDriverRegistry.get_item(node["power_type"])
+        bmc_key = power_driver.get_bmc_key(node["context"])
+        if bmc_key is None:
+            key = (index,)
+        else:
+            key = (node["power_type"], bmc_key)
+        groups.setdefault(key, []).append(node)
+    return list(groups.values())
+
+
+def query_all_nodes(
+    nodes, max_concurrency=5, clock=reactor, spread=0, record_latency=None
+):
     """Queries the given nodes for their power state.
 
-    Nodes' states are reported back to the region.
+    Nodes' states are reported back to the region. Nodes behind the same BMC
+    are queried together when the power driver supports it, each group
+    counting once against `max_concurrency`.
 
+    :param spread: Number of seconds over which the start of the queries is
+        spread, instead of starting them all at once.
+    :param record_latency: Optional callable, called with the number of
+        seconds each query (or group of queries) took.
     :return: A deferred, which fires once all nodes have been queried,
         successfully or not.
     """
+    timer = reactor if clock is None else clock
     semaphore = DeferredSemaphore(tokens=max_concurrency)
-    queries = (
-        semaphore.run(query_node, node, clock)
-        for node in nodes
-        if node["power_type"] in PowerDriverRegistry
-    )
-    return DeferredList(queries, consumeErrors=True)
+    nodes = [
+        node for node in nodes if node["power_type"] in PowerDriverRegistry
+    ]
+    groups = group_nodes_by_bmc(nodes)
+
+    def query(group):
+        started = timer.seconds()
+        d = query_node_group(group, clock)
+        if record_latency is not None:
+
+            def record(results):
+                record_latency(timer.seconds() - started)
+                return results
+
+            d.addCallback(record)
+        return d
+
+    def run(group):
+        return semaphore.run(query, group)
+
+    queries = []
+    for index, group in enumerate(groups):
+        delay = spread * index / len(groups)
+        if delay > 0:
+            queries.append(deferLater(timer, delay, run, group))
+        else:
+            queries.append(run(group))
+
+    def flatten(group_results):
+        results = {}
+        for group, (success, group_result) in zip(
+            groups, group_results, strict=True
+        ):
+            if not success:
+                group_result = [(False, group_result)] * len(group)
+            for node, result in zip(group, group_result, strict=True):
+                results[node["system_id"]] = result
+        return [results[node["system_id"]] for node in nodes]
+
+    d = DeferredList(queries, consumeErrors=True)
+    d.addCallback(flatten)
+    return d
@@ -26,6 +26,7 @@ __all__ = [
     "RequestNodeInfoByMACAddress",
     "SendEvent",
     "SendEventMACAddress",
+    "SendEvents",
     "UpdateControllerState",
     "UpdateNodePowerState",
 ]
@@ -281,6 +282,31 @@ class SendEventIPAddress(amp.Command):
     errors = {NoSuchNode: b"NoSuchNode", NoSuchEventType: b"NoSuchEventType"}
 
 
+class SendEvents(amp.Command):
+    """Send a batch of events, each by IP address.
+
+    Events for unknown nodes or with unknown event types are dropped by the
+    region; no errors are returned.
+
+    :since: 3.8
+    """
+
+    arguments = [
+        (
+            b"events",
+            AmpList(
+                [
+                    (b"ip_address", amp.Unicode()),
+                    (b"type_name", amp.Unicode()),
+                    (b"description", amp.Unicode()),
+                ]
+            ),
+        )
+    ]
+    response = []
+    errors = []
+
+
 class ReportForeignDHCPServer(amp.Command):
     """Report a foreign DHCP server on a rack controller's interface.
 
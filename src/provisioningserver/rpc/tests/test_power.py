@@ -16,7 +16,7 @@ from twisted.internet.defer import (
     maybeDeferred,
     succeed,
 )
-from twisted.internet.task import Clock
+from twisted.internet.task import Clock, deferLater
 from twisted.python.failure import Failure
 
 from maastesting import get_testing_timeout
@@ -27,7 +27,12 @@ from maastesting.twisted import (
     extract_result,
     TwistedLoggerFixture,
 )
-from provisioningserver.drivers.power import DEFAULT_WAITING_POLICY, PowerError
+from provisioningserver.drivers.power import (
+    DEFAULT_WAITING_POLICY,
+    PowerAuthError,
+    PowerConnError,
+    PowerError,
+)
 from provisioningserver.drivers.power.registry import PowerDriverRegistry
 from provisioningserver.events import EVENT_TYPES
 from provisioningserver.rpc import clusterservice, exceptions, power, region
@@ -585,3 +590,150 @@ class TestPowerQueryAsync(MAASTestCase):
             [(True, node1["power_state"]), (True, node2["power_state"])],
             results,
         )
+
+    def make_virsh_nodes(self, count=3):
+        power_address = factory.make_name("power_address")
+        nodes = [self.make_node(power_type="virsh") for _ in range(count)]
+        for node in nodes:
+            node["context"] = {
+                "power_address": power_address,
+                "power_id": factory.make_name("power_id"),
+            }
+        return nodes
+
+    @inlineCallbacks
+    def test_query_all_nodes_queries_nodes_behind_same_bmc_together(self):
+        nodes = self.make_virsh_nodes()
+        get_power_states = self.patch(power, "get_power_states")
+        get_power_states.return_value = succeed(
+            {
+                node["system_id"]: "on" if index else "off"
+                for index, node in enumerate(nodes)
+            }
+        )
+        get_power_state = self.patch(power, "get_power_state")
+        suppress_reporting(self)
+
+        results = yield power.query_all_nodes(nodes)
+
+        get_power_states.assert_called_once_with(
+            "virsh", {node["system_id"]: node["context"] for node in nodes}
+        )
+        get_power_state.assert_not_called()
+        self.assertEqual([(True, "off"), (True, "on"), (True, "on")], results)
+
+    @inlineCallbacks
+    def test_query_all_nodes_queries_missing_nodes_one_by_one(self):
+        nodes = self.make_virsh_nodes()
+        get_power_states = self.patch(power, "get_power_states")
+        get_power_states.return_value = succeed({nodes[0]["system_id"]: "on"})
+        get_power_state = self.patch(power, "get_power_state")
+        get_power_state.side_effect = [succeed("off"), succeed("off")]
+        suppress_reporting(self)
+
+        results = yield power.query_all_nodes(nodes)
+
+        get_power_state.assert_has_calls(
+            [
+                call(
+                    node["system_id"],
+                    node["hostname"],
+                    node["power_type"],
+                    node["context"],
+                    clock=reactor,
+                )
+                for node in nodes[1:]
+            ]
+        )
+        self.assertEqual([(True, "on"), (True, "off"), (True, "off")], results)
+
+    @inlineCallbacks
+    def test_query_all_nodes_falls_back_if_group_query_fails(self):
+        nodes = self.make_virsh_nodes(2)
+        get_power_states = self.patch(power, "get_power_states")
+        get_power_states.return_value = fail(PowerError("boom"))
+        get_power_state = self.patch(power, "get_power_state")
+        get_power_state.side_effect = [succeed("on"), succeed("off")]
+        suppress_reporting(self)
+
+        results = yield power.query_all_nodes(nodes)
+
+        self.assertEqual(2, get_power_state.call_count)
+        self.assertEqual([(True, "on"), (True, "off")], results)
+
+    @inlineCallbacks
+    def test_query_all_nodes_fails_group_if_bmc_unreachable(self):
+        nodes = self.make_virsh_nodes()
+        error = random.choice([PowerConnError, PowerAuthError])("boom")
+        get_power_states = self.patch(power, "get_power_states")
+        get_power_states.return_value = fail(error)
+        get_power_state = self.patch(power, "get_power_state")
+        report_power_state = self.patch(power, "report_power_state")
+        report_power_state.side_effect = lambda d, system_id, hostname: d
+
+        with FakeLogger("maas.power", level=logging.DEBUG) as maaslog:
+            results = yield power.query_all_nodes(nodes)
+
+        get_power_states.assert_called_once()
+        get_power_state.assert_not_called()
+        self.assertEqual(
+            [call(ANY, node["system_id"], node["hostname"]) for node in nodes],
+            report_power_state.mock_calls,
+        )
+        for node in nodes:
+            self.assertRegex(
+                maaslog.output,
+                rf"{node['hostname']}: Could not query power state: boom",
+            )
+        self.assertEqual([(True, None)] * len(nodes), results)
+
+    @inlineCallbacks
+    def test_query_all_nodes_fails_group_skips_nodes_in_action_registry(
+        self,
+    ):
+        nodes = self.make_virsh_nodes()
+        get_power_states = self.patch(power, "get_power_states")
+        get_power_states.return_value = fail(PowerConnError("boom"))
+        get_power_state = self.patch(power, "get_power_state")
+        suppress_reporting(self)
+        self.patch(
+            power, "power_action_registry", {nodes[0]["system_id"]: "on"}
+        )
+
+        results = yield power.query_all_nodes(nodes)
+
+        get_power_state.assert_not_called()
+        self.assertEqual([(True, None)] * len(nodes), results)
+
+    def test_query_all_nodes_spreads_queries(self):
+        nodes = self.make_nodes(2)
+        clock = Clock()
+        get_power_state = self.patch(power, "get_power_state")
+        get_power_state.side_effect = [succeed("on"), succeed("off")]
+        suppress_reporting(self)
+
+        d = power.query_all_nodes(nodes, clock=clock, spread=10)
+
+        self.assertEqual(1, get_power_state.call_count)
+        clock.advance(5)
+        self.assertEqual(2, get_power_state.call_count)
+        self.assertEqual([(True, "on"), (True, "off")], extract_result(d))
+
+    def test_query_all_nodes_records_latency(self):
+        nodes = self.make_nodes(2)
+        clock = Clock()
+        get_power_state = self.patch(power, "get_power_state")
+        get_power_state.side_effect = [
+            deferLater(clock, 2, lambda: "on"),
+            succeed("off"),
+        ]
+        suppress_reporting(self)
+        latencies = []
+
+        d = power.query_all_nodes(
+            nodes, clock=clock, record_latency=latencies.append
+        )
+        clock.advance(2)
+
+        extract_result(d)
+        self.assertEqual([0, 2], latencies)
@@ -7,6 +7,8 @@ import random
 from unittest.mock import sentinel
 
 from twisted.internet.defer import fail, inlineCallbacks, succeed
+from twisted.internet.task import Clock
+from twisted.protocols.amp import MAX_VALUE_LENGTH
 
 from maascommon.events import EventDetail
 from maastesting import get_testing_timeout
@@ -15,6 +17,8 @@ from maastesting.testcase import MAASTestCase, MAASTwistedRunTest
 from provisioningserver.events import (
     EVENT_DETAILS,
     EVENT_TYPES,
+    NodeEventBuffer,
+    nodeEventBuffer,
     NodeEventHub,
     nodeEventHub,
     send_node_event,
@@ -71,15 +75,15 @@ class TestSendEventNodeMACAddress(MAASTestCase):
 
 
 class TestSendEventNodeIPAddress(MAASTestCase):
-    """Tests for `send_node_event_mac_address`."""
+    """Tests for `send_node_event_ip_address`."""
 
-    def test_calls_singleton_hub_logByIP_directly(self):
-        self.patch(nodeEventHub, "logByIP").return_value = sentinel.d
+    def test_calls_singleton_buffer_logByIP_directly(self):
+        self.patch(nodeEventBuffer, "logByIP").return_value = sentinel.d
         result = send_node_event_ip_address(
             sentinel.event_type, sentinel.ip_address, sentinel.description
         )
         self.assertIs(result, sentinel.d)
-        nodeEventHub.logByIP.assert_called_once_with(
+        nodeEventBuffer.logByIP.assert_called_once_with(
             sentinel.event_type, sentinel.ip_address, sentinel.description
         )
 
@@ -425,3 +429,188 @@ class TestSendEventIPAddress(MAASTestCase):
             yield event_hub.logByIP(event_name, ip_address, description)
         # The event has been removed from the cache.
         self.assertEqual(event_hub._types_registered, set())
+
+
+class TestNodeEventBuffer(MAASTestCase):
+    """Tests for `NodeEventBuffer`."""
+
+    run_tests_with = MAASTwistedRunTest.make_factory(timeout=TIMEOUT)
+
+    def setUp(self):
+        super().setUp()
+        self.patch(
+            clusterservice, "get_all_interfaces_definition"
+        ).return_value = {}
+
+    def patch_rpc_methods(self, *commands):
+        fixture = self.useFixture(MockLiveClusterToRegionRPCFixture())
+        return fixture.makeEventLoop(region.RegisterEventType, *commands)
+
+    def make_event(self, event_type=None):
+        if event_type is None:
+            event_type = random.choice(list(map_enum(EVENT_TYPES)))
+        return (
+            event_type,
+            factory.make_ip_address(),
+            factory.make_name("description"),
+        )
+
+    @inlineCallbacks
+    def test_events_are_sent_in_one_batch(self):
+        protocol, connecting = self.patch_rpc_methods(region.SendEvents)
+        self.addCleanup((yield connecting))
+        events = [self.make_event() for _ in range(3)]
+        event_buffer = NodeEventBuffer(NodeEventHub(), clock=Clock())
+
+        results = [event_buffer.logByIP(*event) for event in events]
+        protocol.SendEvents.assert_not_called()
+        yield event_buffer.flush()
+        for result in results:
+            yield result
+
+        protocol.SendEvents.assert_called_once_with(
+            protocol,
+            events=[
+                {
+                    "type_name": event_type,
+                    "ip_address": ip_address,
+                    "description": description,
+                }
+                for event_type, ip_address, description in events
+            ],
+        )
+        self.assertCountEqual(
+            {event_type for event_type, _, _ in events},
+            [
+                call.kwargs["name"]
+                for call in protocol.RegisterEventType.call_args_list
+            ],
+        )
+
+    @inlineCallbacks
+    def test_duplicate_events_are_coalesced(self):
+        protocol, connecting = self.patch_rpc_methods(region.SendEvents)
+        self.addCleanup((yield connecting))
+        event_type, ip_address, description = self.make_event()
+        event_buffer = NodeEventBuffer(NodeEventHub(), clock=Clock())
+
+        for _ in range(3):
+            event_buffer.logByIP(event_type, ip_address, description)
+        yield event_buffer.flush()
+
+        protocol.SendEvents.assert_called_once_with(
+            protocol,
+            events=[
+                {
+                    "type_name": event_type,
+                    "ip_address": ip_address,
+                    "description": description,
+                }
+            ],
+        )
+
+    @inlineCallbacks
+    def test_full_buffer_of_large_events_is_split_into_batches(self):
+        protocol, connecting = self.patch_rpc_methods(region.SendEvents)
+        self.addCleanup((yield connecting))
+        event_buffer = NodeEventBuffer(NodeEventHub(), clock=Clock())
+        event_type = max(map_enum(EVENT_TYPES), key=len)
+        events = [
+            (
+                event_type,
+                str(factory.make_ipv6_address()),
+                factory.make_string(size=1000),
+            )
+            for _ in range(event_buffer.max_size)
+        ]
+
+        results = [event_buffer.logByIP(*event) for event in events]
+        for result in results:
+            yield result
+
+        calls = protocol.SendEvents.call_args_list
+        self.assertGreater(len(calls), 1)
+        events_argument = dict(region.SendEvents.arguments)[b"events"]
+        for call in calls:
+            encoded = events_argument.toStringProto(
+                call.kwargs["events"], None
+            )
+            self.assertLessEqual(len(encoded), MAX_VALUE_LENGTH)
+        self.assertCountEqual(
+            events,
+            [
+                (event["type_name"], event["ip_address"], event["description"])
+                for call in calls
+                for event in call.kwargs["events"]
+            ],
+        )
+
+    def test_flushes_after_delay(self):
+        clock = Clock()
+        event_buffer = NodeEventBuffer(NodeEventHub(), clock=clock, delay=2)
+        flush = self.patch(event_buffer, "flush")
+        event_buffer.logByIP(*self.make_event())
+        event_buffer.logByIP(*self.make_event())
+        clock.advance(1.9)
+        flush.assert_not_called()
+        clock.advance(0.1)
+        flush.assert_called_once_with()
+
+    def test_flushes_when_full(self):
+        event_buffer = NodeEventBuffer(
+            NodeEventHub(), clock=Clock(), max_size=2
+        )
+        flush = self.patch(event_buffer, "flush")
+        event_buffer.logByIP(*self.make_event())
+        flush.assert_not_called()
+        event_buffer.logByIP(*self.make_event())
+        flush.assert_called_once_with()
+
+    def test_flush_cancels_delayed_flush(self):
+        clock = Clock()
+        event_buffer = NodeEventBuffer(NodeEventHub(), clock=clock)
+        self.patch(event_buffer, "_sendEvents").return_value = succeed(None)
+        event_buffer.logByIP(*self.make_event())
+        event_buffer.flush()
+        self.assertEqual([], clock.getDelayedCalls())
+
+    @inlineCallbacks
+    def test_falls_back_to_single_events_if_region_is_older(self):
+        protocol, connecting = self.patch_rpc_methods(
+            region.SendEventIPAddress
+        )
+        self.addCleanup((yield connecting))
+        events = [self.make_event() for _ in range(2)]
+        event_buffer = NodeEventBuffer(NodeEventHub(), clock=Clock())
+
+        results = [event_buffer.logByIP(*event) for event in events]
+        yield event_buffer.flush()
+        for result in results:
+            yield result
+
+        self.assertCountEqual(
+            [
+                {
+                    "type_name": event_type,
+                    "ip_address": ip_address,
+                    "description": description,
+                }
+                for event_type, ip_address, description in events
+            ],
+            [
+                call.kwargs
+                for call in protocol.SendEventIPAddress.call_args_list
+            ],
+        )
+
+    @inlineCallbacks
+    def test_failure_is_passed_to_callers(self):
+        event_buffer = NodeEventBuffer(NodeEventHub(), clock=Clock())
+        self.patch(event_buffer, "_sendEvents").return_value = fail(
+            ZeroDivisionError()
+        )
+
+        d = event_buffer.logByIP(*self.make_event())
+        yield event_buffer.flush()
+        with self.assertRaisesRegex(ZeroDivisionError, ""):
+            yield d
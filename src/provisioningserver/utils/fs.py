@@ -15,7 +15,7 @@ from shutil import copyfile
 import string
 import tempfile
 import threading
-from time import sleep
+from time import sleep, time_ns
 
 from twisted.python.filepath import FilePath
 from twisted.python.lockfile import FilesystemLock as TwistedFilesystemLock
@@ -252,6 +252,56 @@ def write_text_file(path, text, encoding="utf-8"):
         outfile.write(text)
 
 
+class FileCache:
+    """Cache values loaded from files, until the files change.
+
+    Checking whether a file changed only needs a `stat`, which is a lot
+    cheaper than reading and parsing it again. Files modified in the last
+    `racy_seconds` aren't cached, since another change within the same
+    tick of the filesystem clock wouldn't change their modification time.
+
+    :param load: Called with the path of a file to load its value.
+    :param maxsize: The maximum number of cached files.
+    """
+
+    racy_seconds = 2
+
+    def __init__(self, load, maxsize=256):
+        self._load = load
+        self._maxsize = maxsize
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """Return the value loaded from `path`.
+
+        :raise OSError: if `path` can't be found or loaded.
+        """
+        stat_result = stat(path)
+        signature = (
+            stat_result.st_ino,
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+        )
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        value = self._load(path)
+        if time_ns() - stat_result.st_mtime_ns > self.racy_seconds * 10**9:
+            with self._lock:
+                self._entries.pop(path, None)
+                if len(self._entries) >= self._maxsize:
+                    # Evict the oldest entry.
+                    del self._entries[next(iter(self._entries))]
+                self._entries[path] = (signature, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
 class FilesystemLock(TwistedFilesystemLock):
     """Patch Twisted's FilesystemLock.lock to handle
     PermissionError when trying to lock."""
@@ -21,7 +21,12 @@ import time
 from netaddr import IPAddress
 from twisted.application.internet import TimerService
 from twisted.application.service import MultiService
-from twisted.internet.defer import Deferred, inlineCallbacks, maybeDeferred
+from twisted.internet.defer import (
+    Deferred,
+    inlineCallbacks,
+    maybeDeferred,
+    succeed,
+)
 from twisted.internet.error import ProcessDone, ProcessTerminated
 from twisted.internet.interfaces import IReactorMulticast
 from twisted.internet.protocol import DatagramProtocol, ProcessProtocol
@@ -1087,6 +1092,9 @@ class NetworksMonitoringService(SingleInstanceService):
     SERVICE_NAME = "updateInterfaces"
     LOCK_NAME = "networks-monitoring"
     INTERVAL = timedelta(seconds=30)
+    # An observed neighbour is reported again only if its MAC address
+    # changed, or if it hasn't been reported for this long.
+    NEIGHBOUR_REFRESH_INTERVAL = timedelta(minutes=10)
 
     def __init__(
         self,
@@ -1104,6 +1112,10 @@ class NetworksMonitoringService(SingleInstanceService):
         self._monitoring_state = {}
         self._monitoring_mdns = False
         self.beaconing_protocol = None
+        # The reported neighbours, as a mapping of (interface, ip, vid) to
+        # the (mac, time) they were reported with.
+        self._neighbours = {}
+        self._neighbours_pruned = 0.0
 
     @inlineCallbacks
     def do_action(self):
@@ -1160,6 +1172,56 @@ class NetworksMonitoringService(SingleInstanceService):
         This MUST be overridden in subclasses.
         """
 
+    def _getNeighbourClock(self):
+        if self.clock is None:
+            from twisted.internet import reactor
+
+            return reactor
+        return self.clock
+
+    @staticmethod
+    def _getNeighbourKey(neighbour):
+        return (neighbour["interface"], neighbour["ip"], neighbour.get("vid"))
+
+    def _neighboursObserved(self, neighbours):
+        """Report the observed neighbours that are new or changed.
+
+        Bindings that were already reported with the same MAC address are
+        left out until `NEIGHBOUR_REFRESH_INTERVAL` has passed, so that the
+        region only records when they were last seen every so often.
+        """
+        now = self._getNeighbourClock().seconds()
+        refresh = self.NEIGHBOUR_REFRESH_INTERVAL.total_seconds()
+        if now - self._neighbours_pruned >= refresh:
+            self._neighbours = {
+                key: (mac, reported)
+                for key, (mac, reported) in self._neighbours.items()
+                if now - reported < refresh
+            }
+            self._neighbours_pruned = now
+        report = []
+        for neighbour in neighbours:
+            key = self._getNeighbourKey(neighbour)
+            mac, reported = self._neighbours.get(key, (None, None))
+            if mac != neighbour["mac"] or now - reported >= refresh:
+                self._neighbours[key] = (neighbour["mac"], now)
+                report.append(neighbour)
+        if len(report) == 0:
+            return succeed(None)
+
+        def forget(failure):
+            # Report these neighbours again when next observed.
+            for neighbour in report:
+                key = self._getNeighbourKey(neighbour)
+                mac, _ = self._neighbours.get(key, (None, None))
+                if mac == neighbour["mac"]:
+                    del self._neighbours[key]
+            log.err(failure, "Failed to report neighbours.")
+
+        d = maybeDeferred(self.reportNeighbours, report)
+        d.addErrback(forget)
+        return d
+
     def reportBeacons(self, beacons):
         """Receives a report of an observed beacon packet."""
         for beacon in beacons:
@@ -1323,7 +1385,7 @@ class NetworksMonitoringService(SingleInstanceService):
 
     def _startNeighbourDiscovery(self, ifname):
         """Start neighbour discovery service on the specified interface."""
-        service = NeighbourDiscoveryService(ifname, self.reportNeighbours)
+        service = NeighbourDiscoveryService(ifname, self._neighboursObserved)
         service.clock = self.clock
         service.setName("neighbour_discovery:" + ifname)
         service.setServiceParent(self)
@@ -1382,6 +1444,11 @@ class NetworksMonitoringService(SingleInstanceService):
                 maaslog.info(
                     "Stopped neighbour observation service for %s." % ifname
                 )
+        self._neighbours = {
+            key: value
+            for key, value in self._neighbours.items()
+            if key[0] not in deleted_interfaces
+        }
 
     def _startBeaconingServices(self, new_interfaces):
         """Start monitoring services for the specified set of interfaces."""
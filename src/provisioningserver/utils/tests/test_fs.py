@@ -32,6 +32,7 @@ from provisioningserver.utils.fs import (
     atomic_delete,
     atomic_symlink,
     atomic_write,
+    FileCache,
     FileLock,
     FilesystemLock,
     get_maas_common_command,
@@ -556,6 +557,72 @@ class TestWriteTextFile(MAASTestCase):
             self.assertEqual(text, fd.read())
 
 
+class TestFileCache(MAASTestCase):
+    def make_cache(self, **kwargs):
+        load = Mock(side_effect=read_text_file)
+        return FileCache(load, **kwargs), load
+
+    def make_old_file(self, contents=None):
+        path = self.make_file(contents=contents)
+        age_file(path, 10)
+        return path
+
+    def test_loads_file(self):
+        text = factory.make_string()
+        cache, load = self.make_cache()
+        path = self.make_old_file(contents=text)
+        self.assertEqual(text, cache.get(path))
+        load.assert_called_once_with(path)
+
+    def test_caches_value(self):
+        cache, load = self.make_cache()
+        path = self.make_old_file()
+        self.assertIs(cache.get(path), cache.get(path))
+        load.assert_called_once_with(path)
+
+    def test_loads_file_again_when_it_changes(self):
+        cache, load = self.make_cache()
+        path = self.make_old_file()
+        cache.get(path)
+        text = factory.make_string()
+        write_text_file(path, text)
+        age_file(path, 5)
+        self.assertEqual(text, cache.get(path))
+        self.assertEqual([call(path), call(path)], load.mock_calls)
+
+    def test_doesnt_cache_recently_modified_file(self):
+        cache, load = self.make_cache()
+        path = self.make_file()
+        cache.get(path)
+        cache.get(path)
+        self.assertEqual([call(path), call(path)], load.mock_calls)
+
+    def test_evicts_oldest_file(self):
+        cache, load = self.make_cache(maxsize=2)
+        paths = [self.make_old_file() for _ in range(3)]
+        for path in paths:
+            cache.get(path)
+        load.reset_mock()
+        cache.get(paths[2])
+        cache.get(paths[1])
+        cache.get(paths[0])
+        load.assert_called_once_with(paths[0])
+
+    def test_raises_error_for_missing_file(self):
+        cache, load = self.make_cache()
+        path = os.path.join(self.make_dir(), factory.make_name("missing"))
+        self.assertRaises(FileNotFoundError, cache.get, path)
+        load.assert_not_called()
+
+    def test_clear(self):
+        cache, load = self.make_cache()
+        path = self.make_old_file()
+        cache.get(path)
+        cache.clear()
+        cache.get(path)
+        self.assertEqual([call(path), call(path)], load.mock_calls)
+
+
 class TestSystemLocks(MAASTestCase):
     """Tests for `SystemLock` and its children."""
 
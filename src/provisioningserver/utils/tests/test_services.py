@@ -681,6 +681,90 @@ class TestNetworksMonitoringService(MAASTestCase):
         # ... interfaces ARE recorded.
         self.assertNotEqual(service.interfaces, [])
 
+    def make_neighbour(self, **kwargs):
+        neighbour = {
+            "interface": factory.make_name("eth"),
+            "ip": factory.make_ipv4_address(),
+            "mac": factory.make_mac_address(),
+            "time": random.randint(0, 200000000),
+            "vid": None,
+        }
+        neighbour.update(kwargs)
+        return neighbour
+
+    def test_neighboursObserved_reports_new_neighbours(self):
+        service = self.makeService()
+        reportNeighbours = self.patch(service, "reportNeighbours")
+        neighbours = [self.make_neighbour(), self.make_neighbour(vid=10)]
+        service._neighboursObserved(neighbours)
+        reportNeighbours.assert_called_once_with(neighbours)
+
+    def test_neighboursObserved_skips_reported_neighbours(self):
+        service = self.makeService()
+        reportNeighbours = self.patch(service, "reportNeighbours")
+        neighbour = self.make_neighbour()
+        service._neighboursObserved([neighbour])
+        service.clock.advance(1)
+        service._neighboursObserved([dict(neighbour, time=1)])
+        reportNeighbours.assert_called_once_with([neighbour])
+
+    def test_neighboursObserved_reports_moved_neighbours(self):
+        service = self.makeService()
+        reportNeighbours = self.patch(service, "reportNeighbours")
+        neighbour = self.make_neighbour()
+        moved = dict(neighbour, mac=factory.make_mac_address())
+        service._neighboursObserved([neighbour])
+        service._neighboursObserved([moved])
+        service._neighboursObserved([neighbour])
+        reportNeighbours.assert_has_calls(
+            [call([neighbour]), call([moved]), call([neighbour])]
+        )
+
+    def test_neighboursObserved_refreshes_neighbours(self):
+        service = self.makeService()
+        reportNeighbours = self.patch(service, "reportNeighbours")
+        neighbour = self.make_neighbour()
+        service._neighboursObserved([neighbour])
+        service.clock.advance(
+            service.NEIGHBOUR_REFRESH_INTERVAL.total_seconds()
+        )
+        service._neighboursObserved([neighbour])
+        self.assertEqual(2, reportNeighbours.call_count)
+
+    def test_neighboursObserved_prunes_expired_neighbours(self):
+        service = self.makeService()
+        self.patch(service, "reportNeighbours")
+        service._neighboursObserved([self.make_neighbour()])
+        service.clock.advance(
+            service.NEIGHBOUR_REFRESH_INTERVAL.total_seconds()
+        )
+        neighbour = self.make_neighbour()
+        service._neighboursObserved([neighbour])
+        self.assertEqual(
+            [service._getNeighbourKey(neighbour)],
+            list(service._neighbours),
+        )
+
+    def test_neighboursObserved_reports_again_after_failure(self):
+        service = self.makeService()
+        reportNeighbours = self.patch(service, "reportNeighbours")
+        reportNeighbours.side_effect = [Exception("boom"), None]
+        neighbour = self.make_neighbour()
+        with TwistedLoggerFixture() as logger:
+            service._neighboursObserved([neighbour])
+        self.assertIn("Failed to report neighbours.", logger.output)
+        service._neighboursObserved([neighbour])
+        self.assertEqual(2, reportNeighbours.call_count)
+
+    def test_stopping_discovery_forgets_neighbours(self):
+        service = self.makeService()
+        reportNeighbours = self.patch(service, "reportNeighbours")
+        neighbour = self.make_neighbour()
+        service._neighboursObserved([neighbour])
+        service._stopNeighbourDiscoveryServices({neighbour["interface"]})
+        service._neighboursObserved([neighbour])
+        self.assertEqual(2, reportNeighbours.call_count)
+
 
 class TestJSONPerLineProtocol(MAASTestCase):
     """Tests for `JSONPerLineProtocol`."""
@@ -5,6 +5,7 @@
 
 from functools import wraps
 import gzip
+import http.client
 from io import BytesIO
 import json
 import os
@@ -19,7 +20,7 @@ from apiclient.maas_client import MAASClient, MAASDispatcher, MAASOAuth
 from apiclient.testing.django import APIClientTestCase
 from maastesting.factory import factory
 from maastesting.fixtures import TempWDFixture
-from maastesting.httpd import HTTPServerFixture
+from maastesting.httpd import HTTPServerFixture, SilentHTTPRequestHandler
 from maastesting.testcase import MAASTestCase
 
 
@@ -251,6 +252,94 @@ class TestMAASDispatcher(MAASTestCase):
             if isinstance(handler, urllib.request.ProxyHandler):
                 raise AssertionError("ProxyHandler shouldn't be there")
 
+    def make_keep_alive_server(self):
+        self.patch(SilentHTTPRequestHandler, "protocol_version", "HTTP/1.1")
+        self.useFixture(TempWDFixture())
+        name = factory.make_string()
+        content = factory.make_string().encode("ascii")
+        factory.make_file(location=".", name=name, contents=content)
+        httpd = self.useFixture(HTTPServerFixture())
+        connections = []
+        real_connect = http.client.HTTPConnection.connect
+
+        def connect(conn):
+            connections.append(conn)
+            return real_connect(conn)
+
+        self.patch(http.client.HTTPConnection, "connect", connect)
+        return urljoin(httpd.url, name), content, connections
+
+    @no_proxy
+    def test_reuses_connections(self):
+        url, content, connections = self.make_keep_alive_server()
+        dispatcher = MAASDispatcher()
+        for _ in range(3):
+            response = dispatcher.dispatch_query(url, {})
+            self.assertEqual(200, response.code)
+            self.assertEqual(content, response.read())
+        self.assertEqual(1, len(connections))
+
+    @no_proxy
+    def test_reconnects_when_server_closes_idle_connection(self):
+        url, content, connections = self.make_keep_alive_server()
+        # Close the connection after each request, without telling the
+        # client.
+        self.patch(
+            SilentHTTPRequestHandler,
+            "handle",
+            SilentHTTPRequestHandler.handle_one_request,
+        )
+        dispatcher = MAASDispatcher()
+        for _ in range(2):
+            response = dispatcher.dispatch_query(url, {})
+            self.assertEqual(content, response.read())
+        self.assertEqual(2, len(connections))
+
+    @no_proxy
+    def test_doesnt_resend_post_when_reused_connection_fails(self):
+        url, _, connections = self.make_keep_alive_server()
+        posts = []
+
+        def do_POST(handler):
+            posts.append(handler.path)
+            handler.send_response(200)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+
+        self.patch(SilentHTTPRequestHandler, "do_POST", do_POST)
+        real_getresponse = http.client.HTTPConnection.getresponse
+
+        def getresponse(conn):
+            response = real_getresponse(conn)
+            if response._method == "POST":
+                # The connection is reset while the response is read, after
+                # the server handled the request.
+                raise ConnectionResetError()
+            return response
+
+        self.patch(http.client.HTTPConnection, "getresponse", getresponse)
+        dispatcher = MAASDispatcher()
+        dispatcher.dispatch_query(url, {})
+        self.assertRaises(
+            urllib.error.URLError,
+            dispatcher.dispatch_query,
+            url,
+            {},
+            method="POST",
+            data=b"data",
+        )
+        self.assertEqual(1, len(posts))
+        self.assertEqual(1, len(connections))
+
+    @no_proxy
+    def test_close_closes_idle_connections(self):
+        url, content, connections = self.make_keep_alive_server()
+        dispatcher = MAASDispatcher()
+        dispatcher.dispatch_query(url, {})
+        dispatcher.close()
+        dispatcher.dispatch_query(url, {})
+        self.assertEqual(2, len(connections))
+
 
 def make_path():
     """Create an arbitrary resource path."""
@@ -0,0 +1,59 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+import pytest
+from starlette.types import Message
+
+from maasapiserver.common.middlewares.asgi import (
+    on_response_start,
+    ResponseStart,
+)
+
+
+class TestResponseStart:
+    def test_changes_the_message_headers(self) -> None:
+        message = {
+            "type": "http.response.start",
+            "status": 201,
+            "headers": [(b"content-type", b"application/json")],
+        }
+        response = ResponseStart(message)
+        assert response.status_code == 201
+        assert response.headers["content-type"] == "application/json"
+        response.headers["x-test"] = "value"
+        response.set_cookie("cookie", "cookie_value")
+        headers = dict(message["headers"])
+        assert headers[b"x-test"] == b"value"
+        assert headers[b"set-cookie"].startswith(b"cookie=cookie_value;")
+
+    def test_without_headers(self) -> None:
+        message = {"type": "http.response.start", "status": 204}
+        ResponseStart(message).headers["x-test"] = "value"
+        assert message["headers"] == [(b"x-test", b"value")]
+
+
+@pytest.mark.asyncio
+class TestOnResponseStart:
+    async def test_calls_callback_before_sending_start(self) -> None:
+        sent = []
+
+        async def send(message: Message) -> None:
+            sent.append(message)
+
+        def callback(response: ResponseStart) -> None:
+            assert sent == []
+            response.headers["x-test"] = "value"
+
+        wrapped_send = on_response_start(send, callback)
+        await wrapped_send(
+            {"type": "http.response.start", "status": 200, "headers": []}
+        )
+        await wrapped_send({"type": "http.response.body", "body": b"OK"})
+        assert sent == [
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"x-test", b"value")],
+            },
+            {"type": "http.response.body", "body": b"OK"},
+        ]
@@ -1,12 +1,17 @@
+from dataclasses import replace
 from typing import Any, AsyncIterator, Iterator
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from httpx import ASGITransport, AsyncClient
 import pytest
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from maasapiserver.common.middlewares.db import DatabaseMetricsMiddleware
+from maasapiserver.common.middlewares.db import (
+    DatabaseMetricsMiddleware,
+    read_replica,
+    TransactionMiddleware,
+)
 from maasapiserver.v3.middlewares.context import ContextMiddleware
 from maasservicelayer.db import Database
 
@@ -49,3 +54,120 @@ class TestDatabaseMetricsMiddleware:
         metrics = (await query_count_client.get(f"/{count}")).json()
         assert metrics["count"] == count
         assert metrics["latency"] > 0.0
+
+
+async def get_transaction_state(request: Request) -> dict[str, Any]:
+    conn = request.state.context.get_connection()
+    isolation = await conn.execute(text("SHOW transaction_isolation"))
+    read_only = await conn.execute(text("SHOW transaction_read_only"))
+    return {
+        "isolation": isolation.scalar(),
+        "read_only": read_only.scalar(),
+        "lanes": sorted(request.state.db_pool_waits),
+    }
+
+
+def make_transaction_app(db: Database) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(TransactionMiddleware, db=db)
+    app.add_middleware(ContextMiddleware)
+
+    @app.api_route("/", methods=["GET", "POST"])
+    async def transaction(request: Request) -> Any:
+        return await get_transaction_state(request)
+
+    @app.api_route("/hook", methods=["GET", "POST"])
+    async def hook(request: Request) -> Any:
+        conn = request.state.context.get_connection()
+        calls = []
+
+        async def post_commit_hook() -> None:
+            # The hook runs once the transaction is over.
+            calls.append(conn.in_transaction())
+
+        request.state.context.add_post_commit_hook(post_commit_hook)
+        app.state.post_commit_calls = calls
+        return {}
+
+    @app.api_route(
+        "/replica",
+        methods=["GET", "POST"],
+        dependencies=[Depends(read_replica)],
+    )
+    async def replica(request: Request) -> Any:
+        return await get_transaction_state(request)
+
+    return app
+
+
+@pytest.fixture
+async def replica_db(db: Database) -> AsyncIterator[Database]:
+    # The primary stands in for the replica.
+    replica_db = Database(replace(db.config, replica_host=db.config.host))
+    yield replica_db
+    await replica_db.engine.dispose()
+    await replica_db.replica_engine.dispose()
+
+
+def get_client(app: FastAPI) -> AsyncClient:
+    return AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    )
+
+
+class TestTransactionMiddleware:
+    async def test_write_lane(self, db: Database) -> None:
+        async with get_client(make_transaction_app(db)) as client:
+            state = (await client.post("/")).json()
+        assert state == {
+            "isolation": "repeatable read",
+            "read_only": "off",
+            "lanes": ["write"],
+        }
+
+    async def test_read_lane(self, db: Database) -> None:
+        async with get_client(make_transaction_app(db)) as client:
+            state = (await client.get("/")).json()
+        assert state == {
+            "isolation": "read committed",
+            "read_only": "off",
+            "lanes": ["read"],
+        }
+
+    async def test_post_commit_hooks(self, db: Database) -> None:
+        app = make_transaction_app(db)
+        async with get_client(app) as client:
+            await client.post("/hook")
+        assert app.state.post_commit_calls == [False]
+
+    async def test_post_commit_hooks_not_run_for_safe_methods(
+        self, db: Database
+    ) -> None:
+        app = make_transaction_app(db)
+        async with get_client(app) as client:
+            await client.get("/hook")
+        assert app.state.post_commit_calls == []
+
+    async def test_read_replica_without_replica(self, db: Database) -> None:
+        async with get_client(make_transaction_app(db)) as client:
+            state = (await client.get("/replica")).json()
+        assert state["lanes"] == ["read"]
+
+    async def test_read_replica(self, replica_db: Database) -> None:
+        app = make_transaction_app(replica_db)
+        async with get_client(app) as client:
+            state = (await client.get("/replica")).json()
+        assert state == {
+            "isolation": "read committed",
+            "read_only": "on",
+            "lanes": ["read", "replica"],
+        }
+
+    async def test_read_replica_only_for_safe_methods(
+        self, replica_db: Database
+    ) -> None:
+        app = make_transaction_app(replica_db)
+        async with get_client(app) as client:
+            state = (await client.post("/replica")).json()
+        assert state["read_only"] == "off"
+        assert state["lanes"] == ["write"]
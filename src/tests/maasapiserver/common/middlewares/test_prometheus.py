@@ -57,3 +57,17 @@ class TestPrometheusMiddleware:
             rf'maas_apiserver_request_query_count_total{{handler="/{{count}}",.*,method="GET",status="200"}} {count}.0',
             response.text,
         )
+
+    async def test_db_pool_wait_metrics(self, client: AsyncClient) -> None:
+        await client.get("/1")
+        response = await client.get(f"{API_PREFIX}/metrics")
+        assert re.search(
+            r'maas_apiserver_db_pool_wait_time_count{lane="read",.*} 1.0',
+            response.text,
+        )
+
+    async def test_openfga_cache_metrics(self, client: AsyncClient) -> None:
+        response = await client.get(f"{API_PREFIX}/metrics")
+        assert "maas_apiserver_openfga_cache_hits_total{" in response.text
+        assert "maas_apiserver_openfga_cache_misses_total{" in response.text
+        assert "maas_apiserver_openfga_cache_hit_rate{" in response.text
@@ -13,7 +13,7 @@ from maasapiserver.v3.api.public.models.responses.events import (
 )
 from maasapiserver.v3.constants import V3_API_PREFIX
 from maascommon.openfga.base import MAASResourceEntitlement
-from maasservicelayer.models.base import ListResult
+from maasservicelayer.models.base import CursorListResult, ListResult
 from maasservicelayer.models.events import (
     EndpointChoicesEnum,
     Event,
@@ -140,3 +140,46 @@ class TestEventsApi(ApiCommonTests):
             TEST_EVENT_2.node_system_id,
         }
         assert next_link_params["size"][0] == "1"
+
+    async def test_list_by_cursor(
+        self,
+        services_mock: ServiceCollectionV3,
+        mocked_api_client_user_with_permissions: Callable[..., AsyncClient],
+    ) -> None:
+        client = mocked_api_client_user_with_permissions(
+            MAASResourceEntitlement.CAN_VIEW_GLOBAL_ENTITIES,
+        )
+        services_mock.events = Mock(EventsService)
+        services_mock.events.list_by_cursor.side_effect = [
+            CursorListResult[Event](items=[TEST_EVENT_2], next_token="abc"),
+            CursorListResult[Event](
+                items=[TEST_EVENT], next_token=None, total=2
+            ),
+        ]
+
+        response = await client.get(
+            f"{self.BASE_PATH}?token=&size=1&system_id={TEST_EVENT.node_system_id}"
+        )
+        assert response.status_code == 200
+        events_response = EventsListResponse(**response.json())
+        assert events_response.items[0].id == TEST_EVENT_2.id
+        assert events_response.total is None
+        next_link_params = parse_qs(urlparse(events_response.next).query)
+        assert next_link_params["token"] == ["abc"]
+        assert next_link_params["size"] == ["1"]
+        assert next_link_params["system_id"] == [TEST_EVENT.node_system_id]
+        services_mock.events.list.assert_not_called()
+        services_mock.events.list_by_cursor.assert_awaited_once()
+        assert (
+            services_mock.events.list_by_cursor.call_args.kwargs["token"] == ""
+        )
+
+        response = await client.get(f"{self.BASE_PATH}?token=abc&count=true")
+        assert response.status_code == 200
+        events_response = EventsListResponse(**response.json())
+        assert events_response.items[0].id == TEST_EVENT.id
+        assert events_response.total == 2
+        assert events_response.next is None
+        kwargs = services_mock.events.list_by_cursor.call_args.kwargs
+        assert kwargs["token"] == "abc"
+        assert kwargs["with_total"] is True
@@ -0,0 +1,16 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from maasapiserver.v3.listeners.openfga import OpenFGATuplesPostgresListener
+from maascommon.openfga.cache import DECISION_CACHE, MISSING
+
+
+class TestOpenFGATuplesPostgresListener:
+    async def test_cache_is_invalidated_on_notification(self):
+        key = ("check", 1, "can_edit_machines", "maas:0")
+        DECISION_CACHE.set(key, True)
+
+        listener = OpenFGATuplesPostgresListener()
+        listener.handler(None, 0, listener.channel, "")  # type: ignore
+
+        assert DECISION_CACHE.get(key) is MISSING
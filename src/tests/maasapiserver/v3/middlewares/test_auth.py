@@ -2,7 +2,7 @@
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
 from datetime import timedelta
-from typing import Any, AsyncIterator, Callable, Iterator
+from typing import Any, AsyncIterator, Iterator
 from unittest.mock import AsyncMock, call, Mock
 
 from fastapi import FastAPI, Request
@@ -272,7 +272,7 @@ class TestV3AuthenticationMiddleware:
         request_mock.headers = {"Authorization": "bearer invalid_token"}
 
         with pytest.raises(BadRequestException):
-            await auth_middleware.dispatch(request_mock, AsyncMock(Callable))
+            await auth_middleware.authenticate(request_mock)
         mock_logger.assert_not_called()
 
         # valid user JWT Token
@@ -283,7 +283,7 @@ class TestV3AuthenticationMiddleware:
         request_mock.headers = {
             "Authorization": "bearer " + valid_token.encoded
         }
-        await auth_middleware.dispatch(request_mock, AsyncMock(Callable))
+        await auth_middleware.authenticate(request_mock)
         mock_logger.info.assert_called_with(
             AUTHN_AUTH_SUCCESSFUL, type=SECURITY, user_id="myuser"
         )
@@ -296,7 +296,7 @@ class TestV3AuthenticationMiddleware:
         request_mock.headers = {
             "Authorization": "bearer " + valid_admin_token.encoded
         }
-        await auth_middleware.dispatch(request_mock, AsyncMock(Callable))
+        await auth_middleware.authenticate(request_mock)
         mock_logger.info.assert_called_with(
             AUTHN_AUTH_SUCCESSFUL, type=SECURITY, user_id="admin"
         )
@@ -328,11 +328,9 @@ class TestV3AuthenticationMiddleware:
             return_value=None
         )
         request_mock.state.cookie_manager.get_cookie.return_value = None
-        call_next_mock = AsyncMock(Callable)
 
-        await auth_middleware.dispatch(request_mock, call_next_mock)
+        await auth_middleware.authenticate(request_mock)
         assert request_mock.state.authenticated_user == authenticated_user
-        call_next_mock.assert_called_once_with(request_mock)
         macaroon_auth_provider_mock.authenticate.assert_called_once()
 
     async def test_authentication_with_oidc(
@@ -372,10 +370,8 @@ class TestV3AuthenticationMiddleware:
             return_value=cookie_manager,
         )
         cookie_manager.get_cookie.return_value = "oidc_access_token_value"
-        call_next_mock = AsyncMock(Callable)
-        await auth_middleware.dispatch(request_mock, call_next_mock)
+        await auth_middleware.authenticate(request_mock)
         assert request_mock.state.authenticated_user == authenticated_user
-        call_next_mock.assert_called_once_with(request_mock)
         oidc_auth_provider_mock.authenticate.assert_called_once_with(
             request_mock, "oidc_access_token_value"
         )
@@ -1,21 +1,39 @@
-# Copyright 2025 Canonical Ltd.  This software is licensed under the
+# Copyright 2025-2026 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
-from unittest.mock import Mock
-
 from fastapi import Response
 import pytest
-from starlette.requests import Request
-from starlette.types import ASGIApp
+from starlette.types import Message, Receive, Scope, Send
 
 from maasapiserver.v3.middlewares.client_certificate import (
     RequireClientCertMiddleware,
 )
 
 
+async def app(scope: Scope, receive: Receive, send: Send) -> None:
+    response = Response(scope.get("client_cn", "OK"))
+    await response(scope, receive, send)
+
+
 @pytest.fixture
 def middleware():
-    return RequireClientCertMiddleware(Mock(ASGIApp))
+    return RequireClientCertMiddleware(app)
+
+
+async def call_middleware(
+    middleware: RequireClientCertMiddleware, scope: Scope
+) -> tuple[int, bytes]:
+    messages = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    start, body = messages
+    return start["status"], body["body"]
 
 
 @pytest.mark.asyncio
@@ -28,15 +46,11 @@ class TestRequireClientCertMiddleware:
             "headers": [],
             "extensions": {"tls": {"tls_used": True, "client_cert_chain": []}},
         }
-        mock_request = Request(mock_scope)
 
-        async def mock_call_next(request):
-            return Response("OK")
+        status, body = await call_middleware(middleware, mock_scope)
 
-        response = await middleware.dispatch(mock_request, mock_call_next)
-
-        assert response.status_code == 403
-        assert response.body == b'{"detail":"Client certificate required."}'
+        assert status == 403
+        assert body == b'{"detail":"Client certificate required."}'
 
     async def test_valid_client_cert_allows_request(self, middleware):
         mock_scope = {
@@ -48,38 +62,23 @@ class TestRequireClientCertMiddleware:
                 "tls": {"client_cn": "01f09d32-f508-6064-bd1c-c025a58dd068"},
             },
         }
-        mock_request = Request(mock_scope)
-
-        async def call_next(request):
-            return Response("OK")
 
-        response = await middleware.dispatch(mock_request, call_next)
+        status, body = await call_middleware(middleware, mock_scope)
 
-        assert response.status_code == 200
-        assert response.body == b"OK"
+        assert status == 200
+        assert body == b"01f09d32-f508-6064-bd1c-c025a58dd068"
 
     async def test_missing_client_cert_for_agent_enroll_allows_request(
         self, middleware
     ):
-        mock_request = type(
-            "Request",
-            (),
-            {
-                "scope": {
-                    "headers": [],
-                    "path": "/v3/agents:enroll",
-                    "method": "POST",
-                }
-            },
-        )
-        mock_request_instance = mock_request()
-
-        async def mock_call_next(request):
-            return Response("OK")
+        mock_scope = {
+            "type": "http",
+            "headers": [],
+            "path": "/v3/agents:enroll",
+            "method": "POST",
+        }
 
-        response = await middleware.dispatch(
-            mock_request_instance, mock_call_next
-        )
+        status, body = await call_middleware(middleware, mock_scope)
 
-        assert response.status_code == 200
-        assert response.body == b"OK"
+        assert status == 200
+        assert body == b"OK"
@@ -1,11 +1,10 @@
 # Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import Mock, patch
 
 from macaroonbakery.bakery import Macaroon
 import pytest
-from starlette.requests import Request
 from starlette.types import ASGIApp
 
 from maasapiserver.common.api.models.responses.errors import (
@@ -115,30 +114,24 @@ class TestExceptionMiddleware:
     async def test_exception_middleware(
         self, exception_to_raise, expected_response
     ):
-        async def mock_call_next(request):
-            raise exception_to_raise
-
         middleware = ExceptionMiddleware(app=Mock(ASGIApp))
-        request = MagicMock(spec=Request)
 
-        response = await middleware.dispatch(request, mock_call_next)
+        response = middleware.get_error_response(exception_to_raise)
         assert isinstance(response, expected_response)
 
 
 class TestExceptionLogging:
     @pytest.mark.asyncio
     async def test_unauthorized_exception(self):
-        async def mock_call_next(request):
-            raise UnauthorizedException(
-                details=[BaseExceptionDetail(type="type", message="msg")]
-            )
-
         middleware = ExceptionMiddleware(app=Mock(ASGIApp))
-        request = MagicMock(spec=Request)
         with patch(
             "maasapiserver.common.middlewares.exceptions.logger"
         ) as mock_logger:
-            await middleware.dispatch(request, mock_call_next)
+            middleware.get_error_response(
+                UnauthorizedException(
+                    details=[BaseExceptionDetail(type="type", message="msg")]
+                )
+            )
 
         logging_call = mock_logger.info.call_args_list[0]
 
@@ -146,16 +139,14 @@ class TestExceptionLogging:
         assert AUTHN_AUTH_FAILED in logging_call.args[0]
 
     async def test_forbidden_exception(self):
-        async def mock_call_next(request):
-            raise ForbiddenException(
-                details=[BaseExceptionDetail(type="type", message="msg")]
-            )
-
         middleware = ExceptionMiddleware(app=Mock(ASGIApp))
-        request = MagicMock(spec=Request)
         with patch(
             "maasapiserver.common.middlewares.exceptions.logger"
         ) as mock_logger:
-            await middleware.dispatch(request, mock_call_next)
+            middleware.get_error_response(
+                ForbiddenException(
+                    details=[BaseExceptionDetail(type="type", message="msg")]
+                )
+            )
 
         mock_logger.warn.assert_called_once_with(AUTHZ_FAIL, type=SECURITY)
@@ -3,13 +3,18 @@
 
 from argparse import Namespace
 from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 import http.client
+from io import StringIO
 import json
+from operator import itemgetter
+import os
 from pathlib import Path
 import sys
 import tempfile
 from textwrap import dedent
+import time
 from unittest.mock import Mock, sentinel
 from urllib.parse import parse_qs, urlparse
 
@@ -154,6 +159,147 @@ class TestRegisterAPICommands(MAASTestCase):
             SSHKeysImportAction.name_value_pair, positional_action_type
         )
 
+    def test_registers_only_named_profile_and_resource(self):
+        configs = make_configs(number_of_configs=2)
+        self.patch(ProfileConfig, "open").return_value = configs
+        profile_name, other_name = configs
+        profile = configs[profile_name]
+        resource, other_resource = profile["description"]["resources"]
+        handler_name = handler_command_name(resource["name"])
+        action_name = safe_name(resource["auth"]["actions"][0]["name"])
+        parser = ArgumentParser()
+        api.register_api_commands(
+            parser, [profile_name, handler_name, action_name, "--debug"]
+        )
+        self.assertEqual([profile_name], list(parser.subparsers.choices))
+        profile_parser = parser.subparsers.choices[profile_name]
+        self.assertEqual(
+            [handler_name], list(profile_parser.subparsers.choices)
+        )
+        options = parser.parse_args((profile_name, handler_name, action_name))
+        self.assertIsInstance(options.execute, api.Action)
+
+    def test_registers_resources_without_actions_for_listing(self):
+        configs = self.make_profile()
+        [profile_name] = configs
+        resources = configs[profile_name]["description"]["resources"]
+        parser = ArgumentParser()
+        api.register_api_commands(parser, [profile_name])
+        profile_parser = parser.subparsers.choices[profile_name]
+        self.assertEqual(
+            sorted(
+                handler_command_name(resource["name"])
+                for resource in resources
+            )
+            + ["batch"],
+            list(profile_parser.subparsers.choices),
+        )
+        for handler_parser in profile_parser.subparsers.choices.values():
+            self.assertIsNone(handler_parser._subparsers)
+
+    def test_registers_batch_command(self):
+        configs = self.make_profile()
+        [profile_name] = configs
+        parser = ArgumentParser()
+        api.register_api_commands(parser)
+        options = parser.parse_args((profile_name, "batch"))
+        self.assertIsInstance(options.execute, api.BatchCommand)
+        self.assertEqual(configs[profile_name], options.execute.profile)
+
+    def test_registers_profiles_without_resources(self):
+        configs = make_configs(number_of_configs=2)
+        self.patch(ProfileConfig, "open").return_value = configs
+        parser = ArgumentParser()
+        api.register_api_commands(parser, ["--help"])
+        self.assertEqual(list(configs), list(parser.subparsers.choices))
+        for profile_parser in parser.subparsers.choices.values():
+            self.assertIsNone(profile_parser._subparsers)
+
+
+class TestCommandTreeCache(MAASTestCase):
+    """Tests for `CommandTreeCache`."""
+
+    def make_profile(self):
+        profile = make_profile()
+        profile["description"]["hash"] = factory.make_name("hash")
+        return profile
+
+    def test_uses_xdg_cache_home(self):
+        cache_home = self.make_dir()
+        self.patch(api.os, "environ", {"XDG_CACHE_HOME": cache_home})
+        cache = api.CommandTreeCache()
+        self.assertEqual(Path(cache_home) / "maascli", cache.path)
+
+    def test_get_index(self):
+        profile = self.make_profile()
+        cache = api.CommandTreeCache(self.make_dir())
+        self.assertEqual(
+            {
+                handler["handler_name"]: "Short"
+                for handler in api.get_handler_defs(profile)
+            },
+            cache.get_index(profile),
+        )
+
+    def test_get_handler(self):
+        profile = self.make_profile()
+        cache = api.CommandTreeCache(self.make_dir())
+        for handler in api.get_handler_defs(profile):
+            self.assertEqual(
+                handler, cache.get_handler(profile, handler["handler_name"])
+            )
+
+    def test_reads_cached_handlers(self):
+        profile = self.make_profile()
+        cache_dir = self.make_dir()
+        api.CommandTreeCache(cache_dir).get_index(profile)
+        handler_defs = api.get_handler_defs(profile)
+        get_handler_defs = self.patch(api, "get_handler_defs")
+        cache = api.CommandTreeCache(cache_dir)
+        self.assertEqual(
+            {handler["handler_name"] for handler in handler_defs},
+            set(cache.get_index(profile)),
+        )
+        for handler in handler_defs:
+            self.assertEqual(
+                handler, cache.get_handler(profile, handler["handler_name"])
+            )
+        get_handler_defs.assert_not_called()
+
+    def test_keyed_on_description_hash(self):
+        profile = self.make_profile()
+        cache = api.CommandTreeCache(self.make_dir())
+        tree_path = cache.get_tree_path(profile)
+        cache.get_index(profile)
+        profile["description"]["hash"] = factory.make_name("hash")
+        self.assertNotEqual(tree_path, cache.get_tree_path(profile))
+        profile["credentials"] = None
+        self.assertNotEqual(tree_path, cache.get_tree_path(profile))
+
+    def test_not_cached_without_description_hash(self):
+        profile = make_profile()
+        cache_dir = self.make_dir()
+        cache = api.CommandTreeCache(cache_dir)
+        self.assertIsNone(cache.get_tree_path(profile))
+        cache.get_index(profile)
+        self.assertEqual([], list(Path(cache_dir).iterdir()))
+
+    def test_prunes_old_trees(self):
+        cache_dir = Path(self.make_dir())
+        old_tree = cache_dir / "old"
+        old_tree.mkdir()
+        expired = time.time() - api.CommandTreeCache.max_age.total_seconds()
+        os.utime(old_tree, (expired - 1, expired - 1))
+        recent_tree = cache_dir / "recent"
+        recent_tree.mkdir()
+        profile = self.make_profile()
+        cache = api.CommandTreeCache(cache_dir)
+        cache.get_index(profile)
+        self.assertEqual(
+            {recent_tree, cache.get_tree_path(profile)},
+            set(cache_dir.iterdir()),
+        )
+
 
 class TestFunctions(MAASTestCase):
     """Test for miscellaneous functions in `maascli.api`."""
@@ -213,6 +359,22 @@ class TestFunctions(MAASTestCase):
             "Expected application/json, got: text/css", "%s" % error
         )
 
+    def test_http_request_reuses_client(self):
+        request = self.patch_autospec(httplib2.Http, "request")
+        request.return_value = httplib2.Response({}), b""
+        api.http_request("http://example.com/", "GET")
+        api.http_request("http://example.com/", "GET")
+        client1, client2 = (call.args[0] for call in request.mock_calls)
+        self.assertIs(client1, client2)
+
+    def test_get_http_client_per_thread_and_options(self):
+        client = api.get_http_client()
+        self.assertIs(client, api.get_http_client())
+        self.assertIsNot(client, api.get_http_client(insecure=True))
+        with ThreadPoolExecutor(1) as executor:
+            other = executor.submit(api.get_http_client).result()
+        self.assertIsNot(client, other)
+
     def test_http_request_raises_error_if_cert_verify_fails(self):
         self.patch(
             httplib2.Http,
@@ -472,6 +634,189 @@ class TestAction(MAASTestCase):
         )
 
 
+class TestReadOperations(MAASTestCase):
+    """Tests for `read_operations`."""
+
+    def test_reads_json_lines(self):
+        stream = StringIO(
+            '\n{"resource": "a"}\n\nnot json\n{"resource": "b"}\n'
+        )
+        operations = list(api.read_operations(stream))
+        self.assertEqual(
+            [({"resource": "a"}, None), ({"resource": "b"}, None)],
+            [operations[0], operations[2]],
+        )
+        operation, error = operations[1]
+        self.assertIsNone(operation)
+        self.assertTrue(error.startswith("Invalid JSON"))
+
+    def test_reads_json_array(self):
+        stream = StringIO('\n[{"resource": "a"},\n {"resource": "b"}]\n')
+        self.assertEqual(
+            [({"resource": "a"}, None), ({"resource": "b"}, None)],
+            list(api.read_operations(stream)),
+        )
+
+    def test_reads_nothing(self):
+        self.assertEqual([], list(api.read_operations(StringIO(""))))
+
+
+class TestBatchCommand(MAASTestCase):
+    """Tests for `BatchCommand`."""
+
+    def make_command(self, credentials=None):
+        handler = {
+            "name": "MachineHandler",
+            "doc": "Manage a machine.",
+            "path": "/MAAS/api/2.0/machines/{system_id}/",
+            "params": ["system_id"],
+            "actions": [
+                {
+                    "name": "power_parameters",
+                    "doc": "Get power parameters.",
+                    "method": "GET",
+                    "op": "power_parameters",
+                },
+                {
+                    "name": "update",
+                    "doc": "Update a machine.",
+                    "method": "PUT",
+                    "op": None,
+                },
+            ],
+        }
+        profile = make_profile()
+        profile["url"] = "http://example.com:5240/MAAS/api/2.0/"
+        profile["credentials"] = credentials
+        profile["description"]["resources"] = [
+            {"name": "MachineHandler", "auth": None, "anon": handler}
+        ]
+        cache = api.CommandTreeCache(self.make_dir())
+        self.patch(api, "materialize_certificate").return_value = None
+        parser = ArgumentParser()
+        return api.BatchCommand(parser, profile, cache=cache), parser
+
+    def test_prepare_request(self):
+        command, _ = self.make_command(credentials=("a", "b", "c"))
+        uri, method, body, headers = command.prepare_request(
+            {
+                "resource": "machine",
+                "action": "power-parameters",
+                "params": {"system_id": "abc"},
+                "data": {"id": ["x", "y"], "count": 2},
+            }
+        )
+        self.assertEqual("GET", method)
+        self.assertIsNone(body)
+        url = urlparse(uri)
+        self.assertEqual("/MAAS/api/2.0/machines/abc/", url.path)
+        self.assertEqual(
+            {"op": ["power_parameters"], "id": ["x", "y"], "count": ["2"]},
+            parse_qs(url.query),
+        )
+        self.assertIn("Authorization", headers)
+
+    def test_prepare_request_encodes_data_in_body(self):
+        command, _ = self.make_command()
+        uri, method, body, headers = command.prepare_request(
+            {
+                "resource": "machine",
+                "action": "update",
+                "params": {"system_id": "abc"},
+                "data": {"hostname": "foo"},
+            }
+        )
+        self.assertEqual("PUT", method)
+        self.assertIn('name="hostname"', body)
+        self.assertNotIn("Authorization", headers)
+
+    def test_prepare_request_errors(self):
+        command, _ = self.make_command()
+        for operation, message in [
+            ([], "Expected a JSON object."),
+            ({"resource": "foo"}, "Unknown resource: foo"),
+            (
+                {"resource": "machine", "action": "foo"},
+                "Unknown action for machine: foo",
+            ),
+            (
+                {"resource": "machine", "action": "update"},
+                "Missing params: system_id",
+            ),
+        ]:
+            error = self.assertRaises(
+                CommandError, command.prepare_request, operation
+            )
+            self.assertEqual(message, str(error))
+
+    def test_call_writes_results(self):
+        command, parser = self.make_command()
+        response = httplib2.Response({"content-type": "application/json"})
+        response.status = http.client.OK
+        http_request = self.patch(api, "http_request")
+        http_request.return_value = response, b'{"power_address": "x"}'
+        operations = [
+            {
+                "resource": "machine",
+                "action": "power-parameters",
+                "params": {"system_id": f"id{index}"},
+            }
+            for index in range(5)
+        ]
+        path = self.make_file(
+            contents="\n".join(json.dumps(op) for op in operations)
+        )
+        options = parser.parse_args([path, "--parallel", "2"])
+        stdout = self.useFixture(CaptureStandardIO())
+        command(options)
+        options.file.close()
+        results = [
+            json.loads(line) for line in stdout.getOutput().splitlines()
+        ]
+        self.assertEqual(
+            [
+                {
+                    "index": index,
+                    "status": http.client.OK,
+                    "result": {"power_address": "x"},
+                }
+                for index in range(5)
+            ],
+            sorted(results, key=itemgetter("index")),
+        )
+        self.assertEqual(5, http_request.call_count)
+
+    def test_call_fails_if_any_operation_fails(self):
+        command, parser = self.make_command()
+        response = httplib2.Response({"content-type": "text/plain"})
+        response.status = http.client.NOT_FOUND
+        self.patch(api, "http_request").return_value = response, b"Not Found"
+        operations = [
+            {
+                "resource": "machine",
+                "action": "power-parameters",
+                "params": {"system_id": "abc"},
+            },
+            {"resource": "foo"},
+        ]
+        path = self.make_file(contents=json.dumps(operations))
+        options = parser.parse_args([path])
+        stdout = self.useFixture(CaptureStandardIO())
+        error = self.assertRaises(CommandError, command, options)
+        options.file.close()
+        self.assertEqual(2, error.code)
+        results = [
+            json.loads(line) for line in stdout.getOutput().splitlines()
+        ]
+        self.assertCountEqual(
+            [
+                {"index": 0, "status": 404, "result": "Not Found"},
+                {"index": 1, "error": "Unknown resource: foo"},
+            ],
+            results,
+        )
+
+
 class TestActionHelp(MAASTestCase):
     def make_help(self):
         """Create an `ActionHelp` object."""
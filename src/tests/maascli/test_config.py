@@ -4,10 +4,11 @@
 """Tests for `maascli.config`."""
 
 import contextlib
+import json
 import os.path
 import sqlite3
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from twisted.python.filepath import FilePath
 
@@ -61,6 +62,17 @@ class TestProfileConfig(MAASTestCase):
             self.assertEqual({"abc": 123}, config["alice"])
             cursor.assert_not_called()
 
+    def test_decodes_profiles_on_access(self):
+        database = sqlite3.connect(":memory:")
+        config = api.ProfileConfig(database)
+        config["alice"] = {"abc": 123}
+        config["bob"] = {"def": 456}
+        config = api.ProfileConfig(database)
+        loads = self.patch(api.json, "loads", Mock(wraps=json.loads))
+        self.assertEqual({"abc": 123}, config["alice"])
+        self.assertEqual({"abc": 123}, config["alice"])
+        loads.assert_called_once_with('{"abc": 123}')
+
     def test_getting_profile(self):
         database = sqlite3.connect(":memory:")
         config = api.ProfileConfig(database)
@@ -5,6 +5,7 @@ import httpx
 import pytest
 
 from maascommon.openfga.async_client import OpenFGAClient
+from maascommon.openfga.cache import DECISION_CACHE, OpenFGADecisionCache
 from tests.maascommon.openfga.base import LIST_METHODS, PERMISSION_METHODS
 
 
@@ -15,7 +16,9 @@ class TestOpenFGAClient:
     @pytest.fixture
     async def client(self, stub_openfga_server):
         _, socket_path = stub_openfga_server
-        client = OpenFGAClient(unix_socket=socket_path)
+        client = OpenFGAClient(
+            unix_socket=socket_path, cache=OpenFGADecisionCache()
+        )
         yield client
         await client.close()
 
@@ -57,6 +60,64 @@ class TestOpenFGAClient:
         with pytest.raises(httpx.HTTPStatusError):
             await client.list_pools_with_view_machines_access(1)
 
+    async def test_check_is_cached(self, client, stub_openfga_server):
+        server, _ = stub_openfga_server
+        server.allowed = False
+
+        assert await client.can_edit_machines(1) is False
+        server.last_payload = None
+        assert await client.can_edit_machines(1) is False
+
+        assert server.last_payload is None
+        stats = client.cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+
+    async def test_check_cache_is_per_user(self, client, stub_openfga_server):
+        server, _ = stub_openfga_server
+
+        await client.can_edit_machines(1)
+        await client.can_edit_machines(2)
+
+        assert server.last_payload["tuple_key"]["user"] == "user:2"
+        assert client.cache.stats().misses == 2
+
+    async def test_list_objects_is_cached(self, client, stub_openfga_server):
+        server, _ = stub_openfga_server
+        server.list_objects_response = {"objects": ["pool:1", "pool:2"]}
+
+        first = await client.list_pools_with_view_machines_access(1)
+        first.append(3)
+        server.list_objects_response = {"objects": []}
+        second = await client.list_pools_with_view_machines_access(1)
+
+        assert second == [1, 2]
+        assert client.cache.stats().hits == 1
+
+    async def test_invalidate_forces_new_check(
+        self, client, stub_openfga_server
+    ):
+        server, _ = stub_openfga_server
+
+        assert await client.can_edit_machines(1) is True
+        server.allowed = False
+        client.cache.invalidate()
+
+        assert await client.can_edit_machines(1) is False
+
+    async def test_errors_are_not_cached(self, client, stub_openfga_server):
+        server, _ = stub_openfga_server
+        server.status_code = 500
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.can_edit_machines(1)
+
+        server.status_code = 200
+        assert await client.can_edit_machines(1) is True
+
+    async def test_uses_shared_cache_by_default(self):
+        client = OpenFGAClient()
+        assert client.cache is DECISION_CACHE
+        await client.close()
+
     async def test_async_client_closes_properly(self):
         client = OpenFGAClient()
         await client.close()
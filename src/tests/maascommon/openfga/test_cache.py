@@ -0,0 +1,77 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from maascommon.openfga.cache import (
+    MISSING,
+    OpenFGADecisionCache,
+    OpenFGADecisionCacheStats,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestOpenFGADecisionCache:
+    def test_get_missing(self):
+        cache = OpenFGADecisionCache()
+        assert cache.get(("check", 1, "rel", "maas:0")) is MISSING
+        assert cache.stats() == OpenFGADecisionCacheStats(
+            hits=0, misses=1, size=0
+        )
+
+    def test_get_falsy_value(self):
+        cache = OpenFGADecisionCache()
+        cache.set("key", False)
+        assert cache.get("key") is False
+        assert cache.stats().hits == 1
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = OpenFGADecisionCache(ttl=5, clock=clock)
+        cache.set("key", True)
+        clock.now = 4.9
+        assert cache.get("key") is True
+        clock.now = 5
+        assert cache.get("key") is MISSING
+        assert cache.stats().size == 0
+
+    def test_least_recently_used_is_evicted(self):
+        cache = OpenFGADecisionCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_zero_maxsize_disables_cache(self):
+        cache = OpenFGADecisionCache(maxsize=0)
+        cache.set("a", 1)
+        assert cache.get("a") is MISSING
+
+    def test_invalidate(self):
+        cache = OpenFGADecisionCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate()
+        assert cache.get("a") is MISSING
+        assert cache.get("b") is MISSING
+
+    def test_set_ignores_values_fetched_before_invalidate(self):
+        cache = OpenFGADecisionCache()
+        generation = cache.generation
+        cache.invalidate()
+        cache.set("a", 1, generation)
+        assert cache.get("a") is MISSING
+        cache.set("a", 1, cache.generation)
+        assert cache.get("a") == 1
+
+    def test_hit_rate(self):
+        assert OpenFGADecisionCacheStats(0, 0, 0).hit_rate == 0.0
+        assert OpenFGADecisionCacheStats(3, 1, 0).hit_rate == 0.75
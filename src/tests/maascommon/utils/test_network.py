@@ -1,7 +1,9 @@
 #  Copyright 2025 Canonical Ltd.  This software is licensed under the
 #  GNU Affero General Public License version 3 (see the file LICENSE).
 
-from netaddr import IPNetwork
+from ipaddress import IPv4Address, IPv6Address
+
+from netaddr import IPAddress, IPNetwork, IPRange
 import pytest
 
 from maascommon.utils.network import (
@@ -155,6 +157,68 @@ class TestMAASIPSet:
         unused_ip_set = ip_set.get_unused_ranges_for_range(ranges)
         assert unused_ip_set == MAASIPSet(unused)
 
+    def test_get_unused_ranges_for_range_overlapping_ranges(self) -> None:
+        ip_set = MAASIPSet([MAASIPRange("10.0.0.5", "10.0.0.15")])
+        unused_ip_set = ip_set.get_unused_ranges_for_range(
+            [
+                MAASIPRange("10.0.0.1", "10.0.0.10"),
+                MAASIPRange("10.0.0.8", "10.0.0.20"),
+            ]
+        )
+        assert unused_ip_set == MAASIPSet(
+            [
+                MAASIPRange("10.0.0.1", "10.0.0.4"),
+                MAASIPRange("10.0.0.16", "10.0.0.20"),
+            ]
+        )
+
+    def test_find_across_address_families(self) -> None:
+        ip_set = MAASIPSet(
+            [
+                MAASIPRange("10.0.0.1", "10.0.0.10", purpose="a"),
+                MAASIPRange("10.0.0.20", "10.0.0.30", purpose="b"),
+                MAASIPRange("::ffff:10.0.0.1", "::ffff:10.0.0.2", purpose="c"),
+                MAASIPRange("2001:db8::", "2001:db8::ff", purpose="d"),
+            ]
+        )
+        assert ip_set.find("10.0.0.25").purpose == {"b"}
+        assert ip_set.find("::ffff:10.0.0.1").purpose == {"c"}
+        assert ip_set.find("2001:db8::10").purpose == {"d"}
+        assert ip_set.find(IPRange("10.0.0.2", "10.0.0.3")).purpose == {"a"}
+        assert ip_set.find("10.0.0.15") is None
+        assert ip_set.find(IPRange("10.0.0.5", "10.0.0.25")) is None
+        assert "10.0.0.1" in ip_set
+        assert "2001:db8::100" not in ip_set
+
+    def test_includes_purpose(self) -> None:
+        ip_set = MAASIPSet(
+            [
+                MAASIPRange("10.0.0.1", "10.0.0.10", purpose="dynamic"),
+                MAASIPRange("10.0.0.11", "10.0.0.20", purpose="reserved"),
+            ]
+        )
+        assert ip_set.includes_purpose("dynamic")
+        assert ip_set.includes_purpose("reserved")
+        assert not ip_set.includes_purpose("unused")
+
+
+class TestMAASIPRange:
+    def test_from_db(self) -> None:
+        ip_range = MAASIPRange.from_db(
+            IPv4Address("10.0.0.1"), IPv4Address("10.0.0.10"), ["reserved"]
+        )
+        assert ip_range == MAASIPRange("10.0.0.1", "10.0.0.10")
+        assert ip_range.purpose == {"reserved"}
+
+    def test_from_db_ipv6(self) -> None:
+        ip_range = MAASIPRange.from_db(
+            IPv6Address("::ffff:10.0.0.1"),
+            IPv6Address("::ffff:10.0.0.10"),
+            [],
+        )
+        assert ip_range.first == int(IPAddress("::ffff:10.0.0.1"))
+        assert ip_range.version == 6
+
 
 class TestCoerceHostname:
     def test_replaces_international_characters(self):
@@ -0,0 +1,57 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+from maascommon.workflows.dhcp import (
+    ConfigureDHCPForAgentParam,
+    ConfigureDHCPParam,
+    merge_configure_dhcp_for_agent_param,
+    merge_configure_dhcp_param,
+)
+
+
+class TestMergeConfigureDHCPParam:
+    def test_merge(self) -> None:
+        merged = merge_configure_dhcp_param(
+            ConfigureDHCPParam(static_ip_addr_ids=[1], reserved_ip_ids=[2]),
+            ConfigureDHCPParam(ip_range_ids=[3], reserved_ip_ids=[4]),
+        )
+        assert merged == ConfigureDHCPParam(
+            system_ids=[],
+            vlan_ids=[],
+            subnet_ids=[],
+            static_ip_addr_ids=[1],
+            ip_range_ids=[3],
+            reserved_ip_ids=[2, 4],
+        )
+
+
+class TestMergeConfigureDHCPForAgentParam:
+    def test_merge_updates(self) -> None:
+        merged = merge_configure_dhcp_for_agent_param(
+            ConfigureDHCPForAgentParam(
+                system_id="abc", full_reload=False, static_ip_addr_ids=[2, 1]
+            ),
+            ConfigureDHCPForAgentParam(
+                system_id="abc",
+                full_reload=False,
+                static_ip_addr_ids=[1, 3],
+                reserved_ip_ids=[4],
+            ),
+        )
+        assert merged == ConfigureDHCPForAgentParam(
+            system_id="abc",
+            full_reload=False,
+            static_ip_addr_ids=[1, 2, 3],
+            reserved_ip_ids=[4],
+        )
+
+    def test_merge_full_reload(self) -> None:
+        merged = merge_configure_dhcp_for_agent_param(
+            ConfigureDHCPForAgentParam(
+                system_id="abc", full_reload=False, static_ip_addr_ids=[1]
+            ),
+            ConfigureDHCPForAgentParam(system_id="abc", full_reload=True),
+        )
+        assert merged == ConfigureDHCPForAgentParam(
+            system_id="abc", full_reload=True
+        )
@@ -2,7 +2,15 @@ import pytest
 
 from maasserver import vault
 from maasserver.models import Config, Secret, VaultSecret
-from maasserver.secrets import SecretManager, SecretNotFound, UnknownSecret
+from maasserver.secrets import (
+    NOT_CACHED,
+    NOT_FOUND,
+    SECRET_CACHE,
+    SecretCache,
+    SecretManager,
+    SecretNotFound,
+    UnknownSecret,
+)
 from maasserver.testing.factory import factory
 from maasserver.testing.vault import FakeVaultClient
 
@@ -15,6 +23,14 @@ def vault_client(request):
         yield None
 
 
+@pytest.fixture
+def secret_cache():
+    SECRET_CACHE.maxsize = 100
+    yield SECRET_CACHE
+    SECRET_CACHE.maxsize = 0
+    SECRET_CACHE.clear()
+
+
 @pytest.mark.parametrize("vault_client", [True, False], indirect=True)
 @pytest.mark.usefixtures("maasdb")
 class TestSecretManager:
@@ -96,6 +112,38 @@ class TestSecretManager:
             == "default"
         )
 
+    def test_get_composite_secrets_with_models(self, vault_client):
+        nodes = [factory.make_Node() for _ in range(3)]
+        for node in nodes[:2]:
+            self.set_secret(
+                vault_client,
+                f"node/{node.id}/deploy-metadata",
+                {"id": node.id},
+            )
+        manager = SecretManager(vault_client=vault_client)
+        assert manager.get_composite_secrets(
+            "deploy-metadata", nodes, default={}
+        ) == {
+            nodes[0]: {"id": nodes[0].id},
+            nodes[1]: {"id": nodes[1].id},
+            nodes[2]: {},
+        }
+
+    def test_get_composite_secrets_not_found(self, vault_client):
+        node = factory.make_Node()
+        manager = SecretManager(vault_client=vault_client)
+        with pytest.raises(SecretNotFound):
+            manager.get_composite_secrets("deploy-metadata", [node])
+
+    def test_get_composite_secrets_skips_deleted(self, vault_client):
+        node = factory.make_Node()
+        manager = SecretManager(vault_client=vault_client)
+        manager.set_composite_secret("deploy-metadata", {"a": 1}, obj=node)
+        manager.delete_secret("deploy-metadata", obj=node)
+        assert manager.get_composite_secrets(
+            "deploy-metadata", [node], default=None
+        ) == {node: None}
+
     def test_get_composite_secret_global(self, vault_client):
         value = {"bar": "baz"}
         self.set_secret(vault_client, "global/tls", value)
@@ -267,3 +315,187 @@ class TestSecretManager:
             },
             {f"node/{node.id}/deploy-metadata"},
         )
+
+    @pytest.mark.usefixtures("secret_cache")
+    def test_get_composite_secret_cached(self, vault_client):
+        node = factory.make_Node()
+        path = f"node/{node.id}/deploy-metadata"
+        self.set_secret(vault_client, path, {"foo": "bar"})
+        manager = SecretManager(vault_client=vault_client)
+        manager.get_composite_secret("deploy-metadata", obj=node)
+        # Changes made behind the manager's back are not seen.
+        if vault_client:
+            vault_client.store[path] = {"foo": "baz"}
+        else:
+            Secret.objects.filter(path=path).update(value={"foo": "baz"})
+        assert manager.get_composite_secret("deploy-metadata", obj=node) == {
+            "foo": "bar"
+        }
+
+    @pytest.mark.usefixtures("secret_cache")
+    def test_get_composite_secret_caches_not_found(self, vault_client):
+        node = factory.make_Node()
+        manager = SecretManager(vault_client=vault_client)
+        assert (
+            manager.get_composite_secret(
+                "deploy-metadata", obj=node, default=None
+            )
+            is None
+        )
+        self.set_secret(
+            vault_client, f"node/{node.id}/deploy-metadata", {"foo": "bar"}
+        )
+        with pytest.raises(SecretNotFound):
+            manager.get_composite_secret("deploy-metadata", obj=node)
+
+    @pytest.mark.usefixtures("secret_cache")
+    def test_set_composite_secret_invalidates_cache(self, vault_client):
+        node = factory.make_Node()
+        manager = SecretManager(vault_client=vault_client)
+        manager.set_composite_secret("deploy-metadata", {"a": 1}, obj=node)
+        manager.get_composite_secret("deploy-metadata", obj=node)
+        manager.set_composite_secret("deploy-metadata", {"a": 2}, obj=node)
+        assert manager.get_composite_secret("deploy-metadata", obj=node) == {
+            "a": 2
+        }
+
+    @pytest.mark.usefixtures("secret_cache")
+    def test_delete_secret_invalidates_cache(self, vault_client):
+        node = factory.make_Node()
+        manager = SecretManager(vault_client=vault_client)
+        manager.set_composite_secret("deploy-metadata", {"a": 1}, obj=node)
+        manager.get_composite_secret("deploy-metadata", obj=node)
+        manager.delete_all_object_secrets(node)
+        with pytest.raises(SecretNotFound):
+            manager.get_composite_secret("deploy-metadata", obj=node)
+
+    def test_set_composite_secret_not_cached_until_transaction_ends(
+        self, vault_client, secret_cache, mocker
+    ):
+        post_commit = mocker.patch("maasserver.secrets.post_commit")
+        node = factory.make_Node()
+        path = f"node/{node.id}/deploy-metadata"
+        manager = SecretManager(vault_client=vault_client)
+        manager.get_composite_secret("deploy-metadata", obj=node, default=None)
+        manager.set_composite_secret("deploy-metadata", {"a": 1}, obj=node)
+        # The uncommitted value is read, but not cached.
+        assert manager.get_composite_secret("deploy-metadata", obj=node) == {
+            "a": 1
+        }
+        assert secret_cache.get(path) is NOT_CACHED
+        # Once the transaction ends, values are cached again.
+        [end_write] = post_commit.call_args.args
+        end_write(None)
+        manager.get_composite_secret("deploy-metadata", obj=node)
+        assert secret_cache.get(path) == {"a": 1}
+
+    def test_get_composite_secrets_uses_cache(
+        self, vault_client, secret_cache
+    ):
+        nodes = [factory.make_Node() for _ in range(2)]
+        secret_cache.set(f"node/{nodes[0].id}/deploy-metadata", {"a": 1})
+        secret_cache.set(f"node/{nodes[1].id}/deploy-metadata", NOT_FOUND)
+        manager = SecretManager(vault_client=vault_client)
+        assert manager.get_composite_secrets(
+            "deploy-metadata", nodes, default=None
+        ) == {nodes[0]: {"a": 1}, nodes[1]: None}
+
+    def test_get_composite_secrets_fills_cache(
+        self, vault_client, secret_cache
+    ):
+        nodes = [factory.make_Node() for _ in range(2)]
+        self.set_secret(
+            vault_client, f"node/{nodes[0].id}/deploy-metadata", {"a": 1}
+        )
+        manager = SecretManager(vault_client=vault_client)
+        manager.get_composite_secrets("deploy-metadata", nodes, default=None)
+        assert secret_cache.get(f"node/{nodes[0].id}/deploy-metadata") == {
+            "a": 1
+        }
+        assert (
+            secret_cache.get(f"node/{nodes[1].id}/deploy-metadata")
+            is NOT_FOUND
+        )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSecretCache:
+    def test_disabled_by_default(self):
+        cache = SecretCache()
+        cache.set("path", {"a": 1})
+        assert cache.get("path") is NOT_CACHED
+
+    def test_get_set(self):
+        cache = SecretCache(maxsize=10)
+        cache.set("path", {"a": 1})
+        cache.set("missing", NOT_FOUND)
+        assert cache.get("path") == {"a": 1}
+        assert cache.get("missing") is NOT_FOUND
+        assert cache.get("other") is NOT_CACHED
+
+    def test_returns_copies(self):
+        cache = SecretCache(maxsize=10)
+        value = {"a": 1}
+        cache.set("path", value)
+        value["a"] = 2
+        cache.get("path")["a"] = 3
+        assert cache.get("path") == {"a": 1}
+
+    def test_expires(self):
+        clock = FakeClock()
+        cache = SecretCache(maxsize=10, ttl=10.0, clock=clock)
+        cache.set("path", {"a": 1})
+        clock.now = 9.0
+        assert cache.get("path") == {"a": 1}
+        clock.now = 10.0
+        assert cache.get("path") is NOT_CACHED
+
+    def test_evicts_least_recently_used(self):
+        cache = SecretCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is NOT_CACHED
+        assert cache.get("c") == 3
+
+    def test_invalidate(self):
+        cache = SecretCache(maxsize=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        cache.invalidate("a", "b", "unknown")
+        assert cache.get("a") is NOT_CACHED
+        assert cache.get("b") is NOT_CACHED
+        assert cache.get("c") == 3
+
+    def test_not_cached_while_written(self):
+        cache = SecretCache(maxsize=10)
+        cache.set("a", 1)
+        cache.begin_write("a")
+        assert cache.get("a") is NOT_CACHED
+        cache.set("a", 2)
+        assert cache.get("a") is NOT_CACHED
+        cache.end_write("a")
+        cache.set("a", 3)
+        assert cache.get("a") == 3
+
+    def test_end_write_drops_value(self):
+        cache = SecretCache(maxsize=10)
+        cache.begin_write("a")
+        cache.begin_write("a")
+        cache.end_write("a")
+        cache.set("a", 1)
+        assert cache.get("a") is NOT_CACHED
+        cache.end_write("a")
+        assert cache.get("a") is NOT_CACHED
+        cache.set("a", 2)
+        assert cache.get("a") == 2
@@ -1,4 +1,4 @@
-# Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+# Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
 import abc
@@ -85,6 +85,45 @@ class ReadOnlyRepositoryCommonTests(abc.ABC, Generic[T]):
                 for _ in range(page_size):
                     assert created_objects.pop() in objects_results.items
 
+    @pytest.mark.parametrize("num_objects", [10])
+    @pytest.mark.parametrize("page_size", [1, 3, 10, 11])
+    async def test_list_by_cursor(
+        self,
+        page_size: int,
+        repository_instance: BaseRepository,
+        _setup_test_list: Sequence[T],
+        num_objects: int,
+    ):
+        created_objects = list(_setup_test_list)
+        repository = repository_instance
+        listed = []
+        token = None
+        while True:
+            objects_results = await repository.list_by_cursor(
+                size=page_size, token=token
+            )
+            assert len(objects_results.items) <= page_size
+            assert objects_results.total is None
+            listed.extend(objects_results.items)
+            token = objects_results.next_token
+            if token is None:
+                break
+        assert len(listed) == num_objects
+        for created_object in created_objects:
+            assert created_object in listed
+
+    @pytest.mark.parametrize("num_objects", [3])
+    async def test_list_by_cursor_with_total(
+        self,
+        repository_instance: BaseRepository,
+        _setup_test_list: Sequence[T],
+        num_objects: int,
+    ):
+        objects_results = await repository_instance.list_by_cursor(
+            size=1, with_total=True
+        )
+        assert objects_results.total == num_objects
+
     async def test_exists_found(
         self, repository_instance, created_instance: T
     ):
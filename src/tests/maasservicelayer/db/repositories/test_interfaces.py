@@ -516,6 +516,29 @@ class TestInterfaceRepository:
 
         assert unknown_interface.mac_address == "aa:bb:cc:dd:ee:ff"
 
+    async def test_get_interfaces_for_macs(
+        self, db_connection: AsyncConnection, fixture: Fixture
+    ):
+        vlan = await create_test_vlan_entry(
+            fixture=fixture,
+            fabric_id=0,
+        )
+        interfaces_repository = InterfaceRepository(
+            context=Context(connection=db_connection)
+        )
+        interface = await interfaces_repository.create_unknwown_interface(
+            "aa:bb:cc:dd:ee:ff", vlan["id"]
+        )
+
+        result = await interfaces_repository.get_interfaces_for_macs(
+            ["AA:BB:CC:DD:EE:FF", "00:00:00:00:00:01"]
+        )
+
+        assert list(result) == ["aa:bb:cc:dd:ee:ff"]
+        assert [iface.id for iface in result["aa:bb:cc:dd:ee:ff"]] == [
+            interface.id
+        ]
+
     async def test_get_for_ip(
         self, db_connection: AsyncConnection, fixture: Fixture
     ) -> None:
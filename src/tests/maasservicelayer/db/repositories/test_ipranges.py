@@ -203,3 +203,30 @@ class TestIPRangesRepository(RepositoryCommonTests[IPRange]):
         )
 
         assert result.id == dynamic_range["id"]
+
+    async def test_get_dynamic_ranges_for_ips(
+        self, db_connection: AsyncConnection, fixture: Fixture
+    ):
+        subnet_data = await create_test_subnet_entry(
+            fixture, cidr="10.0.0.0/24"
+        )
+        dynamic_range = await create_test_ip_range_entry(
+            fixture,
+            subnet=subnet_data,
+            offset=1,
+            size=5,
+            type=IPRangeType.DYNAMIC,
+        )
+
+        ipranges_repository = IPRangesRepository(
+            Context(connection=db_connection)
+        )
+
+        in_range = (subnet_data["id"], IPv4Address("10.0.0.2"))
+        out_of_range = (subnet_data["id"], IPv4Address("10.0.0.100"))
+        result = await ipranges_repository.get_dynamic_ranges_for_ips(
+            [in_range, out_of_range]
+        )
+
+        assert list(result) == [in_range]
+        assert result[in_range].id == dynamic_range["id"]
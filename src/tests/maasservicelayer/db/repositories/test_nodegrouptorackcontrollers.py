@@ -55,6 +55,18 @@ class TestNodeGroupToRackControllersRepository(
     ):
         pass
 
+    @pytest.mark.skip(reason="Not implemented yet")
+    async def test_list_by_cursor(
+        self, page_size, repository_instance, _setup_test_list, num_objects
+    ):
+        pass
+
+    @pytest.mark.skip(reason="Not implemented yet")
+    async def test_list_by_cursor_with_total(
+        self, repository_instance, _setup_test_list, num_objects
+    ):
+        pass
+
     @pytest.mark.skip(reason="Not implemented yet")
     async def test_create(self, repository_instance, instance_builder):
         pass
@@ -1,7 +1,7 @@
 # Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
-from ipaddress import IPv4Address, IPv4Network
+from ipaddress import IPv4Address, IPv4Network, IPv6Address
 
 import pytest
 from sqlalchemy.dialects import postgresql
@@ -195,3 +195,46 @@ class TestSubnetsRepositoryMethods:
         )
         assert result is not None
         assert result.id == subnet2["id"]
+
+    async def test_find_best_subnets_for_ips(
+        self, db_connection: AsyncConnection, fixture: Fixture
+    ) -> None:
+        await create_test_subnet_entry(fixture, cidr="10.0.0.0/16")
+        subnet2 = await create_test_subnet_entry(fixture, cidr="10.0.1.0/24")
+        subnet3 = await create_test_subnet_entry(fixture, cidr="10.0.2.0/24")
+
+        subnets = SubnetsRepository(Context(connection=db_connection))
+
+        ips = [
+            IPv4Address("10.0.1.2"),
+            IPv4Address("10.0.2.2"),
+            IPv4Address("10.1.0.1"),
+        ]
+        result = await subnets.find_best_subnets_for_ips(ips)
+        assert {ip: subnet.id for ip, subnet in result.items()} == {
+            ips[0]: subnet2["id"],
+            ips[1]: subnet3["id"],
+        }
+
+    async def test_find_best_subnets_for_ips_empty(
+        self, db_connection: AsyncConnection, fixture: Fixture
+    ) -> None:
+        await create_test_subnet_entry(fixture, cidr="10.0.0.0/16")
+
+        subnets = SubnetsRepository(Context(connection=db_connection))
+
+        assert await subnets.find_best_subnets_for_ips([]) == {}
+
+    async def test_find_best_subnets_for_ips_ipv4_mapped(
+        self, db_connection: AsyncConnection, fixture: Fixture
+    ) -> None:
+        subnet = await create_test_subnet_entry(fixture, cidr="10.0.1.0/24")
+        await create_test_subnet_entry(fixture, cidr="2001:db8::/64")
+
+        subnets = SubnetsRepository(Context(connection=db_connection))
+
+        ip = IPv6Address("::ffff:10.0.1.2")
+        result = await subnets.find_best_subnets_for_ips([ip])
+        assert {ip: subnet.id for ip, subnet in result.items()} == {
+            ip: subnet["id"]
+        }
@@ -255,6 +255,20 @@ class TestUsersRepository:
         assert users_list.total == 0
         assert users_list.items == []
 
+    async def test_list_by_cursor_special_users(
+        self, db_connection: AsyncConnection, fixture: Fixture
+    ) -> None:
+        await create_test_user(fixture, username="MAAS")
+        user = await create_test_user(fixture, username="user1")
+
+        users_repository = UsersRepository(Context(connection=db_connection))
+        users_list = await users_repository.list_by_cursor(
+            size=1000, with_total=True
+        )
+        assert users_list.total == 1
+        assert users_list.items == [user]
+        assert users_list.next_token is None
+
     async def test_get_groups_for_users_empty(
         self, db_connection: AsyncConnection, fixture: Fixture
     ) -> None:
@@ -18,9 +18,16 @@ class TestTriggersUsed:
         "resourcepool_sys_rbac_rpool_delete",
         "resourcepool_sys_rbac_rpool_insert",
         "resourcepool_sys_rbac_rpool_update",
+        "secret_sys_secret_delete",
+        "secret_sys_secret_insert",
+        "secret_sys_secret_update",
         "subnet_sys_proxy_subnet_delete",
         "subnet_sys_proxy_subnet_insert",
         "subnet_sys_proxy_subnet_update",
+        "tuple_openfga_tuple_notify",
+        "vaultsecret_sys_secret_delete",
+        "vaultsecret_sys_secret_insert",
+        "vaultsecret_sys_secret_update",
     }
 
     triggers_websocket = {
@@ -167,7 +174,34 @@ class TestTriggersUsed:
         "vlan_vlan_update_notify",
     }
 
-    triggers_all = triggers_system | triggers_websocket
+    triggers_machinesummary = {
+        "auth_user_machinesummary_user_update",
+        "blockdevice_machinesummary_blockdevice_delete",
+        "blockdevice_machinesummary_blockdevice_update",
+        "bmc_machinesummary_bmc_update",
+        "domain_machinesummary_domain_update",
+        "fabric_machinesummary_fabric_update",
+        "interface_ip_addresses_machinesummary_interfaceip_delete",
+        "interface_ip_addresses_machinesummary_interfaceip_insert",
+        "interface_machinesummary_interface_delete",
+        "interface_machinesummary_interface_insert",
+        "interface_machinesummary_interface_update",
+        "node_machinesummary_node_insert",
+        "node_machinesummary_node_update",
+        "node_tags_machinesummary_nodetag_delete",
+        "node_tags_machinesummary_nodetag_insert",
+        "physicalblockdevice_machinesummary_physblockdevice_insert",
+        "resourcepool_machinesummary_resourcepool_update",
+        "space_machinesummary_space_update",
+        "staticipaddress_machinesummary_staticipaddress_update",
+        "subnet_machinesummary_subnet_update",
+        "vlan_machinesummary_vlan_update",
+        "zone_machinesummary_zone_update",
+    }
+
+    triggers_all = (
+        triggers_system | triggers_websocket | triggers_machinesummary
+    )
 
     async def find_triggers_in_database(self, db_connection: AsyncConnection):
         stmt = text(
@@ -1,4 +1,4 @@
-# Copyright 2024-2025 Canonical Ltd.  This software is licensed under the
+# Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
 from typing import Type
@@ -23,6 +23,7 @@ from maasservicelayer.exceptions.catalog import (
     PreconditionFailedException,
 )
 from maasservicelayer.models.base import (
+    CursorListResult,
     ListResult,
     MaasBaseModel,
     ResourceBuilder,
@@ -161,6 +162,19 @@ class TestBaseService:
         )
         assert results == resources
 
+    async def test_list_by_cursor(self, repository_mock, service):
+        resources = CursorListResult[DummyMaasBaseModel](
+            items=[DummyMaasBaseModel(id=0)], next_token=None
+        )
+        repository_mock.list_by_cursor.return_value = resources
+        query = QuerySpec()
+        results = await service.list_by_cursor(10, "token", query, True)
+
+        repository_mock.list_by_cursor.assert_awaited_once_with(
+            size=10, token="token", query=query, with_total=True
+        )
+        assert results == resources
+
     async def test_update_one(self, repository_mock, service):
         resource = DummyMaasBaseModel(id=0)
         repository_mock.get_one.return_value = resource
@@ -1,4 +1,4 @@
-# Copyright 2024 Canonical Ltd.  This software is licensed under the
+# Copyright 2024-2026 Canonical Ltd.  This software is licensed under the
 # GNU Affero General Public License version 3 (see the file LICENSE).
 
 from ipaddress import IPv4Address, IPv6Address
@@ -593,6 +593,191 @@ class TestIntegrationLeasesService:
         )
         assert dnsresource is not None
 
+    async def test_store_lease_info_batch(
+        self, fixture: Fixture, services: ServiceCollectionV3
+    ):
+        subnet = await create_test_subnet_entry(fixture, cidr="10.0.0.0/24")
+        await create_test_ip_range_entry(
+            fixture,
+            subnet,
+            type=IPRangeType.DYNAMIC,
+            start_ip="10.0.0.100",
+            end_ip="10.0.0.200",
+        )
+        await create_test_machine_entry(fixture, hostname="node")
+        mac_address = "00:11:22:33:44:55"
+        await services.leases.store_lease_info_batch(
+            [
+                Lease(
+                    action=LeaseAction.COMMIT,
+                    ip_family=IpAddressFamily.IPV4,
+                    hostname="ubuntu",
+                    mac=mac_address,
+                    ip=IPv4Address("10.0.0.150"),
+                    timestamp_epoch=0,
+                    lease_time_seconds=30,
+                ),
+                # Outside of the dynamic range, ignored.
+                Lease(
+                    action=LeaseAction.COMMIT,
+                    ip_family=IpAddressFamily.IPV4,
+                    hostname="other",
+                    mac="00:11:22:33:44:66",
+                    ip=IPv4Address("10.0.0.10"),
+                    timestamp_epoch=0,
+                    lease_time_seconds=30,
+                ),
+                # Same MAC, gets a new address: the unknown interface created
+                # for the first lease is reused and the old address deleted.
+                Lease(
+                    action=LeaseAction.COMMIT,
+                    ip_family=IpAddressFamily.IPV4,
+                    hostname="node",
+                    mac=mac_address,
+                    ip=IPv4Address("10.0.0.151"),
+                    timestamp_epoch=0,
+                    lease_time_seconds=30,
+                ),
+            ]
+        )
+
+        interfaces = await services.interfaces.get_many(
+            query=QuerySpec(
+                where=InterfaceClauseFactory.with_mac_address(mac_address)
+            )
+        )
+        assert len(interfaces) == 1
+        assert interfaces[0].type == InterfaceType.UNKNOWN
+        assert (
+            await services.interfaces.exists(
+                query=QuerySpec(
+                    where=InterfaceClauseFactory.with_mac_address(
+                        "00:11:22:33:44:66"
+                    )
+                )
+            )
+            is False
+        )
+
+        ip_addresses = await services.staticipaddress.get_many(
+            query=QuerySpec(
+                where=StaticIPAddressClauseFactory.with_subnet_id(subnet["id"])
+            )
+        )
+        assert [ip_address.ip for ip_address in ip_addresses] == [
+            IPv4Address("10.0.0.151")
+        ]
+        # The hostname belongs to a node, so no DNS record is created.
+        dnsresource_exists = await services.dnsresources.exists(
+            query=QuerySpec()
+        )
+        assert dnsresource_exists is False
+
+    async def test_store_lease_info_batch_moves_addresses(
+        self, fixture: Fixture, services: ServiceCollectionV3
+    ):
+        subnet = await create_test_subnet_entry(fixture, cidr="10.0.0.0/24")
+        await create_test_ip_range_entry(
+            fixture,
+            subnet,
+            type=IPRangeType.DYNAMIC,
+            start_ip="10.0.0.100",
+            end_ip="10.0.0.200",
+        )
+
+        def make_lease(mac, ip, hostname):
+            return Lease(
+                action=LeaseAction.COMMIT,
+                ip_family=IpAddressFamily.IPV4,
+                hostname=hostname,
+                mac=mac,
+                ip=IPv4Address(ip),
+                timestamp_epoch=0,
+                lease_time_seconds=30,
+            )
+
+        await services.leases.store_lease_info_batch(
+            [
+                make_lease("00:11:22:33:44:55", "10.0.0.150", "one"),
+                make_lease("00:11:22:33:44:66", "10.0.0.160", "two"),
+            ]
+        )
+        await services.leases.store_lease_info_batch(
+            [
+                make_lease("00:11:22:33:44:55", "10.0.0.151", "one"),
+                make_lease("00:11:22:33:44:66", "10.0.0.161", "two"),
+                # Gets the address the first MAC had before the batch.
+                make_lease("00:11:22:33:44:77", "10.0.0.150", "three"),
+            ]
+        )
+
+        ip_addresses = await services.staticipaddress.get_many(
+            query=QuerySpec(
+                where=StaticIPAddressClauseFactory.with_subnet_id(subnet["id"])
+            )
+        )
+        ip_ids = {ip_address.ip: ip_address.id for ip_address in ip_addresses}
+        assert set(ip_ids) == {
+            IPv4Address("10.0.0.150"),
+            IPv4Address("10.0.0.151"),
+            IPv4Address("10.0.0.161"),
+        }
+        links = await fixture.get("maasserver_interface_ip_addresses")
+        assert len(links) == 3
+        interfaces = {
+            interface.id: str(interface.mac_address)
+            for interface in await services.interfaces.get_many(
+                query=QuerySpec()
+            )
+        }
+        assert {
+            (interfaces[link["interface_id"]], link["staticipaddress_id"])
+            for link in links
+        } == {
+            ("00:11:22:33:44:55", ip_ids[IPv4Address("10.0.0.151")]),
+            ("00:11:22:33:44:66", ip_ids[IPv4Address("10.0.0.161")]),
+            ("00:11:22:33:44:77", ip_ids[IPv4Address("10.0.0.150")]),
+        }
+        dnsresources = {
+            dnsresource.id: dnsresource.name
+            for dnsresource in await services.dnsresources.get_many(
+                query=QuerySpec()
+            )
+        }
+        dnsresource_links = await fixture.get(
+            "maasserver_dnsresource_ip_addresses"
+        )
+        assert {
+            (
+                dnsresources[link["dnsresource_id"]],
+                link["staticipaddress_id"],
+            )
+            for link in dnsresource_links
+        } == {
+            ("one", ip_ids[IPv4Address("10.0.0.151")]),
+            ("two", ip_ids[IPv4Address("10.0.0.161")]),
+            ("three", ip_ids[IPv4Address("10.0.0.150")]),
+        }
+
+    async def test_store_lease_info_batch_no_subnet(
+        self, fixture: Fixture, services: ServiceCollectionV3
+    ):
+        await create_test_subnet_entry(fixture, cidr="10.0.0.0/24")
+        with pytest.raises(LeaseUpdateError):
+            await services.leases.store_lease_info_batch(
+                [
+                    Lease(
+                        action=LeaseAction.COMMIT,
+                        ip_family=IpAddressFamily.IPV4,
+                        hostname="ubuntu",
+                        mac="00:11:22:33:44:55",
+                        ip=IPv4Address("10.1.0.150"),
+                        timestamp_epoch=0,
+                        lease_time_seconds=30,
+                    ),
+                ]
+            )
+
 
 @pytest.mark.asyncio
 class TestLeasesService:
@@ -1029,3 +1214,177 @@ class TestLeasesService:
         self.mock_interfaces_service.link_ip.assert_called_once_with(
             [interface], sip
         )
+
+    async def test_store_lease_info_batch(self) -> None:
+        subnet = Subnet(
+            id=1,
+            cidr="10.0.0.0/24",
+            created=utcnow(),
+            updated=utcnow(),
+            rdns_mode=1,
+            allow_dns=True,
+            allow_proxy=True,
+            active_discovery=True,
+            managed=True,
+            vlan_id=1,
+            disabled_boot_architectures=[],
+        )
+        interface = Interface(
+            id=2,
+            mac_address="00:11:22:33:44:55",
+            type=InterfaceType.PHYSICAL,
+            name="eth0",
+            node_config_id=1,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+        sip = StaticIPAddress(
+            id=3,
+            ip="10.0.0.2",
+            alloc_type=IpAddressType.DISCOVERED,
+            lease_time=600,
+            subnet_id=subnet.id,
+            created=utcnow(),
+            updated=utcnow(),
+        )
+        ip = IPv4Address("10.0.0.2")
+        out_of_range_ip = IPv4Address("10.0.0.200")
+
+        self.mock_static_ip_address_service.create_or_update.return_value = sip
+        self.mock_static_ip_address_service.get_discovered_ips_in_family_for_interfaces.return_value = []
+        self.mock_subnets_service.find_best_subnets_for_ips.return_value = {
+            ip: subnet,
+            out_of_range_ip: subnet,
+        }
+        self.mock_ip_ranges_service.get_dynamic_ranges_for_ips.return_value = {
+            (subnet.id, ip): Mock()
+        }
+        self.mock_interfaces_service.get_interfaces_for_macs.return_value = {
+            "00:11:22:33:44:55": [interface]
+        }
+        self.mock_nodes_service.get_many.return_value = []
+
+        await self.leases_service.store_lease_info_batch(
+            [
+                Lease(
+                    action=LeaseAction.COMMIT,
+                    ip_family=IpAddressFamily.IPV4,
+                    hostname="hostname",
+                    mac="00:11:22:33:44:55",
+                    ip=ip,
+                    timestamp_epoch=int(time.time()),
+                    lease_time_seconds=30,
+                ),
+                Lease(
+                    action=LeaseAction.COMMIT,
+                    ip_family=IpAddressFamily.IPV4,
+                    hostname="other",
+                    mac="00:11:22:33:44:66",
+                    ip=out_of_range_ip,
+                    timestamp_epoch=int(time.time()),
+                    lease_time_seconds=30,
+                ),
+            ]
+        )
+
+        self.mock_subnets_service.find_best_subnets_for_ips.assert_called_once_with(
+            [ip, out_of_range_ip]
+        )
+        self.mock_ip_ranges_service.get_dynamic_ranges_for_ips.assert_called_once()
+        self.mock_interfaces_service.get_interfaces_for_macs.assert_called_once()
+        self.mock_nodes_service.get_many.assert_called_once()
+        self.mock_nodes_service.exists.assert_not_called()
+        self.mock_subnets_service.find_best_subnet_for_ip.assert_not_called()
+        self.mock_interfaces_service.get_interfaces_for_mac.assert_not_called()
+        self.mock_interfaces_service.create_unkwnown_interface.assert_not_called()
+        self.mock_static_ip_address_service.create_or_update.assert_called_once()
+        self.mock_interfaces_service.link_ip.assert_called_once_with(
+            [interface], sip
+        )
+        self.mock_dns_resources_service.update_dynamic_hostname.assert_called_once_with(
+            sip, "hostname"
+        )
+
+    async def test_store_lease_info_batch_deletes_stale_addresses_at_once(
+        self,
+    ) -> None:
+        subnet = Subnet(
+            id=1,
+            cidr="10.0.0.0/24",
+            created=utcnow(),
+            updated=utcnow(),
+            rdns_mode=1,
+            allow_dns=True,
+            allow_proxy=True,
+            active_discovery=True,
+            managed=True,
+            vlan_id=1,
+            disabled_boot_architectures=[],
+        )
+        macs = ["00:11:22:33:44:55", "00:11:22:33:44:66"]
+        interfaces = {
+            mac: Interface(
+                id=i,
+                mac_address=mac,
+                type=InterfaceType.PHYSICAL,
+                name=f"eth{i}",
+                node_config_id=1,
+                created=utcnow(),
+                updated=utcnow(),
+            )
+            for i, mac in enumerate(macs)
+        }
+        stale_sips = {
+            interface.id: StaticIPAddress(
+                id=10 + interface.id,
+                ip=f"10.0.0.{10 + interface.id}",
+                alloc_type=IpAddressType.DISCOVERED,
+                lease_time=600,
+                subnet_id=subnet.id,
+                created=utcnow(),
+                updated=utcnow(),
+            )
+            for interface in interfaces.values()
+        }
+        ips = [IPv4Address("10.0.0.2"), IPv4Address("10.0.0.3")]
+
+        self.mock_static_ip_address_service.get_discovered_ips_in_family_for_interfaces.side_effect = (
+            lambda interfaces, family: [stale_sips[interfaces[0].id]]
+        )
+        self.mock_subnets_service.find_best_subnets_for_ips.return_value = {
+            ip: subnet for ip in ips
+        }
+        self.mock_ip_ranges_service.get_dynamic_ranges_for_ips.return_value = {
+            (subnet.id, ip): Mock() for ip in ips
+        }
+        self.mock_interfaces_service.get_interfaces_for_macs.return_value = {
+            mac: [interface] for mac, interface in interfaces.items()
+        }
+
+        await self.leases_service.store_lease_info_batch(
+            [
+                Lease(
+                    action=LeaseAction.COMMIT,
+                    ip_family=IpAddressFamily.IPV4,
+                    hostname="",
+                    mac=mac,
+                    ip=ip,
+                    timestamp_epoch=int(time.time()),
+                    lease_time_seconds=30,
+                )
+                for mac, ip in zip(macs, ips, strict=True)
+            ]
+        )
+
+        self.mock_static_ip_address_service.delete_by_id.assert_not_called()
+        self.mock_dns_resources_service.release_dynamic_hostname.assert_not_called()
+        self.mock_dns_resources_service.release_dynamic_hostnames.assert_called_once_with(
+            list(stale_sips.values())
+        )
+        self.mock_static_ip_address_service.delete_many.assert_called_once_with(
+            query=QuerySpec(
+                where=StaticIPAddressClauseFactory.with_ids(
+                    [sip.id for sip in stale_sips.values()]
+                )
+            )
+        )
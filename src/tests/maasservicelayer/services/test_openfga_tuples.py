@@ -6,6 +6,7 @@ import pytest
 from sqlalchemy import and_
 from sqlalchemy.sql.operators import eq
 
+from maascommon.openfga.cache import DECISION_CACHE, MISSING
 from maasservicelayer.builders.openfga_tuple import OpenFGATupleBuilder
 from maasservicelayer.context import Context
 from maasservicelayer.db.filters import QuerySpec
@@ -406,6 +407,36 @@ class TestOpenFGAService:
             == id(apiclient2_again)
         )
 
+    @pytest.mark.parametrize(
+        "method, args",
+        [
+            ("upsert", (OpenFGATupleBuilder.build_pool("1"),)),
+            ("delete_many", (QuerySpec(),)),
+            ("delete_pool", (1,)),
+            ("bulk_add_users_to_group", (1, [1, 2])),
+        ],
+    )
+    async def test_writes_invalidate_decision_cache_after_commit(
+        self, method: str, args: tuple
+    ) -> None:
+        mock_repository = Mock(OpenFGATuplesRepository)
+        context = Context()
+        service = OpenFGATupleService(
+            context=context,
+            openfga_tuple_repository=mock_repository,
+            cache=OpenFGAServiceCache(),
+        )
+        key = ("check", 1, "can_edit_machines", "maas:0")
+        DECISION_CACHE.set(key, True)
+
+        await getattr(service, method)(*args)
+        await getattr(service, method)(*args)
+
+        assert DECISION_CACHE.get(key) is True
+        [hook] = context.get_post_commit_hooks()
+        await hook()
+        assert DECISION_CACHE.get(key) is MISSING
+
     async def test_delete_entitlement_maas(self) -> None:
         mock_repository = Mock(OpenFGATuplesRepository)
         mock_repository.delete_many = AsyncMock(return_value=None)
@@ -70,12 +70,6 @@ class TestCommonStaticIPAddressService(ServiceCommonTests):
     ):
         pass
 
-    async def test_delete_many(
-        self, service_instance, test_instance: MaasBaseModel
-    ):
-        with pytest.raises(NotImplementedError):
-            await super().test_delete_many(service_instance, test_instance)
-
 
 @pytest.mark.asyncio
 class TestStaticIPAddressService:
@@ -334,14 +328,14 @@ class TestStaticIPAddressService:
         )
 
     @pytest.mark.parametrize(
-        "builder, should_raise",
+        "builder, triggers_workflow",
         [
             (StaticIPAddressBuilder(subnet_id=10), True),
             (StaticIPAddressBuilder(user_id=10), False),
         ],
     )
     async def test_update_many(
-        self, builder: StaticIPAddressBuilder, should_raise: bool
+        self, builder: StaticIPAddressBuilder, triggers_workflow: bool
     ) -> None:
         now = utcnow()
         ips = [
@@ -369,17 +363,21 @@ class TestStaticIPAddressService:
             staticipaddress_repository=mock_staticipaddress_repository,
         )
 
-        if should_raise:
-            with pytest.raises(NotImplementedError):
-                await staticipaddress_service.update_many(QuerySpec(), builder)
-        else:
-            await staticipaddress_service.update_many(QuerySpec(), builder)
+        await staticipaddress_service.update_many(QuerySpec(), builder)
 
         mock_staticipaddress_repository.update_many.assert_called_once_with(
             query=QuerySpec(),
             builder=builder,
         )
-        mock_temporal.register_or_update_workflow_call.assert_not_called()
+        if triggers_workflow:
+            mock_temporal.register_or_update_workflow_call.assert_called_once_with(
+                CONFIGURE_DHCP_WORKFLOW_NAME,
+                ConfigureDHCPParam(static_ip_addr_ids=[ip.id for ip in ips]),
+                parameter_merge_func=merge_configure_dhcp_param,
+                wait=False,
+            )
+        else:
+            mock_temporal.register_or_update_workflow_call.assert_not_called()
 
     async def test_delete(self) -> None:
         now = utcnow()
@@ -4,11 +4,13 @@
 from unittest.mock import Mock
 
 import pytest
+from temporalio.common import WorkflowIDReusePolicy
 
 from maascommon.enums.events import EventTypeEnum
 from maascommon.workflows.tag import (
-    TAG_EVALUATION_WORKFLOW_NAME,
-    TagEvaluationParam,
+    TagDefinition,
+    TAGS_EVALUATION_WORKFLOW_NAME,
+    TagsEvaluationParam,
 )
 from maasservicelayer.builders.tags import TagBuilder
 from maasservicelayer.context import Context
@@ -131,11 +133,12 @@ class TestTagsService:
         await tags_service.create(builder)
 
         temporal_mock.register_workflow_call.assert_called_once_with(
-            workflow_name=TAG_EVALUATION_WORKFLOW_NAME,
-            workflow_id="tag-evaluation",
-            parameter=TagEvaluationParam(
-                AUTOMATIC_TAG.id, AUTOMATIC_TAG.definition
+            workflow_name=TAGS_EVALUATION_WORKFLOW_NAME,
+            workflow_id=f"tags-evaluation:{AUTOMATIC_TAG.id}",
+            parameter=TagsEvaluationParam(
+                [TagDefinition(AUTOMATIC_TAG.id, AUTOMATIC_TAG.definition)]
             ),
+            id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
         )
         events_service.record_event.assert_called_once_with(
             event_type=EventTypeEnum.TAG,
@@ -183,9 +186,12 @@ class TestTagsService:
         await tags_service.update_by_id(id=AUTOMATIC_TAG.id, builder=builder)
 
         temporal_mock.register_workflow_call.assert_called_once_with(
-            workflow_name=TAG_EVALUATION_WORKFLOW_NAME,
-            workflow_id="tag-evaluation",
-            parameter=TagEvaluationParam(AUTOMATIC_TAG.id, new_tag.definition),
+            workflow_name=TAGS_EVALUATION_WORKFLOW_NAME,
+            workflow_id=f"tags-evaluation:{AUTOMATIC_TAG.id}",
+            parameter=TagsEvaluationParam(
+                [TagDefinition(AUTOMATIC_TAG.id, new_tag.definition)]
+            ),
+            id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
         )
         events_service.record_event.assert_called_once_with(
             event_type=EventTypeEnum.TAG,
@@ -287,11 +293,12 @@ class TestTagsService:
         await tags_service.evaluate_tag(AUTOMATIC_TAG)
 
         temporal_mock.register_workflow_call.assert_called_once_with(
-            workflow_name=TAG_EVALUATION_WORKFLOW_NAME,
-            workflow_id="tag-evaluation",
-            parameter=TagEvaluationParam(
-                AUTOMATIC_TAG.id, AUTOMATIC_TAG.definition
+            workflow_name=TAGS_EVALUATION_WORKFLOW_NAME,
+            workflow_id=f"tags-evaluation:{AUTOMATIC_TAG.id}",
+            parameter=TagsEvaluationParam(
+                [TagDefinition(AUTOMATIC_TAG.id, AUTOMATIC_TAG.definition)]
             ),
+            id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
         )
 
     async def test_evaluate_tag_leaves_manual_tags(
@@ -0,0 +1,29 @@
+# Copyright 2026 Canonical Ltd.  This software is licensed under the
+# GNU Affero General Public License version 3 (see the file LICENSE).
+
+import pytest
+
+from maasservicelayer.exceptions.catalog import ValidationException
+from maasservicelayer.utils.cursor import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    def test_roundtrip(self):
+        token = encode_cursor("id", 42)
+        assert decode_cursor(token, "id", int) == 42
+
+    def test_token_is_url_safe(self):
+        token = encode_cursor("id", 2**62)
+        assert token.replace("-", "").replace("_", "").isalnum()
+
+    @pytest.mark.parametrize(
+        "token", ["", "not-a-token", encode_cursor("id", "42")]
+    )
+    def test_invalid_token(self, token: str):
+        with pytest.raises(ValidationException) as e:
+            decode_cursor(token, "id", int)
+        assert e.value.details[0].field == "token"
+
+    def test_other_sort_key(self):
+        with pytest.raises(ValidationException):
+            decode_cursor(encode_cursor("name", 42), "id", int)
@@ -16,6 +16,7 @@ import pytest
 
 from maasservicelayer.utils.image_local_files import (
     AsyncLocalBootResourceFile,
+    DownloadProgress,
     LocalStoreAllocationFail,
     LocalStoreFileSizeMismatch,
     LocalStoreInvalidHash,
@@ -241,6 +242,120 @@ class TestAsyncLocalBootResourceFile:
 
         assert content == file_content
 
+    async def test_complete_with_partial_download(
+        self, image_store_dir, file_content, file_sha256, file_filename_on_disk
+    ):
+        f = AsyncLocalBootResourceFile(
+            sha256=file_sha256,
+            filename_on_disk=file_filename_on_disk,
+            total_size=FILE_SIZE,
+        )
+        f.path.write_bytes(file_content)
+        await f.save_progress(
+            DownloadProgress.start(file_sha256, FILE_SIZE, FILE_SLICE)
+        )
+        assert await f.complete() is False
+
+    async def test_load_progress_without_partial_download(
+        self, image_store_dir, file_sha256, file_filename_on_disk
+    ):
+        f = AsyncLocalBootResourceFile(
+            sha256=file_sha256,
+            filename_on_disk=file_filename_on_disk,
+            total_size=FILE_SIZE,
+        )
+        progress = await f.load_progress(FILE_SLICE)
+        assert progress == DownloadProgress(
+            file_sha256, FILE_SIZE, FILE_SLICE, [0] * (FILE_SIZE // FILE_SLICE)
+        )
+
+    @pytest.mark.parametrize(
+        "saved",
+        [
+            DownloadProgress("other-sha", FILE_SIZE, FILE_SLICE, [0] * 16),
+            DownloadProgress("", FILE_SIZE, FILE_SLICE * 2, [0] * 8),
+            DownloadProgress("", FILE_SIZE, FILE_SLICE, [FILE_SLICE + 1] * 16),
+        ],
+    )
+    async def test_load_progress_discards_mismatching_progress(
+        self, image_store_dir, file_sha256, file_filename_on_disk, saved
+    ):
+        f = AsyncLocalBootResourceFile(
+            sha256=file_sha256,
+            filename_on_disk=file_filename_on_disk,
+            total_size=FILE_SIZE,
+        )
+        f.path.write_bytes(b"\x00" * FILE_SIZE)
+        saved.sha256 = saved.sha256 or file_sha256
+        await f.save_progress(saved)
+        progress = await f.load_progress(FILE_SLICE)
+        assert progress.downloaded == 0
+
+    async def test_store_parts_resumes_download(
+        self, image_store_dir, file_content, file_sha256, file_filename_on_disk
+    ):
+        f = AsyncLocalBootResourceFile(
+            sha256=file_sha256,
+            filename_on_disk=file_filename_on_disk,
+            total_size=FILE_SIZE,
+        )
+        progress = await f.load_progress(FILE_SIZE // 2)
+        with pytest.raises(ConnectionError):
+            async with f.store_parts(progress) as store:
+                await store.write(0, file_content[:FILE_SLICE])
+                progress.done[0] += FILE_SLICE
+                raise ConnectionError()
+
+        assert f.path.exists()
+        assert await f.complete() is False
+        progress = await f.load_progress(FILE_SIZE // 2)
+        assert progress.done == [FILE_SLICE, 0]
+        assert progress.pending_parts == [0, 1]
+
+        async with f.store_parts(progress) as store:
+            await store.write(FILE_SIZE // 2, file_content[FILE_SIZE // 2 :])
+            await store.write(
+                FILE_SLICE, file_content[FILE_SLICE : FILE_SIZE // 2]
+            )
+            progress.done = [FILE_SIZE // 2, FILE_SIZE // 2]
+
+        assert await f.valid()
+        assert not f.progress_path.exists()
+
+    async def test_store_parts_raises_if_parts_are_missing(
+        self, image_store_dir, file_content, file_sha256, file_filename_on_disk
+    ):
+        f = AsyncLocalBootResourceFile(
+            sha256=file_sha256,
+            filename_on_disk=file_filename_on_disk,
+            total_size=FILE_SIZE,
+        )
+        progress = await f.load_progress(FILE_SIZE // 2)
+        with pytest.raises(LocalStoreFileSizeMismatch):
+            async with f.store_parts(progress) as store:
+                await store.write(0, file_content[: FILE_SIZE // 2])
+                progress.done[0] = FILE_SIZE // 2
+
+        assert not f.path.exists()
+        assert not f.progress_path.exists()
+
+    async def test_store_parts_raises_if_sha_doesnt_match(
+        self, image_store_dir, file_content, file_filename_on_disk
+    ):
+        f = AsyncLocalBootResourceFile(
+            sha256="wrong-sha",
+            filename_on_disk=file_filename_on_disk,
+            total_size=FILE_SIZE,
+        )
+        progress = await f.load_progress(FILE_SIZE)
+        with pytest.raises(LocalStoreInvalidHash):
+            async with f.store_parts(progress) as store:
+                await store.write(0, file_content)
+                progress.done[0] = FILE_SIZE
+
+        assert not f.path.exists()
+        assert not f.progress_path.exists()
+
     async def test_extract_file(
         self,
         image_store_dir,
@@ -524,3 +639,28 @@ class TestSyncLocalBootResourceFile:
 
         for i in range(0, len(file_content), FILE_SLICE):
             f.append_chunk(file_content[i : i + FILE_SLICE])
+
+
+class TestDownloadProgress:
+    def test_mark_downloaded_within_part(self):
+        progress = DownloadProgress.start("", 100, 40)
+        progress.mark_downloaded(0, 10)
+        progress.mark_downloaded(10, 25)
+        assert progress.done == [25, 0, 0]
+
+    def test_mark_downloaded_across_parts(self):
+        progress = DownloadProgress.start("", 100, 40)
+        progress.mark_downloaded(0, 90)
+        assert progress.done == [40, 40, 10]
+        progress.mark_downloaded(90, 100)
+        assert progress.complete
+
+    def test_mark_downloaded_ignores_gaps(self):
+        progress = DownloadProgress("", 100, 40, [10, 0, 0])
+        progress.mark_downloaded(20, 50)
+        assert progress.done == [10, 10, 0]
+
+    def test_mark_downloaded_keeps_done_bytes(self):
+        progress = DownloadProgress("", 100, 40, [30, 0, 0])
+        progress.mark_downloaded(0, 10)
+        assert progress.done == [30, 0, 0]
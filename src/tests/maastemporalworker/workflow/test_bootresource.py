@@ -10,9 +10,8 @@ import os
 from pathlib import Path
 import shutil
 from typing import Any
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, call, Mock
 
-from aiofiles.threadpool.binary import AsyncBufferedIOBase
 import httpx
 import pytest
 from temporalio import activity
@@ -104,9 +103,11 @@ from maasservicelayer.simplestreams.models import (
 )
 from maasservicelayer.utils.image_local_files import (
     AsyncLocalBootResourceFile,
+    DownloadProgress,
     LocalStoreAllocationFail,
     LocalStoreFileSizeMismatch,
     LocalStoreInvalidHash,
+    PartsWriter,
 )
 from maastemporalworker.worker import (
     custom_sandbox_runner,
@@ -226,6 +227,9 @@ def mock_local_file(mocker):
         "maastemporalworker.workflow.bootresource.AsyncLocalBootResourceFile"
     ).return_value = m
     m.total_size = FILE_SIZE
+    m.load_progress.side_effect = lambda part_size: DownloadProgress.start(
+        "0" * 64, 100, part_size
+    )
     yield m
 
 
@@ -353,7 +357,7 @@ class TestDownloadBootresourcefileActivity:
             param.rfile_ids, mock_local_file.total_size
         )
         mock_apiclient.make_client.assert_not_called()
-        mock_local_file.store.assert_not_called()
+        mock_local_file.store_parts.assert_not_called()
 
     async def test_extract_file_emits_heartbeat(
         self,
@@ -407,8 +411,8 @@ class TestDownloadBootresourcefileActivity:
         mock_apiclient._mocked_client.stream.return_value = (
             AsyncContextManagerMock(mock_http_response)
         )
-        mock_store = Mock(AsyncBufferedIOBase)
-        mock_local_file.store.return_value = AsyncContextManagerMock(
+        mock_store = Mock(PartsWriter)
+        mock_local_file.store_parts.return_value = AsyncContextManagerMock(
             mock_store
         )
 
@@ -433,7 +437,7 @@ class TestDownloadBootresourcefileActivity:
             "Download finished",
         ]
 
-        mock_store.write.assert_awaited_once_with(bytearray(b"foobar"))
+        mock_store.write.assert_awaited_once_with(0, bytearray(b"foobar"))
         boot_activities.report_progress.assert_awaited_once_with(
             param.rfile_ids, mock_local_file.total_size
         )
@@ -460,8 +464,8 @@ class TestDownloadBootresourcefileActivity:
         mock_apiclient._mocked_client.stream.return_value = (
             AsyncContextManagerMock(mock_http_response)
         )
-        mock_store = Mock(AsyncBufferedIOBase)
-        mock_local_file.store.return_value = AsyncContextManagerMock(
+        mock_store = Mock(PartsWriter)
+        mock_local_file.store_parts.return_value = AsyncContextManagerMock(
             mock_store
         )
         services_mock.msm.get_status.return_value = MSMStatus(
@@ -500,6 +504,303 @@ class TestDownloadBootresourcefileActivity:
             "http://site-manager.io/site/images/squashfs",
         )
 
+    async def test_download_resumes_partial_file(
+        self,
+        mock_local_file: Mock,
+        boot_activities: BootResourcesActivity,
+        mock_apiclient: Mock,
+        activity_env: ActivityEnvironment,
+    ) -> None:
+        mock_local_file.valid.return_value = False
+        mock_local_file.load_progress.side_effect = None
+        mock_local_file.load_progress.return_value = DownloadProgress(
+            "0" * 64, 100, 100, [94]
+        )
+        mock_http_response = Mock(httpx.Response)
+        mock_http_response.status_code = 206
+        mock_http_response.aiter_bytes.return_value = AsyncIteratorMock(
+            [b"foobar"]
+        )
+        mock_apiclient._mocked_client.stream.return_value = (
+            AsyncContextManagerMock(mock_http_response)
+        )
+        mock_store = Mock(PartsWriter)
+        mock_local_file.store_parts.return_value = AsyncContextManagerMock(
+            mock_store
+        )
+
+        param = ResourceDownloadParam(
+            rfile_ids=[1],
+            source_list=["http://maas-image-stream.io"],
+            sha256="0" * 64,
+            filename_on_disk="0" * 7,
+            total_size=100,
+        )
+        res = await activity_env.run(
+            boot_activities.download_bootresourcefile, param
+        )
+        assert res is True
+
+        mock_apiclient._mocked_client.stream.assert_called_once_with(
+            "GET",
+            "http://maas-image-stream.io",
+            headers={"Range": "bytes=94-99"},
+        )
+        mock_store.write.assert_awaited_once_with(94, bytearray(b"foobar"))
+
+    async def test_download_resume_ignored_by_server(
+        self,
+        mock_local_file: Mock,
+        boot_activities: BootResourcesActivity,
+        mock_apiclient: Mock,
+        activity_env: ActivityEnvironment,
+    ) -> None:
+        mock_local_file.valid.return_value = False
+        mock_local_file.load_progress.side_effect = None
+        mock_local_file.load_progress.return_value = DownloadProgress(
+            "0" * 64, 6, 6, [3]
+        )
+        mock_http_response = Mock(httpx.Response)
+        mock_http_response.status_code = 200
+        mock_http_response.aiter_bytes.return_value = AsyncIteratorMock(
+            [b"fo", b"obar"]
+        )
+        mock_apiclient._mocked_client.stream.return_value = (
+            AsyncContextManagerMock(mock_http_response)
+        )
+        mock_store = Mock(PartsWriter)
+        mock_local_file.store_parts.return_value = AsyncContextManagerMock(
+            mock_store
+        )
+
+        param = ResourceDownloadParam(
+            rfile_ids=[1],
+            source_list=["http://maas-image-stream.io"],
+            sha256="0" * 64,
+            filename_on_disk="0" * 7,
+            total_size=6,
+        )
+        res = await activity_env.run(
+            boot_activities.download_bootresourcefile, param
+        )
+        assert res is True
+
+        # The whole file is downloaded again, in a single request.
+        assert mock_apiclient._mocked_client.stream.call_args_list == [
+            call(
+                "GET",
+                "http://maas-image-stream.io",
+                headers={"Range": "bytes=3-5"},
+            ),
+            call("GET", "http://maas-image-stream.io"),
+        ]
+        mock_store.write.assert_awaited_once_with(0, bytearray(b"foobar"))
+
+    async def test_download_parts_from_all_sources(
+        self,
+        mocker,
+        a_file: Path,
+        boot_activities: BootResourcesActivity,
+        mock_apiclient: Mock,
+        activity_env: ActivityEnvironment,
+    ) -> None:
+        mocker.patch(
+            "maastemporalworker.workflow.bootresource.DOWNLOAD_PART_SIZE", 16
+        )
+        content = a_file.read_bytes()
+        a_file.unlink()
+        requested = []
+
+        def make_client(http_proxy, headers):
+            def stream(method, url, headers):
+                requested.append((url, headers["Range"]))
+                start, end = headers["Range"].removeprefix("bytes=").split("-")
+                response = Mock(httpx.Response)
+                response.status_code = 206
+                response.aiter_bytes.return_value = AsyncIteratorMock(
+                    [content[int(start) : int(end) + 1]]
+                )
+                return AsyncContextManagerMock(response)
+
+            client = Mock(httpx.AsyncClient)
+            client.stream.side_effect = stream
+            return client
+
+        mock_apiclient.make_client.side_effect = make_client
+
+        param = ResourceDownloadParam(
+            rfile_ids=[1],
+            source_list=["http://region1", "http://region2"],
+            sha256=a_file.name,
+            filename_on_disk=a_file.name,
+            total_size=FILE_SIZE,
+        )
+        res = await activity_env.run(
+            boot_activities.download_bootresourcefile, param
+        )
+        assert res is True
+
+        assert a_file.read_bytes() == content
+        assert not a_file.with_name(f"{a_file.name}.progress").exists()
+        assert sorted(requested) == [
+            ("http://region1", "bytes=16-31"),
+            ("http://region1", "bytes=48-49"),
+            ("http://region2", "bytes=0-15"),
+            ("http://region2", "bytes=32-47"),
+        ]
+        assert mock_apiclient.make_client.call_count == 2
+        boot_activities.report_progress.assert_awaited_once_with(
+            param.rfile_ids, FILE_SIZE
+        )
+
+    async def test_download_parts_ignored_by_server(
+        self,
+        mocker,
+        a_file: Path,
+        boot_activities: BootResourcesActivity,
+        mock_apiclient: Mock,
+        activity_env: ActivityEnvironment,
+    ) -> None:
+        mocker.patch(
+            "maastemporalworker.workflow.bootresource.DOWNLOAD_PART_SIZE", 16
+        )
+        content = a_file.read_bytes()
+        a_file.unlink()
+        requested = []
+
+        def stream(method, url, headers=None):
+            requested.append((url, (headers or {}).get("Range")))
+            response = Mock(httpx.Response)
+            response.status_code = 200
+            response.aiter_bytes.return_value = AsyncIteratorMock([content])
+            return AsyncContextManagerMock(response)
+
+        mock_apiclient._mocked_client.stream.side_effect = stream
+
+        param = ResourceDownloadParam(
+            rfile_ids=[1],
+            source_list=["http://region1"],
+            sha256=a_file.name,
+            filename_on_disk=a_file.name,
+            total_size=FILE_SIZE,
+        )
+        res = await activity_env.run(
+            boot_activities.download_bootresourcefile, param
+        )
+        assert res is True
+
+        assert a_file.read_bytes() == content
+        # Only the first part is requested before falling back to a single
+        # stream of the whole file.
+        assert requested == [
+            ("http://region1", "bytes=0-15"),
+            ("http://region1", None),
+        ]
+
+    async def test_download_parts_from_other_source_on_error(
+        self,
+        mocker,
+        a_file: Path,
+        boot_activities: BootResourcesActivity,
+        mock_apiclient: Mock,
+        activity_env: ActivityEnvironment,
+    ) -> None:
+        mocker.patch(
+            "maastemporalworker.workflow.bootresource.DOWNLOAD_PART_SIZE", 16
+        )
+        content = a_file.read_bytes()
+        a_file.unlink()
+        requested = []
+
+        def make_client(http_proxy, headers):
+            def stream(method, url, headers):
+                requested.append((url, headers["Range"]))
+                response = Mock(httpx.Response)
+                if url == "http://broken":
+                    response.raise_for_status.side_effect = (
+                        httpx.HTTPStatusError(
+                            "404",
+                            request=Mock(httpx.Request),
+                            response=httpx.Response(404),
+                        )
+                    )
+                    return AsyncContextManagerMock(response)
+                start, end = headers["Range"].removeprefix("bytes=").split("-")
+                response.status_code = 206
+                response.aiter_bytes.return_value = AsyncIteratorMock(
+                    [content[int(start) : int(end) + 1]]
+                )
+                return AsyncContextManagerMock(response)
+
+            client = Mock(httpx.AsyncClient)
+            client.stream.side_effect = stream
+            return client
+
+        mock_apiclient.make_client.side_effect = make_client
+
+        param = ResourceDownloadParam(
+            rfile_ids=[1],
+            source_list=["http://broken", "http://region1"],
+            sha256=a_file.name,
+            filename_on_disk=a_file.name,
+            total_size=FILE_SIZE,
+        )
+        res = await activity_env.run(
+            boot_activities.download_bootresourcefile, param
+        )
+        assert res is True
+
+        assert a_file.read_bytes() == content
+        assert sorted(
+            part for url, part in requested if url == "http://region1"
+        ) == ["bytes=0-15", "bytes=16-31", "bytes=32-47", "bytes=48-49"]
+
+    async def test_download_keeps_parts_on_http_error(
+        self,
+        mock_local_file: Mock,
+        boot_activities: BootResourcesActivity,
+        mock_apiclient: Mock,
+        activity_env: ActivityEnvironment,
+    ) -> None:
+        mock_local_file.valid.return_value = False
+        mock_local_file.load_progress.side_effect = None
+        mock_local_file.load_progress.return_value = DownloadProgress(
+            "0" * 64, 100, 100, [94]
+        )
+        mock_http_response = Mock(httpx.Response)
+        mock_http_response.raise_for_status.side_effect = (
+            httpx.HTTPStatusError(
+                "500",
+                request=Mock(httpx.Request),
+                response=httpx.Response(500),
+            )
+        )
+        mock_apiclient._mocked_client.stream.return_value = (
+            AsyncContextManagerMock(mock_http_response)
+        )
+        mock_local_file.store_parts.return_value = AsyncContextManagerMock(
+            Mock(PartsWriter)
+        )
+
+        param = ResourceDownloadParam(
+            rfile_ids=[1],
+            source_list=["http://region1", "http://region2"],
+            sha256="0" * 64,
+            filename_on_disk="0" * 7,
+            total_size=100,
+        )
+        with pytest.raises(ApplicationError) as ex:
+            await activity_env.run(
+                boot_activities.download_bootresourcefile, param
+            )
+
+        assert ex.value.non_retryable is True
+        assert mock_apiclient._mocked_client.stream.call_count == 2
+        mock_local_file.unlink.assert_not_called()
+        boot_activities.report_progress.assert_awaited_once_with(
+            param.rfile_ids, 94
+        )
+
     async def test_download_file_fails_checksum_check(
         self,
         mock_local_file: Mock,
@@ -508,7 +809,7 @@ class TestDownloadBootresourcefileActivity:
         activity_env: ActivityEnvironment,
     ) -> None:
         mock_local_file.valid.return_value = False
-        mock_local_file.store.side_effect = LocalStoreInvalidHash()
+        mock_local_file.store_parts.side_effect = LocalStoreInvalidHash()
 
         mock_http_response = Mock(httpx.Response)
         mock_apiclient._mocked_client.stream.return_value = (
@@ -534,10 +835,6 @@ class TestDownloadBootresourcefileActivity:
         boot_activities.report_progress.assert_awaited_once_with(
             param.rfile_ids, 0
         )
-        mock_apiclient._mocked_client.stream.assert_called_once_with(
-            "GET",
-            "http://maas-image-stream.io",
-        )
 
     async def test_download_file_raise_out_of_disk_exception(
         self,
@@ -549,7 +846,7 @@ class TestDownloadBootresourcefileActivity:
         mock_local_file.valid.return_value = False
         exception = IOError()
         exception.errno = 28
-        mock_local_file.store.side_effect = exception
+        mock_local_file.store_parts.side_effect = exception
         mock_http_response = Mock(httpx.Response)
         mock_apiclient._mocked_client.stream.return_value = (
             AsyncContextManagerMock(mock_http_response)
@@ -576,7 +873,7 @@ class TestDownloadBootresourcefileActivity:
         "exception",
         [CancelledError(), asyncio.CancelledError()],
     )
-    async def test_local_file_gets_unlinked_when_activity_is_cancelled(
+    async def test_local_file_is_kept_when_activity_is_cancelled(
         self,
         mock_local_file: Mock,
         boot_activities: BootResourcesActivity,
@@ -587,7 +884,7 @@ class TestDownloadBootresourcefileActivity:
         mock_local_file.valid.return_value = False
         # `store` is not the responsible of raising all these exceptions,
         # but we use it to avoid patching the rest of the function
-        mock_local_file.store.side_effect = exception
+        mock_local_file.store_parts.side_effect = exception
         mock_http_response = Mock(httpx.Response)
         mock_apiclient._mocked_client.stream.return_value = (
             AsyncContextManagerMock(mock_http_response)
@@ -604,7 +901,7 @@ class TestDownloadBootresourcefileActivity:
             await activity_env.run(
                 boot_activities.download_bootresourcefile, param
             )
-        mock_local_file.unlink.assert_called_once()
+        mock_local_file.unlink.assert_not_called()
         boot_activities.report_progress.assert_awaited_once_with(
             param.rfile_ids, 0
         )
@@ -629,6 +926,14 @@ class TestDownloadBootresourcefileActivity:
                 ),
                 True,
             ),
+            (
+                httpx.HTTPStatusError(
+                    "416",
+                    request=Mock(httpx.Request),
+                    response=httpx.Response(416),
+                ),
+                False,
+            ),
             (httpx.HTTPError("Error"), False),
             (LocalStoreInvalidHash(), False),
             (LocalStoreAllocationFail(), True),
@@ -647,7 +952,7 @@ class TestDownloadBootresourcefileActivity:
         mock_local_file.valid.return_value = False
         # `store` is not the responsible of raising all these exceptions,
         # but we use it to avoid patching the rest of the function
-        mock_local_file.store.side_effect = exception
+        mock_local_file.store_parts.side_effect = exception
         mock_http_response = Mock(httpx.Response)
         mock_apiclient._mocked_client.stream.return_value = (
             AsyncContextManagerMock(mock_http_response)
@@ -1,25 +1,41 @@
 from unittest.mock import Mock
+import uuid
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncConnection
+from temporalio import activity
 from temporalio.client import Client
-from temporalio.testing import ActivityEnvironment
+from temporalio.testing import ActivityEnvironment, WorkflowEnvironment
+from temporalio.worker import Worker
 
 from maascommon.enums.ipaddress import IpAddressType
 from maascommon.enums.ipranges import IPRangeType
+from maascommon.workflows.dhcp import (
+    CONFIGURE_DHCP_FOR_AGENT_SIGNAL_NAME,
+    ConfigureDHCPForAgentParam,
+)
 from maasservicelayer.db import Database
 from maasservicelayer.services import CacheForServices
 from maastemporalworker.workflow.dhcp import (
+    APPLY_DHCP_CONFIG_VIA_FILE_ACTIVITY_NAME,
+    APPLY_DHCP_CONFIG_VIA_OMAPI_ACTIVITY_NAME,
+    ApplyConfigViaOmapiParam,
+    ConfigureDHCPForAgentWorkflow,
     ConfigureDHCPParam,
     DHCPConfigActivity,
     DHCPDataForAgent,
+    FETCH_HOSTS_FOR_UPDATE_ACTIVITY_NAME,
     FetchHostsForUpdateParam,
+    GET_OMAPI_KEY_ACTIVITY_NAME,
     GetActiveInterfacesForAgentParam,
     GetDHCPDataForAgentParam,
     Host,
     HostReservationData,
+    HostsForUpdateResult,
     InterfaceData,
     IPRangeData,
+    OMAPIKeyResult,
+    RESTART_DHCP_SERVICE_ACTIVITY_NAME,
     SubnetData,
     VlanData,
 )
@@ -508,3 +524,125 @@ class TestDHCPConfigActivity:
             default_dns_servers=[str(sip["ip"]) for sip in sips],
             ntp_servers=[str(sip["ip"]) for sip in sips],
         )
+
+
+@pytest.mark.asyncio
+class TestConfigureDHCPForAgentWorkflow:
+    async def _run(
+        self,
+        updates: list[ConfigureDHCPForAgentParam],
+        config_changed: bool = True,
+    ) -> dict[str, list]:
+        calls = {}
+
+        def record(name, value=None):
+            calls.setdefault(name, []).append(value)
+
+        @activity.defn(name=APPLY_DHCP_CONFIG_VIA_FILE_ACTIVITY_NAME)
+        async def mock_apply_config_via_file() -> bool:
+            record("apply-via-file")
+            return config_changed
+
+        @activity.defn(name=RESTART_DHCP_SERVICE_ACTIVITY_NAME)
+        async def mock_restart_service() -> None:
+            record("restart")
+
+        @activity.defn(name=FETCH_HOSTS_FOR_UPDATE_ACTIVITY_NAME)
+        async def mock_fetch_hosts(
+            param: FetchHostsForUpdateParam,
+        ) -> HostsForUpdateResult:
+            record("fetch-hosts", param)
+            return HostsForUpdateResult(hosts=[])
+
+        @activity.defn(name=GET_OMAPI_KEY_ACTIVITY_NAME)
+        async def mock_get_omapi_key() -> OMAPIKeyResult:
+            return OMAPIKeyResult(key="key")
+
+        @activity.defn(name=APPLY_DHCP_CONFIG_VIA_OMAPI_ACTIVITY_NAME)
+        async def mock_apply_config_via_omapi(
+            param: ApplyConfigViaOmapiParam,
+        ) -> None:
+            record("apply-via-omapi")
+
+        async with await WorkflowEnvironment.start_time_skipping() as env:
+            async with (
+                Worker(
+                    env.client,
+                    task_queue="region",
+                    workflows=[ConfigureDHCPForAgentWorkflow],
+                    activities=[mock_fetch_hosts, mock_get_omapi_key],
+                ),
+                Worker(
+                    env.client,
+                    task_queue="agent@agent:main",
+                    activities=[
+                        mock_apply_config_via_file,
+                        mock_restart_service,
+                        mock_apply_config_via_omapi,
+                    ],
+                ),
+            ):
+                handle = await env.client.start_workflow(
+                    ConfigureDHCPForAgentWorkflow.run,
+                    updates[0],
+                    id=f"workflow-{uuid.uuid4()}",
+                    task_queue="region",
+                )
+                for update in updates[1:]:
+                    await handle.signal(
+                        CONFIGURE_DHCP_FOR_AGENT_SIGNAL_NAME, update
+                    )
+                await handle.result()
+        return calls
+
+    async def test_coalesces_updates(self) -> None:
+        calls = await self._run(
+            [
+                ConfigureDHCPForAgentParam(
+                    system_id="agent",
+                    full_reload=False,
+                    static_ip_addr_ids=[1],
+                ),
+                ConfigureDHCPForAgentParam(
+                    system_id="agent",
+                    full_reload=False,
+                    static_ip_addr_ids=[2, 1],
+                    reserved_ip_ids=[3],
+                ),
+            ]
+        )
+        assert calls["fetch-hosts"] == [
+            FetchHostsForUpdateParam(
+                system_id="agent",
+                static_ip_addr_ids=[1, 2],
+                reserved_ip_ids=[3],
+            )
+        ]
+        assert len(calls["apply-via-file"]) == 1
+        assert len(calls["apply-via-omapi"]) == 1
+        assert "restart" not in calls
+
+    async def test_full_reload_supersedes_updates(self) -> None:
+        calls = await self._run(
+            [
+                ConfigureDHCPForAgentParam(
+                    system_id="agent",
+                    full_reload=False,
+                    static_ip_addr_ids=[1],
+                ),
+                ConfigureDHCPForAgentParam(
+                    system_id="agent", full_reload=True
+                ),
+            ]
+        )
+        assert len(calls["apply-via-file"]) == 1
+        assert len(calls["restart"]) == 1
+        assert "fetch-hosts" not in calls
+
+    async def test_full_reload_without_changes_skips_restart(self) -> None:
+        calls = await self._run(
+            [ConfigureDHCPForAgentParam(system_id="agent", full_reload=True)],
+            config_changed=False,
+        )
+        assert len(calls["apply-via-file"]) == 1
+        assert "restart" not in calls
@@ -8,7 +8,7 @@ from unittest.mock import Mock
 import uuid
 
 import pytest
-from sqlalchemy import select, update
+from sqlalchemy import select, text, update
 from sqlalchemy.ext.asyncio import AsyncConnection
 from temporalio import activity
 from temporalio.client import Client
@@ -16,16 +16,23 @@ from temporalio.testing import WorkflowEnvironment
 from temporalio.worker import Worker
 
 from maasservicelayer.db import Database
-from maasservicelayer.db.tables import NodeTagTable, TagTable
+from maasservicelayer.db.tables import (
+    NodeTagTable,
+    ScriptResultTable,
+    TagTable,
+)
 from maasservicelayer.models.bmc import Bmc
 from maasservicelayer.models.users import User
 from maasservicelayer.services import CacheForServices
 from maastemporalworker.workflow.tag_evaluation import (
-    EVALUATE_TAG_ACTIVITY_NAME,
+    EVALUATE_TAGS_ACTIVITY_NAME,
+    TagDefinition,
     TagEvaluationActivity,
     TagEvaluationParam,
     TagEvaluationResult,
     TagEvaluationWorkflow,
+    TagsEvaluationParam,
+    TagsEvaluationWorkflow,
 )
 from metadataserver.enum import SCRIPT_STATUS
 from provisioningserver.refresh.node_info_scripts import (
@@ -212,13 +219,13 @@ class TestTagEvaluationWorkflow:
 
     async def test_tag_evaluation_workflow(self):
         calls = {}
-        activity_param = TagEvaluationParam(101, "//node")
+        workflow_param = TagEvaluationParam(101, "//node", batch_size=10)
 
-        @activity.defn(name=EVALUATE_TAG_ACTIVITY_NAME)
-        async def mock_evaluate_tag(
-            param: TagEvaluationParam,
+        @activity.defn(name=EVALUATE_TAGS_ACTIVITY_NAME)
+        async def mock_evaluate_tags(
+            param: TagsEvaluationParam,
         ) -> TagEvaluationResult:
-            calls["evaluate-tag"] = param
+            calls["evaluate-tags"] = param
             return TagEvaluationResult(inserted=0, deleted=0)
 
         async with await WorkflowEnvironment.start_time_skipping() as env:
@@ -226,16 +233,47 @@ class TestTagEvaluationWorkflow:
                 env.client,
                 task_queue="test::region",
                 workflows=[TagEvaluationWorkflow],
-                activities=[mock_evaluate_tag],
+                activities=[mock_evaluate_tags],
             ) as worker:
                 await env.client.execute_workflow(
                     workflow=TagEvaluationWorkflow.run,
+                    arg=workflow_param,
+                    id=f"workflow-{uuid.uuid4()}",
+                    task_queue=worker.task_queue,
+                )
+
+        assert calls["evaluate-tags"] == TagsEvaluationParam(
+            [TagDefinition(101, "//node")], batch_size=10
+        )
+
+    async def test_tags_evaluation_workflow(self):
+        calls = {}
+        activity_param = TagsEvaluationParam(
+            [TagDefinition(101, "//node"), TagDefinition(102, "//lldp")]
+        )
+
+        @activity.defn(name=EVALUATE_TAGS_ACTIVITY_NAME)
+        async def mock_evaluate_tags(
+            param: TagsEvaluationParam,
+        ) -> TagEvaluationResult:
+            calls["evaluate-tags"] = param
+            return TagEvaluationResult(inserted=0, deleted=0)
+
+        async with await WorkflowEnvironment.start_time_skipping() as env:
+            async with Worker(
+                env.client,
+                task_queue="test::region",
+                workflows=[TagsEvaluationWorkflow],
+                activities=[mock_evaluate_tags],
+            ) as worker:
+                await env.client.execute_workflow(
+                    workflow=TagsEvaluationWorkflow.run,
                     arg=activity_param,
                     id=f"workflow-{uuid.uuid4()}",
                     task_queue=worker.task_queue,
                 )
 
-        assert calls["evaluate-tag"] == activity_param
+        assert calls["evaluate-tags"] == activity_param
 
 
 @pytest.mark.asyncio
@@ -453,3 +491,171 @@ class TestTagEvaluationActivities:
             (machine_1["id"], tag_02.id),
             (machine_5["id"], tag_03["id"]),
         }
+
+    @pytest.mark.parametrize("batch_size", [1000, 2, 1])
+    async def test_tags_evaluation_activity(
+        self,
+        db: Database,
+        db_connection: AsyncConnection,
+        fixture: Fixture,
+        _machine_entries_for_tag_evaluation_tests,
+        batch_size,
+    ):
+        """
+        Test the evaluation of several tags in a single pass.
+
+        Tag definitions can contain single quotes, since they are passed to
+        the database as parameters.
+        """
+        tag_evaluation_activity = TagEvaluationActivity(
+            db,
+            CacheForServices(),
+            temporal_client=Mock(Client),
+            connection=db_connection,
+        )
+        machine_1, machine_2, _, _, machine_5 = (
+            _machine_entries_for_tag_evaluation_tests
+        )
+        tag_01 = await create_test_tag_entry(
+            fixture, name="tag_01", definition="//node"
+        )
+        tag_02 = await create_test_tag_entry(
+            fixture, name="tag_02", definition="//vendor[text()='Vendor Y']"
+        )
+        tag_03 = await create_test_tag_entry(
+            fixture, name="tag_03", definition="//lldp"
+        )
+        tag_04 = await create_test_tag_entry(
+            fixture, name="tag_04", definition="//machine"
+        )
+        param = TagsEvaluationParam(
+            [
+                TagDefinition(tag["id"], tag["definition"])
+                for tag in (tag_01, tag_02, tag_03, tag_04)
+            ],
+            batch_size=batch_size,
+        )
+
+        result = await tag_evaluation_activity.evaluate_tags(param)
+
+        rows = await self._retrieve_node_tag_entries(db_connection)
+        assert result == TagEvaluationResult(inserted=4, deleted=0)
+        assert set(rows) == {
+            (machine_1["id"], tag_01["id"]),
+            (machine_2["id"], tag_01["id"]),
+            (machine_2["id"], tag_02["id"]),
+            (machine_5["id"], tag_03["id"]),
+        }
+
+    async def test_tags_evaluation_activity_skips_superseded_definitions(
+        self,
+        db: Database,
+        db_connection: AsyncConnection,
+        fixture: Fixture,
+        _machine_entries_for_tag_evaluation_tests,
+    ):
+        """
+        An evaluation that overlaps with a later one doesn't write the
+        results of the tags whose definition has changed, even if it
+        finishes last.
+        """
+        tag_evaluation_activity = TagEvaluationActivity(
+            db,
+            CacheForServices(),
+            temporal_client=Mock(Client),
+            connection=db_connection,
+        )
+        machine_1, _, _, _, machine_5 = (
+            _machine_entries_for_tag_evaluation_tests
+        )
+        tag_01 = await create_test_tag_entry(
+            fixture, name="tag_01", definition="//node"
+        )
+        tag_02 = await create_test_tag_entry(
+            fixture, name="tag_02", definition="//lldp"
+        )
+        # The evaluation of tags 1 and 2 is started, then tag 1 is updated
+        # and evaluated again before the first evaluation ends.
+        stale_param = TagsEvaluationParam(
+            [
+                TagDefinition(tag_01["id"], tag_01["definition"]),
+                TagDefinition(tag_02["id"], tag_02["definition"]),
+            ]
+        )
+        await db_connection.execute(
+            update(TagTable)
+            .values(definition='//vendor[text()="Vendor X"]')
+            .where(TagTable.c.id == tag_01["id"])
+        )
+        param = TagsEvaluationParam(
+            [TagDefinition(tag_01["id"], '//vendor[text()="Vendor X"]')]
+        )
+
+        result = await tag_evaluation_activity.evaluate_tags(param)
+        assert result == TagEvaluationResult(inserted=1, deleted=0)
+        result = await tag_evaluation_activity.evaluate_tags(stale_param)
+        assert result == TagEvaluationResult(inserted=1, deleted=0)
+
+        rows = await self._retrieve_node_tag_entries(db_connection)
+        assert set(rows) == {
+            (machine_1["id"], tag_01["id"]),
+            (machine_5["id"], tag_02["id"]),
+        }
+
+    async def test_tag_evaluation_activity_stores_xml_documents(
+        self,
+        db: Database,
+        db_connection: AsyncConnection,
+        fixture: Fixture,
+        _machine_entries_for_tag_evaluation_tests,
+    ):
+        """
+        The decoded output of the scripts is stored, and reused by later
+        evaluations until the script result is updated.
+        """
+        tag_evaluation_activity = TagEvaluationActivity(
+            db,
+            CacheForServices(),
+            temporal_client=Mock(Client),
+            connection=db_connection,
+        )
+        tag = await create_test_tag_entry(
+            fixture, name="tag_01", definition="//node"
+        )
+        param = TagEvaluationParam(tag["id"], tag["definition"])
+        result = await tag_evaluation_activity.evaluate_tag(param)
+        assert result == TagEvaluationResult(inserted=2, deleted=0)
+
+        cursor_result = await db_connection.execute(
+            text(
+                "SELECT count(*), count(document) "
+                "FROM maasserver_scriptresultxml"
+            )
+        )
+        # All 5 script results are stored, but the output of machines 3 and
+        # 4 is not a well formed XML document.
+        assert cursor_result.one() == (5, 3)
+
+        # Changing the output without updating the script result doesn't
+        # change the result: the stored document is used.
+        await db_connection.execute(
+            update(ScriptResultTable).values(stdout="")
+        )
+        result = await tag_evaluation_activity.evaluate_tag(param)
+        assert result == TagEvaluationResult(inserted=0, deleted=0)
+
+        # Once the script results are updated, the output is decoded again.
+        await db_connection.execute(
+            update(ScriptResultTable).values(
+                updated=datetime.now(timezone.utc)
+            )
+        )
+        result = await tag_evaluation_activity.evaluate_tag(param)
+        assert result == TagEvaluationResult(inserted=0, deleted=0)
+        cursor_result = await db_connection.execute(
+            text(
+                "SELECT count(*), count(document) "
+                "FROM maasserver_scriptresultxml"
+            )
+        )
+        assert cursor_result.one() == (5, 0)
@@ -22,6 +22,22 @@ class TestPerfTester:
             sleep(0.1)
         assert perf_tester.results["tests"][test_name]["duration"] > 0
 
+    def test_add_results_extends_recorded_results(self):
+        perf_tester = PerfTester(
+            factory.make_name("branch"),
+            factory.make_name("hash"),
+            tracers=["timing"],
+        )
+
+        test_name = factory.make_name("test")
+
+        with perf_tester.record(test_name):
+            sleep(0.1)
+        perf_tester.add_results(test_name, {"requests_per_second": 10.0})
+        results = perf_tester.results["tests"][test_name]
+        assert results["duration"] > 0
+        assert results["requests_per_second"] == 10.0
+
     def test_write_results_outputs_results(self, capsys):
         perf_tester = PerfTester(
             factory.make_name("branch"),